@@ -0,0 +1,127 @@
+/**
+ *  Copyright (C) 2023
+ *  the IceCube Collaboration
+ *
+ *  SPDX-License-Identifier: BSD-2-Clause
+ *
+ *  @file I3OMGeoTable.cxx
+ */
+
+#include <algorithm>
+#include <cmath>
+#include <map>
+#include <mutex>
+#include <boost/weak_ptr.hpp>
+#include <icetray/I3Logging.h>
+#include <dataclasses/geometry/I3OMGeoTable.h>
+
+const int I3OMGeoTable::NOT_IN_GEOMETRY;
+
+namespace {
+  // The tables that are still used by someone, by geometry.  Both are
+  // only held weakly, so a table goes away with the last one using it,
+  // and the geometry tells whether the address has been reused since.
+  typedef std::pair<boost::weak_ptr<const I3Geometry>,
+                    boost::weak_ptr<const I3OMGeoTable> > cache_entry_t;
+  typedef std::map<const I3Geometry*, cache_entry_t> cache_t;
+  cache_t cache;
+  std::mutex cacheMutex;
+}
+
+I3OMGeoTable::I3OMGeoTable(const I3OMGeoMap& omgeo) :
+  minString_(0), nStrings_(0), nOMs_(0)
+{
+  Fill(omgeo);
+}
+
+I3OMGeoTable::I3OMGeoTable(const I3Geometry& geometry) :
+  minString_(0), nStrings_(0), nOMs_(0)
+{
+  Fill(geometry.omgeo);
+}
+
+void
+I3OMGeoTable::Fill(const I3OMGeoMap& omgeo)
+{
+  if (omgeo.empty())
+    return;
+
+  // the map is sorted by string, so the first and last entries bound it
+  minString_ = omgeo.begin()->first.GetString();
+  nStrings_ = omgeo.rbegin()->first.GetString() - minString_ + 1;
+  unsigned maxOM = 0;
+  for (I3OMGeoMap::const_iterator i = omgeo.begin(); i != omgeo.end(); i++)
+    maxOM = std::max(maxOM, i->first.GetOM());
+  nOMs_ = size_t(maxOM) + 1;
+
+  keys_.reserve(omgeo.size());
+  x_.reserve(omgeo.size());
+  y_.reserve(omgeo.size());
+  z_.reserve(omgeo.size());
+  omtypes_.reserve(omgeo.size());
+
+  // The rows are in OMKey order, so the PMTs of each DOM are
+  // contiguous and the DOMs come in increasing cell order.
+  moduleBegin_.assign(nStrings_*nOMs_ + 1, 0);
+  for (I3OMGeoMap::const_iterator i = omgeo.begin(); i != omgeo.end(); i++) {
+    size_t cell = size_t(i->first.GetString() - minString_)*nOMs_ + i->first.GetOM();
+    moduleBegin_[cell + 1]++;
+    keys_.push_back(i->first);
+    x_.push_back(i->second.position.GetX());
+    y_.push_back(i->second.position.GetY());
+    z_.push_back(i->second.position.GetZ());
+    omtypes_.push_back(i->second.omtype);
+  }
+  for (size_t cell = 1; cell < moduleBegin_.size(); cell++)
+    moduleBegin_[cell] += moduleBegin_[cell - 1];
+}
+
+int
+I3OMGeoTable::GetIndex(const OMKey& key) const
+{
+  if (key.GetString() < minString_ || key.GetOM() >= nOMs_)
+    return NOT_IN_GEOMETRY;
+  size_t string = key.GetString() - minString_;
+  if (string >= nStrings_)
+    return NOT_IN_GEOMETRY;
+
+  size_t cell = string*nOMs_ + key.GetOM();
+  for (unsigned i = moduleBegin_[cell]; i < moduleBegin_[cell + 1]; i++)
+    if (keys_[i].GetPMT() == key.GetPMT())
+      return i;
+  return NOT_IN_GEOMETRY;
+}
+
+double
+I3OMGeoTable::GetDistance(size_t i, size_t j) const
+{
+  double dx = x_[j] - x_[i];
+  double dy = y_[j] - y_[i];
+  double dz = z_[j] - z_[i];
+  return std::sqrt(dx*dx + dy*dy + dz*dz);
+}
+
+I3OMGeoTableConstPtr
+I3OMGeoTable::Get(const I3GeometryConstPtr& geometry)
+{
+  if (!geometry)
+    log_fatal("Can't make an I3OMGeoTable without an I3Geometry.");
+
+  std::lock_guard<std::mutex> lock(cacheMutex);
+  for (cache_t::iterator i = cache.begin(); i != cache.end();) {
+    if (i->second.second.expired())
+      cache.erase(i++);
+    else
+      i++;
+  }
+
+  I3OMGeoTableConstPtr table;
+  cache_t::iterator i = cache.find(geometry.get());
+  if (i != cache.end() && i->second.first.lock() == geometry)
+    table = i->second.second.lock();
+  if (!table) {
+    table = I3OMGeoTableConstPtr(new I3OMGeoTable(*geometry));
+    cache[geometry.get()] = cache_entry_t(geometry, table);
+  }
+  return table;
+}
@@ -0,0 +1,160 @@
+#include <algorithm>
+#include <dataclasses/physics/I3TriggerHierarchyIndex.h>
+
+namespace {
+  bool
+  Matches(const TriggerKey& key,
+          const I3TriggerHierarchyIndex::OptionalSource& src,
+          const I3TriggerHierarchyIndex::OptionalType& type,
+          const I3TriggerHierarchyIndex::OptionalConfigID& configID)
+  {
+    return (!src || key.GetSource() == *src)
+      && (!type || key.GetType() == *type)
+      && (!configID || (key.CheckConfigID() && key.GetConfigID() == *configID));
+  }
+}
+
+I3TriggerHierarchyIndex::I3TriggerHierarchyIndex(I3TriggerHierarchyConstPtr triggers) :
+  hierarchy_(triggers), built_(false)
+{}
+
+void
+I3TriggerHierarchyIndex::Build() const
+{
+  if (built_)
+    return;
+  built_ = true;
+  if (!hierarchy_)
+    return;
+
+  triggers_.reserve(hierarchy_->size());
+  for (I3TriggerHierarchy::iterator i = hierarchy_->begin(); i != hierarchy_->end(); i++) {
+    keys_[i->GetTriggerKey()].push_back(triggers_.size());
+    triggers_.push_back(i);
+  }
+}
+
+std::vector<size_t>
+I3TriggerHierarchyIndex::Select(const OptionalSource& src, const OptionalType& type,
+                                const OptionalConfigID& configID) const
+{
+  Build();
+  std::vector<size_t> positions;
+  size_t nKeys = 0;
+  for (key_map_t::const_iterator k = keys_.begin(); k != keys_.end(); k++) {
+    if (!Matches(k->first, src, type, configID))
+      continue;
+    positions.insert(positions.end(), k->second.begin(), k->second.end());
+    nKeys++;
+  }
+  // the positions of every key are in tree order already
+  if (nKeys > 1)
+    std::sort(positions.begin(), positions.end());
+  return positions;
+}
+
+size_t
+I3TriggerHierarchyIndex::size() const
+{
+  Build();
+  return triggers_.size();
+}
+
+size_t
+I3TriggerHierarchyIndex::Count(TriggerKey::SourceID src) const
+{
+  return Count(src, OptionalType(), OptionalConfigID());
+}
+
+size_t
+I3TriggerHierarchyIndex::Count(TriggerKey::TypeID type) const
+{
+  return Count(OptionalSource(), type, OptionalConfigID());
+}
+
+size_t
+I3TriggerHierarchyIndex::Count(TriggerKey::SourceID src, TriggerKey::TypeID type) const
+{
+  return Count(src, type, OptionalConfigID());
+}
+
+size_t
+I3TriggerHierarchyIndex::Count(const TriggerKey& key) const
+{
+  Build();
+  key_map_t::const_iterator k = keys_.find(key);
+  return k == keys_.end() ? 0 : k->second.size();
+}
+
+size_t
+I3TriggerHierarchyIndex::Count(const OptionalSource& src, const OptionalType& type,
+                               const OptionalConfigID& configID) const
+{
+  Build();
+  size_t n = 0;
+  for (key_map_t::const_iterator k = keys_.begin(); k != keys_.end(); k++)
+    if (Matches(k->first, src, type, configID))
+      n += k->second.size();
+  return n;
+}
+
+std::vector<I3TriggerHierarchy::iterator>
+I3TriggerHierarchyIndex::Find(const TriggerKey& key) const
+{
+  Build();
+  std::vector<I3TriggerHierarchy::iterator> found;
+  key_map_t::const_iterator k = keys_.find(key);
+  if (k == keys_.end())
+    return found;
+  found.reserve(k->second.size());
+  for (std::vector<size_t>::const_iterator i = k->second.begin(); i != k->second.end(); i++)
+    found.push_back(triggers_[*i]);
+  return found;
+}
+
+std::vector<I3TriggerHierarchy::iterator>
+I3TriggerHierarchyIndex::Find(const OptionalSource& src, const OptionalType& type,
+                              const OptionalConfigID& configID) const
+{
+  const std::vector<size_t> positions = Select(src, type, configID);
+  std::vector<I3TriggerHierarchy::iterator> found;
+  found.reserve(positions.size());
+  for (std::vector<size_t>::const_iterator i = positions.begin(); i != positions.end(); i++)
+    found.push_back(triggers_[*i]);
+  return found;
+}
+
+std::vector<double>
+I3TriggerHierarchyIndex::GetLengths(const TriggerKey& key) const
+{
+  const std::vector<I3TriggerHierarchy::iterator> found = Find(key);
+  std::vector<double> lengths;
+  lengths.reserve(found.size());
+  for (std::vector<I3TriggerHierarchy::iterator>::const_iterator i = found.begin();
+       i != found.end(); i++)
+    lengths.push_back((*i)->GetTriggerLength());
+  return lengths;
+}
+
+std::vector<double>
+I3TriggerHierarchyIndex::GetLengths(const OptionalSource& src, const OptionalType& type,
+                                    const OptionalConfigID& configID) const
+{
+  const std::vector<size_t> positions = Select(src, type, configID);
+  std::vector<double> lengths;
+  lengths.reserve(positions.size());
+  for (std::vector<size_t>::const_iterator i = positions.begin(); i != positions.end(); i++)
+    lengths.push_back(triggers_[*i]->GetTriggerLength());
+  return lengths;
+}
+
+std::vector<TriggerKey>
+I3TriggerHierarchyIndex::GetKeys() const
+{
+  Build();
+  std::vector<TriggerKey> keys;
+  keys.reserve(keys_.size());
+  for (key_map_t::const_iterator k = keys_.begin(); k != keys_.end(); k++)
+    keys.push_back(k->first);
+  return keys;
+}
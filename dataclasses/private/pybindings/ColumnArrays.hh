@@ -0,0 +1,146 @@
+/**
+ * Helpers to move whole columns of frame objects (all the times, all
+ * the charges, ...) between C++ and python in one call.
+ *
+ * Columns go out as memoryviews over a private copy of the data, so
+ * numpy.asarray() gives a typed array without copying again.  Columns
+ * come in through the buffer protocol, so numpy arrays, memoryviews and
+ * array.arrays of any of the usual numeric types can be passed in.
+ */
+
+#ifndef DATACLASSES_PYBINDINGS_COLUMNARRAYS_HH_INCLUDED
+#define DATACLASSES_PYBINDINGS_COLUMNARRAYS_HH_INCLUDED
+
+#include <vector>
+#include <string>
+#include <stdint.h>
+
+#include <boost/python.hpp>
+
+namespace column_arrays {
+
+template <typename T> struct format;
+template <> struct format<double>   { static const char* value() { return "d"; } };
+template <> struct format<float>    { static const char* value() { return "f"; } };
+template <> struct format<int32_t>  { static const char* value() { return "i"; } };
+template <> struct format<uint32_t> { static const char* value() { return "I"; } };
+template <> struct format<int16_t>  { static const char* value() { return "h"; } };
+template <> struct format<uint16_t> { static const char* value() { return "H"; } };
+template <> struct format<uint8_t>  { static const char* value() { return "B"; } };
+template <> struct format<bool>     { static const char* value() { return "?"; } };
+
+namespace detail {
+
+// a memoryview of unsigned bytes over a copy of the data
+inline boost::python::object
+byte_view(const void *data, size_t size)
+{
+	namespace bp = boost::python;
+	bp::object bytes(bp::handle<>(PyByteArray_FromStringAndSize(
+	    static_cast<const char*>(data), size)));
+	return bp::object(bp::handle<>(PyMemoryView_FromObject(bytes.ptr())));
+}
+
+}
+
+/**
+ * Copy the values into a new 1-d memoryview with the native format of T.
+ */
+template <typename T>
+boost::python::object
+to_column(const std::vector<T>& values)
+{
+	return detail::byte_view(values.empty() ? NULL : &values[0],
+	    values.size()*sizeof(T)).attr("cast")(format<T>::value());
+}
+
+template <>
+inline boost::python::object
+to_column(const std::vector<bool>& values)
+{
+	std::vector<uint8_t> bytes(values.begin(), values.end());
+	return detail::byte_view(bytes.empty() ? NULL : &bytes[0],
+	    bytes.size()).attr("cast")(format<bool>::value());
+}
+
+namespace detail {
+
+struct buffer_guard {
+	Py_buffer view;
+	buffer_guard(PyObject *obj, const std::string &name)
+	{
+		if (PyObject_GetBuffer(obj, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) != 0) {
+			PyErr_Clear();
+			PyErr_Format(PyExc_TypeError, "Column '%s' must support the "
+			    "buffer protocol (e.g. a numpy array).", name.c_str());
+			boost::python::throw_error_already_set();
+		}
+	}
+	~buffer_guard() { PyBuffer_Release(&view); }
+};
+
+template <typename T, typename U>
+void
+convert(const void *buf, size_t n, std::vector<T> &out)
+{
+	const U *values = static_cast<const U*>(buf);
+	out.assign(values, values + n);
+}
+
+}
+
+/**
+ * Read a 1-d column of n values (or any length if n is negative),
+ * converting from the element type of the buffer to T.
+ */
+template <typename T>
+std::vector<T>
+from_column(boost::python::object obj, const std::string &name, long n = -1)
+{
+	detail::buffer_guard guard(obj.ptr(), name);
+	const Py_buffer &view = guard.view;
+
+	if (view.ndim > 1) {
+		PyErr_Format(PyExc_ValueError, "Column '%s' must be 1-dimensional.",
+		    name.c_str());
+		boost::python::throw_error_already_set();
+	}
+	const size_t size = view.len/view.itemsize;
+	if (n >= 0 && size != size_t(n)) {
+		PyErr_Format(PyExc_ValueError, "Column '%s' has %zu entries, "
+		    "expected %ld.", name.c_str(), size, n);
+		boost::python::throw_error_already_set();
+	}
+
+	// native byte order and alignment only
+	std::string fmt(view.format ? view.format : "B");
+	if (fmt.size() == 2 && (fmt[0] == '@' || fmt[0] == '='))
+		fmt = fmt.substr(1);
+
+	std::vector<T> out;
+	if (fmt.size() == 1) {
+		switch (fmt[0]) {
+		case 'd': detail::convert<T, double>(view.buf, size, out); return out;
+		case 'f': detail::convert<T, float>(view.buf, size, out); return out;
+		case 'b': detail::convert<T, signed char>(view.buf, size, out); return out;
+		case 'B': detail::convert<T, unsigned char>(view.buf, size, out); return out;
+		case '?': detail::convert<T, bool>(view.buf, size, out); return out;
+		case 'h': detail::convert<T, short>(view.buf, size, out); return out;
+		case 'H': detail::convert<T, unsigned short>(view.buf, size, out); return out;
+		case 'i': detail::convert<T, int>(view.buf, size, out); return out;
+		case 'I': detail::convert<T, unsigned int>(view.buf, size, out); return out;
+		case 'l': detail::convert<T, long>(view.buf, size, out); return out;
+		case 'L': detail::convert<T, unsigned long>(view.buf, size, out); return out;
+		case 'q': detail::convert<T, long long>(view.buf, size, out); return out;
+		case 'Q': detail::convert<T, unsigned long long>(view.buf, size, out); return out;
+		}
+	}
+	PyErr_Format(PyExc_TypeError, "Column '%s' has unsupported format '%s'.",
+	    name.c_str(), fmt.c_str());
+	boost::python::throw_error_already_set();
+	return out;
+}
+
+}
+
+#endif // DATACLASSES_PYBINDINGS_COLUMNARRAYS_HH_INCLUDED
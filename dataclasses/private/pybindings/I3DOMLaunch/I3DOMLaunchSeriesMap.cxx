@@ -30,15 +30,71 @@
 //   
 //
 
+#include <vector>
+
 #include <dataclasses/physics/I3DOMLaunch.h>
 #include <icetray/python/dataclass_suite.hpp>
 
+#include "../ColumnArrays.hh"
+
 using namespace boost::python;
 
+namespace {
+
+// Only the header fields, so the waveforms are neither
+// wrapped nor copied.
+dict
+I3DOMLaunchSeriesMap_header_columns(const I3DOMLaunchSeriesMap &launches)
+{
+  size_t n = 0;
+  for (const auto &i : launches)
+    n += i.second.size();
+
+  std::vector<int32_t> string, trigger_mode;
+  std::vector<uint32_t> om;
+  std::vector<uint8_t> pmt, trigger_type, which_atwd;
+  std::vector<double> time;
+  std::vector<bool> lc_bit;
+  string.reserve(n); trigger_mode.reserve(n); om.reserve(n); pmt.reserve(n);
+  trigger_type.reserve(n); which_atwd.reserve(n); time.reserve(n); lc_bit.reserve(n);
+
+  for (const auto &i : launches) {
+    for (const auto &launch : i.second) {
+      string.push_back(i.first.GetString());
+      om.push_back(i.first.GetOM());
+      pmt.push_back(i.first.GetPMT());
+      time.push_back(launch.GetStartTime());
+      lc_bit.push_back(launch.GetLCBit());
+      trigger_type.push_back(launch.GetTriggerType());
+      trigger_mode.push_back(launch.GetTriggerMode());
+      which_atwd.push_back(launch.GetWhichATWD());
+    }
+  }
+
+  dict out;
+  out["string"] = column_arrays::to_column(string);
+  out["om"] = column_arrays::to_column(om);
+  out["pmt"] = column_arrays::to_column(pmt);
+  out["time"] = column_arrays::to_column(time);
+  out["lc_bit"] = column_arrays::to_column(lc_bit);
+  out["trigger_type"] = column_arrays::to_column(trigger_type);
+  out["trigger_mode"] = column_arrays::to_column(trigger_mode);
+  out["which_atwd"] = column_arrays::to_column(which_atwd);
+  return out;
+}
+
+}
+
 void register_I3DOMLaunchSeriesMap()
 {
   class_<I3DOMLaunchSeriesMap, bases<I3FrameObject>, I3DOMLaunchSeriesMapPtr>("I3DOMLaunchSeriesMap")
     .def(dataclass_suite<I3DOMLaunchSeriesMap>())
+    .def("header_columns", &I3DOMLaunchSeriesMap_header_columns,
+         "Copy the launch headers into a dict of columns (string, om, pmt, "
+         "time, lc_bit, trigger_type, trigger_mode, which_atwd), one entry "
+         "per launch with DOMs grouped together. The waveforms aren't "
+         "copied. Each column is a typed memoryview; use numpy.asarray() "
+         "to get an array without another copy.")
     ;
 
   register_pointer_conversions<I3DOMLaunchSeriesMap>();
@@ -0,0 +1,118 @@
+//
+//   Copyright (c) 2023   the IceCube Collaboration
+//
+//   SPDX-License-Identifier: BSD-2-Clause
+//
+
+#include <vector>
+
+#include <dataclasses/geometry/I3OMGeoTable.h>
+#include <icetray/python/dataclass_suite.hpp>
+
+#include "ColumnArrays.hh"
+
+using namespace boost::python;
+
+namespace {
+
+size_t
+checked_index(const I3OMGeoTable &table, long i)
+{
+	if (i < 0)
+		i += table.size();
+	if (i < 0 || size_t(i) >= table.size()) {
+		PyErr_SetString(PyExc_IndexError, "I3OMGeoTable index out of range");
+		throw_error_already_set();
+	}
+	return i;
+}
+
+OMKey
+I3OMGeoTable_key(const I3OMGeoTable &table, long i)
+{
+	return table.GetKey(checked_index(table, i));
+}
+
+I3Position
+I3OMGeoTable_position(const I3OMGeoTable &table, long i)
+{
+	return table.GetPosition(checked_index(table, i));
+}
+
+double
+I3OMGeoTable_distance(const I3OMGeoTable &table, long i, long j)
+{
+	return table.GetDistance(checked_index(table, i), checked_index(table, j));
+}
+
+object
+I3OMGeoTable_indices(const I3OMGeoTable &table, object string, object om,
+    object pmt)
+{
+	const std::vector<int32_t> s = column_arrays::from_column<int32_t>(string, "string");
+	const long n = s.size();
+	const std::vector<uint32_t> o = column_arrays::from_column<uint32_t>(om, "om", n);
+	const std::vector<uint8_t> p = pmt.is_none() ? std::vector<uint8_t>(n, 0) :
+	    column_arrays::from_column<uint8_t>(pmt, "pmt", n);
+
+	std::vector<int32_t> indices(n);
+	for (long j = 0; j < n; j++)
+		indices[j] = table.GetIndex(OMKey(s[j], o[j], p[j]));
+	return column_arrays::to_column(indices);
+}
+
+dict
+I3OMGeoTable_to_columns(const I3OMGeoTable &table)
+{
+	std::vector<int32_t> string, omtype;
+	std::vector<uint32_t> om;
+	std::vector<uint8_t> pmt;
+	string.reserve(table.size()); om.reserve(table.size());
+	pmt.reserve(table.size()); omtype.reserve(table.size());
+	for (size_t i = 0; i < table.size(); i++) {
+		string.push_back(table.GetKey(i).GetString());
+		om.push_back(table.GetKey(i).GetOM());
+		pmt.push_back(table.GetKey(i).GetPMT());
+		omtype.push_back(table.GetOMType(i));
+	}
+
+	dict out;
+	out["string"] = column_arrays::to_column(string);
+	out["om"] = column_arrays::to_column(om);
+	out["pmt"] = column_arrays::to_column(pmt);
+	out["x"] = column_arrays::to_column(table.GetXs());
+	out["y"] = column_arrays::to_column(table.GetYs());
+	out["z"] = column_arrays::to_column(table.GetZs());
+	out["omtype"] = column_arrays::to_column(omtype);
+	return out;
+}
+
+}
+
+void register_I3OMGeoTable()
+{
+	class_<I3OMGeoTable, I3OMGeoTablePtr>("I3OMGeoTable",
+	    "Densely indexed positions and types of the OMs in a geometry. Build "
+	    "it once per Geometry frame, then look up the indices of the OMKeys "
+	    "of a whole pulse map at once with indices() and use them to index "
+	    "the numpy.asarray()-ed columns from to_columns().",
+	    init<const I3Geometry&>(args("geometry")))
+	    .def(init<const I3OMGeoMap&>(args("omgeo")))
+	    .def("__len__", &I3OMGeoTable::size)
+	    .def("__contains__", &I3OMGeoTable::Has)
+	    .def("index", &I3OMGeoTable::GetIndex, args("key"),
+	        "Index of the OMKey, or -1 if it's not in the geometry.")
+	    .def("key", &I3OMGeoTable_key, args("index"))
+	    .def("position", &I3OMGeoTable_position, args("index"))
+	    .def("distance", &I3OMGeoTable_distance, args("index1", "index2"))
+	    .def("indices", &I3OMGeoTable_indices,
+	        (arg("string"), arg("om"), arg("pmt")=object()),
+	        "Indices of the OMKeys given as columns (e.g. from "
+	        "I3RecoPulseSeriesMap.to_columns()), -1 where they're not in "
+	        "the geometry.")
+	    .def("to_columns", &I3OMGeoTable_to_columns,
+	        "Copy the table into a dict of columns (string, om, pmt, x, y, z, "
+	        "omtype), one entry per index. Each column is a typed memoryview; "
+	        "use numpy.asarray() to get an array without another copy.")
+	    ;
+}
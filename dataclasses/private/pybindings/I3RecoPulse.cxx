@@ -37,6 +37,8 @@
 #include <icetray/python/dataclass_suite.hpp>
 #include <dataclasses/ostream_overloads.hpp>
 
+#include "ColumnArrays.hh"
+
 using namespace boost::python;
 
 static I3RecoPulseSeriesMapPtr
@@ -246,6 +248,79 @@ I3RecoPulseSeriesMap_pmtoffsets(const I3RecoPulseSeriesMap &rpsm)
 
 	return out;
 }
+
+static dict
+I3RecoPulseSeriesMap_to_columns(const I3RecoPulseSeriesMap &rpsm)
+{
+	size_t n = 0;
+	for (const auto &i : rpsm)
+		n += i.second.size();
+
+	std::vector<int32_t> string;
+	std::vector<uint32_t> om;
+	std::vector<uint8_t> pmt, flags;
+	std::vector<double> time;
+	std::vector<float> charge, width;
+	string.reserve(n); om.reserve(n); pmt.reserve(n); flags.reserve(n);
+	time.reserve(n); charge.reserve(n); width.reserve(n);
+
+	for (const auto &i : rpsm) {
+		for (const auto &k : i.second) {
+			string.push_back(i.first.GetString());
+			om.push_back(i.first.GetOM());
+			pmt.push_back(i.first.GetPMT());
+			time.push_back(k.GetTime());
+			charge.push_back(k.GetCharge());
+			width.push_back(k.GetWidth());
+			flags.push_back(k.GetFlags());
+		}
+	}
+
+	dict out;
+	out["string"] = column_arrays::to_column(string);
+	out["om"] = column_arrays::to_column(om);
+	out["pmt"] = column_arrays::to_column(pmt);
+	out["time"] = column_arrays::to_column(time);
+	out["charge"] = column_arrays::to_column(charge);
+	out["width"] = column_arrays::to_column(width);
+	out["flags"] = column_arrays::to_column(flags);
+	return out;
+}
+
+static I3RecoPulseSeriesMapPtr
+I3RecoPulseSeriesMap_from_columns(object string, object om, object pmt,
+    object time, object charge, object width, object flags)
+{
+	const std::vector<double> t = column_arrays::from_column<double>(time, "time");
+	const long n = t.size();
+	const std::vector<int32_t> s = column_arrays::from_column<int32_t>(string, "string", n);
+	const std::vector<uint32_t> o = column_arrays::from_column<uint32_t>(om, "om", n);
+	const std::vector<uint8_t> p = column_arrays::from_column<uint8_t>(pmt, "pmt", n);
+	const std::vector<float> q = column_arrays::from_column<float>(charge, "charge", n);
+	const std::vector<float> w = column_arrays::from_column<float>(width, "width", n);
+	const std::vector<uint8_t> f = flags.is_none() ? std::vector<uint8_t>(n, 0) :
+	    column_arrays::from_column<uint8_t>(flags, "flags", n);
+
+	I3RecoPulseSeriesMapPtr rpsm(new I3RecoPulseSeriesMap);
+	I3RecoPulseSeries *series = NULL;
+	OMKey key;
+	for (long j = 0; j < n; j++) {
+		// only look up the series when the DOM changes
+		OMKey next(s[j], o[j], p[j]);
+		if (series == NULL || next != key) {
+			key = next;
+			series = &(*rpsm)[key];
+		}
+		I3RecoPulse pulse;
+		pulse.SetTime(t[j]);
+		pulse.SetCharge(q[j]);
+		pulse.SetWidth(w[j]);
+		pulse.SetFlags(f[j]);
+		series->push_back(pulse);
+	}
+
+	return rpsm;
+}
 }
 
 
@@ -273,6 +348,18 @@ void register_I3RecoPulse()
         "each OMKey. The format of the numpy.asarray() version of an "
         "I3RecoPulseSeriesMap is one row per pulse, PMTs grouped together, "
         "with columns (String, OM, PMT, Time, Charge, Width).")
+    .def("to_columns", &I3RecoPulseSeriesMap_to_columns,
+        "Copy the pulses into a dict of columns (string, om, pmt, time, "
+        "charge, width, flags), one entry per pulse with PMTs grouped "
+        "together. Each column is a typed memoryview; use numpy.asarray() "
+        "to get an array without another copy.")
+    .def("from_columns", &I3RecoPulseSeriesMap_from_columns,
+        (arg("string"), arg("om"), arg("pmt"), arg("time"), arg("charge"),
+        arg("width"), arg("flags")=object()),
+        "Build an I3RecoPulseSeriesMap from columns like the ones returned by "
+        "to_columns(), e.g. numpy arrays. Pulses keep their order within "
+        "each PMT.")
+    .staticmethod("from_columns")
     ;
   register_pointer_conversions<I3RecoPulseSeriesMap>();
 
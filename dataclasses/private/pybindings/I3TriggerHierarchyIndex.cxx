@@ -0,0 +1,114 @@
+//
+//   Copyright (c) 2023   the IceCube Collaboration
+//
+//   SPDX-License-Identifier: BSD-2-Clause
+//
+
+#include <vector>
+
+#include <dataclasses/physics/I3TriggerHierarchyIndex.h>
+#include <icetray/python/dataclass_suite.hpp>
+
+using namespace boost::python;
+
+namespace {
+
+// A TriggerKey as the first argument, or any of source, type and
+// config_id, with None matching anything.
+struct query {
+	boost::optional<TriggerKey> key;
+	I3TriggerHierarchyIndex::OptionalSource source;
+	I3TriggerHierarchyIndex::OptionalType type;
+	I3TriggerHierarchyIndex::OptionalConfigID config_id;
+
+	query(object source_, object type_, object config_id_)
+	{
+		extract<TriggerKey> as_key(source_);
+		if (as_key.check()) {
+			if (!type_.is_none() || !config_id_.is_none()) {
+				PyErr_SetString(PyExc_TypeError,
+				    "type and config_id can't be given with a TriggerKey");
+				throw_error_already_set();
+			}
+			key = as_key();
+			return;
+		}
+		if (!source_.is_none())
+			source = extract<TriggerKey::SourceID>(source_)();
+		if (!type_.is_none())
+			type = extract<TriggerKey::TypeID>(type_)();
+		if (!config_id_.is_none())
+			config_id = extract<int>(config_id_)();
+	}
+};
+
+size_t
+I3TriggerHierarchyIndex_count(const I3TriggerHierarchyIndex &index,
+    object source, object type, object config_id)
+{
+	query q(source, type, config_id);
+	return q.key ? index.Count(*q.key) :
+	    index.Count(q.source, q.type, q.config_id);
+}
+
+list
+I3TriggerHierarchyIndex_find(const I3TriggerHierarchyIndex &index,
+    object source, object type, object config_id)
+{
+	query q(source, type, config_id);
+	const std::vector<I3TriggerHierarchy::iterator> found = q.key ?
+	    index.Find(*q.key) : index.Find(q.source, q.type, q.config_id);
+	list out;
+	for (std::vector<I3TriggerHierarchy::iterator>::const_iterator i = found.begin();
+	    i != found.end(); i++)
+		out.append(**i);
+	return out;
+}
+
+list
+I3TriggerHierarchyIndex_lengths(const I3TriggerHierarchyIndex &index,
+    object source, object type, object config_id)
+{
+	query q(source, type, config_id);
+	const std::vector<double> lengths = q.key ?
+	    index.GetLengths(*q.key) : index.GetLengths(q.source, q.type, q.config_id);
+	list out;
+	for (std::vector<double>::const_iterator i = lengths.begin(); i != lengths.end(); i++)
+		out.append(*i);
+	return out;
+}
+
+list
+I3TriggerHierarchyIndex_keys(const I3TriggerHierarchyIndex &index)
+{
+	const std::vector<TriggerKey> keys = index.GetKeys();
+	list out;
+	for (std::vector<TriggerKey>::const_iterator i = keys.begin(); i != keys.end(); i++)
+		out.append(*i);
+	return out;
+}
+
+}
+
+void register_I3TriggerHierarchyIndex()
+{
+	class_<I3TriggerHierarchyIndex, I3TriggerHierarchyIndexPtr>("I3TriggerHierarchyIndex",
+	    "The triggers of an I3TriggerHierarchy by TriggerKey. The hierarchy is "
+	    "walked once, at the first query, so make one per frame and ask it "
+	    "for as many keys as needed. The queries take a TriggerKey or any of "
+	    "source, type and config_id; the ones that are None match anything.",
+	    init<I3TriggerHierarchyConstPtr>(args("hierarchy")))
+	    .def("__len__", &I3TriggerHierarchyIndex::size)
+	    .def("count", &I3TriggerHierarchyIndex_count,
+	        (arg("source")=object(), arg("type")=object(), arg("config_id")=object()),
+	        "Number of triggers matching.")
+	    .def("find", &I3TriggerHierarchyIndex_find,
+	        (arg("source")=object(), arg("type")=object(), arg("config_id")=object()),
+	        "The triggers matching, in the order of the hierarchy.")
+	    .def("lengths", &I3TriggerHierarchyIndex_lengths,
+	        (arg("source")=object(), arg("type")=object(), arg("config_id")=object()),
+	        "The lengths of the triggers matching, in the order of the hierarchy.")
+	    .def("keys", &I3TriggerHierarchyIndex_keys,
+	        "The different keys in the hierarchy.")
+	    ;
+}
@@ -67,7 +67,8 @@ namespace bp = boost::python;
   (I3MapStringTestMapStringString)(I3MapTriggerUInt)                    \
   (I3Double)(I3String)(I3Constants)(I3RecoPulseSeriesMapMask)           \
   (I3RecoPulseSeriesMapUnion)(I3SuperDST)(TankKey)(I3Orientation)       \
-  (ModuleKey)(I3ModuleGeo)(I3OMGeo)(I3TankGeo)(I3FilterResult)          \
+  (ModuleKey)(I3ModuleGeo)(I3OMGeo)(I3OMGeoTable)(I3TankGeo)            \
+  (I3FilterResult)                                                      \
   (I3MapI3ParticleID)(I3VectorChar)(I3VectorString)(I3VectorBool)       \
   (I3VectorOMKey)(I3VectorModuleKey)(I3VectorShort)(I3VectorTankKey)    \
   (I3VectorUShort)(I3VectorInt)(I3VectorUInt)(I3VectorInt64)            \
@@ -75,7 +76,8 @@ namespace bp = boost::python;
   (I3VectorI3Particle)(I3VectorParticleType)(I3VectorI3Position)        \
   (I3VectorPairDoubleDouble)(I3MCTreePhysicsLibrary)(I3VectorUtils)     \
   (I3VectorAntennaKey)(I3VectorScintKey)                                \
-  (SPEChargeDistribution)(I3TriggerHierarchy)(I3Trigger)(TriggerKey)    \
+  (SPEChargeDistribution)(I3TriggerHierarchy)(I3TriggerHierarchyIndex)  \
+  (I3Trigger)(TriggerKey)                                               \
   (I3RecoPulseSeriesMapApplySPECorrection)(I3FlasherStatus)             \
   (I3FlasherStatusMap)(I3FlasherSubrunMap)                              \
   (I3RecoPulseSeriesMapCombineByModule)(I3UInt64)                       \
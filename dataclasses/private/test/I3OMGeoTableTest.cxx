@@ -0,0 +1,85 @@
+/**
+    copyright  (C) 2023
+    the icecube collaboration
+
+    @file I3OMGeoTableTest.cxx
+*/
+
+#include <I3Test.h>
+
+#include "dataclasses/geometry/I3OMGeoTable.h"
+
+TEST_GROUP(I3OMGeoTableTest);
+
+namespace {
+  I3OMGeoMap make_omgeo()
+  {
+    I3OMGeoMap omgeo;
+    I3OMGeo g;
+    g.omtype = I3OMGeo::IceCube;
+    g.position = I3Position(1., 2., 3.);
+    omgeo[OMKey(21, 30)] = g;
+    g.position = I3Position(4., 6., 3.);
+    omgeo[OMKey(1, 1)] = g;
+    g.omtype = I3OMGeo::mDOM;
+    g.position = I3Position(7., 8., 9.);
+    omgeo[OMKey(87, 5, 0)] = g;
+    omgeo[OMKey(87, 5, 23)] = g;
+    return omgeo;
+  }
+}
+
+TEST(index_in_omkey_order)
+{
+  I3OMGeoMap omgeo = make_omgeo();
+  I3OMGeoTable table(omgeo);
+  ENSURE_EQUAL(table.size(), omgeo.size());
+
+  int i = 0;
+  for (I3OMGeoMap::const_iterator iter = omgeo.begin(); iter != omgeo.end(); iter++, i++) {
+    ENSURE_EQUAL(table.GetIndex(iter->first), i);
+    ENSURE(table.GetKey(i) == iter->first);
+    ENSURE_EQUAL(table.GetX(i), iter->second.position.GetX());
+    ENSURE_EQUAL(table.GetY(i), iter->second.position.GetY());
+    ENSURE_EQUAL(table.GetZ(i), iter->second.position.GetZ());
+    ENSURE(table.GetOMType(i) == iter->second.omtype);
+  }
+}
+
+TEST(missing_keys)
+{
+  I3OMGeoTable table(make_omgeo());
+  ENSURE_EQUAL(table.GetIndex(OMKey(21, 31)), I3OMGeoTable::NOT_IN_GEOMETRY);
+  ENSURE_EQUAL(table.GetIndex(OMKey(87, 5, 1)), I3OMGeoTable::NOT_IN_GEOMETRY);
+  ENSURE_EQUAL(table.GetIndex(OMKey(0, 1)), I3OMGeoTable::NOT_IN_GEOMETRY);
+  ENSURE_EQUAL(table.GetIndex(OMKey(88, 1)), I3OMGeoTable::NOT_IN_GEOMETRY);
+  ENSURE_EQUAL(table.GetIndex(OMKey(1, 200)), I3OMGeoTable::NOT_IN_GEOMETRY);
+  ENSURE(!table.Has(OMKey(-1, 1)));
+
+  I3OMGeoTable empty;
+  ENSURE(empty.empty());
+  ENSURE_EQUAL(empty.GetIndex(OMKey(1, 1)), I3OMGeoTable::NOT_IN_GEOMETRY);
+}
+
+TEST(distance)
+{
+  I3OMGeoTable table(make_omgeo());
+  int i = table.GetIndex(OMKey(1, 1));
+  int j = table.GetIndex(OMKey(21, 30));
+  ENSURE_DISTANCE(table.GetDistance(i, j), 5., 1e-12);
+  ENSURE_DISTANCE(table.GetDistance(j, i), 5., 1e-12);
+  ENSURE_EQUAL(table.GetDistance(i, i), 0.);
+}
+
+TEST(shared_per_geometry)
+{
+  I3GeometryPtr geometry(new I3Geometry);
+  geometry->omgeo = make_omgeo();
+  I3GeometryPtr other(new I3Geometry(*geometry));
+
+  I3OMGeoTableConstPtr table = I3OMGeoTable::Get(geometry);
+  ENSURE_EQUAL(table->size(), geometry->omgeo.size());
+  ENSURE(I3OMGeoTable::Get(geometry) == table, "not shared for the same geometry");
+  ENSURE(I3OMGeoTable::Get(other) != table, "shared between geometries");
+  ENSURE_EQUAL(I3OMGeoTable::Get(other)->size(), table->size());
+}
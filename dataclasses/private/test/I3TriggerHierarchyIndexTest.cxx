@@ -0,0 +1,111 @@
+#include <I3Test.h>
+#include <dataclasses/physics/I3TriggerHierarchyIndex.h>
+
+TEST_GROUP(I3TriggerHierarchyIndex);
+
+namespace {
+  I3TriggerHierarchyPtr
+  MakeHierarchy()
+  {
+    I3TriggerHierarchyPtr t(new I3TriggerHierarchy);
+    I3TriggerHierarchy::iterator iter, jter, kter;
+
+    iter = t->insert(t->begin(), I3Trigger());
+    iter->GetTriggerKey() = TriggerKey(TriggerKey::GLOBAL, TriggerKey::MERGED);
+
+    jter = t->append_child(iter, I3Trigger());
+    jter->GetTriggerKey() = TriggerKey(TriggerKey::GLOBAL,
+                                       TriggerKey::TWO_COINCIDENCE, 1);
+    kter = t->append_child(jter, I3Trigger());
+    kter->GetTriggerKey() = TriggerKey(TriggerKey::IN_ICE,
+                                       TriggerKey::SIMPLE_MULTIPLICITY, 2);
+    kter->SetTriggerLength(10.);
+    kter = t->append_child(jter, I3Trigger());
+    kter->GetTriggerKey() = TriggerKey(TriggerKey::AMANDA_MUON_DAQ,
+                                       TriggerKey::UNKNOWN_TYPE, 3);
+
+    jter = t->append_child(iter, I3Trigger());
+    jter->GetTriggerKey() = TriggerKey(TriggerKey::GLOBAL,
+                                       TriggerKey::THROUGHPUT, 4);
+    kter = t->append_child(jter, I3Trigger());
+    kter->GetTriggerKey() = TriggerKey(TriggerKey::ICE_TOP,
+                                       TriggerKey::SIMPLE_MULTIPLICITY, 5);
+    kter->SetTriggerLength(20.);
+    kter = t->append_child(jter, I3Trigger());
+    kter->GetTriggerKey() = TriggerKey(TriggerKey::IN_ICE,
+                                       TriggerKey::SIMPLE_MULTIPLICITY, 2);
+    kter->SetTriggerLength(30.);
+    return t;
+  }
+}
+
+// the index gives the same answers as I3TriggerHierarchyUtils
+TEST(SameAsUtils)
+{
+  I3TriggerHierarchyPtr t = MakeHierarchy();
+  I3TriggerHierarchyIndex index(t);
+
+  ENSURE_EQUAL(index.size(), t->size());
+
+  const TriggerKey::SourceID sources[] = {TriggerKey::GLOBAL, TriggerKey::IN_ICE,
+                                          TriggerKey::ICE_TOP, TriggerKey::EXTERNAL,
+                                          TriggerKey::AMANDA_MUON_DAQ};
+  const TriggerKey::TypeID types[] = {TriggerKey::MERGED, TriggerKey::SIMPLE_MULTIPLICITY,
+                                      TriggerKey::THROUGHPUT, TriggerKey::MIN_BIAS,
+                                      TriggerKey::UNKNOWN_TYPE};
+  for (unsigned i = 0; i < 5; i++) {
+    ENSURE_EQUAL(index.Count(sources[i]), I3TriggerHierarchyUtils::Count(*t, sources[i]));
+    ENSURE_EQUAL(index.Count(types[i]), I3TriggerHierarchyUtils::Count(*t, types[i]));
+    for (unsigned j = 0; j < 5; j++) {
+      ENSURE_EQUAL(index.Count(sources[i], types[j]),
+                   I3TriggerHierarchyUtils::Count(*t, sources[i], types[j]));
+      for (int config = 0; config < 6; config++) {
+        const TriggerKey key(sources[i], types[j], config);
+        ENSURE_EQUAL(index.Count(key), I3TriggerHierarchyUtils::Count(*t, key));
+      }
+      const TriggerKey key(sources[i], types[j]);
+      ENSURE_EQUAL(index.Count(key), I3TriggerHierarchyUtils::Count(*t, key));
+    }
+  }
+}
+
+TEST(Find)
+{
+  I3TriggerHierarchyPtr t = MakeHierarchy();
+  I3TriggerHierarchyIndex index(t);
+
+  const TriggerKey smt(TriggerKey::IN_ICE, TriggerKey::SIMPLE_MULTIPLICITY, 2);
+  std::vector<I3TriggerHierarchy::iterator> found = index.Find(smt);
+  ENSURE_EQUAL(found.size(), 2u);
+  ENSURE(found[0] == I3TriggerHierarchyUtils::Find(*t, smt));
+  ENSURE_DISTANCE(found[0]->GetTriggerLength(), 10., 1e-9);
+  ENSURE_DISTANCE(found[1]->GetTriggerLength(), 30., 1e-9);
+  ENSURE(index.Find(TriggerKey(TriggerKey::IN_ICE, TriggerKey::STRING, 2)).empty());
+
+  // several keys come back in the order of the tree
+  std::vector<double> lengths = index.GetLengths(I3TriggerHierarchyIndex::OptionalSource(),
+                                                 TriggerKey::SIMPLE_MULTIPLICITY,
+                                                 I3TriggerHierarchyIndex::OptionalConfigID());
+  ENSURE_EQUAL(lengths.size(), 3u);
+  ENSURE_DISTANCE(lengths[0], 10., 1e-9);
+  ENSURE_DISTANCE(lengths[1], 20., 1e-9);
+  ENSURE_DISTANCE(lengths[2], 30., 1e-9);
+
+  // a config ID only matches triggers with one
+  ENSURE_EQUAL(index.Count(TriggerKey::GLOBAL, I3TriggerHierarchyIndex::OptionalType(), 1), 1u);
+  ENSURE_EQUAL(index.Count(I3TriggerHierarchyIndex::OptionalSource(),
+                           I3TriggerHierarchyIndex::OptionalType(),
+                           I3TriggerHierarchyIndex::OptionalConfigID()), t->size());
+  ENSURE_EQUAL(index.GetKeys().size(), 6u);
+}
+
+TEST(Empty)
+{
+  I3TriggerHierarchyIndex index(I3TriggerHierarchyConstPtr(new I3TriggerHierarchy));
+  ENSURE_EQUAL(index.size(), 0u);
+  ENSURE_EQUAL(index.Count(TriggerKey::IN_ICE), 0u);
+  ENSURE(index.Find(TriggerKey(TriggerKey::IN_ICE, TriggerKey::SIMPLE_MULTIPLICITY)).empty());
+
+  I3TriggerHierarchyIndex none((I3TriggerHierarchyConstPtr()));
+  ENSURE_EQUAL(none.size(), 0u);
+}
@@ -0,0 +1,94 @@
+/**
+ *  Copyright (C) 2023
+ *  the IceCube Collaboration
+ *
+ *  SPDX-License-Identifier: BSD-2-Clause
+ *
+ *  @file I3OMGeoTable.h
+ */
+
+#ifndef I3OMGEOTABLE_H_INCLUDED
+#define I3OMGEOTABLE_H_INCLUDED
+
+#include <vector>
+#include "icetray/OMKey.h"
+#include "dataclasses/I3Position.h"
+#include "dataclasses/Utility.h"
+#include "dataclasses/geometry/I3Geometry.h"
+
+/**
+ * @brief Densely indexed copy of the positions and types in an I3OMGeoMap.
+ *
+ * Every OMKey in the map gets an index in [0, size()), in OMKey order,
+ * and the positions are stored in flat arrays, so code that looks up
+ * positions per hit or per pair of hits can do a table lookup and
+ * array indexing instead of searching the std::map every time.
+ *
+ * The table is a snapshot of the map it's built from.  Get the table of
+ * the I3Geometry in a frame with I3OMGeoTable::Get(), which returns the
+ * same table to every caller with the same I3Geometry, so it's only built
+ * once per Geometry frame however many modules use it:
+ *     if (geometry != geoTableGeometry_) {
+ *       geoTableGeometry_ = geometry;
+ *       geoTable_ = I3OMGeoTable::Get(geometry);
+ *     }
+ */
+class I3OMGeoTable
+{
+public:
+  static const int NOT_IN_GEOMETRY = -1;
+
+  I3OMGeoTable() : minString_(0), nStrings_(0), nOMs_(0) {}
+  explicit I3OMGeoTable(const I3OMGeoMap& omgeo);
+  explicit I3OMGeoTable(const I3Geometry& geometry);
+
+  /**
+   * Index of the OMKey, or NOT_IN_GEOMETRY.
+   */
+  int GetIndex(const OMKey& key) const;
+  bool Has(const OMKey& key) const { return GetIndex(key) != NOT_IN_GEOMETRY; }
+
+  size_t size() const { return keys_.size(); }
+  bool empty() const { return keys_.empty(); }
+
+  const OMKey& GetKey(size_t i) const { return keys_[i]; }
+  double GetX(size_t i) const { return x_[i]; }
+  double GetY(size_t i) const { return y_[i]; }
+  double GetZ(size_t i) const { return z_[i]; }
+  I3Position GetPosition(size_t i) const { return I3Position(x_[i], y_[i], z_[i]); }
+  I3OMGeo::OMType GetOMType(size_t i) const { return omtypes_[i]; }
+
+  double GetDistance(size_t i, size_t j) const;
+
+  const std::vector<OMKey>& GetKeys() const { return keys_; }
+  const std::vector<double>& GetXs() const { return x_; }
+  const std::vector<double>& GetYs() const { return y_; }
+  const std::vector<double>& GetZs() const { return z_; }
+  const std::vector<I3OMGeo::OMType>& GetOMTypes() const { return omtypes_; }
+
+  /**
+   * The table of geometry, shared by all the callers with the same
+   * I3Geometry.  It's only kept as long as one of them holds it.
+   */
+  static boost::shared_ptr<const I3OMGeoTable> Get(const I3GeometryConstPtr& geometry);
+
+private:
+  void Fill(const I3OMGeoMap& omgeo);
+
+  // The rows of the DOM (string, om) are [moduleBegin_[cell], moduleBegin_[cell+1])
+  // with cell = (string - minString_)*nOMs_ + om.  There's one row per PMT.
+  int minString_;
+  size_t nStrings_;
+  size_t nOMs_;
+  std::vector<unsigned> moduleBegin_;
+
+  std::vector<OMKey> keys_;
+  std::vector<double> x_;
+  std::vector<double> y_;
+  std::vector<double> z_;
+  std::vector<I3OMGeo::OMType> omtypes_;
+};
+
+I3_POINTER_TYPEDEFS(I3OMGeoTable);
+
+#endif // I3OMGEOTABLE_H_INCLUDED
@@ -0,0 +1,95 @@
+/**
+ *  Copyright (C) 2023
+ *  the IceCube Collaboration
+ *
+ *  SPDX-License-Identifier: BSD-2-Clause
+ *
+ *  @file I3TriggerHierarchyIndex.h
+ */
+
+#ifndef I3TRIGGERHIERARCHYINDEX_H_INCLUDED
+#define I3TRIGGERHIERARCHYINDEX_H_INCLUDED
+
+#include <map>
+#include <vector>
+#include <boost/optional.hpp>
+#include "dataclasses/physics/I3TriggerHierarchy.h"
+
+/**
+ * @brief Index of the triggers in an I3TriggerHierarchy by TriggerKey.
+ *
+ * The I3TriggerHierarchyUtils Count and Find functions walk the whole
+ * tree on every call, so code asking for many keys per event walks it
+ * many times.  The index walks the tree once, the first time it's
+ * asked, and sorts the triggers by their (source, type, config ID).
+ * After that a query only looks at the handful of different keys in
+ * the hierarchy.
+ *
+ * The queries taking optional source, type and config ID match any
+ * value where one isn't set, like the python trigger_hierarchy_recipes.
+ * A config ID only matches triggers which have one.  Triggers matching
+ * several keys are returned in the order of the tree (pre-order).
+ *
+ * The index holds on to the hierarchy and is a snapshot of it, so make
+ * a new one if the hierarchy changes.
+ */
+class I3TriggerHierarchyIndex
+{
+public:
+  typedef boost::optional<TriggerKey::SourceID> OptionalSource;
+  typedef boost::optional<TriggerKey::TypeID> OptionalType;
+  typedef boost::optional<int> OptionalConfigID;
+
+  explicit I3TriggerHierarchyIndex(I3TriggerHierarchyConstPtr triggers);
+
+  /**
+   * Number of triggers in the hierarchy.
+   */
+  size_t size() const;
+
+  size_t Count(TriggerKey::SourceID src) const;
+  size_t Count(TriggerKey::TypeID type) const;
+  size_t Count(TriggerKey::SourceID src, TriggerKey::TypeID type) const;
+  size_t Count(const TriggerKey& key) const;
+  size_t Count(const OptionalSource& src, const OptionalType& type,
+               const OptionalConfigID& configID) const;
+
+  /**
+   * The triggers with exactly this key, in the order of the tree.
+   */
+  std::vector<I3TriggerHierarchy::iterator> Find(const TriggerKey& key) const;
+  std::vector<I3TriggerHierarchy::iterator>
+  Find(const OptionalSource& src, const OptionalType& type,
+       const OptionalConfigID& configID) const;
+
+  /**
+   * The lengths of the triggers Find returns.
+   */
+  std::vector<double> GetLengths(const TriggerKey& key) const;
+  std::vector<double> GetLengths(const OptionalSource& src, const OptionalType& type,
+                                 const OptionalConfigID& configID) const;
+
+  /**
+   * The different keys in the hierarchy.
+   */
+  std::vector<TriggerKey> GetKeys() const;
+
+private:
+  // positions of the triggers of a key in triggers_
+  typedef std::map<TriggerKey, std::vector<size_t> > key_map_t;
+
+  void Build() const;
+  std::vector<size_t> Select(const OptionalSource& src, const OptionalType& type,
+                             const OptionalConfigID& configID) const;
+
+  I3TriggerHierarchyConstPtr hierarchy_;
+
+  // built by the first query
+  mutable bool built_;
+  mutable std::vector<I3TriggerHierarchy::iterator> triggers_;
+  mutable key_map_t keys_;
+};
+
+I3_POINTER_TYPEDEFS(I3TriggerHierarchyIndex);
+
+#endif // I3TRIGGERHIERARCHYINDEX_H_INCLUDED
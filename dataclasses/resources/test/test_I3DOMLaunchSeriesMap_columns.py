@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+
+import sys
+import unittest
+
+from icecube import icetray, dataclasses
+
+try:
+	import numpy
+except ImportError:
+	print('This test requires numpy to function')
+	sys.exit(0)
+
+class I3DOMLaunchSeriesMapColumnsTest(unittest.TestCase):
+	def testHeaderColumns(self):
+		launches = dataclasses.I3DOMLaunchSeriesMap()
+		for key, times in [(icetray.OMKey(7, 7), [1.0, 2.0]),
+		                   (icetray.OMKey(42, 61), [3.0])]:
+			series = dataclasses.I3DOMLaunchSeries()
+			for t in times:
+				launch = dataclasses.I3DOMLaunch()
+				launch.time = t
+				launch.lc_bit = key.string == 7
+				launch.trigger_mode = dataclasses.I3DOMLaunch.TriggerMode.SLC_READOUT
+				series.append(launch)
+			launches[key] = series
+
+		columns = launches.header_columns()
+		self.assertEqual(list(numpy.asarray(columns['string'])), [7, 7, 42])
+		self.assertEqual(list(numpy.asarray(columns['om'])), [7, 7, 61])
+		self.assertEqual(list(numpy.asarray(columns['pmt'])), [0, 0, 0])
+		self.assertEqual(list(numpy.asarray(columns['time'])), [1., 2., 3.])
+		self.assertEqual(list(numpy.asarray(columns['lc_bit'])), [True, True, False])
+		self.assertEqual(numpy.asarray(columns['lc_bit']).dtype, numpy.bool_)
+		self.assertEqual(list(numpy.asarray(columns['trigger_mode'])),
+			[int(dataclasses.I3DOMLaunch.TriggerMode.SLC_READOUT)]*3)
+		self.assertEqual(len(numpy.asarray(columns['trigger_type'])), 3)
+		self.assertEqual(len(numpy.asarray(columns['which_atwd'])), 3)
+
+	def testEmpty(self):
+		columns = dataclasses.I3DOMLaunchSeriesMap().header_columns()
+		self.assertEqual(len(numpy.asarray(columns['time'])), 0)
+
+if __name__ == "__main__":
+	unittest.main()
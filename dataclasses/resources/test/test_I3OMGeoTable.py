@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+import sys
+import unittest
+
+from icecube import icetray, dataclasses
+
+try:
+	import numpy
+except ImportError:
+	print('This test requires numpy to function')
+	sys.exit(0)
+
+class I3OMGeoTableTest(unittest.TestCase):
+	def setUp(self):
+		self.geometry = dataclasses.I3Geometry()
+		for string, om, x in [(1, 1, 0.), (21, 30, 3.), (21, 31, 6.)]:
+			omgeo = dataclasses.I3OMGeo()
+			omgeo.position = dataclasses.I3Position(x, 4., 0.)
+			omgeo.omtype = dataclasses.I3OMGeo.IceCube
+			self.geometry.omgeo[icetray.OMKey(string, om)] = omgeo
+		self.table = dataclasses.I3OMGeoTable(self.geometry)
+
+	def testLookup(self):
+		self.assertEqual(len(self.table), 3)
+		self.assertEqual(self.table.index(icetray.OMKey(21, 30)), 1)
+		self.assertEqual(self.table.index(icetray.OMKey(21, 32)), -1)
+		self.assertTrue(icetray.OMKey(1, 1) in self.table)
+		self.assertEqual(self.table.key(2), icetray.OMKey(21, 31))
+		self.assertEqual(self.table.position(1).x, 3.)
+		self.assertEqual(self.table.distance(0, 2), 6.)
+		with self.assertRaises(IndexError):
+			self.table.key(3)
+
+	def testColumns(self):
+		columns = self.table.to_columns()
+		self.assertEqual(list(numpy.asarray(columns['string'])), [1, 21, 21])
+		self.assertEqual(list(numpy.asarray(columns['x'])), [0., 3., 6.])
+
+	def testPulsePositions(self):
+		pulses = dataclasses.I3RecoPulseSeriesMap()
+		for key in [icetray.OMKey(21, 31), icetray.OMKey(86, 1)]:
+			series = dataclasses.I3RecoPulseSeries()
+			series.append(dataclasses.I3RecoPulse())
+			pulses[key] = series
+		columns = pulses.to_columns()
+		index = numpy.asarray(self.table.indices(columns['string'], columns['om'], columns['pmt']))
+		self.assertEqual(list(index), [2, -1])
+		x = numpy.asarray(self.table.to_columns()['x'])
+		self.assertEqual(x[index[index >= 0]][0], 6.)
+
+if __name__ == "__main__":
+	unittest.main()
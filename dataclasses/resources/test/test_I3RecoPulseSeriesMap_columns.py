@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+
+import sys
+import unittest
+
+from icecube import icetray, dataclasses
+
+try:
+	import numpy
+except ImportError:
+	print('This test requires numpy to function')
+	sys.exit(0)
+
+class I3RecoPulseSeriesMapColumnsTest(unittest.TestCase):
+	def setUp(self):
+		self.pulses = dataclasses.I3RecoPulseSeriesMap()
+		for key, times in [(icetray.OMKey(7, 7), [1.0, 2.0]),
+		                   (icetray.OMKey(42, 7, 1), [3.0, 4.0, 5.0])]:
+			vec = dataclasses.I3RecoPulseSeries()
+			for t in times:
+				pulse = dataclasses.I3RecoPulse()
+				pulse.time = t
+				pulse.charge = t/2
+				pulse.width = 4.0
+				pulse.flags = int(dataclasses.I3RecoPulse.PulseFlags.LC)
+				vec.append(pulse)
+			self.pulses[key] = vec
+
+	def testToColumns(self):
+		columns = self.pulses.to_columns()
+		self.assertEqual(list(numpy.asarray(columns['string'])), [7, 7, 42, 42, 42])
+		self.assertEqual(list(numpy.asarray(columns['om'])), [7]*5)
+		self.assertEqual(list(numpy.asarray(columns['pmt'])), [0, 0, 1, 1, 1])
+		self.assertEqual(list(numpy.asarray(columns['time'])), [1., 2., 3., 4., 5.])
+		self.assertEqual(list(numpy.asarray(columns['charge'])), [.5, 1., 1.5, 2., 2.5])
+		self.assertEqual(list(numpy.asarray(columns['width'])), [4.]*5)
+		self.assertEqual(list(numpy.asarray(columns['flags'])), [1]*5)
+		self.assertEqual(numpy.asarray(columns['time']).dtype, numpy.float64)
+
+	def testEmpty(self):
+		columns = dataclasses.I3RecoPulseSeriesMap().to_columns()
+		self.assertEqual(len(numpy.asarray(columns['time'])), 0)
+		pulses = dataclasses.I3RecoPulseSeriesMap.from_columns(**columns)
+		self.assertEqual(len(pulses), 0)
+
+	def testRoundTrip(self):
+		columns = {k: numpy.asarray(v) for k, v in self.pulses.to_columns().items()}
+		pulses = dataclasses.I3RecoPulseSeriesMap.from_columns(**columns)
+		self.assertEqual(pulses, self.pulses)
+
+	def testFromArrays(self):
+		pulses = dataclasses.I3RecoPulseSeriesMap.from_columns(
+			string=numpy.array([42, 7, 42]), om=numpy.array([7, 7, 7]),
+			pmt=numpy.zeros(3, dtype=int), time=numpy.array([3., 1., 4.]),
+			charge=numpy.ones(3), width=numpy.ones(3))
+		self.assertEqual(len(pulses), 2)
+		self.assertEqual([p.time for p in pulses[icetray.OMKey(42, 7)]], [3., 4.])
+		self.assertEqual([p.flags for p in pulses[icetray.OMKey(7, 7)]], [0])
+
+	def testWrongLength(self):
+		columns = {k: numpy.asarray(v) for k, v in self.pulses.to_columns().items()}
+		columns['charge'] = columns['charge'][:-1]
+		with self.assertRaises(ValueError):
+			dataclasses.I3RecoPulseSeriesMap.from_columns(**columns)
+
+if __name__ == "__main__":
+	unittest.main()
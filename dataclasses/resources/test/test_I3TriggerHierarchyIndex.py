@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+
+import unittest
+
+from icecube import dataclasses
+from icecube.dataclasses import I3Trigger, TriggerKey
+
+class I3TriggerHierarchyIndexTest(unittest.TestCase):
+	def setUp(self):
+		self.hierarchy = dataclasses.I3TriggerHierarchy()
+		for source, ttype, config_id, length in [
+				(dataclasses.IN_ICE, dataclasses.SIMPLE_MULTIPLICITY, 1006, 10.),
+				(dataclasses.ICE_TOP, dataclasses.SIMPLE_MULTIPLICITY, 102, 20.),
+				(dataclasses.IN_ICE, dataclasses.SIMPLE_MULTIPLICITY, 1006, 30.),
+				(dataclasses.IN_ICE, dataclasses.VOLUME, 21001, 40.)]:
+			trigger = I3Trigger()
+			trigger.key = TriggerKey(source, ttype, config_id)
+			trigger.length = length
+			self.hierarchy.insert(trigger)
+		self.index = dataclasses.I3TriggerHierarchyIndex(self.hierarchy)
+
+	def testCount(self):
+		self.assertEqual(len(self.index), 4)
+		smt8 = TriggerKey(dataclasses.IN_ICE, dataclasses.SIMPLE_MULTIPLICITY, 1006)
+		self.assertEqual(self.index.count(smt8), 2)
+		self.assertEqual(self.index.count(source = dataclasses.IN_ICE), 3)
+		self.assertEqual(self.index.count(type = dataclasses.SIMPLE_MULTIPLICITY), 3)
+		self.assertEqual(self.index.count(dataclasses.ICE_TOP, dataclasses.SIMPLE_MULTIPLICITY), 1)
+		self.assertEqual(self.index.count(config_id = 21001), 1)
+		self.assertEqual(self.index.count(config_id = 1), 0)
+		self.assertEqual(self.index.count(), 4)
+		with self.assertRaises(TypeError):
+			self.index.count(smt8, config_id = 1006)
+
+	def testFind(self):
+		smt8 = TriggerKey(dataclasses.IN_ICE, dataclasses.SIMPLE_MULTIPLICITY, 1006)
+		found = self.index.find(smt8)
+		self.assertEqual(len(found), 2)
+		self.assertTrue(all(t.key == smt8 for t in found))
+		self.assertEqual(self.index.find(TriggerKey(dataclasses.IN_ICE, dataclasses.STRING, 1007)), [])
+
+	def testSameAsScan(self):
+		for source in (None, dataclasses.IN_ICE, dataclasses.ICE_TOP):
+			for ttype in (None, dataclasses.SIMPLE_MULTIPLICITY, dataclasses.VOLUME):
+				expected = [t.length for t in self.hierarchy
+					if (source is None or t.key.source == source)
+					and (ttype is None or t.key.type == ttype)]
+				self.assertEqual(self.index.lengths(source, ttype), expected)
+
+	def testKeys(self):
+		self.assertEqual(len(self.index.keys()), 3)
+
+if __name__ == "__main__":
+	unittest.main()
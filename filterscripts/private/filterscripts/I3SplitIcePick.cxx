@@ -0,0 +1,30 @@
+#include <filterscripts/I3SplitIcePick.h>
+
+#include <icetray/I3IcePickInstaller.h>
+#include <dataclasses/physics/I3EventHeader.h>
+
+I3_SERVICE_FACTORY(I3IcePickInstaller<I3SplitIcePick>);
+
+I3SplitIcePick::I3SplitIcePick(const I3Context& context) :
+  I3IcePick(context),
+  splitName_("")
+{
+  AddParameter("SplitName",
+	       "Sub event stream of the Physics frames to select.",
+	       splitName_);
+}
+
+void I3SplitIcePick::Configure()
+{
+  GetParameter("SplitName",splitName_);
+  if(splitName_.empty())
+    log_fatal("I3SplitIcePick needs a SplitName");
+}
+
+bool I3SplitIcePick::SelectFrame(I3Frame& frame)
+{
+  if(frame.GetStop() != I3Frame::Physics)
+    return false;
+  I3EventHeaderConstPtr header = frame.Get<I3EventHeaderConstPtr>();
+  return header && header->GetSubEventStream() == splitName_;
+}
@@ -9,14 +9,15 @@
 #include "filterscripts/TriggerCheck_13.h"
 
 #include <icetray/I3Bool.h>
+#include <dataclasses/I3Map.h>
 #include <dataclasses/TriggerKey.h>
 #include <dataclasses/physics/I3Trigger.h>
 #include <dataclasses/physics/I3TriggerHierarchy.h>
+#include <dataclasses/physics/I3TriggerHierarchyIndex.h>
 #include <icetray/I3Frame.h>
 
 I3_MODULE(TriggerCheck_13);
 
-using namespace I3TriggerHierarchyUtils;
 
 TriggerCheck_13::TriggerCheck_13(const I3Context& context) 
   : I3Module(context),
@@ -32,7 +33,8 @@ TriggerCheck_13::TriggerCheck_13(const I3Context& context)
     fixed_rate_trigger_bool_("FixedRateTriggered"),
     scint_min_bias_bool_("ScintMinBiasTriggered"),
     icetop_volume_bool_("IceTopVolumeTriggered"),
-    iceact_smt_bool_("IceActSMTTriggered")
+    iceact_smt_bool_("IceActSMTTriggered"),
+    trigger_flags_("TriggerCheckFlags")
     
 {
   AddOutBox("OutBox");
@@ -76,6 +78,10 @@ TriggerCheck_13::TriggerCheck_13(const I3Context& context)
   AddParameter("IceTopVolumeTriggerFlag",
   	       "Name of bool to use when IN_Top::Volume (2 station trigger) Trigger present",
   	       icetop_volume_bool_);
+  AddParameter("TriggerFlags",
+  	       "Name of the I3MapStringBool with all of the flags above by their names, "
+  	       "so filters can read them with one frame lookup (empty for none)",
+  	       trigger_flags_);
   physics_min_bias_confid_ = 99999;
   AddParameter("PhysMinBiasConfigID",
 	       "The config ID used for PhysicsMinBias Trigger events",
@@ -124,6 +130,8 @@ TriggerCheck_13::TriggerCheck_13(const I3Context& context)
   	       icetop_volume_bool_);
   GetParameter("IceActSMTTriggerFlag",
 	       iceact_smt_bool_);
+  GetParameter("TriggerFlags",
+	       trigger_flags_);
   GetParameter("PhysMinBiasConfigID",
 	       physics_min_bias_confid_);
   GetParameter("DeepCoreSMTConfigID",
@@ -174,7 +182,10 @@ void TriggerCheck_13::Physics(I3FramePtr frame)
     }
 **/
 
-  unsigned int slow_part = Count(*triggers,TriggerKey::IN_ICE,TriggerKey::SLOW_PARTICLE);
+  // walks the hierarchy once for all of the counts below
+  I3TriggerHierarchyIndex index(triggers);
+
+  unsigned int slow_part = index.Count(TriggerKey::IN_ICE,TriggerKey::SLOW_PARTICLE);
   //If the slow particle is setoff, abort all other checks and just flag as SP
   I3BoolPtr SlowPart_boolPtr(new I3Bool(false));
   if (slow_part){
@@ -182,40 +193,40 @@ void TriggerCheck_13::Physics(I3FramePtr frame)
     log_trace("Slow particle TRUE");
   }
     
-  unsigned int frt_count = Count(*triggers,TriggerKey::IN_ICE,TriggerKey::UNBIASED);
+  unsigned int frt_count = index.Count(TriggerKey::IN_ICE,TriggerKey::UNBIASED);
   I3BoolPtr FRT_boolPtr(new I3Bool(false));
   if (frt_count){
     FRT_boolPtr->value = true;
     log_trace("Fixed rate trigger TRUE");
   }
   
-  unsigned int inice_smt = Count(*triggers,TriggerKey::IN_ICE,TriggerKey::SIMPLE_MULTIPLICITY);
-  unsigned int icetop_smt = Count(*triggers,TriggerKey::ICE_TOP,TriggerKey::SIMPLE_MULTIPLICITY);
-  unsigned int inice_string = Count(*triggers,TriggerKey::IN_ICE,TriggerKey::STRING);  
-  unsigned int inice_volume = Count(*triggers,TriggerKey::IN_ICE,TriggerKey::VOLUME);  
-  unsigned int icetop_volume = Count(*triggers,TriggerKey::ICE_TOP,TriggerKey::VOLUME);  
-  unsigned int faint_part = Count(*triggers,TriggerKey::IN_ICE,TriggerKey::FAINT_PARTICLE);
+  unsigned int inice_smt = index.Count(TriggerKey::IN_ICE,TriggerKey::SIMPLE_MULTIPLICITY);
+  unsigned int icetop_smt = index.Count(TriggerKey::ICE_TOP,TriggerKey::SIMPLE_MULTIPLICITY);
+  unsigned int inice_string = index.Count(TriggerKey::IN_ICE,TriggerKey::STRING);  
+  unsigned int inice_volume = index.Count(TriggerKey::IN_ICE,TriggerKey::VOLUME);  
+  unsigned int icetop_volume = index.Count(TriggerKey::ICE_TOP,TriggerKey::VOLUME);  
+  unsigned int faint_part = index.Count(TriggerKey::IN_ICE,TriggerKey::FAINT_PARTICLE);
 
   log_trace("Found:  IISMT: %i ITSMT: %i, IISTRING: %i\n",
 	    inice_smt,icetop_smt,inice_string);
 
 
-  unsigned int DeepCoreSMT_trigger = Count(*triggers,
+  unsigned int DeepCoreSMT_trigger = index.Count(
 					   TriggerKey(TriggerKey::IN_ICE,
 						      TriggerKey::SIMPLE_MULTIPLICITY,
 						      deepcore_smt_confid_));
 			      
-  unsigned int PhysMinBias_trigger = Count(*triggers,
+  unsigned int PhysMinBias_trigger = index.Count(
 					   TriggerKey(TriggerKey::IN_ICE,
 						      TriggerKey::MIN_BIAS,
 						      physics_min_bias_confid_));
 
-  unsigned int ScintMinBias_trigger = Count(*triggers,
+  unsigned int ScintMinBias_trigger = index.Count(
 					   TriggerKey(TriggerKey::ICE_TOP,
 						      TriggerKey::MIN_BIAS,
 						      scint_min_bias_config_));
 
-  unsigned int IceActSMT_trigger = Count(*triggers,
+  unsigned int IceActSMT_trigger = index.Count(
 					 TriggerKey(TriggerKey::ICE_TOP,
 						    TriggerKey::SIMPLE_MULTIPLICITY,
 						    iceact_smt_config_));
@@ -304,5 +315,25 @@ void TriggerCheck_13::Physics(I3FramePtr frame)
    frame->Put(faint_particle_bool_, FaintPart_boolPtr);
    frame->Put(fixed_rate_trigger_bool_, FRT_boolPtr); 
 
+   // All of the flags in one object, which I3FilterModule reads instead
+   // of getting the I3Bools of its TriggerEvalList one by one
+   if (trigger_flags_.size())
+     {
+       I3MapStringBoolPtr flags(new I3MapStringBool);
+       (*flags)[inice_smt_bool_] = InIceSMT_boolPtr->value;
+       (*flags)[icetop_smt_bool_] = IceTopSMT_boolPtr->value;
+       (*flags)[inice_string_bool_] = InIceString_boolPtr->value;
+       (*flags)[volume_trigger_bool_] = VolumeTrig_boolPtr->value;
+       (*flags)[icetop_volume_bool_] = IceTopVolume_boolPtr->value;
+       (*flags)[physics_min_bias_bool_] = PhysMinBias_boolPtr->value;
+       (*flags)[scint_min_bias_bool_] = ScintMinBias_boolPtr->value;
+       (*flags)[deepcore_smt_bool_] = DeepCoreSMT_boolPtr->value;
+       (*flags)[iceact_smt_bool_] = IceACTSMT_boolPtr->value;
+       (*flags)[slow_particle_bool_] = SlowPart_boolPtr->value;
+       (*flags)[faint_particle_bool_] = FaintPart_boolPtr->value;
+       (*flags)[fixed_rate_trigger_bool_] = FRT_boolPtr->value;
+       frame->Put(trigger_flags_, flags);
+     }
+
    PushFrame(frame,"OutBox");
 }
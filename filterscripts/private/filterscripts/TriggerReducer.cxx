@@ -5,13 +5,11 @@
 #include <dataclasses/physics/I3TriggerHierarchy.h>
 #include <icetray/I3Frame.h>
 #include <vector>
-#include <algorithm>
+#include <set>
 
 I3_MODULE(TriggerReducer);
 using namespace std;
 
-using namespace I3TriggerHierarchyUtils;
-
 TriggerReducer::TriggerReducer(const I3Context& context) 
   : I3ConditionalModule(context),
     I3TriggerHierarchy_("I3TriggerHierarchy"),
@@ -37,7 +35,7 @@ void TriggerReducer::Configure()
 	       OutTriggerHierarchy_);
   GetParameter("TriggerConfigIDList",
 	       match_keys_);
-  
+  match_set_ = std::set<int>(match_keys_.begin(), match_keys_.end());
 }
 
 void TriggerReducer::Physics(I3FramePtr frame)
@@ -70,10 +68,7 @@ void TriggerReducer::Physics(I3FramePtr frame)
 		   TriggerKey::GetSourceString(th_iter->GetTriggerKey().GetSource()),
 		   TriggerKey::GetTypeString(th_iter->GetTriggerKey().GetType()),
 		   th_iter->GetTriggerKey().GetConfigID());*/
-	  int mycount;
-	  mycount = (int) count(match_keys_.begin(),match_keys_.end(),
-			th_iter->GetTriggerKey().GetConfigID());
-	  if (mycount > 0)
+	  if (match_set_.count(th_iter->GetTriggerKey().GetConfigID()))
 	    {
 	      log_debug("Found match %i",th_iter->GetTriggerKey().GetConfigID());
 	      saved_triggers->insert(saved_triggers->begin(), *th_iter);
@@ -10,6 +10,7 @@
 #include <dataclasses/physics/I3TWRLaunch.h>
 #include <icetray/I3Units.h>
 #include <icetray/I3Bool.h>
+#include <dataclasses/I3Map.h>
 
 /**
  * @brief This module will apply a filter to the events it's given.  
@@ -30,7 +31,8 @@ public:
     firstsec_(0),
     firstnanosec_(0),
     lastsec_(0),
-    lastnanosec_(0)
+    lastnanosec_(0),
+    triggerFlags_("TriggerCheckFlags")
     {
       FilterModule::AddParameter("DecisionName",
 		   "Name of the filter decision in the Frame",
@@ -42,6 +44,14 @@ public:
       FilterModule::AddParameter("TriggerEvalList",
 		   "List of bools from TriggerCheck that are required for event consideration",
 		   executeFilter_);
+      FilterModule::AddParameter("TriggerFlags",
+		   "I3MapStringBool from TriggerCheck with the bools by name. The "
+		   "TriggerEvalList is looked up in it, the bools that aren't in "
+		   "it (or all of them, if it isn't in the frame) in the frame. "
+		   "An entry in the map wins over an I3Bool of the same name, "
+		   "so an I3Bool put later in the chain is only seen if the map "
+		   "doesn't have it",
+		   triggerFlags_);
       FilterModule::AddOutBox("OutBox");
     }
 
@@ -53,6 +63,8 @@ public:
 		   discardEvents_);
       FilterModule::GetParameter("TriggerEvalList",
 		   executeFilter_);
+      FilterModule::GetParameter("TriggerFlags",
+		   triggerFlags_);
       
       FilterModule::Configure();
       number_Events_Picked = 0;
@@ -80,15 +92,40 @@ public:
 	    }
 	}
 
+      // One frame lookup for all of the trigger bools, if TriggerCheck
+      // put them together
+      I3MapStringBoolConstPtr triggerFlags;
+      if (executeFilter_.size() && triggerFlags_.size())
+	triggerFlags = frame->template Get<I3MapStringBoolConstPtr>(triggerFlags_);
+
       unsigned int execute = 0; 
       for (unsigned int i = 0;
 	   i <  executeFilter_.size(); 
 	   i++)
 	{
-	  I3BoolConstPtr executeBool = frame->Get<I3BoolConstPtr>(executeFilter_[i]);
-	  if(executeBool)
+	  bool found = false;
+	  bool value = false;
+	  if(triggerFlags)
+	    {
+	      I3MapStringBool::const_iterator flag = triggerFlags->find(executeFilter_[i]);
+	      if(flag != triggerFlags->end())
+		{
+		  found = true;
+		  value = flag->second;
+		}
+	    }
+	  if(!found)
+	    {
+	      I3BoolConstPtr executeBool = frame->template Get<I3BoolConstPtr>(executeFilter_[i]);
+	      if(executeBool)
+		{
+		  found = true;
+		  value = executeBool->value;
+		}
+	    }
+	  if(found)
 	    {
-	      if (executeBool->value)
+	      if (value)
 		{
 		  execute++;
 		  log_trace("Executing because of %s\n",executeFilter_[i].c_str());
@@ -161,6 +198,7 @@ public:
   unsigned int lastsec_;
   unsigned long long int lastnanosec_;
   std::vector<std::string> executeFilter_;    
+  std::string triggerFlags_;
 
   SET_LOGGER("I3FilterModule");
 };
@@ -0,0 +1,29 @@
+#ifndef JEB_FILTER_I3SPLITICEPICK_H
+#define JEB_FILTER_I3SPLITICEPICK_H
+
+#include <icetray/I3IcePick.h>
+#include <icetray/I3Frame.h>
+
+/**
+ * @brief IcePick selecting the Physics frames of one split, the same
+ * frames as phys_services.which_split.
+ *
+ * Installed as a service, modules can use it with IcePickServiceKey in
+ * place of If=which_split(...), so the split is checked in C++ instead
+ * of by a python callback for every module and frame.
+ */
+class I3SplitIcePick : public I3IcePick
+{
+ public:
+
+  I3SplitIcePick(const I3Context&);
+  void Configure();
+  bool SelectFrame(I3Frame& frame);
+
+  SET_LOGGER("I3SplitIcePick");
+
+ private:
+  std::string splitName_;
+};
+
+#endif
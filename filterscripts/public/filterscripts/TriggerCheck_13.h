@@ -36,6 +36,7 @@ class TriggerCheck_13 : public I3Module
   std::string scint_min_bias_bool_;
   std::string icetop_volume_bool_;
   std::string iceact_smt_bool_;
+  std::string trigger_flags_;
   unsigned int physics_min_bias_confid_;
   unsigned int deepcore_smt_confid_;
   unsigned int scint_min_bias_config_;
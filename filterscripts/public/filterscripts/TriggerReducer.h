@@ -9,6 +9,7 @@
 #ifndef JEBFILTER_TRIGGERREDUCER_H_INCLUDED
 #define JEBFILTER_TRIGGERREDUCER_H_INCLUDED
 
+#include <set>
 #include <icetray/I3ConditionalModule.h>
 #include "icetray/I3Tray.h"
 #include <dataclasses/physics/I3Trigger.h>
@@ -28,6 +29,8 @@ class TriggerReducer : public I3ConditionalModule
   std::string I3TriggerHierarchy_;
   std::string OutTriggerHierarchy_;
   std::vector<int> match_keys_;
+  // the same config IDs, for the lookups per trigger
+  std::set<int> match_set_;
 
 };
 #endif
@@ -27,7 +27,7 @@ def OnlineFilter(tray, name, simulation=False, decode = False, If=lambda f: True
         ic79_geometry = False
         ):
 
-    from icecube.phys_services.which_split import which_split
+    from icecube.filterscripts.split_gate import SplitGate, AddGatedSegment
 
     # import all the actual worker segments....
     from icecube.filterscripts.baseproc import BaseProcessing
@@ -59,6 +59,13 @@ def OnlineFilter(tray, name, simulation=False, decode = False, If=lambda f: True
     from icecube.filterscripts.alerteventfollowup import AlertEventFollowup
     from icecube.filterscripts.grecofilter import GRECOOnlineFilter
 
+    # One gate per split.  The modules of the segments added with
+    # AddGatedSegment check the split natively instead of in python.
+    in_ice = SplitGate(filter_globals.InIceSplitter, name + "_InIceSplitGate")
+    null_split = SplitGate(filter_globals.NullSplitter, name + "_NullSplitGate")
+    ice_top = SplitGate(filter_globals.IceTopSplitter, name + "_IceTopSplitGate")
+    slop_split = SplitGate(filter_globals.SLOPSplitter, name + "_SLOPSplitGate")
+
     
     # Get the spline paths sorted.
     # This is used by Online L2 and ESTReS
@@ -121,167 +128,114 @@ def OnlineFilter(tray, name, simulation=False, decode = False, If=lambda f: True
         tray.AddSegment(IceTopVEMCal, "VEMCALStuff")
 
 ## Filters that use the InIce Trigger splitting
-    tray.AddSegment(MuonFilter, "MuonFilter",
-                    pulses = filter_globals.CleanedMuonPulses,
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+    AddGatedSegment(tray, MuonFilter, "MuonFilter", in_ice,
+                    pulses = filter_globals.CleanedMuonPulses)
 
 ## In the FSS segment the "pulses" are used for finiteReco, after customized hit
 ## cleaning which is not optimized for track fitting but rather for vetoing
 ## downgoing muons in top & side layers. So: do *not* provide pulses that are
 ## already e.g. SRT cleaned, such as CleanedMuonPulses.
-    tray.AddSegment(FSSFilter, "FSSFilter",
+    AddGatedSegment(tray, FSSFilter, "FSSFilter", in_ice,
                     pulses = filter_globals.SplitUncleanedInIcePulses,
-                    If = which_split(split_name=filter_globals.InIceSplitter),
                     ic79_geometry = ic79_geometry
                     )
 
-    tray.AddSegment(CascadeFilter, "CascadeFilter",
-                    pulses = filter_globals.CleanedMuonPulses,
-                    muon_llhfit_name=filter_globals.muon_llhfit,
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
-    tray.AddSegment(VEFFilter, "VEF",
+    AddGatedSegment(tray, CascadeFilter, "CascadeFilter", in_ice,
                     pulses = filter_globals.CleanedMuonPulses,
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+                    muon_llhfit_name=filter_globals.muon_llhfit)
+    AddGatedSegment(tray, VEFFilter, "VEF", in_ice,
+                    pulses = filter_globals.CleanedMuonPulses)
 
-    tray.AddSegment(LowUpFilter, "LowUpFilter",
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+    AddGatedSegment(tray, LowUpFilter, "LowUpFilter", in_ice)
 
     # High Q filter
-    tray.AddSegment(HighQFilter, "HighQFilter",
-                    pulses = filter_globals.SplitUncleanedInIcePulses,
-                    If =  (which_split(split_name= filter_globals.InIceSplitter))
-                    )
+    AddGatedSegment(tray, HighQFilter, "HighQFilter", in_ice,
+                    pulses = filter_globals.SplitUncleanedInIcePulses)
 
     # HESE veto (VHESelfVeto)
-    tray.AddSegment(HeseFilter, "HeseFilter",
-                    pulses = filter_globals.SplitUncleanedInIcePulses,
-                    If =  (which_split(split_name= filter_globals.InIceSplitter))
-                    )
+    AddGatedSegment(tray, HeseFilter, "HeseFilter", in_ice,
+                    pulses = filter_globals.SplitUncleanedInIcePulses)
 
     # MESE veto (Jakob van Santen's veto)
-    tray.AddSegment(MeseFilter, "MeseFilter",
-                    pulses = filter_globals.SplitUncleanedInIcePulses,
-                    If =  (which_split(split_name= filter_globals.InIceSplitter))
-                    )
+    AddGatedSegment(tray, MeseFilter, "MeseFilter", in_ice,
+                    pulses = filter_globals.SplitUncleanedInIcePulses)
 
     # OnlineL2, used by HESE and GFU
-    tray.AddSegment(OnlineL2Filter, "OnlineL2",
+    AddGatedSegment(tray, OnlineL2Filter, "OnlineL2", in_ice,
                     pulses = filter_globals.CleanedMuonPulses,
                     linefit_name = filter_globals.muon_linefit,
                     llhfit_name = filter_globals.muon_llhfit,
                     SplineRecoAmplitudeTable = SplineRecoAmplitudeTable,
                     SplineRecoTimingTable = SplineRecoTimingTable,
                     PathToCramerRaoTable = PathToCramerRaoTable,
-                    forceOnlineL2BadDOMList=forceOnlineL2BadDOMList,
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+                    forceOnlineL2BadDOMList=forceOnlineL2BadDOMList)
 
     if (simulation):
         # sim data
-        tray.AddSegment(ShadowFilter, "MoonAndSun",mcseed=424242,
-                        If = which_split(split_name=filter_globals.InIceSplitter)
-                        )
+        AddGatedSegment(tray, ShadowFilter, "MoonAndSun", in_ice, mcseed=424242)
     else:
         # exp data
-        tray.AddSegment(ShadowFilter, "MoonAndSun",
-                        If = which_split(split_name=filter_globals.InIceSplitter)
-                        )
+        AddGatedSegment(tray, ShadowFilter, "MoonAndSun", in_ice)
 
-    tray.AddSegment(ESTReSFilter,"ESTReSFilter",
+    AddGatedSegment(tray, ESTReSFilter, "ESTReSFilter", in_ice,
                     pulsesname=filter_globals.SplitUncleanedInIcePulses,
                     base_processing_fit = filter_globals.muon_llhfit,
                     SplineRecoAmplitudeTable = SplineRecoAmplitudeTable,
-                    SplineRecoTimingTable = SplineRecoTimingTable,
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+                    SplineRecoTimingTable = SplineRecoTimingTable)
 
 
-    tray.AddSegment(DeepCoreFilter,"DeepCoreFilter",
+    AddGatedSegment(tray, DeepCoreFilter, "DeepCoreFilter", in_ice,
                     pulses = filter_globals.SplitUncleanedInIcePulses,
-                    seededRTConfig = seededRTConfig,
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+                    seededRTConfig = seededRTConfig)
 
-    tray.AddSegment(GRECOOnlineFilter, "GRECOOnlineFilter",
-                    uncleaned_pulses = filter_globals.SplitUncleanedInIcePulses,
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+    AddGatedSegment(tray, GRECOOnlineFilter, "GRECOOnlineFilter", in_ice,
+                    uncleaned_pulses = filter_globals.SplitUncleanedInIcePulses)
                     
     #EHE, now on the InIce!
-    tray.AddSegment(EHEFilter, "EHEFilter",
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+    AddGatedSegment(tray, EHEFilter, "EHEFilter", in_ice)
 
     ## Filters on the Null split
 
-    tray.AddSegment(MinBiasFilters, "MinBias",
-                    If = which_split(split_name=filter_globals.NullSplitter)
-                    )
-    tray.AddSegment(FixedRateTrigFilter, "FixedRate",
-                    If = which_split(split_name=filter_globals.NullSplitter)
-                    )
-    tray.AddSegment(ScintMinBiasFilters, "ScintMinBias",
-                    If = which_split(split_name=filter_globals.NullSplitter)
-                    )
-    tray.AddSegment(IceActTrigFilter, "IceActFilters",
-                    If = which_split(split_name=filter_globals.NullSplitter)
-    )
+    AddGatedSegment(tray, MinBiasFilters, "MinBias", null_split)
+    AddGatedSegment(tray, FixedRateTrigFilter, "FixedRate", null_split)
+    AddGatedSegment(tray, ScintMinBiasFilters, "ScintMinBias", null_split)
+    AddGatedSegment(tray, IceActTrigFilter, "IceActFilters", null_split)
 
-    tray.AddSegment(DSTFilter, "DSTFilter",
+    AddGatedSegment(tray, DSTFilter, "DSTFilter", in_ice,
                     dstname  = filter_globals.dst,
-                    pulses   = filter_globals.CleanedMuonPulses,
-                    If = which_split(split_name=filter_globals.InIceSplitter))
+                    pulses   = filter_globals.CleanedMuonPulses)
     ## SLOP filter
     if slop_split_enabled:
-        tray.AddSegment(SLOPFilter, "SLOPFilter",
-                        use_pulses=sdstarchive,
-                        If = which_split(split_name=filter_globals.SLOPSplitter))
+        AddGatedSegment(tray, SLOPFilter, "SLOPFilter", slop_split,
+                        use_pulses=sdstarchive)
 
     ##FP filter
-    tray.AddSegment(FPFilter,"FPFilter",
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+    AddGatedSegment(tray, FPFilter, "FPFilter", in_ice)
     
     
     ## Filters on the CR split
-    tray.AddSegment(CosmicRayFilter, "CosmicRayFilter",
-                    Pulses = filter_globals.CleanedHLCTankPulses,
-                    If = which_split(split_name=filter_globals.IceTopSplitter)
-                    )
-    tray.AddSegment(IceTopTwoStationFilter, "TwoStationFilter",
-                    If = which_split(split_name=filter_globals.IceTopSplitter)
-                    )
+    AddGatedSegment(tray, CosmicRayFilter, "CosmicRayFilter", ice_top,
+                    Pulses = filter_globals.CleanedHLCTankPulses)
+    AddGatedSegment(tray, IceTopTwoStationFilter, "TwoStationFilter", ice_top)
 
     ## Gamma-Ray Follow-Up
     if gfu_enabled:
         from icecube.filterscripts.gfufilter import GammaFollowUp
-        tray.AddSegment(GammaFollowUp, "GammaFollowUp",
+        AddGatedSegment(tray, GammaFollowUp, "GammaFollowUp", in_ice,
                         OnlineL2SegmentName = "OnlineL2",
                         BDTUpFile = GFUBDTUpPath,
                         BDTDownFile = GFUBDTDownPath,
-                        angular_error = True,
-                        If = which_split(split_name=filter_globals.InIceSplitter)
-                        )
+                        angular_error = True)
 
     ## EHE Online Alert Follow-up
-    tray.AddSegment(EHEAlertFilter, "EHEAlertFilter",
-                    If= which_split(split_name=filter_globals.InIceSplitter)
-    )
+    AddGatedSegment(tray, EHEAlertFilter, "EHEAlertFilter", in_ice)
     ## Monopole filter
-    tray.AddSegment(MonopoleFilter, "MonopoleFilter",
+    AddGatedSegment(tray, MonopoleFilter, "MonopoleFilter", in_ice,
                     pulses = filter_globals.SplitUncleanedInIcePulses,
-                    seededRTConfig = seededRTConfig,
-                    If = which_split(split_name=filter_globals.InIceSplitter)
-                    )
+                    seededRTConfig = seededRTConfig)
     # Alert followup
     if alert_followup:
-        tray.AddSegment(AlertEventFollowup, "AlertFollowup",
+        AddGatedSegment(tray, AlertEventFollowup, "AlertFollowup", in_ice,
                         omit_GCD_diff = alert_followup_omit_GCD_diff,
                         base_GCD_path=alert_followup_base_GCD_path,
-                        base_GCD_filename=alert_followup_base_GCD_filename,
-                        If = (which_split(split_name= filter_globals.InIceSplitter))
-                        )
+                        base_GCD_filename=alert_followup_base_GCD_filename)
@@ -213,6 +213,8 @@ def BaseProcessing(tray, name, pulses='MuonPulseSeriesReco',
      #      etc....
      #  These are used later by individual filters that want to 
      #    select on specific triggers.
+     #  TriggerFlags puts them all into one I3MapStringBool too, which
+     #    the I3FilterModules read their TriggerEvalList from.
      # will run on ALL splits.
      tray.AddModule("TriggerCheck_13",name + "_Trigchecker",
 		    I3TriggerHierarchy=filter_globals.triggerhierarchy,
@@ -228,7 +230,8 @@ def BaseProcessing(tray, name, pulses='MuonPulseSeriesReco',
                     ScintMinBiasTriggerFlag=filter_globals.scintminbiastriggered,
                     IceTopVolumeTriggerFlag=filter_globals.icetopvolumetriggered,
                     ScintMinBiasConfigID=filter_globals.scintminbiasconfigid,
-                    IceActSMTConfigID =filter_globals.iceactsmtconfigid
+                    IceActSMTConfigID =filter_globals.iceactsmtconfigid,
+                    TriggerFlags=filter_globals.triggerflags
 		    )
 
 
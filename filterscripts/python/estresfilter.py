@@ -62,10 +62,7 @@ def ESTReSFilter(tray, name,
     def If_with_triggers(frame):
         if not If(frame):
             return False
-        for trigger in TriggerEvalList:
-            if frame[trigger].value:
-                return True
-        return False  
+        return filter_globals.any_triggered(frame, TriggerEvalList)
   
     tray.AddModule('HomogenizedQTot', name+'_qtot_total',
         Pulses=pulsesname,
@@ -93,6 +93,21 @@ fixedratetriggered = 'FixedRateTriggered'
 icetopvolumetriggered = 'IceTopVolumeTriggered'
 scintminbiastriggered = 'ScintMinBiasTriggered'
 iceactsmttriggered = 'IceActSMTTriggered'
+# all of the above in one I3MapStringBool, by name
+triggerflags = 'TriggerCheckFlags'
+
+def any_triggered(frame, triggers):
+    '''
+    True if any of the trigger flags in triggers is set.  They're read
+    from the triggerflags map with one frame lookup, flags that aren't
+    in the map (or all of them, if there's no map) from their I3Bools.
+    An entry in the map wins over an I3Bool of the same name.
+    '''
+    flags = frame[triggerflags] if triggerflags in frame else dict()
+    for trigger in triggers:
+        if flags[trigger] if trigger in flags else frame[trigger].value:
+            return True
+    return False
 
 #TODO: make sure configIDs have not changed in 20XX, 
 # commit any changes at last minute for test run
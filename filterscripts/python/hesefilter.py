@@ -23,10 +23,7 @@ def HeseFilter(tray,name, pulses='RecoPulses',If = lambda f: True):
     def If_with_triggers(frame):
         if not If(frame):
             return False
-        for trigger in TriggerEvalList:
-            if frame[trigger].value:
-                return True
-        return False
+        return filter_globals.any_triggered(frame, TriggerEvalList)
     
     # apply the veto 
     tray.AddModule('HomogenizedQTot', name+'_qtot_total',
@@ -24,10 +24,7 @@ def MeseFilter(tray,name, pulses='RecoPulses',If = lambda f: True):
     def If_with_triggers(frame):
         if not If(frame):
             return False
-        for trigger in TriggerEvalList:
-            if frame[trigger].value:
-                return True
-        return False
+        return filter_globals.any_triggered(frame, TriggerEvalList)
 
     tray.AddModule('I3LCPulseCleaning', name+'_lcclean1',
         Input=pulses,
@@ -0,0 +1,87 @@
+# Segment level gating on the split of the frame.
+#
+# The filter segments pass their If (usually which_split) on to every
+# module they add, so every module pays a python callback for every
+# frame, even in the splits the segment has nothing to do with.
+# A SplitGate is a which_split that also installs an I3SplitIcePick
+# service.  While a segment is added with AddGatedSegment the tray swaps
+# If=gate for IcePickServiceKey, so those modules check the split in C++.
+# Modules with an If of their own (e.g. lambda f: If(f) and ...) keep
+# calling it, and the gate still works as a plain which_split there.
+
+class SplitGate(object):
+    '''
+    which_split(split_name) that modules can check natively through the
+    I3SplitIcePick service service_key.
+    '''
+    def __init__(self, split_name, service_key = None):
+        from icecube.phys_services.which_split import which_split
+        self.split_name = split_name
+        self.service_key = service_key or "SplitGate_" + split_name
+        self._which_split = which_split(split_name = split_name)
+        self._installed = False
+
+    def __call__(self, frame):
+        return self._which_split(frame)
+
+    def install(self, tray):
+        if not self._installed:
+            tray.AddService("I3IcePickInstaller<I3SplitIcePick>", self.service_key,
+                            SplitName = self.split_name)
+            self._installed = True
+
+class GatedTray(object):
+    '''
+    While it's entered, the modules added to the tray (with AddModule or
+    Add, also by nested segments) that get the gate as their If are gated
+    with the IcePick service instead.  The tray's own methods are only
+    wrapped for that time, so the segment is added by the tray itself.
+    '''
+    def __init__(self, tray, gate):
+        self._tray = tray
+        self._gate = gate
+        self._saved = None
+
+    def _swap(self, kwargs):
+        if kwargs.get("If") is self._gate and not kwargs.get("IcePickServiceKey"):
+            del kwargs["If"]
+            kwargs["IcePickServiceKey"] = self._gate.service_key
+
+    def __enter__(self):
+        tray = self._tray
+        # a gate entered before this one is wrapped in turn
+        self._saved = dict((name, tray.__dict__[name])
+                           for name in ("AddModule", "Add") if name in tray.__dict__)
+        add_module, add = tray.AddModule, tray.Add
+
+        def AddModule(_type, _name = None, *args, **kwargs):
+            self._swap(kwargs)
+            return add_module(_type, _name, *args, **kwargs)
+
+        def Add(_type, _name = None, *args, **kwargs):
+            # segments get the If, to pass it on to their modules
+            if not hasattr(_type, "__i3traysegment__"):
+                self._swap(kwargs)
+            return add(_type, _name, *args, **kwargs)
+
+        tray.AddModule = AddModule
+        tray.Add = Add
+        return tray
+
+    def __exit__(self, *exc_info):
+        for name in ("AddModule", "Add"):
+            if name in self._saved:
+                setattr(self._tray, name, self._saved[name])
+            else:
+                delattr(self._tray, name)
+        self._saved = None
+        return False
+
+def AddGatedSegment(tray, segment, name, gate, **kwargs):
+    '''
+    tray.AddSegment(segment, name, If = gate, **kwargs), with the modules
+    that only use the gate checking it natively.
+    '''
+    gate.install(tray)
+    with GatedTray(tray, gate):
+        return tray.AddSegment(segment, name, If = gate, **kwargs)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+# Adds a small filter segment once with If=which_split and once with
+# AddGatedSegment.  Both have to process the same frames and make the
+# same filter decisions, and the gated modules must not call the gate
+# from python.
+
+import random
+
+from I3Tray import I3Tray
+from icecube.icetray import I3Test
+from icecube import icetray, dataclasses, filterscripts
+from icecube.filterscripts.split_gate import SplitGate, AddGatedSegment
+from icecube.phys_services.which_split import which_split
+
+NEVENTS = 60
+SPLITS = ["InIceSplit", "NullSplit", "IceTopSplit"]
+
+class CountingGate(SplitGate):
+    '''
+    A SplitGate that counts how often it's called from python.
+    '''
+    def __init__(self, split_name):
+        SplitGate.__init__(self, split_name)
+        self.calls = 0
+
+    def __call__(self, frame):
+        self.calls += 1
+        return SplitGate.__call__(self, frame)
+
+@icetray.traysegment
+def SmallFilter(tray, name, If = lambda f: True):
+    def Seen(frame):
+        frame[name + "_Seen"] = icetray.I3Bool(True)
+    tray.AddModule(Seen, name + "_Seen", If = If)
+    tray.Add("I3FilterModule<I3BoolFilter>", name + "_Filter",
+             BoolKey = "KeepIt",
+             DecisionName = name + "_Decision",
+             If = If)
+    # a module with an If of its own still calls the gate
+    def Both(frame):
+        frame[name + "_Both"] = icetray.I3Bool(True)
+    tray.Add(Both, name + "_Both",
+             If = lambda f: If(f) and f["KeepIt"].value)
+
+@icetray.traysegment
+def Nested(tray, name, If = lambda f: True):
+    tray.AddSegment(SmallFilter, name + "_Inner", If = If)
+
+def Run(add_segment):
+    rng = random.Random(2718)
+    count = [0]
+    def Source(frame):
+        header = dataclasses.I3EventHeader()
+        header.event_id = count[0]
+        header.sub_event_stream = SPLITS[rng.randrange(len(SPLITS))]
+        frame["I3EventHeader"] = header
+        frame["KeepIt"] = icetray.I3Bool(rng.random() < 0.5)
+        count[0] += 1
+
+    results = list()
+    def Collect(frame):
+        results.append(tuple([frame["I3EventHeader"].event_id,
+                              frame["I3EventHeader"].sub_event_stream] +
+                             [frame[key].value if key in frame else None
+                              for key in ("Small_Seen", "Small_Decision", "Small_Both",
+                                          "Nested_Inner_Seen",
+                                          "Nested_Inner_Decision")]))
+
+    tray = I3Tray()
+    tray.AddModule("I3InfiniteSource", Stream = icetray.I3Frame.Physics)
+    tray.AddModule(Source, Streams = [icetray.I3Frame.Physics])
+    add_segment(tray)
+    tray.AddModule(Collect, Streams = [icetray.I3Frame.Physics])
+    tray.Execute(NEVENTS)
+    return results
+
+def Plain(tray):
+    tray.AddSegment(SmallFilter, "Small", If = which_split(split_name = "InIceSplit"))
+    tray.AddSegment(Nested, "Nested", If = which_split(split_name = "InIceSplit"))
+
+gates = list()
+def Gated(tray):
+    gates.append(CountingGate("InIceSplit"))
+    AddGatedSegment(tray, SmallFilter, "Small", gates[-1])
+    gates.append(CountingGate("InIceSplit"))
+    AddGatedSegment(tray, Nested, "Nested", gates[-1])
+
+plain = Run(Plain)
+gated = Run(Gated)
+
+I3Test.ENSURE(any(r[3] for r in plain), "the filter kept no frames")
+I3Test.ENSURE(any(r[2] is None for r in plain), "every frame was in the split")
+I3Test.ENSURE(gated == plain,
+              "the gated segment processed different frames or made "
+              "different decisions")
+
+# only the module with an If of its own calls the gate from python,
+# once for every Physics frame, in the nested segment too
+for gate in gates:
+    I3Test.ENSURE(gate.calls == NEVENTS,
+                  "the gate was called %d times for %d frames" % (gate.calls, NEVENTS))
+
+# the tray is left as it was
+tray = I3Tray()
+AddGatedSegment(tray, SmallFilter, "Small", SplitGate("InIceSplit"))
+I3Test.ENSURE("AddModule" not in vars(tray) and "Add" not in vars(tray),
+              "the tray still gates its modules")
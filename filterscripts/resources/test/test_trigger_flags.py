@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+# The filters look their TriggerEvalList up in the TriggerCheckFlags map
+# if it's in the frame.  I3FilterModule and filter_globals.any_triggered
+# have to keep the same frames and make the same decisions with the map
+# as with only the I3Bools from TriggerCheck.
+
+import random
+
+from I3Tray import I3Tray
+from icecube.icetray import I3Test
+from icecube import icetray, dataclasses, filterscripts
+from icecube.filterscripts import filter_globals
+
+NEVENTS = 200
+FLAGS = [filter_globals.inicesmttriggered,
+         filter_globals.deepcoresmttriggered,
+         filter_globals.slowparticletriggered]
+TRIGGER_EVAL_LIST = FLAGS[:2]
+
+def Run(with_map, frames = None):
+    '''
+    Returns the number, any_triggered and filter decision of the
+    frames the filter kept.
+    '''
+    rng = random.Random(31415)
+    count = [0]
+    def AddFlags(frame):
+        frame["EventNumber"] = icetray.I3Int(count[0])
+        count[0] += 1
+        flags = dataclasses.I3MapStringBool()
+        for flag in FLAGS:
+            flags[flag] = rng.random() < 0.3
+            frame[flag] = icetray.I3Bool(flags[flag])
+        frame["KeepIt"] = icetray.I3Bool(rng.random() < 0.5)
+        if with_map:
+            frame[filter_globals.triggerflags] = flags
+
+    def AnyTriggered(frame):
+        frame["AnyTriggered"] = icetray.I3Bool(
+            filter_globals.any_triggered(frame, TRIGGER_EVAL_LIST))
+
+    kept = list()
+    def Collect(frame):
+        kept.append((frame["EventNumber"].value,
+                     frame["AnyTriggered"].value,
+                     frame["BoolFilter"].value if "BoolFilter" in frame else None))
+
+    tray = I3Tray()
+    tray.AddModule("I3InfiniteSource", Stream = icetray.I3Frame.Physics)
+    tray.AddModule(AddFlags, Streams = [icetray.I3Frame.Physics])
+    tray.AddModule(AnyTriggered, Streams = [icetray.I3Frame.Physics])
+    tray.AddModule("I3FilterModule<I3BoolFilter>",
+                   BoolKey = "KeepIt",
+                   DecisionName = "BoolFilter",
+                   DiscardEvents = True,
+                   TriggerEvalList = TRIGGER_EVAL_LIST,
+                   TriggerFlags = filter_globals.triggerflags)
+    tray.AddModule(Collect, Streams = [icetray.I3Frame.Physics])
+    tray.Execute(NEVENTS)
+    return kept
+
+with_bools = Run(with_map = False)
+with_map = Run(with_map = True)
+
+I3Test.ENSURE(len(with_bools) > 0, "the filter kept no frames")
+I3Test.ENSURE(len(with_bools) < NEVENTS, "the filter kept every frame")
+I3Test.ENSURE(any(decision is None for n, triggered, decision in with_bools),
+              "every frame was triggered")
+I3Test.ENSURE(with_map == with_bools,
+              "the decisions with the TriggerCheckFlags map differ "
+              "from the ones with only the I3Bools")
+for n, triggered, decision in with_map:
+    I3Test.ENSURE(triggered == (decision is not None),
+                  "any_triggered and I3FilterModule disagree on frame %d" % n)
+
+# The map wins over an I3Bool of the same name
+def Disagree(frame):
+    flags = dataclasses.I3MapStringBool()
+    flags[filter_globals.inicesmttriggered] = False
+    frame[filter_globals.triggerflags] = flags
+    frame[filter_globals.inicesmttriggered] = icetray.I3Bool(True)
+    frame["KeepIt"] = icetray.I3Bool(True)
+
+decisions = list()
+tray = I3Tray()
+tray.AddModule("I3InfiniteSource", Stream = icetray.I3Frame.Physics)
+tray.AddModule(Disagree, Streams = [icetray.I3Frame.Physics])
+tray.AddModule(lambda frame: decisions.append(
+    filter_globals.any_triggered(frame, [filter_globals.inicesmttriggered])),
+               Streams = [icetray.I3Frame.Physics])
+tray.AddModule("I3FilterModule<I3BoolFilter>",
+               BoolKey = "KeepIt",
+               DecisionName = "BoolFilter",
+               TriggerEvalList = [filter_globals.inicesmttriggered])
+tray.AddModule(lambda frame: decisions.append("BoolFilter" in frame),
+               Streams = [icetray.I3Frame.Physics])
+tray.Execute(1)
+
+I3Test.ENSURE(decisions == [False, False],
+              "the I3Bool was used instead of the TriggerCheckFlags entry")
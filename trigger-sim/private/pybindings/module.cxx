@@ -38,6 +38,7 @@ namespace bp = boost::python;
 //
 #include <trigger-sim/utilities/DOMSetFunctions.h>
 #include <trigger-sim/utilities/TimeShifterUtils.h>
+#include <trigger-sim/algorithms/TriggerCollector.h>
 #define REGISTER_THESE_THINGS						\
   (GlobalTriggerSim)
 
@@ -45,6 +46,14 @@ namespace bp = boost::python;
 #define I3_REGISTER(r, data, t) BOOST_PP_CAT(register_,t)();
 BOOST_PP_SEQ_FOR_EACH(I3_REGISTRATION_FN_DECL, ~, REGISTER_THESE_THINGS)
 
+namespace{
+  void FinishTriggerCollector(I3Frame& frame,
+                              const std::string& collectorName,
+                              const std::string& triggerName){
+    TriggerCollector::Finish(frame, collectorName, triggerName);
+  }
+}
+
 I3_PYTHON_MODULE(trigger_sim)
 {
   load_project("trigger-sim", false);
@@ -57,6 +66,10 @@ I3_PYTHON_MODULE(trigger_sim)
 
   def("ShiftFrameObjects",&TimeShifterUtils::ShiftFrameObjects);
 
+  def("GetTimeShift",&TimeShifterUtils::GetTimeShift);
+
+  def("FinishTriggerCollector",&FinishTriggerCollector);
+
 }
 
 
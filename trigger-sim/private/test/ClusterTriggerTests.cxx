@@ -2,6 +2,8 @@
 
 #include "trigger-sim/algorithms/ClusterTriggerAlgorithm.h"
 #include "trigger-sim/algorithms/TriggerHit.h"
+#include "trigger-sim/algorithms/TriggerHitBuffer.h"
+#include <algorithm>
 #include <phys-services/I3GSLRandomService.h>
 
 TEST_GROUP(ClusterTriggerTests);
@@ -106,6 +108,53 @@ void TestHashing() {
 
 }
 
+void TestPrunedHits() {
+
+  ClusterTriggerAlgorithm stringTrigger(1500, 3, 6);
+  TriggerHitVectorPtr hits(new TriggerHitVector());
+
+  // The three hits at 10 make sites at 8-13.  With an even coherence
+  // length a site reaches 3 positions up and 2 down, so the hit at 16
+  // is near the site at 13, but the hit at 5 isn't near the one at 8.
+  // The hit on string 2 is on the wrong string.
+  hits->push_back(TriggerHit(1,10,1));
+  hits->push_back(TriggerHit(2,10,1));
+  hits->push_back(TriggerHit(3,10,1));
+  hits->push_back(TriggerHit(4,16,1));
+  hits->push_back(TriggerHit(5,5,1));
+  hits->push_back(TriggerHit(6,10,2));
+
+  stringTrigger.AddHits(hits);
+  ENSURE_EQUAL(stringTrigger.GetNumberOfTriggers(), 1u);
+
+  TriggerHitVectorPtr triggerHits = stringTrigger.GetNextTrigger();
+  ENSURE_EQUAL(triggerHits->size(), 4u);
+  ENSURE(triggerHits->back() == TriggerHit(4,16,1));
+}
+
+void TestSlidingWindow() {
+
+  ClusterTriggerAlgorithm stringTrigger(1000, 3, 7);
+  TriggerHitVectorPtr hits(new TriggerHitVector());
+
+  // the hits leaving the window have to be taken out of the counts:
+  // there are never 3 hits at once in the window at positions 1-3.
+  hits->push_back(TriggerHit(0,1,1));
+  hits->push_back(TriggerHit(600,2,1));
+  hits->push_back(TriggerHit(1200,3,1));
+  hits->push_back(TriggerHit(1300,50,1));
+  hits->push_back(TriggerHit(1800,1,1));
+  hits->push_back(TriggerHit(1900,51,1));
+
+  stringTrigger.AddHits(hits);
+  ENSURE_EQUAL(stringTrigger.GetNumberOfTriggers(), 0u);
+
+  // but the same hits all in one window trigger
+  ClusterTriggerAlgorithm wideTrigger(2000, 3, 7);
+  wideTrigger.AddHits(hits);
+  ENSURE_EQUAL(wideTrigger.GetNumberOfTriggers(), 1u);
+  ENSURE_EQUAL(wideTrigger.GetNextTrigger()->size(), 4u);
+}
 
 void TriggerTest() {
 
@@ -125,6 +174,35 @@ void TriggerTest() {
   ENSURE(nTrig == 1);
 }
 
+void TestReusedBuffer() {
+
+  // one algorithm and one buffer for every event, the way the module
+  // uses them, has to give the same triggers as a new one per event
+  ClusterTriggerAlgorithm reused(1000, 3, 7);
+  TriggerHitBuffer buffer;
+
+  I3GSLRandomService rand(27182);
+  for ( int event(0); event < 100; event++){
+    TriggerHitVectorPtr hits(new TriggerHitVector());
+    int nHits( rand.Uniform(0, 40) );
+    for ( int i(0) ; i < nHits; i++)
+      hits->push_back( TriggerHit( rand.Uniform(0, 10000),
+                                   rand.Uniform(1, 60), rand.Uniform(1, 4) ) );
+    std::sort(hits->begin(), hits->end());
+
+    ClusterTriggerAlgorithm fresh(1000, 3, 7);
+    fresh.AddHits(hits);
+
+    buffer.clear();
+    for (TriggerHitVector::const_iterator i = hits->begin(); i != hits->end(); i++)
+      buffer.push_back(*i);
+    reused.AddHits(buffer);
+
+    ENSURE_EQUAL(reused.GetNumberOfTriggers(), fresh.GetNumberOfTriggers());
+    while (TriggerHitVectorPtr triggerHits = fresh.GetNextTrigger())
+      ENSURE(*reused.GetNextTrigger() == *triggerHits);
+  }
+}
 
 TEST(simple_ct_test) {
   SimpleCTTest();
@@ -138,6 +216,18 @@ TEST(test_no_trigger) {
   TestNoTrigger();
 }
 
+TEST(test_pruned_hits) {
+  TestPrunedHits();
+}
+
+TEST(test_sliding_window) {
+  TestSlidingWindow();
+}
+
+TEST(test_reused_buffer) {
+  TestReusedBuffer();
+}
+
 TEST(test_hashing) {
   TestHashing();
 }
@@ -0,0 +1,82 @@
+#include <I3Test.h>
+
+#include <trigger-sim/algorithms/CylinderNeighbourTable.h>
+#include <trigger-sim/algorithms/CylinderTriggerAlgorithm.h>
+#include <dataclasses/geometry/I3Geometry.h>
+
+TEST_GROUP(CylinderNeighbourTableTests);
+
+namespace{
+  // three strings, 125m apart in x, with DOMs every 17m
+  I3GeometryPtr MakeGeometry(){
+    I3GeometryPtr geo(new I3Geometry);
+    for(int str(1); str <= 3; str++)
+      for(unsigned om(1); om <= 10; om++){
+        I3OMGeo omgeo;
+        omgeo.position = I3Position(125.*(str-1), 0., -17.*om);
+        geo->omgeo[OMKey(str,om)] = omgeo;
+      }
+    return geo;
+  }
+}
+
+TEST(NeighbourTest)
+{
+  I3GeometryPtr geo = MakeGeometry();
+  CylinderNeighbourTable table(*geo, 175., 75.);
+
+  ENSURE_EQUAL(table.size(), 30u);
+  ENSURE_EQUAL(table.GetIndex(OMKey(4,1)), CylinderNeighbourTable::NOT_IN_GEOMETRY);
+
+  unsigned center = table.GetIndex(OMKey(2,5));
+  // a DOM is in its own cylinder
+  ENSURE(table.AreNeighbours(center, center));
+  // within 37.5m vertically, on the neighbouring strings too
+  ENSURE(table.AreNeighbours(center, table.GetIndex(OMKey(1,3))));
+  ENSURE(table.AreNeighbours(center, table.GetIndex(OMKey(3,7))));
+  ENSURE(!table.AreNeighbours(center, table.GetIndex(OMKey(2,8))));
+  // string 1 and 3 are 250m apart
+  ENSURE(!table.AreNeighbours(table.GetIndex(OMKey(1,5)), table.GetIndex(OMKey(3,5))));
+
+  // the relation is symmetric
+  for(unsigned i(0); i < table.size(); i++)
+    for(unsigned j(0); j < table.size(); j++)
+      ENSURE_EQUAL(table.AreNeighbours(i,j), table.AreNeighbours(j,i));
+
+  ENSURE_EQUAL(table.GetNeighbours(center).size(), 15u);
+}
+
+TEST(VolumeTriggerTest)
+{
+  I3GeometryPtr geo = MakeGeometry();
+  CylinderNeighbourTableConstPtr table(new CylinderNeighbourTable(*geo, 175., 75.));
+
+  // four hits close together plus two far away ones in the same time window
+  TriggerHitVectorPtr hits(new TriggerHitVector);
+  hits->push_back(TriggerHit(100., 1, 1));
+  hits->push_back(TriggerHit(110., 5, 2));
+  hits->push_back(TriggerHit(120., 10, 3));
+  hits->push_back(TriggerHit(130., 6, 2));
+  hits->push_back(TriggerHit(140., 4, 3));
+  hits->push_back(TriggerHit(150., 5, 1));
+
+  CylinderTriggerAlgorithm volumeTrigger(1000., 4, 100, table);
+  volumeTrigger.AddHits(hits);
+  ENSURE_EQUAL(volumeTrigger.GetNumberOfTriggers(), 1u);
+
+  // only the hits in the cylinder around (2,5) are kept
+  TriggerHitVectorPtr triggerHits = volumeTrigger.GetNextTrigger();
+  ENSURE_EQUAL(triggerHits->size(), 4u);
+  ENSURE_EQUAL(triggerHits->front().time, 110.);
+  ENSURE_EQUAL(triggerHits->back().time, 150.);
+
+  // the same thing with the geometry
+  CylinderTriggerAlgorithm geoTrigger(1000., 4, 100, geo, 175., 75.);
+  geoTrigger.AddHits(hits);
+  ENSURE_EQUAL(geoTrigger.GetNumberOfTriggers(), 1u);
+
+  // and five aren't enough
+  CylinderTriggerAlgorithm highTrigger(1000., 5, 100, table);
+  highTrigger.AddHits(hits);
+  ENSURE_EQUAL(highTrigger.GetNumberOfTriggers(), 0u);
+}
@@ -0,0 +1,113 @@
+#include <I3Test.h>
+
+#include <trigger-sim/utilities/DOMSetTable.h>
+#include <trigger-sim/utilities/DOMSetFunctions.h>
+#include <dataclasses/physics/I3DOMLaunch.h>
+#include <icetray/OMKey.h>
+
+#include <vector>
+#include <boost/foreach.hpp>
+
+TEST_GROUP(DOMSetTableTests);
+
+TEST(DefaultsTest)
+{
+  // the default table has to agree with the defaults written out as
+  // a map, which goes through the map lookup instead of the table
+  DOMSetTable defaults;
+  I3MapKeyVectorIntConstPtr domSets = DOMSetFunctions::GetDefaultDOMSets();
+  BOOST_FOREACH(I3MapKeyVectorInt::const_reference r, *domSets)
+    BOOST_FOREACH(unsigned domSet, DOMSetFunctions::DOMSETS)
+      ENSURE_EQUAL(defaults.InDOMSet(r.first, domSet),
+                   DOMSetFunctions::InDOMSet(r.first, domSet, domSets),
+                   "default DOMSetTable disagrees with the default DOMSets");
+
+  // IceTop, IceAct and DeepCore DOMs beyond the usual strings
+  ENSURE(defaults.InDOMSet(OMKey(1,61), 3));
+  ENSURE(defaults.InDOMSet(OMKey(0,1), 9));
+  ENSURE(defaults.InDOMSet(OMKey(0,3), 10));
+  ENSURE(defaults.InDOMSet(OMKey(90,20), 4));
+  ENSURE(!defaults.InDOMSet(OMKey(90,5), 4));
+  ENSURE_EQUAL(defaults.GetMask(OMKey(1,2)), DOMSetFunctions::GetDOMSetMask(OMKey(1,2), I3MapKeyVectorIntConstPtr()));
+}
+
+TEST(FrameDOMSetsTest)
+{
+  I3MapKeyVectorIntPtr domSets(new I3MapKeyVectorInt);
+  (*domSets)[OMKey(1,1)].push_back(2);
+  (*domSets)[OMKey(1,1)].push_back(11);
+  (*domSets)[OMKey(1,2)].push_back(-1);
+  (*domSets)[OMKey(5,61)].push_back(3);
+  (*domSets)[OMKey(3,1,1)].push_back(7);
+  (*domSets)[OMKey(4,1)].push_back(40);
+
+  DOMSetTable table(domSets);
+  ENSURE(table.GetDOMSets() == domSets);
+
+  for(int str(-1); str <= 6; str++)
+    for(unsigned om(0); om <= 65; om++)
+      for(unsigned char pmt(0); pmt <= 1; pmt++){
+        OMKey dom(str, om, pmt);
+        ENSURE_EQUAL(table.GetMask(dom), DOMSetFunctions::GetDOMSetMask(dom, domSets),
+                     "DOMSetTable mask disagrees with GetDOMSetMask");
+      }
+
+  ENSURE(table.InDOMSet(OMKey(1,1), 11));
+  ENSURE(!table.InDOMSet(OMKey(1,2), 2));
+  ENSURE(table.InDOMSet(OMKey(3,1,1), 7));
+  ENSURE(!table.InDOMSet(OMKey(3,1), 7));
+  // DOMSets that don't fit in the mask still work
+  ENSURE(table.InDOMSet(OMKey(4,1), 40));
+  ENSURE(!table.InDOMSet(OMKey(1,1), 40));
+  // DOMs that aren't in the map are in no DOMSet (and get an error)
+  ENSURE_EQUAL(table.GetMask(OMKey(2,1)), 0u);
+  ENSURE(!table.InDOMSet(OMKey(2,1), 2));
+  ENSURE(!table.InDOMSet(OMKey(3,1,2), 7));
+}
+
+TEST(SelectTest)
+{
+  I3DOMLaunchSeriesMap launches;
+  launches[OMKey(21,30)].push_back(I3DOMLaunch());
+  launches[OMKey(80,5)].push_back(I3DOMLaunch());
+  launches[OMKey(80,20)].push_back(I3DOMLaunch());
+  launches[OMKey(1,61)].push_back(I3DOMLaunch());
+
+  DOMSetTableConstPtr table = DOMSetFunctions::GetDOMSetTable(I3MapKeyVectorIntConstPtr());
+
+  std::vector<I3DOMLaunchSeriesMap::const_iterator> doms;
+  table->Select(launches, 4u, doms);
+  ENSURE_EQUAL(doms.size(), 1u);
+  ENSURE(doms[0]->first == OMKey(80,20));
+
+  doms.clear();
+  table->Select(launches, boost::optional<int>(11), doms);
+  ENSURE_EQUAL(doms.size(), 3u);
+  ENSURE(doms[0]->first == OMKey(21,30));
+  ENSURE(doms[1]->first == OMKey(80,5));
+  ENSURE(doms[2]->first == OMKey(80,20));
+
+  // without a DOMSet all DOMs are selected
+  doms.clear();
+  table->Select(launches, boost::optional<int>(), doms);
+  ENSURE_EQUAL(doms.size(), launches.size());
+}
+
+TEST(CacheTest)
+{
+  // the table is only rebuilt when the DOMSets change
+  I3MapKeyVectorIntPtr domSets(new I3MapKeyVectorInt);
+  (*domSets)[OMKey(1,1)].push_back(2);
+
+  DOMSetTableConstPtr table = DOMSetFunctions::GetDOMSetTable(domSets);
+  ENSURE(DOMSetFunctions::GetDOMSetTable(domSets, table) == table);
+
+  I3MapKeyVectorIntPtr otherDOMSets(new I3MapKeyVectorInt(*domSets));
+  DOMSetTableConstPtr other = DOMSetFunctions::GetDOMSetTable(otherDOMSets, table);
+  ENSURE(other != table);
+  ENSURE(other->GetDOMSets() == otherDOMSets);
+
+  // the defaults are shared
+  ENSURE(DOMSetFunctions::GetDOMSetTable(I3MapKeyVectorIntConstPtr(), table) ==
+         DOMSetFunctions::GetDefaultDOMSetTable());
+}
@@ -0,0 +1,55 @@
+#include <I3Test.h>
+
+#include "trigger-sim/algorithms/FPTTimeWindow.h"
+#include "trigger-sim/algorithms/FptHit.h"
+
+TEST_GROUP(FPTTimeWindowTests);
+
+namespace{
+  FptHitVectorPtr MakeHits(){
+    // a cluster of 3 SLC + 1 HLC hits, a gap and then 2 HLC hits
+    FptHitVectorPtr hits(new FptHitVector);
+    hits->push_back(FptHit(0., 1, 0, 1));
+    hits->push_back(FptHit(10., 2, 0, 1));
+    hits->push_back(FptHit(20., 3, 1, 1));
+    hits->push_back(FptHit(30., 4, 0, 1));
+    hits->push_back(FptHit(1000., 5, 1, 1));
+    hits->push_back(FptHit(1010., 6, 1, 1));
+    return hits;
+  }
+}
+
+TEST(SLCFractionTest)
+{
+  FptHitVectorPtr hits = MakeHits();
+
+  // windows of 100ns every 500ns : [0,100) and [1000,1100)
+  FPTTimeWindow timeWindow(2, 10, 0.5, 100., 500.);
+  FptHitIterPairVectorPtr windows = timeWindow.FPTFixedTimeWindows(hits, 500.);
+
+  // only the first window has enough SLC hits
+  ENSURE_EQUAL(windows->size(), 1u);
+  ENSURE(windows->at(0).first == hits->begin());
+  ENSURE(windows->at(0).second == hits->begin() + 4);
+}
+
+TEST(HitRangeTest)
+{
+  FptHitVectorPtr hits = MakeHits();
+
+  // no SLC requirement, at most 3 hits
+  FPTTimeWindow timeWindow(2, 3, -1., 100., 500.);
+  FptHitIterPairVectorPtr windows = timeWindow.FPTFixedTimeWindows(hits, 500.);
+
+  // the first window has 4 hits, the one at 500ns is empty
+  // and the one at 1000ns has the last 2 hits.
+  ENSURE_EQUAL(windows->size(), 1u);
+  ENSURE(windows->at(0).first == hits->begin() + 4);
+  ENSURE(windows->at(0).second == hits->end());
+
+  FPTTimeWindow wideWindow(2, 10, -1., 100., 10.);
+  windows = wideWindow.FPTFixedTimeWindows(hits, 10.);
+  ENSURE(!windows->empty());
+  ENSURE(windows->front().first == hits->begin());
+  ENSURE(windows->back().second == hits->end());
+}
@@ -193,3 +193,75 @@ TEST(test_merged_length_long_enough){
   ENSURE(merged_iterator->GetTriggerLength() == 28000);
   
 }
+
+// The throughput triggers are ordered by the trigger time of their
+// children, which isn't the order of the readout windows when the
+// readout windows differ.  All three windows overlap here, so they
+// have to end up in one merged trigger regardless of the input order.
+
+TEST(test_merge_unordered_readout_windows){
+
+  I3DetectorStatus d;
+  GlobalTriggerSim gts(d);
+
+  TriggerKey global_key=TriggerKey(TriggerKey::GLOBAL, TriggerKey::THROUGHPUT);
+
+  I3Trigger t1;
+  t1.GetTriggerKey() = global_key;
+  t1.SetTriggerFired(true);
+  t1.SetTriggerTime(100);
+  t1.SetTriggerLength(100);
+
+  I3Trigger t2;
+  t2.GetTriggerKey() = global_key;
+  t2.SetTriggerFired(true);
+  t2.SetTriggerTime(0);
+  t2.SetTriggerLength(50);
+
+  I3Trigger t3;
+  t3.GetTriggerKey() = global_key;
+  t3.SetTriggerFired(true);
+  t3.SetTriggerTime(40);
+  t3.SetTriggerLength(110);
+
+  I3Trigger t4;
+  t4.GetTriggerKey() = global_key;
+  t4.SetTriggerFired(true);
+  t4.SetTriggerTime(1000);
+  t4.SetTriggerLength(100);
+
+  I3TriggerPairVector tTriggers;
+  tTriggers.push_back( I3TriggerPair( t1, I3Trigger() ) );
+  tTriggers.push_back( I3TriggerPair( t2, I3Trigger() ) );
+  tTriggers.push_back( I3TriggerPair( t3, I3Trigger() ) );
+  tTriggers.push_back( I3TriggerPair( t4, I3Trigger() ) );
+
+  I3TriggerHierarchyPtr gTriggers = gts.Merge(tTriggers);
+
+  // one merged trigger with three TTs and one TT, each TT with its child
+  ENSURE(gTriggers->size() == 12);
+
+  // the latest group comes first
+  I3TriggerHierarchy::sibling_iterator tt_iter = gTriggers->begin();
+  ENSURE(tt_iter->GetTriggerKey().GetType() == TriggerKey::THROUGHPUT);
+  ENSURE(tt_iter->GetTriggerTime() == 1000);
+
+  I3TriggerHierarchy::sibling_iterator merged_iter = tt_iter;
+  ++merged_iter;
+  ENSURE(merged_iter->GetTriggerKey().GetType() == TriggerKey::MERGED);
+  ENSURE(merged_iter->GetTriggerTime() == 0);
+  ENSURE(merged_iter->GetTriggerLength() == 200);
+  ENSURE(gTriggers->number_of_children(merged_iter) == 3);
+
+  // the throughput triggers in the order the search for overlaps put
+  // them in: the one that made the MERGED trigger, the one it overlapped
+  // with, then the rest
+  I3TriggerHierarchy::sibling_iterator c_iter = gTriggers->begin(merged_iter);
+  ENSURE(c_iter->GetTriggerTime() == 40);
+  ++c_iter;
+  ENSURE(c_iter->GetTriggerTime() == 0);
+  ++c_iter;
+  ENSURE(c_iter->GetTriggerTime() == 100);
+
+  ENSURE(gTriggers->number_of_children(tt_iter) == 1);
+}
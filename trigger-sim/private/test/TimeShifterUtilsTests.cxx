@@ -0,0 +1,28 @@
+#include <I3Test.h>
+
+#include <icetray/name_of.h>
+#include <dataclasses/physics/I3MCHit.h>
+#include <dataclasses/physics/I3DOMLaunch.h>
+#include <dataclasses/physics/I3TriggerHierarchy.h>
+#include <trigger-sim/utilities/TimeShifterUtils.h>
+
+using TimeShifterUtils::NormalizeTypeName;
+
+TEST_GROUP(TimeShifterUtilsTests);
+
+// The names libc++ builds store in the frame have std::__1 in them
+TEST(libcxx_names){
+  ENSURE_EQUAL(NormalizeTypeName("I3Map<OMKey, std::__1::vector<I3MCHit, std::__1::allocator<I3MCHit> > >"),
+               std::string("I3Map<OMKey, std::vector<I3MCHit, std::allocator<I3MCHit> > >"));
+  ENSURE_EQUAL(NormalizeTypeName("I3Map<OMKey, std::__1::vector<I3MCHit, std::__1::allocator<I3MCHit> > >"),
+               NormalizeTypeName(I3::name_of<I3MCHitSeriesMap>()));
+  ENSURE_EQUAL(NormalizeTypeName("I3Map<OMKey, std::__1::vector<I3DOMLaunch, std::__1::allocator<I3DOMLaunch> > >"),
+               NormalizeTypeName(I3::name_of<I3DOMLaunchSeriesMap>()));
+}
+
+TEST(unchanged_names){
+  ENSURE_EQUAL(NormalizeTypeName(I3::name_of<I3TriggerHierarchy>()),
+               NormalizeTypeName(NormalizeTypeName(I3::name_of<I3TriggerHierarchy>())));
+  ENSURE_EQUAL(NormalizeTypeName("I3Double"), std::string("I3Double"));
+  ENSURE_EQUAL(NormalizeTypeName(""), std::string(""));
+}
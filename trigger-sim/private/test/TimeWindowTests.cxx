@@ -317,10 +317,41 @@ void TestThreshold(unsigned int threshold) {
     ENSURE((--windowStop)->time  == h10.time);
   }
 
-}// namespace TimeWindowTests
+}
+
+/**
+ * The windows have to point into the vector that was passed in
+ * and hits with equal times resolve to the first of them.
+ *
+ * This is the behaviour of the list based implementation this replaced,
+ * kept on purpose so the triggers don't change: the end of a window is
+ * the first hit with the time of its last hit, so later hits with that
+ * same time (here the second hit at 8 ns) are left out of the window.
+ * The start and end times of the window are the same either way.
+ */
+void TestEqualTimes() {
+
+  TimeWindow timeWindowClass(3, 10);
+  TriggerHitVector hits;
+
+  hits.push_back(TriggerHit(1,1,1));
+  hits.push_back(TriggerHit(5,2,1));
+  hits.push_back(TriggerHit(5,3,1));
+  hits.push_back(TriggerHit(8,4,1));
+  hits.push_back(TriggerHit(8,5,1));
+  hits.push_back(TriggerHit(100,6,1));
 
+  TriggerHitIterPairVectorPtr timeWindows = timeWindowClass.SlidingTimeWindows(hits);
+  ENSURE_EQUAL(timeWindows->size(), 1u);
+
+  TriggerHitIterPair window = timeWindows->at(0);
+  ENSURE(window.first == hits.begin());
+  ENSURE(window.second == hits.begin() + 4);
+  ENSURE_EQUAL((window.second - 1)->time, hits[4].time);
 }
 
+}// namespace TimeWindowTests
+
 TEST(simple_test) {
   TimeWindowTests::MultipleTest(1);
 }
@@ -349,3 +380,7 @@ TEST(theshold_equal) {
 TEST(theshold_low) {
   TimeWindowTests::TestThreshold(9);
 }
+
+TEST(equal_times) {
+  TimeWindowTests::TestEqualTimes();
+}
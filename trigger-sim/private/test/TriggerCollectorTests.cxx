@@ -0,0 +1,119 @@
+#include <I3Test.h>
+
+#include <icetray/I3Frame.h>
+#include <dataclasses/TriggerKey.h>
+#include <dataclasses/physics/I3Trigger.h>
+#include <dataclasses/physics/I3TriggerHierarchy.h>
+#include <trigger-sim/algorithms/TriggerCollector.h>
+
+#include <vector>
+
+TEST_GROUP(TriggerCollectorTests);
+
+namespace{
+  std::vector<I3Trigger> MakeTriggers(TriggerKey::TypeID type, unsigned n){
+    std::vector<I3Trigger> triggers;
+    for(unsigned i(0); i < n; i++){
+      I3Trigger t;
+      t.GetTriggerKey() = TriggerKey(TriggerKey::IN_ICE, type, 1000 + i);
+      t.SetTriggerFired(true);
+      t.SetTriggerTime(100.*i);
+      t.SetTriggerLength(50.);
+      triggers.push_back(t);
+    }
+    return triggers;
+  }
+
+  // what a SMT, a SLOP and a cluster trigger module add to the frame
+  void AddTriggers(I3Frame& frame, const std::string& collectorName){
+    TriggerCollector::AddTriggers(frame, collectorName, "I3Triggers",
+                                  MakeTriggers(TriggerKey::SIMPLE_MULTIPLICITY, 3));
+    TriggerCollector::AddTriggers(frame, collectorName, "I3Triggers",
+                                  MakeTriggers(TriggerKey::SLOW_PARTICLE, 2), false);
+    TriggerCollector::AddTriggers(frame, collectorName, "I3Triggers",
+                                  MakeTriggers(TriggerKey::STRING, 2));
+  }
+
+  void EnsureSameHierarchy(const I3TriggerHierarchy& lhs, const I3TriggerHierarchy& rhs){
+    ENSURE_EQUAL(lhs.size(), rhs.size(), "the hierarchies have different sizes");
+    I3TriggerHierarchy::iterator l(lhs.begin()), r(rhs.begin());
+    for(; l != lhs.end() && r != rhs.end(); l++, r++){
+      ENSURE(*l == *r, "the hierarchies have different triggers");
+      ENSURE_EQUAL(lhs.depth(l), rhs.depth(r), "the hierarchies have a different structure");
+    }
+  }
+}
+
+TEST(SameHierarchy)
+{
+  // a trigger from an earlier pass, with a daughter
+  I3TriggerHierarchyPtr old(new I3TriggerHierarchy);
+  std::vector<I3Trigger> global = MakeTriggers(TriggerKey::MERGED, 2);
+  I3TriggerHierarchy::iterator top = old->insert(old->end(), global[0]);
+  old->append_child(top, global[1]);
+
+  I3Frame direct(I3Frame::DAQ);
+  direct.Put("I3Triggers", old);
+  AddTriggers(direct, "");
+
+  I3Frame collected(I3Frame::DAQ);
+  collected.Put("I3Triggers", old);
+  AddTriggers(collected, "TriggerCollector");
+
+  // the hierarchy isn't touched until the collector is finished
+  ENSURE(collected.Get<I3TriggerHierarchyConstPtr>("I3Triggers") == old);
+  TriggerCollectorConstPtr collector = collected.Get<TriggerCollectorConstPtr>("TriggerCollector");
+  ENSURE(collector);
+  ENSURE_EQUAL(collector->size(), 7u);
+
+  I3TriggerHierarchyConstPtr triggers =
+    TriggerCollector::Finish(collected, "TriggerCollector", "I3Triggers");
+  ENSURE(!collected.Has("TriggerCollector"), "the collector should be gone");
+  ENSURE(collected.Get<I3TriggerHierarchyConstPtr>("I3Triggers") == triggers);
+  ENSURE_EQUAL(triggers->size(), 9u);
+  EnsureSameHierarchy(*triggers, direct.Get<I3TriggerHierarchy>("I3Triggers"));
+
+  // the collected triggers are in hierarchy order
+  std::vector<I3Trigger> inOrder = collector->GetTriggers();
+  ENSURE_EQUAL(inOrder.size(), 7u);
+  ENSURE(inOrder.front().GetTriggerKey().GetType() == TriggerKey::STRING);
+  ENSURE(inOrder.back().GetTriggerKey().GetType() == TriggerKey::SLOW_PARTICLE);
+}
+
+TEST(WithoutHierarchy)
+{
+  I3Frame direct(I3Frame::DAQ);
+  AddTriggers(direct, "");
+
+  I3Frame collected(I3Frame::DAQ);
+  AddTriggers(collected, "TriggerCollector");
+  ENSURE(!collected.Has("I3Triggers"));
+
+  I3TriggerHierarchyConstPtr triggers =
+    TriggerCollector::Finish(collected, "TriggerCollector", "I3Triggers");
+  ENSURE(triggers);
+  EnsureSameHierarchy(*triggers, direct.Get<I3TriggerHierarchy>("I3Triggers"));
+
+  // without a collector Finish just returns what's there
+  ENSURE(TriggerCollector::Finish(direct, "TriggerCollector", "I3Triggers") ==
+         direct.Get<I3TriggerHierarchyConstPtr>("I3Triggers"));
+  ENSURE(TriggerCollector::Finish(direct, "", "I3Triggers") ==
+         direct.Get<I3TriggerHierarchyConstPtr>("I3Triggers"));
+}
+
+TEST(NotChangedInPlace)
+{
+  I3Frame frame(I3Frame::DAQ);
+  TriggerCollector::AddTriggers(frame, "TriggerCollector", "I3Triggers",
+                                MakeTriggers(TriggerKey::SIMPLE_MULTIPLICITY, 3));
+  TriggerCollectorConstPtr first = frame.Get<TriggerCollectorConstPtr>("TriggerCollector");
+  ENSURE_EQUAL(first->size(), 3u);
+
+  // the next module puts a new collector, the one in the frame stays as it was
+  TriggerCollector::AddTriggers(frame, "TriggerCollector", "I3Triggers",
+                                MakeTriggers(TriggerKey::STRING, 2));
+  TriggerCollectorConstPtr second = frame.Get<TriggerCollectorConstPtr>("TriggerCollector");
+  ENSURE(second != first, "the collector was changed in place");
+  ENSURE_EQUAL(first->size(), 3u);
+  ENSURE_EQUAL(second->size(), 5u);
+}
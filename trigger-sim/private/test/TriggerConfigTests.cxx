@@ -0,0 +1,106 @@
+#include <I3Test.h>
+
+#include <icetray/I3Units.h>
+#include <dataclasses/TriggerKey.h>
+#include <dataclasses/physics/I3Trigger.h>
+#include <dataclasses/status/I3DetectorStatus.h>
+#include <dataclasses/status/I3TriggerStatus.h>
+#include <trigger-sim/utilities/TriggerConfig.h>
+#include <trigger-sim/utilities/DetectorStatusUtils.h>
+#include <trigger-sim/utilities/ReadoutWindowUtil.h>
+
+using DetectorStatusUtils::tk_ts_pair_t;
+
+TEST_GROUP(TriggerConfigTests);
+
+namespace{
+  I3DetectorStatusConstPtr MakeDetectorStatus(double readoutTime){
+    I3TriggerReadoutConfig roc;
+    roc.readoutTimeMinus = readoutTime;
+    roc.readoutTimePlus = readoutTime;
+    roc.readoutTimeOffset = 0.;
+
+    I3TriggerStatus smt8;
+    smt8.GetTriggerSettings()["threshold"] = "8";
+    smt8.GetReadoutSettings()[I3TriggerStatus::ALL] = roc;
+
+    I3TriggerStatus smt3;
+    smt3.GetTriggerSettings()["threshold"] = "3";
+    smt3.GetReadoutSettings()[I3TriggerStatus::ALL] = roc;
+
+    I3DetectorStatusPtr ds(new I3DetectorStatus);
+    ds->triggerStatus[TriggerKey(TriggerKey::IN_ICE, TriggerKey::SIMPLE_MULTIPLICITY, 1006)] = smt8;
+    ds->triggerStatus[TriggerKey(TriggerKey::IN_ICE, TriggerKey::SIMPLE_MULTIPLICITY, 1011)] = smt3;
+    return ds;
+  }
+}
+
+TEST(Shared)
+{
+  I3DetectorStatusConstPtr ds = MakeDetectorStatus(I3Units::microsecond);
+
+  // every module with the same DetectorStatus gets the same config
+  TriggerConfigConstPtr config = TriggerConfig::Get(ds);
+  ENSURE(config->GetDetectorStatus() == ds);
+  ENSURE(TriggerConfig::Get(ds) == config, "the config wasn't shared");
+
+  // a new DetectorStatus gets its own
+  I3DetectorStatusConstPtr other = MakeDetectorStatus(I3Units::microsecond);
+  TriggerConfigConstPtr otherConfig = TriggerConfig::Get(other);
+  ENSURE(otherConfig != config);
+  ENSURE(otherConfig->GetDetectorStatus() == other);
+  ENSURE(TriggerConfig::Get(ds) == config);
+
+  // once nobody has it any more it's made again
+  otherConfig.reset();
+  otherConfig = TriggerConfig::Get(other);
+  ENSURE(otherConfig->GetDetectorStatus() == other);
+}
+
+TEST(SameTriggerStatus)
+{
+  I3DetectorStatusConstPtr ds = MakeDetectorStatus(I3Units::microsecond);
+  TriggerConfigConstPtr config = TriggerConfig::Get(ds);
+
+  for(int configID = 1006; configID <= 1011; configID += 5){
+    boost::optional<tk_ts_pair_t> expected = DetectorStatusUtils::GetTriggerStatus
+      (ds, DetectorStatusUtils::_sourceID = TriggerKey::IN_ICE,
+       DetectorStatusUtils::_typeID = TriggerKey::SIMPLE_MULTIPLICITY,
+       DetectorStatusUtils::_configID = configID);
+    ENSURE(expected);
+
+    // the second time comes from the cache
+    for(unsigned i(0); i < 2; i++){
+      boost::optional<tk_ts_pair_t> tkts = config->GetTriggerStatus
+        (TriggerKey::IN_ICE, TriggerKey::SIMPLE_MULTIPLICITY, configID);
+      ENSURE(tkts, "the trigger status wasn't found");
+      ENSURE(tkts->first == expected->first);
+      ENSURE(tkts->second.GetTriggerSettings() == expected->second.GetTriggerSettings());
+    }
+  }
+
+  // ambiguous without the config ID, and not there at all
+  ENSURE(!config->GetTriggerStatus(TriggerKey::IN_ICE, TriggerKey::SIMPLE_MULTIPLICITY,
+                                   boost::optional<int>()));
+  ENSURE(!config->GetTriggerStatus(TriggerKey::IN_ICE, TriggerKey::VOLUME, 21001));
+}
+
+TEST(SameReadoutWindows)
+{
+  I3DetectorStatusConstPtr ds = MakeDetectorStatus(2*I3Units::microsecond);
+  TriggerConfigConstPtr config = TriggerConfig::Get(ds);
+  ReadoutWindowUtil roUtil(*ds);
+
+  I3Trigger t;
+  t.GetTriggerKey() = TriggerKey(TriggerKey::IN_ICE, TriggerKey::SIMPLE_MULTIPLICITY, 1006);
+  t.SetTriggerFired(true);
+  t.SetTriggerTime(10*I3Units::microsecond);
+  t.SetTriggerLength(I3Units::microsecond);
+
+  ENSURE(config->GetReadoutWindowUtil()->GetInIceReadoutWindow(t) ==
+         roUtil.GetInIceReadoutWindow(t));
+  ENSURE(config->GetReadoutWindowUtil()->GetIceTopReadoutWindow(t) ==
+         roUtil.GetIceTopReadoutWindow(t));
+  ENSURE_DISTANCE(config->GetReadoutWindowUtil()->GetEarliestReadoutTime(t),
+                  8*I3Units::microsecond, 1e-6);
+}
@@ -0,0 +1,126 @@
+#include <I3Test.h>
+
+#include "trigger-sim/algorithms/TriggerHitBuffer.h"
+#include "trigger-sim/algorithms/TimeWindow.h"
+#include "trigger-sim/algorithms/SimpleMajorityTriggerAlgorithm.h"
+#include "phys-services/I3GSLRandomService.h"
+
+#include <algorithm>
+#include <cmath>
+
+TEST_GROUP(TriggerHitBufferTests);
+
+namespace {
+  // hits on a coarse time grid, so there are plenty with the same time
+  TriggerHitVector RandomHits(I3GSLRandomService& rand, unsigned nHits)
+  {
+    TriggerHitVector hits;
+    for(unsigned n(0); n < nHits; n++)
+      hits.push_back(TriggerHit(std::floor(rand.Uniform(0, 200))*10.,
+                                rand.Uniform(1, 60),
+                                rand.Uniform(1, 86)));
+    return hits;
+  }
+}
+
+TEST(SortTest)
+{
+  I3GSLRandomService rand(31415);
+  TriggerHitBuffer buffer;
+  for(unsigned trial(0); trial < 100; trial++){
+    TriggerHitVector hits = RandomHits(rand, trial);
+
+    // refilling the same buffer has to forget the last event
+    buffer.clear();
+    for(TriggerHitVector::const_iterator i = hits.begin(); i != hits.end(); i++)
+      buffer.push_back(i->time, i->pos, i->string);
+    buffer.SortByTime();
+
+    std::stable_sort(hits.begin(), hits.end());
+    ENSURE_EQUAL(buffer.size(), hits.size());
+    for(size_t i(0); i < hits.size(); i++)
+      ENSURE(buffer[i] == hits[i], "SortByTime has to keep the order of equal times");
+  }
+}
+
+TEST(SlidingTimeWindowsTest)
+{
+  I3GSLRandomService rand(27182);
+  TriggerHitIndexPairVector windows;
+  for(unsigned trial(0); trial < 1000; trial++){
+    TriggerHitVector hits = RandomHits(rand, rand.Uniform(0, 60));
+    std::stable_sort(hits.begin(), hits.end());
+    TriggerHitBuffer buffer(hits);
+
+    TimeWindow timeWindow(rand.Uniform(1, 8), rand.Uniform(10, 300));
+    TriggerHitIterPairVectorPtr expected = timeWindow.SlidingTimeWindows(hits);
+    timeWindow.SlidingTimeWindows(buffer, windows);
+
+    ENSURE_EQUAL(windows.size(), expected->size());
+    for(size_t i(0); i < windows.size() && i < expected->size(); i++){
+      ENSURE((*expected)[i].first == hits.begin() + windows[i].first);
+      ENSURE((*expected)[i].second == hits.begin() + windows[i].second);
+    }
+  }
+}
+
+TEST(SimpleMajorityTriggerBufferTest)
+{
+  I3GSLRandomService rand(16180);
+  SimpleMajorityTriggerAlgorithm smTrigger(100, 4);
+  SimpleMajorityTriggerAlgorithm bufferTrigger(100, 4);
+  TriggerHitBuffer buffer;
+  for(unsigned trial(0); trial < 100; trial++){
+    TriggerHitVectorPtr hits(new TriggerHitVector(RandomHits(rand, 100)));
+    std::stable_sort(hits->begin(), hits->end());
+    smTrigger.AddHits(hits);
+
+    buffer.clear();
+    for(TriggerHitVector::const_iterator i = hits->begin(); i != hits->end(); i++)
+      buffer.push_back(*i);
+    bufferTrigger.AddHits(buffer);
+
+    const TriggerHitIndexPairVector& windows = bufferTrigger.GetTriggerWindows();
+    ENSURE_EQUAL(bufferTrigger.GetNumberOfTriggers(), windows.size());
+    ENSURE_EQUAL(smTrigger.GetNumberOfTriggers(), windows.size());
+    for(size_t i(0); i < windows.size(); i++){
+      TriggerHitVectorPtr expected = smTrigger.GetNextTrigger();
+      TriggerHitVectorPtr triggerHits = bufferTrigger.GetNextTrigger();
+      ENSURE(expected && triggerHits);
+      ENSURE(*triggerHits == *expected);
+      ENSURE_EQUAL(buffer.time[windows[i].first], expected->front().time);
+      ENSURE_EQUAL(buffer.time[windows[i].second - 1], expected->back().time);
+    }
+    ENSURE(!bufferTrigger.GetNextTrigger());
+  }
+}
+
+TEST(GrowthsTest)
+{
+  I3GSLRandomService rand(14142);
+  TriggerHitBuffer buffer;
+  ENSURE_EQUAL(buffer.GetGrowths(), 0u);
+
+  // the first unordered event grows the columns and the sort scratch space
+  TriggerHitVector hits = RandomHits(rand, 500);
+  for(TriggerHitVector::const_iterator i = hits.begin(); i != hits.end(); i++)
+    buffer.push_back(*i);
+  buffer.SortByTime();
+  ENSURE(buffer.GetGrowths() > 0u);
+
+  // events up to that size don't
+  const size_t growths(buffer.GetGrowths());
+  for(unsigned trial(0); trial < 100; trial++){
+    TriggerHitVector event = RandomHits(rand, rand.Uniform(0, 500));
+    buffer.clear();
+    buffer.reserve(event.size());
+    for(TriggerHitVector::const_iterator i = event.begin(); i != event.end(); i++)
+      buffer.push_back(*i);
+    buffer.SortByTime();
+  }
+  ENSURE_EQUAL(buffer.GetGrowths(), growths, "refilling the buffer should not grow it");
+
+  // a larger one does
+  buffer.reserve(501);
+  ENSURE(buffer.GetGrowths() > growths);
+}
@@ -0,0 +1,98 @@
+#include <I3Test.h>
+
+#include <trigger-sim/algorithms/TriggerHitTable.h>
+#include <trigger-sim/utilities/DOMSetFunctions.h>
+#include <dataclasses/physics/I3DOMLaunch.h>
+#include <icetray/OMKey.h>
+
+#include <boost/foreach.hpp>
+
+TEST_GROUP(TriggerHitTableTests);
+
+namespace{
+  void AddLaunch(I3DOMLaunchSeriesMap& launches, const OMKey& omkey,
+                 double time, bool lc){
+    I3DOMLaunch launch;
+    launch.SetStartTime(time);
+    launch.SetLCBit(lc);
+    launches[omkey].push_back(launch);
+  }
+}
+
+TEST(DOMSetMaskTest)
+{
+  // the mask has to agree with InDOMSet for the defaults...
+  for(int str(1); str <= 86; str++)
+    for(unsigned om(1); om <= 64; om++){
+      OMKey dom(str, om);
+      uint32_t mask = DOMSetFunctions::GetDOMSetMask(dom, I3MapKeyVectorIntConstPtr());
+      BOOST_FOREACH(unsigned domSet, DOMSetFunctions::DOMSETS)
+        ENSURE_EQUAL(bool(mask & (1u << domSet)),
+                     DOMSetFunctions::InDOMSet(dom, domSet, I3MapKeyVectorIntConstPtr()),
+                     "DOMSet mask disagrees with InDOMSet");
+    }
+
+  // ...and for DOMSets from the frame
+  I3MapKeyVectorIntPtr domSets(new I3MapKeyVectorInt);
+  (*domSets)[OMKey(1,1)].push_back(2);
+  (*domSets)[OMKey(1,1)].push_back(11);
+  (*domSets)[OMKey(1,2)].push_back(-1);
+
+  ENSURE_EQUAL(DOMSetFunctions::GetDOMSetMask(OMKey(1,1), domSets), (1u << 2) | (1u << 11));
+  ENSURE_EQUAL(DOMSetFunctions::GetDOMSetMask(OMKey(1,2), domSets), 0u);
+  ENSURE_EQUAL(DOMSetFunctions::GetDOMSetMask(OMKey(1,3), domSets), 0u);
+}
+
+TEST(TimeOrderTest)
+{
+  I3DOMLaunchSeriesMap launches;
+  AddLaunch(launches, OMKey(21,30), 300., true);
+  AddLaunch(launches, OMKey(21,30), 900., false);
+  AddLaunch(launches, OMKey(80,20), 100., true);
+  AddLaunch(launches, OMKey(1,61), 500., true);
+
+  TriggerHitTable table("InIceRawData", launches, I3MapKeyVectorIntConstPtr());
+
+  ENSURE_EQUAL(table.GetSourceName(), std::string("InIceRawData"));
+  ENSURE_EQUAL(table.size(), 4u);
+
+  for(TriggerHitTable::const_iterator i = table.begin(); i + 1 != table.end(); i++)
+    ENSURE(i->time <= (i + 1)->time, "hits are not time ordered");
+
+  const TriggerHitTable::HitVector& hits = table.GetHits();
+  ENSURE(hits[0].omKey == OMKey(80,20));
+  ENSURE(hits[0].lc);
+  ENSURE(!hits[0].InDOMSet(2));
+  ENSURE(hits[0].InDOMSet(4));
+
+  ENSURE(hits[1].omKey == OMKey(21,30));
+  ENSURE(hits[1].InDOMSet(2));
+
+  ENSURE(hits[2].omKey == OMKey(1,61));
+  ENSURE(hits[2].InDOMSet(3));
+  ENSURE(!hits[2].InDOMSet(2));
+
+  ENSURE(hits[3].omKey == OMKey(21,30));
+  ENSURE(!hits[3].lc);
+}
+
+TEST(EqualTimesTest)
+{
+  // launches at the same time keep their OMKey order
+  I3DOMLaunchSeriesMap launches;
+  AddLaunch(launches, OMKey(30,1), 100., true);
+  AddLaunch(launches, OMKey(10,1), 100., true);
+  AddLaunch(launches, OMKey(20,1), 100., true);
+
+  TriggerHitTable table("InIceRawData", launches, I3MapKeyVectorIntConstPtr());
+
+  ENSURE(table.GetHits()[0].omKey == OMKey(10,1));
+  ENSURE(table.GetHits()[1].omKey == OMKey(20,1));
+  ENSURE(table.GetHits()[2].omKey == OMKey(30,1));
+}
+
+TEST(EmptyTest)
+{
+  TriggerHitTable table("IceTopRawData", I3DOMLaunchSeriesMap(), I3MapKeyVectorIntConstPtr());
+  ENSURE(table.empty());
+}
@@ -0,0 +1,64 @@
+#include <I3Test.h>
+
+#include <icetray/I3Frame.h>
+#include <dataclasses/I3Map.h>
+#include <trigger-sim/utilities/TriggerProfile.h>
+
+TEST_GROUP(TriggerProfileTests);
+
+TEST(TimeBins)
+{
+  ENSURE_EQUAL(TriggerProfile::GetTimeBin(0.), 0u);
+  ENSURE_EQUAL(TriggerProfile::GetTimeBin(0.5), 0u);
+  ENSURE_EQUAL(TriggerProfile::GetTimeBin(1.), 1u);
+  ENSURE_EQUAL(TriggerProfile::GetTimeBin(1.9), 1u);
+  ENSURE_EQUAL(TriggerProfile::GetTimeBin(2.), 2u);
+  ENSURE_EQUAL(TriggerProfile::GetTimeBin(1000.), 10u);
+  ENSURE_EQUAL(TriggerProfile::GetTimeBin(1e30), TriggerProfile::N_TIME_BINS - 1);
+
+  // every time falls into the bin between its edges
+  for(unsigned i = 1; i + 1 < TriggerProfile::N_TIME_BINS; i++){
+    ENSURE_EQUAL(TriggerProfile::GetTimeBin(TriggerProfile::GetTimeBinEdge(i)), i);
+    ENSURE_EQUAL(TriggerProfile::GetTimeBin(0.99 * TriggerProfile::GetTimeBinEdge(i + 1)), i);
+  }
+}
+
+TEST(FrameCounts)
+{
+  TriggerProfile profile("test");
+
+  I3Frame frame(I3Frame::DAQ);
+  profile.Start();
+  profile.Count("hits", 10);
+  profile.Count("hits", 5);
+  profile.Count("pairs", 3);
+  profile.Stop(frame, "Profile");
+
+  I3MapStringDoubleConstPtr counts = frame.Get<I3MapStringDoubleConstPtr>("Profile");
+  ENSURE((bool)counts, "the counts should be in the frame");
+  ENSURE_DISTANCE(counts->find("hits")->second, 15., 1e-9);
+  ENSURE_DISTANCE(counts->find("pairs")->second, 3., 1e-9);
+  ENSURE(counts->find("time") != counts->end(), "the time should be in the frame");
+  ENSURE(counts->find("time")->second >= 0.);
+
+  // no key, only the totals
+  I3Frame other(I3Frame::DAQ);
+  profile.Start();
+  profile.Count("hits", 1);
+  profile.Stop(other, "");
+  ENSURE(!other.Has("Profile"), "nothing should be put without a key");
+
+  ENSURE_EQUAL(profile.GetNFrames(), 2u);
+  ENSURE_DISTANCE(profile.GetTotals().find("hits")->second, 16., 1e-9);
+  ENSURE_DISTANCE(profile.GetMaxima().find("hits")->second, 15., 1e-9);
+  ENSURE_DISTANCE(profile.GetTotals().find("pairs")->second, 3., 1e-9);
+
+  unsigned nFrames(0);
+  for(unsigned i = 0; i < TriggerProfile::N_TIME_BINS; i++)
+    nFrames += profile.GetTimeHistogram()[i];
+  ENSURE_EQUAL(nFrames, 2u);
+
+  // the counts of the first frame aren't changed by the second one
+  ENSURE_DISTANCE(counts->find("hits")->second, 15., 1e-9);
+  ENSURE(profile.Summary().find("hits") != std::string::npos);
+}
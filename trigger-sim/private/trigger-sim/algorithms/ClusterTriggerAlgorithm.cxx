@@ -11,138 +11,116 @@
 
 #include <trigger-sim/algorithms/ClusterTriggerAlgorithm.h>
 #include <trigger-sim/algorithms/TimeWindow.h>
+#include <algorithm>
+#include <map>
 #include <boost/foreach.hpp>
 #include <boost/assign/std/vector.hpp>
 
 using namespace boost::assign;
 
+namespace{
+  // the highest DOM position a site can be at
+  const int MAX_POSITION(60);
+  const size_t N_POSITIONS(MAX_POSITION + 1);
+}
+
 ClusterTriggerAlgorithm::ClusterTriggerAlgorithm(double triggerWindow, unsigned int triggerThreshold,
 						 unsigned int coherenceLength) : 
   triggerWindow_(triggerWindow),
   triggerThreshold_(triggerThreshold),
+  hits_(0),
+  queueBegin_(0),
+  queueEnd_(0),
+  nSites_(0),
   triggerCount_(0)
 {
 
   coherenceUp_   = (coherenceLength - 1) / 2;
   coherenceDown_ = coherenceLength / 2;
 
+  // a site needs at least one hit, even if the threshold is 0
+  siteThreshold_ = std::max(triggerThreshold_, 1u);
+
   log_debug("ClusterTriggerAlgorithm configuration:");
   log_debug("  TriggerWindow = %f", triggerWindow_);
   log_debug("  TriggerThreshold = %d", triggerThreshold_);
   log_debug("  CoherenceUp = %d", coherenceUp_);
   log_debug("  CoherenceDown = %d", coherenceDown_);
-
-  hitQueue_.clear();
 }
 
 ClusterTriggerAlgorithm::~ClusterTriggerAlgorithm() {}
 
 void ClusterTriggerAlgorithm::AddHits(TriggerHitVectorPtr hits)
 {
+  buffer_.clear();
+  buffer_.reserve(hits->size());
+  BOOST_FOREACH(const TriggerHit& hit, *hits)
+    buffer_.push_back(hit);
 
-  log_debug("ClusterTrigger has %zd hits to process", hits->size());
+  AddHits(buffer_);
+}
+
+void ClusterTriggerAlgorithm::AddHits(const TriggerHitBuffer& hits)
+{
+
+  log_debug("ClusterTrigger has %zd hits to process", hits.size());
 
-  /*------------------------------------------------------------*
-   * Check Trigger condition on this string
-   *------------------------------------------------------------*/
   triggers_.clear();
   triggerCount_ = 0;
 
-  hitQueue_.clear();
+  hits_ = &hits;
+  queueBegin_ = queueEnd_ = 0;
+  nSites_ = 0;
 
-  // Iterate over all the hits
-  TriggerHitVector::const_iterator nextHit;
-  for (nextHit = hits->begin(); nextHit != hits->end(); nextHit++) {
-    double nextTime = nextHit->time;
-    log_debug("  Processing hit at time %f", nextTime);
+  // Give every string with hits its own block of position counters
+  std::map<int, size_t> strings;
+  BOOST_FOREACH(int string, hits.string)
+    strings.insert(std::make_pair(string, 0));
+  size_t nStrings(0);
+  for (std::map<int, size_t>::iterator i = strings.begin(); i != strings.end(); i++)
+    i->second = N_POSITIONS*nStrings++;
+  counters_.assign(N_POSITIONS*nStrings, 0);
 
-    // Check for an empty queue
-    if (hitQueue_.empty()) {  
-      log_debug("Queue is empty, adding new hit");
-      hitQueue_.push_back(*nextHit);
-      continue;  
-    }      
+  stringIndex_.clear();
+  stringIndex_.reserve(hits.size());
+  BOOST_FOREACH(int string, hits.string)
+    stringIndex_.push_back(strings[string]);
 
-    // Check time window
- //   double startTime = hitQueue_.front().time;
- //   double stopTime = startTime + triggerWindow_;
- //   log_debug("    Current time window = (%f, %f)", startTime, stopTime); // Commented these 3 lines out, no use for them anymore
+  /*------------------------------------------------------------*
+   * Check Trigger condition on this string
+   *------------------------------------------------------------*/
+  while (queueEnd_ < hits_->size()) {
+    double nextTime = hits_->time[queueEnd_];
+    log_debug("  Processing hit at time %f", nextTime);
 
     // Slide the window until next time is in window
-    while ( (nextTime - hitQueue_.front().time)  > triggerWindow_) {  // Changed here to DAQ analogue - Thorsten
+    while (queueBegin_ != queueEnd_ &&
+	   (nextTime - hits_->time[queueBegin_]) > triggerWindow_) {  // Changed here to DAQ analogue - Thorsten
 
       log_debug("    Hit is outside window, checking for trigger...");
 
-      bool timeTrigger = (hitQueue_.size() >= triggerThreshold_);
-      log_debug("     TimeTrigger = %s", timeTrigger ? "T" : "F");
-
-      bool posTrigger = PosWindow();
-
-      log_debug("     PosTrigger = %s", posTrigger ? "T" : "F");
-
-      // Check for threshold in the time window and in position window
-      if ( timeTrigger && posTrigger ) {
-
-	// We have a trigger
-	log_debug("  We have a trigger!");
-
-	// Copy hits in hitQueue into the vector of vectors
-	TriggerHitVectorPtr triggerHits(new TriggerHitVector);
-	TriggerHitList::const_iterator queueIter;
-	for (queueIter = hitQueue_.begin(); queueIter != hitQueue_.end(); queueIter++)
-	  triggerHits->push_back(*queueIter);
-	triggers_.push_back(*triggerHits);
-	triggerCount_++;
-
-	hitQueue_.clear();
+      if (CheckTrigger()) {
+	// start over with an empty window
+	while (queueBegin_ != queueEnd_)
+	  Pop();
 	break;
-
-      } else {
-
-	// remove the head
-	log_debug("    No trigger, shift the queue");
-	if(hitQueue_.size() > 0) //////////////// CHANGE THORSTEN --- Here error occured before
-	{
-		hitQueue_.pop_front();
-	}
-	else // if size  is 0 break!!!
-	{
-		break;
-	}
       }
 
+      // remove the head
+      log_debug("    No trigger, shift the queue");
+      Pop();
     }
 
     // Add nextHit to queue
     log_debug("    Hit is in window, adding it to queue");
-    hitQueue_.push_back(*nextHit);  
-
+    Push();
   }
 
   // After the last hit, check the queue again
   log_debug("    Last hit, checking for trigger...");
+  CheckTrigger();
 
-  bool timeTrigger = (hitQueue_.size() >= triggerThreshold_);
-  log_debug("     TimeTrigger = %s", timeTrigger ? "T" : "F");
-      
-  bool posTrigger = PosWindow();
-
-  log_debug("     PosTrigger = %s", posTrigger ? "T" : "F");
-
-  // Check for threshold in the time window and in position window
-  if ( timeTrigger && posTrigger ) {
-
-    // We have a trigger
-    log_debug("  We have a trigger!");
-    // Copy hits in hitQueue into the vector of vectors
-    TriggerHitVectorPtr triggerHits(new TriggerHitVector);
-    TriggerHitList::const_iterator queueIter;
-    for (queueIter = hitQueue_.begin(); queueIter != hitQueue_.end(); queueIter++)
-      triggerHits->push_back(*queueIter);
-    triggers_.push_back(*triggerHits);
-    triggerCount_++;
-  }
-  
+  hits_ = 0;
 }
 
 unsigned int ClusterTriggerAlgorithm::GetNumberOfTriggers() {
@@ -159,116 +137,73 @@ TriggerHitVectorPtr ClusterTriggerAlgorithm::GetNextTrigger() {
   return hits;
 }
 
-bool ClusterTriggerAlgorithm::PosWindow()
+void ClusterTriggerAlgorithm::Push()
 {
-  log_debug("    Checking position window trigger...");
-
-  bool trigger = false;
-
-  std::map<int, unsigned> coherenceMap;
-
-  // Iterate over the hit queue
-  TriggerHitList::iterator centralHit;
-  for (centralHit = hitQueue_.begin(); centralHit != hitQueue_.end(); centralHit++) {
-
-    // Get the lower and upper bounds
-    unsigned int centralPos = centralHit->pos;
-    int centralString = centralHit->string;
-    int lower = centralPos - coherenceUp_;
-    if (lower < 1) lower = 1;
-    int upper = centralPos + coherenceDown_;
-    if (upper > 60) upper = 60;
-
-    log_debug("      Central hit at (%d, %d)   Pos window = (%d, %d)", centralString, centralPos, lower, upper);
-
-    // Iterate over the doms in the coherence window
-    for (int dom = lower; dom <= upper; dom++) {
-
-      // create the key
-      int key = GetHash(centralString, dom);
-
-      // Update counter for this dom
-      unsigned counter = 0;
-      std::map<int, unsigned>::const_iterator iter = coherenceMap.find(key);
-      if (iter != coherenceMap.end()) counter = iter->second;
-      counter += 1;
-      coherenceMap[key] = counter;
+  const unsigned int hitPos = hits_->pos[queueEnd_];
+  const size_t index = stringIndex_[queueEnd_];
+  queueEnd_++;
+
+  // the hit counts for the DOM positions within the coherence length
+  long lower = std::max(long(hitPos) - long(coherenceUp_), 1L);
+  long upper = std::min(long(hitPos) + long(coherenceDown_), long(MAX_POSITION));
+  for (long pos = lower; pos <= upper; pos++)
+    if (++counters_[index + pos] == siteThreshold_)
+      nSites_++;
+}
 
-      log_debug("        Dom (%d, %d) now has count %d", centralString, dom, counter);
+void ClusterTriggerAlgorithm::Pop()
+{
+  const unsigned int hitPos = hits_->pos[queueBegin_];
+  const size_t index = stringIndex_[queueBegin_];
+  queueBegin_++;
+
+  long lower = std::max(long(hitPos) - long(coherenceUp_), 1L);
+  long upper = std::min(long(hitPos) + long(coherenceDown_), long(MAX_POSITION));
+  for (long pos = lower; pos <= upper; pos++)
+    if (counters_[index + pos]-- == siteThreshold_)
+      nSites_--;
+}
 
-      if (counter >= triggerThreshold_) trigger = true;
-    }
-    
-  }
+bool ClusterTriggerAlgorithm::NearSite(size_t i) const
+{
+  // the sites whose coherence range reaches the hit i
+  const unsigned int hitPos = hits_->pos[i];
+  const size_t index = stringIndex_[i];
+  long lower = std::max(long(hitPos) - long(coherenceDown_), 1L);
+  long upper = std::min(long(hitPos) + long(coherenceUp_), long(MAX_POSITION));
+  for (long pos = lower; pos <= upper; pos++)
+    if (counters_[index + pos] >= siteThreshold_)
+      return true;
+  return false;
+}
 
-  if (!trigger) return false;
+bool ClusterTriggerAlgorithm::CheckTrigger()
+{
+  bool timeTrigger = (queueEnd_ - queueBegin_ >= triggerThreshold_);
+  log_debug("     TimeTrigger = %s", timeTrigger ? "T" : "F");
 
-  // Now remove sites from the map that are below threshold
-  std::map<int, unsigned>::iterator mapIter;
-  for (mapIter = coherenceMap.begin(); mapIter != coherenceMap.end();) {
-    if (mapIter->second < triggerThreshold_) {
-      // must increment iterator before erasing it
-      coherenceMap.erase(mapIter++);
-    } else {
-      ++mapIter;
-    }
-  }
+  bool posTrigger = (nSites_ > 0);
+  log_debug("     PosTrigger = %s", posTrigger ? "T" : "F");
 
-  log_debug("Pruned coherence map:");
-  for (mapIter = coherenceMap.begin(); mapIter != coherenceMap.end(); mapIter++) {
-    int string __attribute__((unused)) = GetString(mapIter->first);
-    int pos __attribute__((unused)) = GetPosition(mapIter->first);
-    log_debug("  Count(%d,%d) = %d", string, pos, mapIter->second);
+  // Check for threshold in the time window and in position window
+  if ( !(timeTrigger && posTrigger) )
+    return false;
+
+  // We have a trigger
+  log_debug("  We have a trigger!");
+
+  // Copy the hits in the window that are near a site
+  TriggerHitVector triggerHits;
+  for (size_t i = queueBegin_; i != queueEnd_; i++) {
+    if (NearSite(i))
+      triggerHits.push_back((*hits_)[i]);
+    else
+      log_debug("  Hit at (%d,%d) is not near a site, dropping it",
+		hits_->string[i], hits_->pos[i]);
   }
+  triggers_.push_back(triggerHits);
+  triggerCount_++;
 
-  // Now remove hits from the queue that are not at valid sites in the map
-  log_debug("Pruning the hit queue:");
-  TriggerHitList::iterator hitIter;
-  for (hitIter = hitQueue_.begin(); hitIter != hitQueue_.end();) { // CHANGE THORSTEN remove hitIter++ from the loop start to the end
-
-    // check hit
-    unsigned int hitPos = hitIter->pos;
-    int hitString = hitIter->string;
-
-    log_debug("  Hit at (%d,%d)", hitString, hitPos);
-
-    bool near = false;
-
-    // check the map
-    std::map<int, unsigned>::iterator mapIter;
-    for (mapIter = coherenceMap.begin(); mapIter != coherenceMap.end(); mapIter++) {
-      int string = GetString(mapIter->first);
-      int pos = GetPosition(mapIter->first);
-
-      int delta = hitPos - pos;
-
-      bool sameString = (hitString == string);
-      bool closePos = false;
-      if (delta < 0) 
-	closePos = (-delta <= static_cast<int>(coherenceUp_));
-      else if (delta > 0)
-	closePos = (delta <= static_cast<int>(coherenceDown_));
-      else
-	closePos = true;
-      
-      if (sameString && closePos) {
-	near = true;
-	log_debug("    is near site (%d,%d)", string, pos);
-      } else {
-	log_debug("    is NOT near site (%d,%d)", string, pos);
-      }
-    }
-    
-    if (!near) {
-      log_debug("  Hit is not near a site, deleting from queue");
-      hitIter = hitQueue_.erase(hitIter);
-    } else {
-      hitIter++;
-      log_debug("  Hit is near a site, keep it");
-    }
-    
-  }
-  
   return true;
 }
 
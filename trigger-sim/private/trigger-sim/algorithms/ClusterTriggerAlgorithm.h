@@ -12,8 +12,22 @@
 #ifndef CLUSTER_TRIGGER_ALGORITHM_H
 #define CLUSTER_TRIGGER_ALGORITHM_H
 
+#include <vector>
 #include "icetray/I3Logging.h"
 #include "trigger-sim/algorithms/TriggerHit.h"
+#include "trigger-sim/algorithms/TriggerHitBuffer.h"
+
+/**
+ * @brief The string (cluster) trigger.
+ *
+ * Slides a time window over the hits and triggers if there are at least
+ * TriggerThreshold hits in it and at least TriggerThreshold of them are
+ * within the coherence length of one DOM position on the same string.
+ *
+ * The number of hits in the window covering each DOM position is kept
+ * up to date as hits enter and leave the window, so checking the
+ * position condition doesn't depend on the number of hits in the window.
+ */
 
 class ClusterTriggerAlgorithm
 {
@@ -25,6 +39,12 @@ class ClusterTriggerAlgorithm
 
   void AddHits(TriggerHitVectorPtr hits);
 
+  /**
+   * Finds the triggers in the time ordered hits of the buffer.  The
+   * algorithm keeps its memory between calls, so keep one around.
+   */
+  void AddHits(const TriggerHitBuffer& hits);
+
   unsigned int GetNumberOfTriggers();
   TriggerHitVectorPtr GetNextTrigger();
 
@@ -39,14 +59,36 @@ class ClusterTriggerAlgorithm
   unsigned int coherenceUp_;
   unsigned int coherenceDown_;
 
-  TriggerHitList hitQueue_;
+  // a DOM position needs this many hits near it to count as a site
+  unsigned int siteThreshold_;
+
+  // the hits passed in as a TriggerHitVector
+  TriggerHitBuffer buffer_;
+
+  // The hits in the time window are hits_[queueBegin_, queueEnd_).
+  const TriggerHitBuffer* hits_;
+  size_t queueBegin_;
+  size_t queueEnd_;
+
+  // For the hit i, counters_[stringIndex_[i] + pos] is the number of hits
+  // in the window whose coherence range covers the DOM position pos on
+  // the same string.  nSites_ is the number of positions with at least
+  // siteThreshold_ hits.
+  std::vector<size_t> stringIndex_;
+  std::vector<unsigned int> counters_;
+  unsigned int nSites_;
 
   TriggerHitVectorVector triggers_;
   unsigned int triggerCount_;
 
-  bool PosWindow();
+  void Push();
+  void Pop();
+  bool CheckTrigger();
+  bool NearSite(size_t i) const;
 
   SET_LOGGER("ClusterTriggerAlgorithm");
 };
 
+I3_POINTER_TYPEDEFS(ClusterTriggerAlgorithm);
+
 #endif
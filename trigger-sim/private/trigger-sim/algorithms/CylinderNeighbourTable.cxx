@@ -0,0 +1,102 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file CylinderNeighbourTable.cxx
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#include <trigger-sim/algorithms/CylinderNeighbourTable.h>
+
+#include <algorithm>
+#include <cmath>
+#include <limits>
+#include <boost/foreach.hpp>
+
+const unsigned CylinderNeighbourTable::NOT_IN_GEOMETRY(std::numeric_limits<unsigned>::max());
+
+namespace{
+  struct DOMPosition{
+    double x, y, z;
+    unsigned index;
+    bool operator<(const DOMPosition& rhs) const { return x < rhs.x; }
+  };
+}
+
+CylinderNeighbourTable::CylinderNeighbourTable(const I3Geometry& geometry,
+                                               double radius, double height) :
+  radius_(radius),
+  height_(height),
+  geoTable_(new I3OMGeoTable(geometry))
+{
+  Fill();
+}
+
+CylinderNeighbourTable::CylinderNeighbourTable(const I3OMGeoTableConstPtr& geoTable,
+                                               double radius, double height) :
+  radius_(radius),
+  height_(height),
+  geoTable_(geoTable)
+{
+  if(!geoTable_)
+    log_fatal("Can't make a CylinderNeighbourTable without an I3OMGeoTable.");
+  Fill();
+}
+
+void CylinderNeighbourTable::Fill()
+{
+  std::vector<DOMPosition> positions(geoTable_->size());
+  for(unsigned i = 0; i < geoTable_->size(); i++){
+    positions[i].x = geoTable_->GetX(i);
+    positions[i].y = geoTable_->GetY(i);
+    positions[i].z = geoTable_->GetZ(i);
+    positions[i].index = i;
+  }
+  neighbours_.resize(positions.size());
+
+  // Sorting in x means only DOMs within one radius in x have to be
+  // compared.  The cut is a little wider than the radius so rounding
+  // can't make it disagree with the exact check below.
+  std::sort(positions.begin(), positions.end());
+  const double xCut(radius_ * (1. + 1e-9));
+
+  for(std::vector<DOMPosition>::const_iterator p1 = positions.begin();
+      p1 != positions.end(); p1++){
+    for(std::vector<DOMPosition>::const_iterator p2 = p1;
+        p2 != positions.end() && p2->x - p1->x <= xCut; p2++){
+      // same test as the CylinderTriggerAlgorithm always did
+      double dx = (p2->x - p1->x);
+      double dy = (p2->y - p1->y);
+      double dz = fabs(p2->z - p1->z);
+      double dr = sqrt(dx*dx + dy*dy);
+      if (dr < radius_ && dz < (0.5*height_)) {
+        neighbours_[p1->index].push_back(p2->index);
+        if(p2 != p1)
+          neighbours_[p2->index].push_back(p1->index);
+      }
+    }
+  }
+
+  size_t nPairs(0);
+  BOOST_FOREACH(std::vector<unsigned>& n, neighbours_){
+    std::sort(n.begin(), n.end());
+    nPairs += n.size();
+  }
+  log_debug("Built the cylinder neighbours (R = %g, H = %g) for %zu DOMs with %zu entries",
+            radius_, height_, neighbours_.size(), nPairs);
+}
+
+unsigned CylinderNeighbourTable::GetIndex(const OMKey& omkey) const
+{
+  int i = geoTable_->GetIndex(omkey);
+  return i == I3OMGeoTable::NOT_IN_GEOMETRY ? NOT_IN_GEOMETRY : unsigned(i);
+}
+
+bool CylinderNeighbourTable::AreNeighbours(unsigned i, unsigned j) const
+{
+  const std::vector<unsigned>& n = neighbours_.at(i);
+  return std::binary_search(n.begin(), n.end(), j);
+}
@@ -10,6 +10,8 @@
  */
 
 #include <trigger-sim/algorithms/CylinderTriggerAlgorithm.h>
+#include <algorithm>
+#include <cmath>
 #include <boost/foreach.hpp>
 
 CylinderTriggerAlgorithm::CylinderTriggerAlgorithm(double triggerWindow, unsigned int triggerThreshold, unsigned int simpleMultiplicity,
@@ -19,7 +21,34 @@ CylinderTriggerAlgorithm::CylinderTriggerAlgorithm(double triggerWindow, unsigne
   simpleMultiplicity_(simpleMultiplicity),
   Radius_(Radius),
   Zdistance_(Zdistance),
-  triggerCount_(0)
+  triggerCount_(0),
+  nCylinders_(0),
+  nPairs_(0)
+{
+
+  log_debug("CylinderTriggerAlgorithm configuration:");
+  log_debug("  TriggerWindow = %f", triggerWindow_);
+  log_debug("  TriggerThreshold = %d", triggerThreshold_);
+  log_debug("  Radius = %g", Radius_);
+  log_debug("  ZDistanze = %g", Zdistance_);
+
+  hitQueue_.clear();
+  if(Geometry)
+    neighbours_ = CylinderNeighbourTableConstPtr
+      (new CylinderNeighbourTable(I3OMGeoTable::Get(Geometry), Radius_, Zdistance_));
+}
+
+CylinderTriggerAlgorithm::CylinderTriggerAlgorithm(double triggerWindow, unsigned int triggerThreshold, unsigned int simpleMultiplicity,
+					       CylinderNeighbourTableConstPtr neighbours) : 
+  triggerWindow_(triggerWindow),
+  triggerThreshold_(triggerThreshold),
+  simpleMultiplicity_(simpleMultiplicity),
+  Radius_(neighbours ? neighbours->GetRadius() : NAN),
+  Zdistance_(neighbours ? neighbours->GetHeight() : NAN),
+  neighbours_(neighbours),
+  triggerCount_(0),
+  nCylinders_(0),
+  nPairs_(0)
 {
 
   log_debug("CylinderTriggerAlgorithm configuration:");
@@ -29,50 +58,61 @@ CylinderTriggerAlgorithm::CylinderTriggerAlgorithm(double triggerWindow, unsigne
   log_debug("  ZDistanze = %g", Zdistance_);
 
   hitQueue_.clear();
-  Geometry_ = Geometry;
 }
 
 CylinderTriggerAlgorithm::~CylinderTriggerAlgorithm() {}
 
 void CylinderTriggerAlgorithm::AddHits(TriggerHitVectorPtr hits)
 {
+  buffer_.clear();
+  buffer_.reserve(hits->size());
+  BOOST_FOREACH(const TriggerHit& hit, *hits)
+    buffer_.push_back(hit);
+
+  AddHits(buffer_);
+}
 
-  log_debug("CylinderTrigger has %zd hits to process", hits->size());
+void CylinderTriggerAlgorithm::AddHits(const TriggerHitBuffer& hits)
+{
+
+  log_debug("CylinderTrigger has %zd hits to process", hits.size());
 
   /*------------------------------------------------------------*
    * Check Trigger condition
    *------------------------------------------------------------*/
   triggers_.clear();
   triggerCount_ = 0;
+  nCylinders_ = 0;
+  nPairs_ = 0;
   hitQueue_.clear();
 
   // Iterate over all the hits
-  TriggerHitVector::const_iterator nextHit;
-  for (nextHit = hits->begin(); nextHit != hits->end(); nextHit++) {
-    double nextTime = nextHit->time;
+  for (size_t nextHit = 0; nextHit < hits.size(); nextHit++) {
+    double nextTime = hits.time[nextHit];
     log_debug("  Processing hit at time %f", nextTime);
 
     // Check for an empty queue
     if (hitQueue_.empty()) {  
       log_debug("Queue is empty, adding new hit");
-      hitQueue_.push_back(*nextHit);
+      Queue(hits[nextHit]);
       continue;  
     }      
 
     // Check time window
-    double startTime = hitQueue_.front().time;
+    double startTime = hitQueue_.front().hit.time;
     double stopTime __attribute__((unused)) = startTime + triggerWindow_;
     log_debug("    Current time window = (%f, %f)", startTime, stopTime);
 
     // Slide the window until next time is in window
-    while ((nextTime - hitQueue_.front().time)  > triggerWindow_) {
+    while (!hitQueue_.empty() && (nextTime - hitQueue_.front().hit.time)  > triggerWindow_) {
 
       log_debug("    Hit is outside window, checking for trigger...");
 
       bool timeTrigger = (hitQueue_.size() >= triggerThreshold_);
       log_debug("     TimeTrigger = %s", timeTrigger ? "T" : "F");
 
-      bool posTrigger = PosWindow();
+      // no volume can be over threshold if the whole window isn't
+      bool posTrigger = timeTrigger && PosWindow();
       
       log_debug("     PosTrigger = %s", posTrigger ? "T" : "F");
 
@@ -87,11 +127,11 @@ void CylinderTriggerAlgorithm::AddHits(TriggerHitVectorPtr hits)
 	if(hitQueue_.size() > 0)
 	{
 	
-	  TriggerHitVectorPtr triggerHits(new TriggerHitVector);
-	  TriggerHitList::const_iterator queueIter;
-	  for (queueIter = hitQueue_.begin(); queueIter != hitQueue_.end(); queueIter++)
-	    triggerHits->push_back(*queueIter);
-	  triggers_.push_back(*triggerHits);
+	  TriggerHitVector triggerHits;
+	  triggerHits.reserve(hitQueue_.size());
+	  BOOST_FOREACH(const QueuedHit& q, hitQueue_)
+	    triggerHits.push_back(q.hit);
+	  triggers_.push_back(triggerHits);
 	  triggerCount_++;
       	}
 	hitQueue_.clear();
@@ -114,7 +154,7 @@ void CylinderTriggerAlgorithm::AddHits(TriggerHitVectorPtr hits)
 
     // Add nextHit to queue
     log_debug("    Hit is in window, adding it to queue");
-    hitQueue_.push_back(*nextHit);  
+    Queue(hits[nextHit]);
 
   }
 
@@ -124,7 +164,7 @@ void CylinderTriggerAlgorithm::AddHits(TriggerHitVectorPtr hits)
   bool timeTrigger = (hitQueue_.size() >= triggerThreshold_);
   log_debug("     TimeTrigger = %s", timeTrigger ? "T" : "F");
       
-  bool posTrigger = PosWindow();
+  bool posTrigger = timeTrigger && PosWindow();
 
   log_debug("     PosTrigger = %s", posTrigger ? "T" : "F");
 
@@ -134,11 +174,11 @@ void CylinderTriggerAlgorithm::AddHits(TriggerHitVectorPtr hits)
     // We have a trigger
     log_debug("  We have a trigger!");
     // Copy hits in hitQueue into the vector of vectors
-    TriggerHitVectorPtr triggerHits(new TriggerHitVector);
-    TriggerHitList::const_iterator queueIter;
-    for (queueIter = hitQueue_.begin(); queueIter != hitQueue_.end(); queueIter++)
-      triggerHits->push_back(*queueIter);
-    triggers_.push_back(*triggerHits);
+    TriggerHitVector triggerHits;
+    triggerHits.reserve(hitQueue_.size());
+    BOOST_FOREACH(const QueuedHit& q, hitQueue_)
+      triggerHits.push_back(q.hit);
+    triggers_.push_back(triggerHits);
     triggerCount_++;
   }
 }
@@ -157,109 +197,116 @@ TriggerHitVectorPtr CylinderTriggerAlgorithm::GetNextTrigger() {
   return hits;
 }
 
+void CylinderTriggerAlgorithm::Queue(const TriggerHit& hit)
+{
+  // look the DOM up once when it enters the queue, not for every pair
+  QueuedHit q;
+  q.hit = hit;
+  q.dom = neighbours_ ?
+    neighbours_->GetIndex(OMKey(hit.string, hit.pos)) :
+    CylinderNeighbourTable::NOT_IN_GEOMETRY;
+  hitQueue_.push_back(q);
+}
+
+/**
+ * Looks for a hit with at least triggerThreshold_ hits (itself included)
+ * in the cylinder around it.  If there is one the queue is reduced to the
+ * hits in that cylinder.
+ *
+ * Instead of comparing all pairs of hits, the hits are counted per DOM and
+ * the count in a cylinder is the sum over the neighbouring DOMs, taken from
+ * the precomputed CylinderNeighbourTable.  Hits on the same DOM share the
+ * same count, so each DOM in the window is only looked at once.
+ */
 bool CylinderTriggerAlgorithm::PosWindow()
 {
   log_debug("    Checking position window trigger...");
 
-  double x1; 
-  double y1; 
-  double z1;
-  double x2; 
-  double y2; 
-  double z2;
-  double dx;
-  double dy;
-  double dz;
-  double dx2;
-  double dy2;
-  double dr2;
-  double dr;
-  
-  I3OMGeoMap::const_iterator geo_iter; 
-  TriggerHitList tempHits;
-
   if(hitQueue_.size() >= simpleMultiplicity_)
   {
     return true;
   }
-  TriggerHitList::iterator hit1;
-  for (hit1 = hitQueue_.begin(); hit1 != hitQueue_.end(); hit1++) {
 
-    // the hit string and position
-    int hitString = hit1->string;
-    unsigned int hitPos = hit1->pos;
-    log_debug("      Central hit at (%d, %d) - time: %f", hitString, hitPos, hit1->time);
-    
-    OMKey omkey(hitString, hitPos);
+  if(hitQueue_.empty())
+  {
+    return false;
+  }
 
-    /// find position ///
-    geo_iter = Geometry_->omgeo.find(omkey);
-    if(geo_iter == Geometry_->omgeo.end()){
+  if(!neighbours_)
+    log_fatal("  No geometry to build the cylinder neighbours from");
+
+  if(domCount_.size() != neighbours_->size()){
+    domCount_.assign(neighbours_->size(), 0);
+    domChecked_.assign(neighbours_->size(), false);
+  }
+
+  // count the hits on each DOM in the window
+  windowDOMs_.clear();
+  BOOST_FOREACH(const QueuedHit& q, hitQueue_){
+    if(q.dom == CylinderNeighbourTable::NOT_IN_GEOMETRY)
       log_fatal("  Warning, OMKey not part of geometry"); // trigger algorithm  does not work when the geometry entry is not there
-      continue;
-    }
-    x1 = geo_iter->second.position.GetX();
-    y1 = geo_iter->second.position.GetY();
-    z1 = geo_iter->second.position.GetZ();
-   
-    tempHits.clear();
-    tempHits.push_back(*hit1);
-
-    TriggerHitList::iterator hit2;
-    for (hit2 = hitQueue_.begin(); hit2 != hitQueue_.end(); hit2++) {
-      if (hit2 == hit1) continue;
-
-      // see if this hit is in the volume
-      unsigned int thisOM = hit2->pos;
-      int thisString = hit2->string;
-      OMKey thisKey(thisString, thisOM);
-      
-        /// find position of other DOMs///
-      geo_iter = Geometry_->omgeo.find(thisKey);
-      if(geo_iter == Geometry_->omgeo.end()){
-	log_fatal("  Warning, OMKey not part of geometry");
-	
-	continue;
-      }
-      x2 = geo_iter->second.position.GetX();
-      y2 = geo_iter->second.position.GetY();
-      z2 = geo_iter->second.position.GetZ();
-      
-      dx = (x2-x1);
-      dy = (y2-y1);
-      dz = fabs(z2-z1); 
-     
-      dx2 = dx*dx;
-      dy2 = dy*dy;
-      
-      dr2 = dx2+dy2;
-      dr = sqrt(dr2);
-      
-      if (dr < Radius_ && dz < (0.5*Zdistance_) ) {
-	tempHits.push_back(*hit2);
- 	log_debug("      Hit at ( R = %f, Z = %f) OM(%d, %d) is in the volume - t: %f", dr, dz, thisString, thisOM, hit2->time);
-      } else {
- 	log_debug("      Hit at ( R = %f, Z = %f) OM(%d, %d) is not in the volume - t: %f", dr, dz, thisString, thisOM, hit2->time);
-      }
+    if(domCount_[q.dom]++ == 0)
+      windowDOMs_.push_back(q.dom);
+  }
+
+  std::deque<QueuedHit>::const_iterator central = hitQueue_.end();
+  std::deque<QueuedHit>::const_iterator hit1;
+  for (hit1 = hitQueue_.begin(); hit1 != hitQueue_.end(); hit1++) {
+
+    if(domChecked_[hit1->dom]) continue;
+    domChecked_[hit1->dom] = true;
+
+    log_debug("      Central hit at (%d, %d) - time: %f", hit1->hit.string, hit1->hit.pos, hit1->hit.time);
+
+    // count the hits in the volume, going through whichever
+    // is shorter, the neighbours or the DOMs in the window.
+    const std::vector<unsigned>& neighbours = neighbours_->GetNeighbours(hit1->dom);
+    size_t nInVolume(0);
+    nCylinders_++;
+    nPairs_ += std::min(neighbours.size(), windowDOMs_.size());
+    if(neighbours.size() < windowDOMs_.size()){
+      BOOST_FOREACH(unsigned dom, neighbours)
+        nInVolume += domCount_[dom];
+    }else{
+      BOOST_FOREACH(unsigned dom, windowDOMs_)
+        if(neighbours_->AreNeighbours(hit1->dom, dom))
+          nInVolume += domCount_[dom];
     }
-    log_debug("    There are %zd hits in this volume", tempHits.size());
-   
+    // the central hit is always counted, but only once
+    if(neighbours_->AreNeighbours(hit1->dom, hit1->dom))
+      nInVolume -= 1;
+    nInVolume += 1;
+
+    log_debug("    There are %zd hits in this volume", nInVolume);
+
     // how many hits do we have?
-    if (tempHits.size() >= triggerThreshold_)
+    if (nInVolume >= triggerThreshold_)
     {
       log_debug("    Found a volume over threshold (%d)", triggerThreshold_);
-      
-      tempHits.sort();
-      hitQueue_.clear();
-      for (TriggerHitList::iterator iter = tempHits.begin(); iter != tempHits.end(); iter++) 
-      {
-      	hitQueue_.push_back(*iter);
-      }
-      
-      return true;  
+      central = hit1;
+      break;
     }
+  }
+
+  BOOST_FOREACH(unsigned dom, windowDOMs_){
+    domCount_[dom] = 0;
+    domChecked_[dom] = false;
+  }
 
+  if(central == hitQueue_.end())
+    return false;
+
+  // keep the central hit and the ones in its volume
+  std::deque<QueuedHit> volumeHits;
+  volumeHits.push_back(*central);
+  std::deque<QueuedHit>::const_iterator hit2;
+  for (hit2 = hitQueue_.begin(); hit2 != hitQueue_.end(); hit2++) {
+    if (hit2 == central) continue;
+    if (neighbours_->AreNeighbours(central->dom, hit2->dom))
+      volumeHits.push_back(*hit2);
   }
+  std::stable_sort(volumeHits.begin(), volumeHits.end());
+  hitQueue_.swap(volumeHits);
 
-  return false;
+  return true;
 }
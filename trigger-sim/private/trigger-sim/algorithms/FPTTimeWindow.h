@@ -2,6 +2,7 @@
 #define FPT_TIME_WINDOW_H
 
 #include <string>
+#include <vector>
 #include "trigger-sim/algorithms/FptHit.h"
 #include "icetray/I3Logging.h"
 
@@ -22,6 +23,7 @@ class FPTTimeWindow
 
 
    //* Fixed time windows
+   //* The hits have to be time ordered.
  
   FptHitIterPairVectorPtr FPTFixedTimeWindows(FptHitVectorPtr hits,double separation);
 
@@ -32,18 +34,14 @@ class FPTTimeWindow
    */
   FPTTimeWindow();
 
-  void DumpHits(FptHitList& hits, const std::string& head, const std::string& pad);
-  void CopyHits(FptHitList& sourceHits, FptHitList& destHits);
-  bool Overlap(FptHitList& hits1, FptHitList& hits2);
-
   unsigned int hit_min_;
   unsigned int hit_max_;
   double slcfraction_min_;
   double time_window_;
   double time_window_separation_;
 
-  FptHitListPtr FPTtimeWindowHits_;
-  FptHitListPtr FPTtriggerWindowHits_;
+  // slcCount_[i] is the number of SLC hits before hit i
+  std::vector<unsigned int> slcCount_;
 
   SET_LOGGER("FPTTimeWindow");
 };
@@ -14,6 +14,7 @@
 #include "dataclasses/geometry/I3Geometry.h"
 #include <dataclasses/I3Direction.h>
 #include <icetray/I3Units.h>
+#include <algorithm>
 using namespace boost::assign;
 int global1  = 0;
  double double_velocity_min_;
@@ -25,7 +26,7 @@ int global1  = 0;
   unsigned int zenith_histogram_min_;
   double histogram_binning_;
   double slcfraction_min_;
-FaintParticleTriggerAlgorithm::FaintParticleTriggerAlgorithm(double time_window,double time_window_separation, double max_trigger_length, unsigned int hit_min,unsigned int hit_max,double double_velocity_min,double double_velocity_max, unsigned int double_min,bool use_dc_version, unsigned int triple_min, unsigned int azimuth_histogram_min,unsigned int zenith_histogram_min, double histogram_binning, double slcfraction_min,  const I3GeometryConstPtr &geo) : 
+FaintParticleTriggerAlgorithm::FaintParticleTriggerAlgorithm(double time_window,double time_window_separation, double max_trigger_length, unsigned int hit_min,unsigned int hit_max,double double_velocity_min,double double_velocity_max, unsigned int double_min,bool use_dc_version, unsigned int triple_min, unsigned int azimuth_histogram_min,unsigned int zenith_histogram_min, double histogram_binning, double slcfraction_min,  const I3GeometryConstPtr &geo, const I3OMGeoTableConstPtr &geoTable) : 
   time_window_(time_window),
   time_window_separation_(time_window_separation),
   max_trigger_length_(max_trigger_length),
@@ -42,8 +43,16 @@ FaintParticleTriggerAlgorithm::FaintParticleTriggerAlgorithm(double time_window,
   slcfraction_min_(slcfraction_min), 
  
   triggerCount_(0),
-  triggerIndex_(0)
+  triggerIndex_(0),
+  geoTable_(geoTable),
+  hits_(NULL),
+  pairedBegin_(0),
+  pairedEnd_(0),
+  nPairs_(0),
+  nTriples_(0)
 {
+  if (!geoTable_ && geo)
+    geoTable_ = I3OMGeoTable::Get(geo);
 
   log_debug("FaintParticleTriggerAlgorithm configuration:");
   log_debug("  TriggerWindow = %f", time_window_);
@@ -67,6 +76,8 @@ void FaintParticleTriggerAlgorithm::AddHits(FptHitVectorPtr hits,const I3Geometr
   triggers_current_.clear();
   triggerCount_ = 0;
   triggerIndex_ = 0;
+  nPairs_ = 0;
+  nTriples_ = 0;
   
   // Get time windows
   FptHitIterPairVectorPtr timeWindows = FPTtimeWindow.FPTFixedTimeWindows(hits,time_window_separation_);
@@ -77,6 +88,7 @@ void FaintParticleTriggerAlgorithm::AddHits(FptHitVectorPtr hits,const I3Geometr
     return;
   }
   log_debug("Found %zd triggered time windows", timeWindows->size());
+  ResetPairs(*hits);
   FptHitVectorPtr timeHits_current(new FptHitVector);
   bool max_extended = false;
   // Loop over the time windows and pull out the hits in each
@@ -100,7 +112,7 @@ void FaintParticleTriggerAlgorithm::AddHits(FptHitVectorPtr hits,const I3Geometr
       //std::cout <<"Hit time"<<hitIter->time<<std::endl;
     }
     //Second cut: number of Doubles
-    std::vector<int> Double_Indices = DoubleThreshold(timeHits, geo);
+    std::vector<int> Double_Indices = WindowDoubles(firstHit - hits->begin(), lastHit - hits->begin());
     unsigned int number_doubles = Double_Indices.size()/2;
     if (number_doubles >= double_min_ ){
         
@@ -309,12 +321,85 @@ std::vector<int> FaintParticleTriggerAlgorithm::DoubleThreshold(FptHitVectorPtr
     return Doubles;
 }
 
+void FaintParticleTriggerAlgorithm::ResetPairs(const FptHitVector& hits)
+{
+  // look up the DOM positions once per hit and not once per pair
+  hitPositions_.clear();
+  hitPositions_.reserve(hits.size());
+  BOOST_FOREACH(const FptHit& hit, hits)
+    hitPositions_.push_back(geoTable_->GetPosition(GetGeoIndex(hit)));
+
+  partners_.assign(hits.size(), std::vector<unsigned int>());
+  hits_ = &hits;
+  pairedBegin_ = 0;
+  pairedEnd_ = 0;
+}
+
+bool FaintParticleTriggerAlgorithm::IsDouble(unsigned int ind_hit_1, unsigned int ind_hit_2) const
+{
+  const FptHit& hit1 = (*hits_)[ind_hit_1];
+  const FptHit& hit2 = (*hits_)[ind_hit_2];
+  if (hit1.string == hit2.string && hit1.pos == hit2.pos)
+    return false;
+
+  const I3Position& p1 = hitPositions_[ind_hit_1];
+  const I3Position& p2 = hitPositions_[ind_hit_2];
+  double dx = p2.GetX() - p1.GetX();
+  double dy = p2.GetY() - p1.GetY();
+  double dz = p2.GetZ() - p1.GetZ();
+  double distance = sqrt(dx*dx + dy*dy + dz*dz);
+  double time = abs(hit2.time - hit1.time);
+  //in km/s
+  double velocity = 1e6*distance/time;
+  return velocity > double_velocity_min_ && velocity < double_velocity_max_;
+}
+
+/**
+   The time windows only move forward, so the velocity consistent pairs
+   are kept from one window to the next.  Pairs of hits that left the
+   window are dropped and only the hits that entered the window are
+   paired up with the hits already in it.  Every pair of hits is
+   evaluated at most once per AddHits call.
+
+   The returned indices are relative to the first hit of the window and
+   come in the same order as the ones from DoubleThreshold.
+ */
+std::vector<int> FaintParticleTriggerAlgorithm::WindowDoubles(unsigned int windowBegin, unsigned int windowEnd)
+{
+  // drop the pairs of the hits that left the window
+  for (; pairedBegin_ < windowBegin && pairedBegin_ < pairedEnd_; pairedBegin_++)
+    std::vector<unsigned int>().swap(partners_[pairedBegin_]);
+  pairedBegin_ = windowBegin;
+
+  // pair up the hits that entered the window, the partner lists
+  // stay sorted since the hits are added in order.
+  for (unsigned int ind_hit_2 = std::max(pairedEnd_, windowBegin); ind_hit_2 < windowEnd; ind_hit_2++) {
+    nPairs_ += ind_hit_2 - windowBegin;
+    for (unsigned int ind_hit_1 = windowBegin; ind_hit_1 < ind_hit_2; ind_hit_1++)
+      if (IsDouble(ind_hit_1, ind_hit_2))
+        partners_[ind_hit_1].push_back(ind_hit_2);
+  }
+  pairedEnd_ = std::max(pairedEnd_, windowEnd);
+
+  std::vector<int> Doubles;
+  for (unsigned int ind_hit_1 = windowBegin; ind_hit_1 < windowEnd; ind_hit_1++) {
+    BOOST_FOREACH(unsigned int ind_hit_2, partners_[ind_hit_1]) {
+      if (ind_hit_2 >= windowEnd)
+        break;
+      Doubles.push_back(ind_hit_1 - windowBegin);
+      Doubles.push_back(ind_hit_2 - windowBegin);
+    }
+  }
+  return Doubles;
+}
+
 unsigned int FaintParticleTriggerAlgorithm::TripleThreshold(FptHitVectorPtr timeWindowHits,std::vector<int> Double_Indices, const I3GeometryConstPtr &geo)
 {
     unsigned int triple_combinations =0;
     int loop_end = Double_Indices.size();
     for (int j = 0; j < loop_end-2; j+= 2) {
             for (int k = j + 2; k <= loop_end-2; k += 2) {
+                nTriples_++;
                 //Check for two doubles that share the middle hit in time (0,1) (1,2) -> (0,1,2)
                 int hit1_ind = Double_Indices[j+1];
                 int hit2_ind =Double_Indices[k];
@@ -349,19 +434,28 @@ unsigned int FaintParticleTriggerAlgorithm::TripleThreshold(FptHitVectorPtr time
     return triple_combinations;
 }
 
+unsigned FaintParticleTriggerAlgorithm::GetGeoIndex(const FptHit& hit) const
+{
+  if (!geoTable_)
+    log_fatal("No geometry");
+  int index = geoTable_->GetIndex(OMKey(hit.string, hit.pos));
+  if (index == I3OMGeoTable::NOT_IN_GEOMETRY)
+    log_fatal("OMKey(%d,%d) is not in the geometry", hit.string, hit.pos);
+  return index;
+}
+
 //function from SLOP trigger to calculate the distance between to OMs
 double FaintParticleTriggerAlgorithm::getDistance(FptHit hit1, FptHit hit2,const I3GeometryConstPtr &geo)
 {
-  I3OMGeoMap::const_iterator geo_iterator_1 = geo->omgeo.find(OMKey(hit1.string, hit1.pos));
-  I3OMGeoMap::const_iterator geo_iterator_2 = geo->omgeo.find(OMKey(hit2.string, hit2.pos));
-  //std::cout<<"omkey"<<geo_iterator_1<<std::endl;
-
-  double x1 = geo_iterator_1->second.position.GetX();
-  double y1 = geo_iterator_1->second.position.GetY();
-  double z1 = geo_iterator_1->second.position.GetZ();
-  double x2 = geo_iterator_2->second.position.GetX();
-  double y2 = geo_iterator_2->second.position.GetY();
-  double z2 = geo_iterator_2->second.position.GetZ();
+  unsigned index1 = GetGeoIndex(hit1);
+  unsigned index2 = GetGeoIndex(hit2);
+
+  double x1 = geoTable_->GetX(index1);
+  double y1 = geoTable_->GetY(index1);
+  double z1 = geoTable_->GetZ(index1);
+  double x2 = geoTable_->GetX(index2);
+  double y2 = geoTable_->GetY(index2);
+  double z2 = geoTable_->GetZ(index2);
   
   double diff = sqrt( pow(x2 - x1, 2) + pow(y2 - y1, 2) + pow(z2 - z1, 2) );
   
@@ -378,16 +472,15 @@ std::vector<double> FaintParticleTriggerAlgorithm::getDirection(FptHitVectorPtr
     for (int j = 0; j <= loop_end-2; j+= 2) {
         FptHit hit1 = (*timeWindowHits)[Double_Indices[j]];
         FptHit hit2 = (*timeWindowHits)[Double_Indices[j+1]]; 
-        I3OMGeoMap::const_iterator geo_iterator_1 = geo->omgeo.find(OMKey(hit1.string, hit1.pos));
-        I3OMGeoMap::const_iterator geo_iterator_2 = geo->omgeo.find(OMKey(hit2.string, hit2.pos));
-        //std::cout<<"omkey"<<geo_iterator_1<<std::endl;
-
-        double x1 = geo_iterator_1->second.position.GetX();
-        double y1 = geo_iterator_1->second.position.GetY();
-        double z1 = geo_iterator_1->second.position.GetZ();
-        double x2 = geo_iterator_2->second.position.GetX();
-        double y2 = geo_iterator_2->second.position.GetY();
-        double z2 = geo_iterator_2->second.position.GetZ();
+        unsigned index1 = GetGeoIndex(hit1);
+        unsigned index2 = GetGeoIndex(hit2);
+
+        double x1 = geoTable_->GetX(index1);
+        double y1 = geoTable_->GetY(index1);
+        double z1 = geoTable_->GetZ(index1);
+        double x2 = geoTable_->GetX(index2);
+        double y2 = geoTable_->GetY(index2);
+        double z2 = geoTable_->GetZ(index2);
         I3Direction dir1((x2-x1),(y2-y1),(z2-z1));
         Zenith_values.push_back(dir1.GetZenith()/I3Units::degree);
         Azimuth_values.push_back(dir1.GetAzimuth()/I3Units::degree);
@@ -13,6 +13,7 @@
 #include "icetray/I3Logging.h"
 #include "trigger-sim/algorithms/FptHit.h"
 #include "dataclasses/geometry/I3Geometry.h"
+#include "dataclasses/geometry/I3OMGeoTable.h"
 
 /**
 
@@ -52,7 +53,7 @@ class FaintParticleTriggerAlgorithm
 {
 
  public:
-  FaintParticleTriggerAlgorithm(double time_window,double time_window_separation, double max_trigger_length,  unsigned int hit_min,unsigned int hit_max,double double_velocity_min,double double_velocity_max, unsigned int double_min, bool use_dc_version, unsigned int triple_min,unsigned int azimuth_histogram_min,unsigned int zenith_histogram_min, double histogram_binning, double slcfraction_min, const I3GeometryConstPtr &geo);
+  FaintParticleTriggerAlgorithm(double time_window,double time_window_separation, double max_trigger_length,  unsigned int hit_min,unsigned int hit_max,double double_velocity_min,double double_velocity_max, unsigned int double_min, bool use_dc_version, unsigned int triple_min,unsigned int azimuth_histogram_min,unsigned int zenith_histogram_min, double histogram_binning, double slcfraction_min, const I3GeometryConstPtr &geo, const I3OMGeoTableConstPtr &geoTable = I3OMGeoTableConstPtr());
   ~FaintParticleTriggerAlgorithm();
 
 
@@ -67,8 +68,34 @@ class FaintParticleTriggerAlgorithm
   unsigned int TripleThreshold(FptHitVectorPtr timeWindowHits,std::vector<int> Double_Indices, const I3GeometryConstPtr &geo);
   std::vector<double> getDirection(FptHitVectorPtr timeWindowHits, std::vector<int> Double_Indices, const I3GeometryConstPtr &geo);
   std::vector<double> CalcHistogram(std::vector<double> Angles, int lower_bound, int upper_bound, int bin_size);
+
+  /**
+   * Number of pairs of hits checked for a velocity consistent double
+   * and of pairs of doubles checked for a triple in the last AddHits.
+   */
+  size_t GetNumberOfPairs() const { return nPairs_; }
+  size_t GetNumberOfTriples() const { return nTriples_; }
  private:
 
+  /**
+   * Prepares the rolling pair search for a new set of time ordered hits.
+   */
+  void ResetPairs(const FptHitVector& hits);
+
+  /**
+   * Index of the DOM of the hit in geoTable_.
+   */
+  unsigned GetGeoIndex(const FptHit& hit) const;
+
+  /**
+   * Same as DoubleThreshold for the hits [windowBegin, windowEnd), but
+   * reusing the pairs of the previous windows.  Windows have to be
+   * passed in time order.
+   */
+  std::vector<int> WindowDoubles(unsigned int windowBegin, unsigned int windowEnd);
+
+  bool IsDouble(unsigned int ind_hit_1, unsigned int ind_hit_2) const;
+
   double time_window_;
   double time_window_separation_;
   double max_trigger_length_;
@@ -88,6 +115,20 @@ class FaintParticleTriggerAlgorithm
   unsigned int triggerCount_;
   unsigned int triggerIndex_;
 
+  // the DOM positions, built from the geometry if not passed in
+  I3OMGeoTableConstPtr geoTable_;
+
+  // state of the rolling pair search over the hits of the last AddHits
+  const FptHitVector* hits_;
+  std::vector<I3Position> hitPositions_;
+  // partners_[i] are the later hits forming a double with hit i
+  std::vector<std::vector<unsigned int> > partners_;
+  unsigned int pairedBegin_;
+  unsigned int pairedEnd_;
+
+  size_t nPairs_;
+  size_t nTriples_;
+
   SET_LOGGER("FaintParticleTriggerAlgorithm");
 };
 
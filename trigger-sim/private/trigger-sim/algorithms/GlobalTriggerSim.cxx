@@ -17,6 +17,7 @@
 #include <dataclasses/I3Time.h>
 #include "trigger-sim/utilities/ReadoutWindowUtil.h"
 #include <boost/foreach.hpp>
+#include <algorithm>
 using namespace std;
 
 typedef std::map<I3TriggerStatus::Subdetector, I3TriggerReadoutConfig> roconfigmap_t;
@@ -73,6 +74,25 @@ void GlobalTriggerSim::InsertThroughputTriggers(std::vector<I3Trigger>& triggerS
 }
 
 
+namespace{
+  // orders the throughput triggers by the start of their readout window
+  bool EarlierThroughput(const I3TriggerPair* lhs, const I3TriggerPair* rhs){
+    return lhs->first.GetTriggerTime() < rhs->first.GetTriggerTime();
+  }
+}
+
+/**
+ * The throughput triggers are swept in the order of their readout
+ * windows.  A throughput trigger that starts before the end of the
+ * current window belongs to the same group and extends it, otherwise
+ * it starts a new group.  Groups of more than one throughput trigger
+ * get a MERGED parent spanning all their readout windows.
+ *
+ * The hierarchy comes out in the order the search for overlaps used to
+ * build it: every group is inserted at the front, so the latest group
+ * comes first, and the throughput triggers of a MERGED trigger are the
+ * second, the first and then the others in time order.
+ */
 I3TriggerHierarchyPtr
 GlobalTriggerSim::Merge(const I3TriggerPairVector& tpTriggers){
 
@@ -84,85 +104,58 @@ GlobalTriggerSim::Merge(const I3TriggerPairVector& tpTriggers){
     log_debug("passed a null pointer, null iterator, empty hierarchy, or incomplete tree.");
     return I3TriggerHierarchyPtr(new I3TriggerHierarchy() );
   }
-  
-  /**
-   * Each trigger has a throughput trigger as a parent, so if the size of
-   * the tree is two, this means there is only one trigger in the event.
-   */
-  if(tpTriggers.size() == 1){
-    // trivial case
-    I3TriggerHierarchyPtr th(new I3TriggerHierarchy() );
-    I3TriggerHierarchy::iterator tt_iter = th->insert( th->begin(), tpTriggers.front().first);
-    th->append_child( tt_iter, tpTriggers.front().second );
-    return th;
-  }
+
+  // sort pointers, the trigger pairs are too big to shuffle around
+  std::vector<const I3TriggerPair*> sorted;
+  sorted.reserve(tpTriggers.size());
+  BOOST_FOREACH( const I3TriggerPair& tpair, tpTriggers )
+    sorted.push_back(&tpair);
+  std::stable_sort(sorted.begin(), sorted.end(), EarlierThroughput);
 
   I3TriggerHierarchyPtr mergedTriggers(new I3TriggerHierarchy() );
 
-  BOOST_FOREACH( const I3TriggerPair& tpair, tpTriggers ){
-    
-    I3TriggerHierarchy::iterator overlap_iter = FindOverlap( mergedTriggers, tpair.first );
- 
-    if( overlap_iter == mergedTriggers->end() ){
-      // no overlap in the tree
-      I3TriggerHierarchy::iterator tt_iter = mergedTriggers->insert( mergedTriggers->begin() , tpair.first);
-      mergedTriggers->append_child( tt_iter, tpair.second );
+  std::vector<const I3TriggerPair*>::const_iterator group_begin(sorted.begin());
+  while( group_begin != sorted.end() ){
+
+    double earliest_time( (*group_begin)->first.GetTriggerTime() );
+    double latest_time( earliest_time + (*group_begin)->first.GetTriggerLength() );
+
+    std::vector<const I3TriggerPair*>::const_iterator group_end(group_begin + 1);
+    for( ; group_end != sorted.end() &&
+	   (*group_end)->first.GetTriggerTime() <= latest_time; ++group_end ){
+      double t2( (*group_end)->first.GetTriggerTime() + (*group_end)->first.GetTriggerLength() );
+      if( latest_time < t2 ) latest_time = t2;
+    }
+
+    if( group_end - group_begin == 1 ){
+      // no overlap
+      I3TriggerHierarchy::iterator tt_iter =
+	mergedTriggers->insert( mergedTriggers->begin(), (*group_begin)->first );
+      mergedTriggers->append_child( tt_iter, (*group_begin)->second );
     }else{
-      // found an overlap
-      // if it's already a MERGED we only need to add the child and expand the window
-      if( overlap_iter->GetTriggerKey().GetType() == TriggerKey::MERGED ){
-      	I3TriggerHierarchy::iterator tt_iter = mergedTriggers->append_child(overlap_iter, tpair.first);
-	mergedTriggers->append_child( tt_iter, tpair.second );	
-
-	double t1( overlap_iter->GetTriggerTime() + overlap_iter->GetTriggerLength() );
-	double t2( tpair.first.GetTriggerTime() + tpair.first.GetTriggerLength() );	
-	double latest_time( t1 < t2 ? t2 : t1 );
-	
-	double st1( overlap_iter->GetTriggerTime() );
-	double st2( tpair.first.GetTriggerTime() );
-	double earliest_time( st1 < st2 ? st1 : st2 );
-	// set the times
-	overlap_iter->SetTriggerTime( earliest_time );
-	overlap_iter->SetTriggerLength( latest_time - earliest_time );
+      // need to create a merged trigger with the TTs as children
+      TriggerKey mKey(TriggerKey::GLOBAL, TriggerKey::MERGED);
+      I3Trigger mTrigger;
+      mTrigger.GetTriggerKey() = mKey;
+      mTrigger.SetTriggerFired(true);
+      mTrigger.SetTriggerTime( earliest_time );
+      mTrigger.SetTriggerLength( latest_time - earliest_time );
+
+      I3TriggerHierarchy::iterator m_iter =
+	mergedTriggers->insert( mergedTriggers->begin(), mTrigger );
+
+      // append the TT as children ( don't forget the grand children ),
+      // the second one first, where the MERGED trigger was made
+      std::vector<const I3TriggerPair*> children(group_begin, group_end);
+      std::swap(children[0], children[1]);
+      BOOST_FOREACH( const I3TriggerPair* tpair, children ){
+	I3TriggerHierarchy::iterator tt_iter =
+	  mergedTriggers->append_child( m_iter, tpair->first );
+	mergedTriggers->append_child( tt_iter, tpair->second );
       }
-      if( overlap_iter->GetTriggerKey().GetType() == TriggerKey::THROUGHPUT ){
-	// need to create a merged trigger and reparent
-	// there are only two TT to worry about
-	
-	double st1( overlap_iter->GetTriggerTime() );
-	double st2( tpair.first.GetTriggerTime() );
-	double earliest_time( st1 < st2 ? st1 : st2 );
-
-	double lt1( overlap_iter->GetTriggerTime() + overlap_iter->GetTriggerLength() );
-	double lt2( tpair.first.GetTriggerTime() + tpair.first.GetTriggerLength() );
-	double latest_time( lt1 < lt2 ? lt2 : lt1 );
-
-	//need to create a merged trigger
-	TriggerKey mKey(TriggerKey::GLOBAL, TriggerKey::MERGED);
-	I3Trigger mTrigger;
-	mTrigger.GetTriggerKey() = mKey;
-	mTrigger.SetTriggerFired(true);
-	mTrigger.SetTriggerTime( earliest_time );
-	mTrigger.SetTriggerLength( latest_time - earliest_time );
-	 
-	// insert the merged trigger into the tree
-	I3TriggerHierarchy::iterator m_iter = 
-	  mergedTriggers->insert( mergedTriggers->begin() , mTrigger);
-
-	// append the TT as children ( don't forget the grand children )
-	I3TriggerHierarchy::iterator tt_iter = 
-	  mergedTriggers->append_child( m_iter, tpair.first );
-	mergedTriggers->append_child( tt_iter, tpair.second );
-
-	tt_iter = mergedTriggers->append_child( m_iter, *overlap_iter );
-	mergedTriggers->append_child( tt_iter, *(mergedTriggers->child( overlap_iter, 0 ) ) );
-
-	mergedTriggers->erase_children( overlap_iter );
-	mergedTriggers->erase( overlap_iter );
+    }
 
-      }
-      //need a check that it's one or the other
-    }    
+    group_begin = group_end;
   }
   return mergedTriggers;
 }
@@ -20,6 +20,7 @@ SimpleMajorityTriggerAlgorithm::SimpleMajorityTriggerAlgorithm(double triggerWin
 							       unsigned int triggerThreshold) : 
   triggerWindow_(triggerWindow),
   triggerThreshold_(triggerThreshold),
+  hits_(0),
   triggerCount_(0),
   triggerIndex_(0)
 {
@@ -34,53 +35,41 @@ SimpleMajorityTriggerAlgorithm::~SimpleMajorityTriggerAlgorithm() {}
 
 void SimpleMajorityTriggerAlgorithm::AddHits(TriggerHitVectorPtr hits)
 {
+  buffer_.clear();
+  buffer_.reserve(hits->size());
+  BOOST_FOREACH(const TriggerHit& hit, *hits)
+    buffer_.push_back(hit);
 
-  log_debug("Adding %zd hits to SimpleMajorityTigger", hits->size());
+  AddHits(buffer_);
+}
+
+void SimpleMajorityTriggerAlgorithm::AddHits(const TriggerHitBuffer& hits)
+{
+
+  log_debug("Adding %zd hits to SimpleMajorityTigger", hits.size());
 
   /*------------------------------------------------------------*
    * Check Trigger condition
    *------------------------------------------------------------*/
   TimeWindow timeWindow(triggerThreshold_, triggerWindow_);
-  triggers_.clear();
-  triggerCount_ = 0;
+  hits_ = &hits;
   triggerIndex_ = 0;
 
   // Get time windows
-  TriggerHitIterPairVectorPtr timeWindows = timeWindow.SlidingTimeWindows(hits);
+  timeWindow.SlidingTimeWindows(hits, triggerWindows_);
+  triggerCount_ = triggerWindows_.size();
 
   // If the vector is empty, there are no time windows for this string
-  if (timeWindows->empty()) {
+  if (triggerWindows_.empty()) {
     log_debug("No valid time windows for this string");
     return;
   }
-  log_debug("Found %zd triggered time windows", timeWindows->size());
-
-  // Loop over the time windows and pull out the hits in each
-  for (TriggerHitIterPairVector::const_iterator timeWindowIter = timeWindows->begin(); 
-       timeWindowIter != timeWindows->end(); 
-       timeWindowIter++) {
-
-    // Create a vector of the hits in this time window
-    TriggerHitVectorPtr timeHits(new TriggerHitVector);
-
-    // Get the window boundaries
-    TriggerHitVector::const_iterator firstHit = timeWindowIter->first;
-    TriggerHitVector::const_iterator lastHit  = timeWindowIter->second;
-
-    // Iterate over the hits and pull out the ones for this window
-    for (TriggerHitVector::const_iterator hitIter = firstHit; 
-	 hitIter != lastHit; 
-	 hitIter++)
-      timeHits->push_back(*hitIter);
-
-    log_debug("Time window (%f, %f) has %zd hits", firstHit->time, (--lastHit)->time, timeHits->size());
+  log_debug("Found %zd triggered time windows", triggerWindows_.size());
 
-    triggers_.push_back(*timeHits);
-    triggerCount_++;
-    log_debug("Trigger! Count = %d", triggerCount_);
+  BOOST_FOREACH(const TriggerHitIndexPair& w, triggerWindows_)
+    log_debug("Time window (%f, %f) has %zd hits",
+              hits.time[w.first], hits.time[w.second - 1], w.second - w.first);
 
-  } 
-  
 }
 
 unsigned int SimpleMajorityTriggerAlgorithm::GetNumberOfTriggers() {
@@ -91,7 +80,11 @@ TriggerHitVectorPtr SimpleMajorityTriggerAlgorithm::GetNextTrigger() {
   TriggerHitVectorPtr hits;
   if (triggerCount_ > 0) {
     log_debug("Returning trigger window %d", triggerIndex_);
-    hits = TriggerHitVectorPtr(new TriggerHitVector(triggers_.at(triggerIndex_)));
+    const TriggerHitIndexPair& w = triggerWindows_.at(triggerIndex_);
+    hits = TriggerHitVectorPtr(new TriggerHitVector);
+    hits->reserve(w.second - w.first);
+    for (size_t i = w.first; i < w.second; i++)
+      hits->push_back((*hits_)[i]);
     triggerCount_--;
     triggerIndex_++;
   }
@@ -14,6 +14,7 @@
 
 #include "icetray/I3Logging.h"
 #include "trigger-sim/algorithms/TriggerHit.h"
+#include "trigger-sim/algorithms/TriggerHitBuffer.h"
 
 /**
 
@@ -57,6 +58,19 @@ class SimpleMajorityTriggerAlgorithm
 
   void AddHits(TriggerHitVectorPtr hits);
 
+  /**
+   * Finds the triggers in the time ordered hits of the buffer.  The
+   * algorithm keeps its memory between calls, so keep one around and
+   * use GetTriggerWindows to avoid copying the hits of each trigger.
+   * The buffer has to outlive the calls to GetNextTrigger.
+   */
+  void AddHits(const TriggerHitBuffer& hits);
+
+  /**
+   * The hits [first, second) of each trigger, in time order.
+   */
+  const TriggerHitIndexPairVector& GetTriggerWindows() const { return triggerWindows_; }
+
   unsigned int GetNumberOfTriggers();
   TriggerHitVectorPtr GetNextTrigger();
 
@@ -65,11 +79,17 @@ class SimpleMajorityTriggerAlgorithm
   double triggerWindow_;
   unsigned int triggerThreshold_;
 
-  TriggerHitVectorVector triggers_;
+  // the hits passed in as a TriggerHitVector
+  TriggerHitBuffer buffer_;
+  const TriggerHitBuffer* hits_;
+
+  TriggerHitIndexPairVector triggerWindows_;
   unsigned int triggerCount_;
   unsigned int triggerIndex_;
 
   SET_LOGGER("SimpleMajorityTriggerAlgorithm");
 };
 
+I3_POINTER_TYPEDEFS(SimpleMajorityTriggerAlgorithm);
+
 #endif
@@ -5,10 +5,7 @@ using namespace std;
 
 TimeWindow::TimeWindow(unsigned int threshold, double window) 
   : threshold_(threshold), window_(window) 
-{
-  timeWindowHits_ = TriggerHitListPtr( new TriggerHitList() );
-  triggerWindowHits_ = TriggerHitListPtr( new TriggerHitList() );
-}
+{}
 
 TimeWindow::~TimeWindow() {}
 
@@ -20,61 +17,66 @@ TimeWindow::~TimeWindow() {}
    of each valid time window:
       std::vector<pair<TriggerHitVector::const_iterator,TriqggerHitVector::const_iterator> >
 
+   Since the hits are time ordered both the sliding time window and the
+   current trigger window are contiguous ranges of the input, so they're
+   tracked as indices (two pointers) and every hit is visited a constant
+   number of times.
  */
 TriggerHitIterPairVectorPtr TimeWindow::SlidingTimeWindows(TriggerHitVectorPtr hits)
+{
+  return SlidingTimeWindows(*hits);
+}
+
+TriggerHitIterPairVectorPtr TimeWindow::SlidingTimeWindows(const TriggerHitVector& hits)
 {
   // The return variable is a std::vector of pairs, each pair is the begin/end iterators for the time window
   TriggerHitIterPairVectorPtr triggerWindows(new TriggerHitIterPairVector());
 
-  // Initialize the trigger condition
-  bool trigger = false;
-
-  // Keep track of hits in the sliding time window
-  timeWindowHits_->clear();
+  TriggerHitIndexPairVector windows;
+  SlidingTimeWindows(TriggerHitBuffer(hits), windows);
 
-  // Keep track of hits in the current trigger window
-  triggerWindowHits_->clear();
+  triggerWindows->reserve(windows.size());
+  BOOST_FOREACH(const TriggerHitIndexPair& w, windows)
+    triggerWindows->push_back(TriggerHitIterPair(hits.begin() + w.first,
+                                                 hits.begin() + w.second));
+  return triggerWindows;
+}
 
-  // Create the begin/end pointers
-  TriggerHitVector::const_iterator beginHit;
-  TriggerHitVector::const_iterator endHit;
+void TimeWindow::SlidingTimeWindows(const TriggerHitBuffer& hits,
+                                    TriggerHitIndexPairVector& triggerWindows)
+{
+  triggerWindows.clear();
 
-  // Outer loop over all hits except the last
-  // The iteration of startingHit is controlled by the sliding of the time window
-  TriggerHitVector::const_iterator startingHit = hits->begin();
-  if(startingHit==hits->end())
+  const size_t nHits = hits.size();
+  if(nHits == 0)
   {
-    return triggerWindows;
+    return;
   }
- // while (startingHit != hits->end()) {
+
+  // Initialize the trigger condition
+  bool trigger = false;
+
+  // The sliding time window holds the hits [windowBegin, nextHit)
+  // and the current trigger window [triggerBegin, triggerEnd]
+  size_t windowBegin = 0;
+  size_t triggerBegin = 0;
+  size_t triggerEnd = 0;
 
   // Define the times of this trigger window
-  double startTime = startingHit->time;
+  double startTime = hits.time[windowBegin];
   double stopTime  = startTime + window_;
   log_debug("New starting hit! TimeWindow = (%f, %f)", startTime, stopTime);
 
-  // Push the startingHit into the timeWindowHits if its empty
-  //if (timeWindowHits_->empty())
-  timeWindowHits_->push_back(*startingHit);
-
-  DumpHits(*timeWindowHits_, " TimeWindowHits:", "   ");
-
-  // Initialize the counter (including startingHit)
-  unsigned int count = timeWindowHits_->size(); // holds the number of hits within the sliding timewindow
-//  unsigned int trigger_hit_count=0;
-
-  // Initialize the begin/end pointers if the trigger is not active
-  if (!trigger) {
-    beginHit = startingHit;
-    endHit = hits->end();
-  }
+  // holds the number of hits within the sliding timewindow
+  unsigned int count = 1;
 
-  // Inner loop over all later hits
-  TriggerHitVector::const_iterator nextHit;
-  for (nextHit = startingHit + 1; nextHit != hits->end(); nextHit++) {
+  // Loop over all later hits
+  for (size_t nextHit = 1; nextHit < nHits; nextHit++) {
 
     // The time of the next hit
-    double nextTime = nextHit->time;
+    const double nextTime = hits.time[nextHit];
+    // we are at the last hit, this is in simulation only.... form a trigger if there is one...
+    const bool lastHit = (nextHit == nHits - 1);
     log_debug("  NextTime = %f", nextTime);
 
     // Check if it falls in the time window
@@ -86,203 +88,101 @@ TriggerHitIterPairVectorPtr TimeWindow::SlidingTimeWindows(TriggerHitVectorPtr h
     else if (nextTime <= stopTime)
     {
       // in window, increment counter
-      timeWindowHits_->push_back(*nextHit);
-      count = timeWindowHits_->size();
+      count++;
 
       if(trigger)
       {
-      	triggerWindowHits_->push_back(*nextHit);
-
-
-
-      //   trigger_hit_count=triggerWindowHits_->size();
+        triggerEnd = nextHit;
       }
 
-      if(nextHit == (hits->end()-1)) // we are at the last hit, this is in simulation only.... form a trigger if there is one...
+      if(lastHit && (trigger || count >= threshold_))
       {
-      	log_debug("special case;;;;;; we are at the last hit adn still in window");
-      	if(trigger || (!trigger && (timeWindowHits_->size() >= threshold_)) )
-      	{
-	  log_debug("yeah"); 
-
-	  if(!trigger)
-	  {
-	    CopyHits(*timeWindowHits_, *triggerWindowHits_); 
-	  }
-
-      	  double trigger_start=triggerWindowHits_->front().time;
-      	  double trigger_end=triggerWindowHits_->back().time;
-
-      	  for(beginHit=hits->begin(); beginHit!=hits->end(); beginHit++)
-      	  {
-      	    if(beginHit->time == trigger_start)
-      	    {
-	      log_debug("trigger_start: %f", trigger_start);
-      	      break;
-      	    }
-      	  }
-      	  for(endHit=hits->begin(); endHit!=hits->end(); endHit++)
-      	  {
-      	    if(endHit->time == trigger_end)
-      	    {
-	      log_debug("trigger_end: %f", trigger_end);
-      	      break;
-      	    }
-      	  }
-
-
-       //   beginHit=triggerWindowHits_->begin();
-	//  endHit=(triggerWindowHits_->end()-1);
-
-	  TriggerHitIterPair triggerWindow(beginHit, (endHit+1));
-	  triggerWindows->push_back(triggerWindow);
-	  DumpHits(*triggerWindowHits_, "      TriggerWindowHits:", "      ");
-	 }
-
-       //  break; // break the whole loop
-
-       }  
-
+        log_debug("special case;;;;;; we are at the last hit adn still in window");
+        if(!trigger)
+        {
+          triggerBegin = windowBegin;
+          triggerEnd = nextHit;
+        }
+        triggerWindows.push_back(MakeWindow(hits, triggerBegin, triggerEnd));
+        DumpHits(hits, triggerBegin, triggerEnd, "      TriggerWindowHits:", "      ");
+      }
 
       log_debug("    Hit inside window, counter = %d", count);
-      DumpHits(*timeWindowHits_, "    TimeWindowHits:", "      ");
+      DumpHits(hits, windowBegin, nextHit, "    TimeWindowHits:", "      ");
     } else {
       // Hit is beyond window, must slide window
       log_debug("    Hit outside window, sliding...");
 
       // First check if the current window is above threshold
       if (count >= threshold_) { 
-	log_debug("      Window is above threshold");
-	// First time we are above threshold, so no trigger yet, 
-	// then define beginHit for this trigger!!
-	if(!trigger){
-	 // beginHit =  startingHit;
-	  CopyHits(*timeWindowHits_, *triggerWindowHits_); 
-      //    trigger_hit_count=triggerWindowHits_->size();
-	  DumpHits(*triggerWindowHits_, "      TriggerWindowHits:", "      ");
-
-
-	  log_debug("StartTime of trigger: %lf",beginHit->time);
-	}
-	trigger = true;
-	//endHit = nextHit;  
+        log_debug("      Window is above threshold");
+        // First time we are above threshold, so no trigger yet, 
+        // then the trigger window starts with the time window.
+        if(!trigger){
+          triggerBegin = windowBegin;
+          triggerEnd = nextHit - 1;
+          DumpHits(hits, triggerBegin, triggerEnd, "      TriggerWindowHits:", "      ");
+          log_debug("StartTime of trigger: %lf", hits.time[triggerBegin]);
+        }
+        trigger = true;
       }
 
-      // Copy new hits into the triggerWindowHits
-
       // Now slide the window
-      //  slide until either next hit is inside or count goes to zero
-      bool inWindow = true;
-      if (nextTime > stopTime)
-      {
-	 inWindow=false;
-      }
-
-      log_debug("nextTime: %f, stopTime: %f", nextTime, stopTime);
-
+      //  slide until either next hit is inside or count goes to one
+      bool inWindow = false;
       while ((!inWindow) && (count > 1))
       {
-	//startingHit++;
-        timeWindowHits_->pop_front();
-        count = timeWindowHits_->size();
-      	log_debug("nextTime: %f, stopTime: %f", nextTime, stopTime);
-	// new time window
-	startTime = timeWindowHits_->front().time;
-	stopTime = startTime + window_;
-	log_debug("      New TimeWindow = (%f, %f)  Count = %d", startTime, stopTime, count);
-	DumpHits(*timeWindowHits_, "      TimeWindowHits:", "        ");
-
-	if (nextTime <= stopTime) {
-	  inWindow = true;
-	}
+        windowBegin++;
+        count--;
+        // new time window
+        startTime = hits.time[windowBegin];
+        stopTime = startTime + window_;
+        log_debug("      New TimeWindow = (%f, %f)  Count = %d", startTime, stopTime, count);
+
+        if (nextTime <= stopTime) {
+          inWindow = true;
+        }
       }
 
       if(!inWindow) // the prior while loop broke because count was 1
       {
-	timeWindowHits_->pop_front();
-
-	timeWindowHits_->push_back(*nextHit);
-	startTime = timeWindowHits_->front().time;
-	stopTime = startTime + window_;
-
-	count = timeWindowHits_->size();
-
-
+        // the next hit starts a new window
+        windowBegin = nextHit;
+        startTime = hits.time[windowBegin];
+        stopTime = startTime + window_;
+        count = 1;
       }
       else // Hit really falls into the window and count is bigger than 1
       {
-	// just push it back
-	timeWindowHits_->push_back(*nextHit);
-	count = timeWindowHits_->size();
+        count++;
       }
 
       if(trigger)
       {
-	log_debug("am in trigger...");
-
-	DumpHits(*triggerWindowHits_, "  overlap..     TriggerWindowHits:", "        ");
-
-	bool overlap = Overlap(*timeWindowHits_, *triggerWindowHits_);
-	if( ((count < threshold_) && (!overlap)) || (count==1 && threshold_== 1) || nextHit == (hits->end()-1))
-	{
-	  log_debug("form a trigger...");
-	  if( nextHit == (hits->end()-1) && (overlap)) // if we overlap we have to take it - simulation/daq issue
-	  {
-	    triggerWindowHits_->push_back(*nextHit);
-	  }
-      /*    for(int i = 0; i < (int)triggerWindowHits_->size(); i++)
-	  {
-
-
-
-	  }*/
-
-	  double trigger_start=triggerWindowHits_->front().time;
-	  double trigger_end=triggerWindowHits_->back().time;
-
-	  for(beginHit=hits->begin(); beginHit!=hits->end(); beginHit++)
-	  {
-	    if(beginHit->time == trigger_start)
-	    {
-	      break;
-	    }
-	  }
-	  for(endHit=hits->begin(); endHit!=hits->end(); endHit++)
-	  {
-	    if(endHit->time == trigger_end)
-	    {
-	      break;
-	    }
-	  }
-
-
-       //   beginHit=triggerWindowHits_->begin();
-	//  endHit=(triggerWindowHits_->end()-1);
-
-	  TriggerHitIterPair triggerWindow(beginHit, (endHit+1));
-	  triggerWindows->push_back(triggerWindow);
-	  DumpHits(*triggerWindowHits_, "       TriggerWindowHits:", "        ");
-	  trigger=false;
-	  triggerWindowHits_->clear();
-
-
-	}
-	else
-	{
-	  triggerWindowHits_->push_back(*nextHit);
-
-	}
-
+        log_debug("am in trigger...");
+
+        bool overlap = Overlap(hits, windowBegin, nextHit, triggerBegin, triggerEnd);
+        if( ((count < threshold_) && (!overlap)) || (count==1 && threshold_== 1) || lastHit)
+        {
+          log_debug("form a trigger...");
+          if(lastHit && overlap) // if we overlap we have to take it - simulation/daq issue
+          {
+            triggerEnd = nextHit;
+          }
+
+          triggerWindows.push_back(MakeWindow(hits, triggerBegin, triggerEnd));
+          DumpHits(hits, triggerBegin, triggerEnd, "       TriggerWindowHits:", "        ");
+          trigger=false;
+        }
+        else
+        {
+          triggerEnd = nextHit;
+        }
       }
-      // Check for overlap
     } // end time window check
 
-  } // end inner loop
-  timeWindowHits_->clear();
-  log_debug("      Reached end of inner loop...");
-  DumpHits(*timeWindowHits_, "       TimeWindowHits:", "        ");
-
-  return triggerWindows;
+  } // end loop
+  log_debug("      Reached end of loop...");
 }
 
 /**
@@ -366,45 +266,57 @@ TriggerHitIterPairVectorPtr TimeWindow::FixedTimeWindows(TriggerHitVectorPtr hit
   return triggerWindows;
 }
 
-TriggerHitIterPairVectorPtr TimeWindow::SlidingTimeWindows(TriggerHitVector& hits)
+void TimeWindow::DumpHits(const TriggerHitBuffer& hits, size_t first, size_t last,
+                          const char* head, const char* pad)
 {
 
-  TriggerHitVectorPtr hitsPtr(new TriggerHitVector(hits));
-  return SlidingTimeWindows(hitsPtr);
+  log_debug("%s", head);
+  for(size_t n = first; n <= last && n < hits.size(); n++)
+    log_debug("%sHit %zu @ Time %f", pad, n - first, hits.time[n]);
 
 }
 
-void TimeWindow::DumpHits(TriggerHitList& hits, const string& head, const string& pad)
+/**
+   Whether the sliding time window [windowBegin, windowEnd] shares a hit
+   with the trigger window [triggerBegin, triggerEnd].  Both are ranges
+   of the same time ordered hits, so this is mostly an index comparison.
+   Identical hits (same time, position and string) also count as shared.
+ */
+bool TimeWindow::Overlap(const TriggerHitBuffer& hits, size_t windowBegin, size_t windowEnd,
+                         size_t triggerBegin, size_t triggerEnd)
 {
-
-  log_debug("%s", head.c_str());
-  int n = 0;
-  BOOST_FOREACH( const TriggerHit& hit __attribute__((unused)), hits ) {
-    log_debug("%sHit %d @ Time %f", pad.c_str(), n, hit.time);
-    n++;
-  }
-
+  if (windowBegin <= triggerEnd && triggerBegin <= windowEnd)
+    return true;
+
+  // identical hits can only be found among the ones
+  // with the same time at the edges of the two ranges
+  const double edgeTime = hits.time[triggerEnd];
+  for (size_t w = windowBegin; w <= windowEnd && hits.time[w] == edgeTime; w++)
+    for (size_t t = triggerEnd + 1; t-- > triggerBegin && hits.time[t] == edgeTime; )
+      if (hits.Equal(t, w))
+        return true;
+
+  return false;
 }
 
-void TimeWindow::CopyHits(TriggerHitList& sourceHits, TriggerHitList& destHits)
+/**
+   Makes the window [first, second) for the trigger window [triggerBegin, triggerEnd].
+   Hits with the same time as the first or last hit in the trigger window
+   are resolved to the first of them in the input.
+ */
+TriggerHitIndexPair TimeWindow::MakeWindow(const TriggerHitBuffer& hits,
+                                           size_t triggerBegin, size_t triggerEnd)
 {
+  size_t beginHit = triggerBegin;
+  while (beginHit > 0 && hits.time[beginHit - 1] == hits.time[triggerBegin])
+    beginHit--;
 
-  // Copy from source to dest IFF source does not already exist in dest
-  BOOST_FOREACH( TriggerHit sourceHit, sourceHits ) {
-    if (find(destHits.begin(), destHits.end(), sourceHit) == destHits.end())
-      destHits.push_back(sourceHit);
-  }
+  size_t endHit = triggerEnd;
+  while (endHit > 0 && hits.time[endHit - 1] == hits.time[triggerEnd])
+    endHit--;
 
-}
+  log_debug("trigger_start: %f", hits.time[beginHit]);
+  log_debug("trigger_end: %f", hits.time[endHit]);
 
-bool TimeWindow::Overlap(TriggerHitList& hits1, TriggerHitList& hits2)
-{
-  bool overlap = false;
-  BOOST_FOREACH( TriggerHit hit1, hits1 ) {
-    if (find(hits2.begin(), hits2.end(), hit1) != hits2.end()) {
-      overlap = true;
-      break;
-    }
-  }
-  return overlap;
+  return TriggerHitIndexPair(beginHit, endHit + 1);
 }
@@ -3,6 +3,7 @@
 
 #include <string>
 #include "trigger-sim/algorithms/TriggerHit.h"
+#include "trigger-sim/algorithms/TriggerHitBuffer.h"
 #include "icetray/I3Logging.h"
 
 /**
@@ -22,9 +23,19 @@ class TimeWindow
 
   /**
    * Sliding time windows
+   * The hits have to be time ordered and the returned iterators
+   * point into the vector that's passed in.
    */
   TriggerHitIterPairVectorPtr SlidingTimeWindows(TriggerHitVectorPtr hits);
-  TriggerHitIterPairVectorPtr SlidingTimeWindows(TriggerHitVector& hits);
+  TriggerHitIterPairVectorPtr SlidingTimeWindows(const TriggerHitVector& hits);
+
+  /**
+   * Same as above for the hits in a buffer.  The windows replace the
+   * contents of triggerWindows, so reusing the same vector for every
+   * event avoids allocating a new one.
+   */
+  void SlidingTimeWindows(const TriggerHitBuffer& hits,
+                          TriggerHitIndexPairVector& triggerWindows);
 
   /**
    * Fixed time windows
@@ -38,16 +49,16 @@ class TimeWindow
    */
   TimeWindow();
 
-  void DumpHits(TriggerHitList& hits, const std::string& head, const std::string& pad);
-  void CopyHits(TriggerHitList& sourceHits, TriggerHitList& destHits);
-  bool Overlap(TriggerHitList& hits1, TriggerHitList& hits2);
+  void DumpHits(const TriggerHitBuffer& hits, size_t first, size_t last,
+                const char* head, const char* pad);
+  bool Overlap(const TriggerHitBuffer& hits, size_t windowBegin, size_t windowEnd,
+               size_t triggerBegin, size_t triggerEnd);
+  TriggerHitIndexPair MakeWindow(const TriggerHitBuffer& hits,
+                                 size_t triggerBegin, size_t triggerEnd);
 
   unsigned int threshold_;
   double window_;
 
-  TriggerHitListPtr timeWindowHits_;
-  TriggerHitListPtr triggerWindowHits_;
-
   SET_LOGGER("TimeWindow");
 };
 
@@ -0,0 +1,134 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerCollector.cxx
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#include <boost/foreach.hpp>
+
+#include <serialization/vector.hpp>
+
+#include "trigger-sim/algorithms/TriggerCollector.h"
+
+TriggerCollector::~TriggerCollector() {}
+
+std::vector<I3Trigger> TriggerCollector::GetTriggers() const
+{
+  std::vector<I3Trigger> triggers(front_.rbegin(), front_.rend());
+  triggers.insert(triggers.end(), back_.begin(), back_.end());
+  return triggers;
+}
+
+I3TriggerHierarchyPtr
+TriggerCollector::MakeHierarchy(const I3TriggerHierarchyConstPtr& old) const
+{
+  I3TriggerHierarchyPtr triggers = old ?
+    I3TriggerHierarchyPtr(new I3TriggerHierarchy(*old)) :
+    I3TriggerHierarchyPtr(new I3TriggerHierarchy);
+
+  BOOST_FOREACH(const I3Trigger& t, front_)
+    triggers->insert(triggers->begin(), t);
+  BOOST_FOREACH(const I3Trigger& t, back_)
+    triggers->insert(triggers->end(), t);
+
+  return triggers;
+}
+
+void TriggerCollector::AddTriggers(I3Frame& frame,
+                                   const std::string& collectorName,
+                                   const std::string& triggerName,
+                                   const std::vector<I3Trigger>& triggers,
+                                   bool front)
+{
+  if(collectorName.empty()){
+    // Check to see if a trigger hierarchy already exists
+    I3TriggerHierarchyPtr hierarchy;
+    if(frame.Has(triggerName)){
+      const I3TriggerHierarchy& old_th = frame.Get<I3TriggerHierarchy>(triggerName);
+      hierarchy = I3TriggerHierarchyPtr(new I3TriggerHierarchy(old_th));
+      frame.Delete(triggerName);
+    }else{
+      hierarchy = I3TriggerHierarchyPtr(new I3TriggerHierarchy);
+    }
+
+    // Fill the trigger hierarchy
+    BOOST_FOREACH(const I3Trigger& t, triggers)
+      hierarchy->insert(front ? hierarchy->begin() : hierarchy->end(), t);
+
+    frame.Put(triggerName, hierarchy);
+    return;
+  }
+
+  // The collector only holds the triggers found in this frame, so
+  // copying it is cheap, unlike copying the hierarchy.
+  TriggerCollectorPtr collector;
+  if(frame.Has(collectorName)){
+    TriggerCollectorConstPtr old = frame.Get<TriggerCollectorConstPtr>(collectorName);
+    if(!old)
+      log_fatal("The frame object %s is not a TriggerCollector.", collectorName.c_str());
+    collector = TriggerCollectorPtr(new TriggerCollector(*old));
+    frame.Delete(collectorName);
+  }else{
+    collector = TriggerCollectorPtr(new TriggerCollector);
+  }
+
+  BOOST_FOREACH(const I3Trigger& t, triggers){
+    if(front)
+      collector->PushFront(t);
+    else
+      collector->PushBack(t);
+  }
+
+  frame.Put(collectorName, collector);
+}
+
+I3TriggerHierarchyConstPtr TriggerCollector::Finish(I3Frame& frame,
+                                                    const std::string& collectorName,
+                                                    const std::string& triggerName)
+{
+  I3TriggerHierarchyConstPtr old = frame.Get<I3TriggerHierarchyConstPtr>(triggerName);
+  if(collectorName.empty() || !frame.Has(collectorName))
+    return old;
+
+  TriggerCollectorConstPtr collector = frame.Get<TriggerCollectorConstPtr>(collectorName);
+  if(!collector)
+    log_fatal("The frame object %s is not a TriggerCollector.", collectorName.c_str());
+  log_debug("Making %s from %zu collected triggers", triggerName.c_str(), collector->size());
+
+  I3TriggerHierarchyConstPtr triggers = collector->MakeHierarchy(old);
+  frame.Delete(collectorName);
+  if(frame.Has(triggerName))
+    frame.Delete(triggerName);
+  frame.Put(triggerName, triggers);
+  return triggers;
+}
+
+template <class Archive>
+void
+TriggerCollector::serialize(Archive& ar, unsigned version)
+{
+  ar & make_nvp("I3FrameObject", base_object<I3FrameObject>(*this));
+  ar & make_nvp("Front", front_);
+  ar & make_nvp("Back", back_);
+}
+
+std::ostream& TriggerCollector::Print(std::ostream& oss) const
+{
+  oss << "[ TriggerCollector : " << size() << " triggers" << std::endl;
+  BOOST_FOREACH(const I3Trigger& t, GetTriggers())
+    oss << "    " << t << std::endl;
+  oss << "]";
+  return oss;
+}
+
+std::ostream& operator<<(std::ostream& oss, const TriggerCollector& c)
+{
+  return c.Print(oss);
+}
+
+I3_SERIALIZABLE(TriggerCollector);
@@ -0,0 +1,61 @@
+#include "trigger-sim/algorithms/TriggerHitBuffer.h"
+#include <algorithm>
+
+namespace{
+  // whether v has to allocate to take n elements
+  template<class T>
+  bool Grows(const std::vector<T>& v, size_t n){ return n > v.capacity(); }
+}
+
+TriggerHitBuffer::TriggerHitBuffer(const TriggerHitVector& hits) :
+  growths_(0)
+{
+  reserve(hits.size());
+  for(TriggerHitVector::const_iterator i = hits.begin(); i != hits.end(); i++)
+    push_back(*i);
+}
+
+void TriggerHitBuffer::clear()
+{
+  time.clear();
+  pos.clear();
+  string.clear();
+}
+
+void TriggerHitBuffer::reserve(size_t n)
+{
+  growths_ += Grows(time, n) + Grows(pos, n) + Grows(string, n);
+  time.reserve(n);
+  pos.reserve(n);
+  string.reserve(n);
+}
+
+void TriggerHitBuffer::SortByTime()
+{
+  const size_t n = size();
+
+  // nothing to do for hits that are already time ordered,
+  // e.g. the ones from a TriggerHitTable
+  bool ordered(true);
+  for(size_t i = 1; i < n && ordered; i++)
+    ordered = !(time[i] < time[i-1]);
+  if(ordered) return;
+
+  // sort (time, index) pairs, the index breaks ties,
+  // then gather the other columns in that order
+  growths_ += Grows(order_, n) + Grows(posScratch_, n) + Grows(stringScratch_, n);
+  order_.resize(n);
+  for(size_t i = 0; i < n; i++)
+    order_[i] = std::make_pair(time[i], i);
+  std::sort(order_.begin(), order_.end());
+
+  posScratch_.resize(n);
+  stringScratch_.resize(n);
+  for(size_t i = 0; i < n; i++){
+    time[i] = order_[i].first;
+    posScratch_[i] = pos[order_[i].second];
+    stringScratch_[i] = string[order_[i].second];
+  }
+  pos.swap(posScratch_);
+  string.swap(stringScratch_);
+}
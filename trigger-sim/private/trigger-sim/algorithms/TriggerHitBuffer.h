@@ -0,0 +1,88 @@
+#ifndef TRIGGER_HIT_BUFFER_H
+#define TRIGGER_HIT_BUFFER_H
+
+#include <vector>
+#include <utility>
+#include <cstddef>
+#include "trigger-sim/algorithms/TriggerHit.h"
+
+/**
+ * @brief The hits of an event stored as columns (time, pos, string)
+ * instead of a vector of TriggerHits.
+ *
+ * The trigger modules keep one of these and refill it every frame.
+ * clear() keeps the memory, so once the buffer has seen the largest
+ * event its columns and sort scratch space don't grow again.
+ */
+
+class TriggerHitBuffer
+{
+ public:
+  TriggerHitBuffer() : growths_(0) {}
+  explicit TriggerHitBuffer(const TriggerHitVector& hits);
+
+  size_t size() const { return time.size(); }
+  bool empty() const { return time.empty(); }
+
+  /**
+   * Removes the hits, but keeps the memory.
+   */
+  void clear();
+  void reserve(size_t n);
+
+  void push_back(double aTime, unsigned int aPos, int aString)
+  {
+    if(time.size() == time.capacity()) growths_++;
+    if(pos.size() == pos.capacity()) growths_++;
+    if(string.size() == string.capacity()) growths_++;
+    time.push_back(aTime);
+    pos.push_back(aPos);
+    string.push_back(aString);
+  }
+
+  void push_back(const TriggerHit& hit) { push_back(hit.time, hit.pos, hit.string); }
+
+  TriggerHit operator[](size_t i) const { return TriggerHit(time[i], pos[i], string[i]); }
+
+  /**
+   * Same as TriggerHit::operator==, without making the TriggerHits.
+   */
+  bool Equal(size_t i, size_t j) const
+  {
+    return time[i] == time[j] && pos[i] == pos[j] && string[i] == string[j];
+  }
+
+  /**
+   * Time orders the hits.  Hits with the same time keep their order.
+   */
+  void SortByTime();
+
+  /**
+   * Number of times a column or the scratch space of SortByTime had to
+   * grow, i.e. allocate, since the buffer was made.  Filled through
+   * push_back, reserve and SortByTime only.
+   */
+  size_t GetGrowths() const { return growths_; }
+
+  std::vector<double> time;
+  std::vector<unsigned int> pos;
+  std::vector<int> string;
+
+ private:
+  // scratch space for SortByTime, kept to reuse the memory
+  std::vector<std::pair<double, size_t> > order_;
+  std::vector<unsigned int> posScratch_;
+  std::vector<int> stringScratch_;
+
+  size_t growths_;
+};
+
+/**
+ * The hits [first, second) of a TriggerHitBuffer.
+ */
+typedef std::pair<size_t, size_t> TriggerHitIndexPair;
+typedef std::vector<TriggerHitIndexPair> TriggerHitIndexPairVector;
+
+I3_POINTER_TYPEDEFS(TriggerHitBuffer);
+
+#endif // TRIGGER_HIT_BUFFER_H
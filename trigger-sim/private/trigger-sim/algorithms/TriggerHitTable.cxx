@@ -0,0 +1,96 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerHitTable.cxx
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#include <algorithm>
+
+#include <boost/foreach.hpp>
+
+#include <serialization/vector.hpp>
+#include <serialization/string.hpp>
+
+#include "trigger-sim/algorithms/TriggerHitTable.h"
+#include "trigger-sim/utilities/DOMSetFunctions.h"
+
+TriggerHitTable::TriggerHitTable(const std::string& sourceName,
+                                 const I3DOMLaunchSeriesMap& launches,
+                                 const I3MapKeyVectorIntConstPtr& domSets) :
+  sourceName_(sourceName)
+{
+  Fill(launches, *DOMSetFunctions::GetDOMSetTable(domSets));
+}
+
+TriggerHitTable::TriggerHitTable(const std::string& sourceName,
+                                 const I3DOMLaunchSeriesMap& launches,
+                                 const DOMSetTable& domSets) :
+  sourceName_(sourceName)
+{
+  Fill(launches, domSets);
+}
+
+void TriggerHitTable::Fill(const I3DOMLaunchSeriesMap& launches,
+                           const DOMSetTable& domSets)
+{
+  size_t nLaunches(0);
+  BOOST_FOREACH(I3DOMLaunchSeriesMap::const_reference r, launches)
+    nLaunches += r.second.size();
+  hits_.reserve(nLaunches);
+
+  BOOST_FOREACH(I3DOMLaunchSeriesMap::const_reference r, launches){
+    // the DOMSet membership only depends on the DOM,
+    // so only look it up once and not for every launch.
+    const uint32_t mask = domSets.GetMask(r.first);
+    BOOST_FOREACH(const I3DOMLaunch& launch, r.second)
+      hits_.push_back(Hit(launch.GetStartTime(), r.first, launch.GetLCBit(), mask));
+  }
+
+  // stable, so hits with equal times stay in OMKey order
+  std::stable_sort(hits_.begin(), hits_.end());
+
+  log_debug("Extracted %zu hits from %s", hits_.size(), sourceName_.c_str());
+}
+
+TriggerHitTable::~TriggerHitTable() {}
+
+template <class Archive>
+void
+TriggerHitTable::Hit::serialize(Archive& ar, unsigned version)
+{
+  ar & make_nvp("Time", time);
+  ar & make_nvp("OMKey", omKey);
+  ar & make_nvp("LC", lc);
+  ar & make_nvp("DOMSetMask", domSetMask);
+}
+
+template <class Archive>
+void
+TriggerHitTable::serialize(Archive& ar, unsigned version)
+{
+  ar & make_nvp("I3FrameObject", base_object<I3FrameObject>(*this));
+  ar & make_nvp("SourceName", sourceName_);
+  ar & make_nvp("Hits", hits_);
+}
+
+std::ostream& TriggerHitTable::Print(std::ostream& oss) const
+{
+  oss << "[ TriggerHitTable (" << sourceName_ << ") : " << hits_.size() << " hits" << std::endl;
+  BOOST_FOREACH(const Hit& h, hits_)
+    oss << "    " << h.omKey << " t = " << h.time
+        << " lc = " << h.lc << " domsets = 0x" << std::hex << h.domSetMask << std::dec << std::endl;
+  oss << "]";
+  return oss;
+}
+
+std::ostream& operator<<(std::ostream& oss, const TriggerHitTable& t)
+{
+  return t.Print(oss);
+}
+
+I3_SERIALIZABLE(TriggerHitTable);
@@ -10,6 +10,7 @@
  */
 
 #include <trigger-sim/modules/ClusterTrigger.h>
+#include <trigger-sim/algorithms/TriggerCollector.h>
 #include <trigger-sim/algorithms/ClusterTriggerAlgorithm.h>
 #include <icetray/OMKey.h>
 #include <dataclasses/I3Vector.h>
@@ -25,10 +26,6 @@
 
 using namespace boost::assign;
 using DetectorStatusUtils::tk_ts_pair_t;
-using DetectorStatusUtils::_sourceID;
-using DetectorStatusUtils::_typeID;
-using DetectorStatusUtils::_configID;
-using DetectorStatusUtils::GetTriggerStatus;
 
 I3_MODULE(ClusterTrigger);
 const TriggerKey::SourceID SOURCEID(TriggerKey::IN_ICE);
@@ -47,6 +44,10 @@ ClusterTrigger::ClusterTrigger(const I3Context& context) :
   dataReadoutName_("InIceRawData"),
   triggerName_("I3Triggers"),
   domSetsName_("DOMSets"),
+  detectorStatusName_("I3DetectorStatus"),
+  triggerHitTableName_(""),
+  triggerCollectorName_(""),
+  profileName_(""),
   configIDParam_(INT_MIN),
   triggerWindow_(NAN),
   triggerThreshold_(INT_MAX),
@@ -71,6 +72,27 @@ ClusterTrigger::ClusterTrigger(const I3Context& context) :
            "Name of the I3MapKeyVectorInt defining the DomSets for each DOM.",
            domSetsName_);
 
+  AddParameter("DetectorStatusName",
+           "Name of the I3DetectorStatus to take the trigger configuration from.",
+           detectorStatusName_);
+
+  AddParameter("TriggerHitTableName",
+	       "Name of the TriggerHitTable made by the TriggerHitExtractor. "
+	       "If set and found in the frame the hits are taken from there "
+	       "instead of the DOM launches.",
+	       triggerHitTableName_);
+
+  AddParameter("TriggerCollectorName",
+	       "Name of the TriggerCollector to add the triggers to.  If set, "
+	       "I3GlobalTriggerSim makes the I3TriggerHierarchy from it, "
+	       "otherwise the triggers are added to TriggerName right away.",
+	       triggerCollectorName_);
+
+  AddParameter("ProfileName",
+	       "If set, the time and the number of hits of every frame are put "
+	       "into the frame under this name and summed up at Finish.",
+	       profileName_);
+
   AddOutBox("OutBox");
 }
 
@@ -82,6 +104,13 @@ void ClusterTrigger::Configure()
   GetParameter("TriggerName",triggerName_);
   GetParameter("TriggerConfigID",configIDParam_);
   GetParameter("DOMSetsName", domSetsName_);
+  GetParameter("DetectorStatusName", detectorStatusName_);
+  GetParameter("TriggerHitTableName", triggerHitTableName_);
+  GetParameter("TriggerCollectorName", triggerCollectorName_);
+  GetParameter("ProfileName", profileName_);
+
+  if(profileName_.size())
+    profile_ = TriggerProfilePtr(new TriggerProfile(GetName()));
 
   if(configIDParam_ != INT_MIN)
     configID_ = configIDParam_;
@@ -89,13 +118,17 @@ void ClusterTrigger::Configure()
 
 void ClusterTrigger::DAQ(I3FramePtr frame)
 {
+  if(profile_) profile_->Start();
 
   // Get the DOMSets from the frame
   I3MapKeyVectorIntConstPtr domSets = 
     frame->Get<I3MapKeyVectorIntConstPtr>(domSetsName_);
+  domSetTable_ = DOMSetFunctions::GetDOMSetTable(domSets, domSetTable_);
 
   // Create the trigger object
-  ClusterTriggerAlgorithm stringTrigger(triggerWindow_, triggerThreshold_, coherenceLength_);
+  if(!stringTrigger_)
+    stringTrigger_ = ClusterTriggerAlgorithmPtr
+      (new ClusterTriggerAlgorithm(triggerWindow_, triggerThreshold_, coherenceLength_));
 
   log_debug("Checking for StringTriggers...");
   eventCount_++;
@@ -105,40 +138,63 @@ void ClusterTrigger::DAQ(I3FramePtr frame)
   /*------------------------------------------------------------*
    * Get DomLaunchSeriesMap from frame
    *------------------------------------------------------------*/
+  TriggerHitTableConstPtr hitTable;
+  if(triggerHitTableName_.size()){
+    hitTable = frame->Get<TriggerHitTableConstPtr>(triggerHitTableName_);
+    if(hitTable && hitTable->GetSourceName() != dataReadoutName_)
+      log_fatal("The TriggerHitTable %s was made from %s, not %s.",
+		triggerHitTableName_.c_str(),
+		hitTable->GetSourceName().c_str(),
+		dataReadoutName_.c_str());
+  }
+
   I3DOMLaunchSeriesMapConstPtr fullMap = 
     frame->Get<I3DOMLaunchSeriesMapConstPtr>(dataReadoutName_);
 
-  if (fullMap == 0) {
+  if (fullMap == 0 && !hitTable) {
     log_debug("Frame does not contain an I3DOMLaunchSeriesMap named %s", 
 	      dataReadoutName_.c_str());
   } else {
 
-    // count the hits
-    int count = 0;
-    I3DOMLaunchSeriesMap::const_iterator mapIter;
-    for (mapIter = fullMap->begin(); mapIter != fullMap->end(); mapIter++) {
-      I3DOMLaunchSeries::const_iterator seriesIter;
-      for (seriesIter = mapIter->second.begin(); 
-	   seriesIter != mapIter->second.end(); 
-	   seriesIter++) count++;
-    }
-    log_debug("Got %d hits", count);
+    // the buffer only allocates when it has to grow
+    const size_t growths(hits_.GetGrowths());
+    hits_.clear();
+
+    if (hitTable) {
+      // already extracted and time ordered
+      log_debug("Got %zu hits from %s", hitTable->size(), triggerHitTableName_.c_str());
+      FillHits(*hitTable, hits_);
+    } else {
+      // count the hits
+      int count = 0;
+      I3DOMLaunchSeriesMap::const_iterator mapIter;
+      for (mapIter = fullMap->begin(); mapIter != fullMap->end(); mapIter++) {
+        I3DOMLaunchSeries::const_iterator seriesIter;
+        for (seriesIter = mapIter->second.begin(); 
+             seriesIter != mapIter->second.end(); 
+             seriesIter++) count++;
+      }
+      log_debug("Got %d hits", count);
 
-    /*------------------------------------------------------------*
-     * Fill the TriggerHits
-     *------------------------------------------------------------*/
-    TriggerHitVectorPtr hits(new TriggerHitVector);
-    FillHits(fullMap, hits, domSets);
+      /*------------------------------------------------------------*
+       * Fill the TriggerHits
+       *------------------------------------------------------------*/
+      FillHits(fullMap, hits_, *domSetTable_);
 
-    std::sort(hits->begin(), hits->end());
-    Dump(hits);
+      hits_.SortByTime();
+    }
+    Dump(hits_);
+    if(profile_){
+      profile_->Count("hits", hits_.size());
+      profile_->Count("buffer_growths", hits_.GetGrowths() - growths);
+    }
 
-    stringTrigger.AddHits(hits);
+    stringTrigger_->AddHits(hits_);
 
-    unsigned int numTriggers = stringTrigger.GetNumberOfTriggers();
+    unsigned int numTriggers = stringTrigger_->GetNumberOfTriggers();
     for (unsigned int n = 0; n < numTriggers; n++) {
 
-      TriggerHitVectorPtr triggerHits = stringTrigger.GetNextTrigger();
+      TriggerHitVectorPtr triggerHits = stringTrigger_->GetNextTrigger();
 
       // We have a trigger!
       triggerCount_++;
@@ -160,22 +216,13 @@ void ClusterTrigger::DAQ(I3FramePtr frame)
     
   } // endif
   
-  // Check to see if a trigger hierarchy already exists
-  I3TriggerHierarchyPtr triggers;
-  if(frame->Has(triggerName_)){
-    const I3TriggerHierarchy& old_th = frame->Get<I3TriggerHierarchy>(triggerName_);
-    triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy(old_th));
-    frame->Delete(triggerName_);
-  }else{
-    triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy);
-  }
-
-  // Fill the trigger hierarchy
-  std::vector<I3Trigger>::const_iterator tIter;
-  for (tIter = tlist.begin(); tIter != tlist.end(); tIter++)
-    triggers->insert(triggers->begin(), *tIter);    
+  // Add the triggers to the trigger hierarchy (or the collector)
+  TriggerCollector::AddTriggers(*frame, triggerCollectorName_, triggerName_, tlist);
 
-  frame->Put(triggerName_,triggers);
+  if(profile_){
+    profile_->Count("triggers", tlist.size());
+    profile_->Stop(*frame, profileName_);
+  }
   PushFrame( frame );
 
 }
@@ -183,52 +230,59 @@ void ClusterTrigger::DAQ(I3FramePtr frame)
 void ClusterTrigger::Finish()
 {
   log_info("Found %d triggers out of %d events", triggerCount_, eventCount_);
+
+  if(profile_) log_info("%s", profile_->Summary().c_str());
 }
 
 void ClusterTrigger::FillHits(I3DOMLaunchSeriesMapConstPtr launches, 
-			      TriggerHitVectorPtr hits, 
-			      I3MapKeyVectorIntConstPtr domSets)
+			      TriggerHitBuffer& hits, 
+			      const DOMSetTable& domSets)
 {
+  // only the InIce DOMs (DOMSet 2)
+  doms_.clear();
+  domSets.Select(*launches, 2u, doms_);
 
-  I3DOMLaunchSeriesMap::const_iterator mapIter;
-  for (mapIter = launches->begin(); mapIter != launches->end(); mapIter++) {
+  BOOST_FOREACH(I3DOMLaunchSeriesMap::const_iterator mapIter, doms_) {
     const OMKey& omKey = mapIter->first;
-    if( DOMSetFunctions::InDOMSet(omKey, 2, domSets)) {
-      I3DOMLaunchSeries::const_iterator seriesIter;
-      for (seriesIter = mapIter->second.begin(); 
-	   seriesIter != mapIter->second.end(); 
-	   seriesIter++) {
-        if( seriesIter->GetLCBit() ){
-	  TriggerHitPtr hit(new TriggerHit);
-	  hit->pos = omKey.GetOM();
-	  hit->string = omKey.GetString();
-	  hit->time = seriesIter->GetStartTime();
-	  hits->push_back(*hit);
-        }
+    I3DOMLaunchSeries::const_iterator seriesIter;
+    for (seriesIter = mapIter->second.begin(); 
+	 seriesIter != mapIter->second.end(); 
+	 seriesIter++) {
+      if( seriesIter->GetLCBit() ){
+	hits.push_back(seriesIter->GetStartTime(), omKey.GetOM(), omKey.GetString());
       }
-    }	
+    }
   }
 }
 
+void ClusterTrigger::FillHits(const TriggerHitTable& table,
+			      TriggerHitBuffer& hits)
+{
+  hits.reserve(table.size());
+  BOOST_FOREACH(const TriggerHitTable::Hit& h, table){
+    if( h.lc && h.InDOMSet(2) )
+      hits.push_back(h.time, h.omKey.GetOM(), h.omKey.GetString());
+  }
+}
 
-void ClusterTrigger::Dump(TriggerHitVectorPtr input)
+void ClusterTrigger::Dump(const TriggerHitBuffer& input)
 {
-  log_debug("Dumping Event with %zd hits...", input->size());
+  log_debug("Dumping Event with %zd hits...", input.size());
 
-  TriggerHitVector::const_iterator iter;
-  for (iter = input->begin(); iter != input->end(); iter++) {
-    const TriggerHit& hit __attribute__((unused)) = *iter;
-    log_debug("  Time %f   Position %u", hit.time, hit.pos);
+  for (size_t i = 0; i < input.size(); i++) {
+    log_debug("  Time %f   Position %u", input.time[i], input.pos[i]);
   }
 }
 
 void ClusterTrigger::DetectorStatus(I3FramePtr frame){
   // Get DetectorStatus from the frame
-  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>();
-  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object.");
+  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>(detectorStatusName_);
+  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object called %s.",
+                           detectorStatusName_.c_str());
 
-  boost::optional<tk_ts_pair_t> tkts = GetTriggerStatus
-    (detStatus, _sourceID = SOURCEID, _typeID = TYPEID, _configID = configID_ );
+  triggerConfig_ = TriggerConfig::Get(detStatus);
+  boost::optional<tk_ts_pair_t> tkts =
+    triggerConfig_->GetTriggerStatus(SOURCEID, TYPEID, configID_);
 
   if(!tkts) log_fatal("Failed to configure this module from the DetectorStatus.");
 
@@ -245,6 +299,9 @@ void ClusterTrigger::DetectorStatus(I3FramePtr frame){
       <<", coherenceLength: "<<coherenceLength_;
   log_debug("%s",sstr.str().c_str());
 
+  // the algorithm is made with the new settings at the next DAQ frame
+  stringTrigger_.reset();
+
   PushFrame( frame );
 }
 
@@ -10,6 +10,7 @@
  */
 
 #include <trigger-sim/modules/CylinderTrigger.h>
+#include <trigger-sim/algorithms/TriggerCollector.h>
 #include <trigger-sim/algorithms/CylinderTriggerAlgorithm.h>
 #include <icetray/OMKey.h>
 #include <dataclasses/I3Vector.h>
@@ -24,10 +25,6 @@
 
 using namespace boost::assign;
 using DetectorStatusUtils::tk_ts_pair_t;
-using DetectorStatusUtils::_sourceID;
-using DetectorStatusUtils::_typeID;
-using DetectorStatusUtils::_configID;
-using DetectorStatusUtils::GetTriggerStatus;
 
 I3_MODULE(CylinderTrigger);
 const TriggerKey::TypeID TYPEID(TriggerKey::VOLUME);
@@ -38,6 +35,10 @@ CylinderTrigger::CylinderTrigger(const I3Context& context) :
   pulseReadoutName_(""),
   triggerName_("I3Triggers"),
   domSetsName_("DOMSets"),
+  detectorStatusName_("I3DetectorStatus"),
+  triggerHitTableName_(""),
+  triggerCollectorName_(""),
+  profileName_(""),
   configIDParam_(INT_MIN),
   triggerWindow_(NAN),
   triggerThreshold_(INT_MAX),
@@ -69,10 +70,32 @@ CylinderTrigger::CylinderTrigger(const I3Context& context) :
            "Name of the I3MapKeyVectorInt defining the DomSets for each DOM.",
            domSetsName_);
 
+  AddParameter("DetectorStatusName",
+           "Name of the I3DetectorStatus to take the trigger configuration from.",
+           detectorStatusName_);
+
   AddParameter("MeasurementMode",
 	       "The way to do the triggering. 0=All LC hits, 1=PMTs with at least 1 LC hit, 2=Modules with at least 1 LC hit",
 	       measurementMode_);
 
+  AddParameter("TriggerHitTableName",
+	       "Name of the TriggerHitTable made by the TriggerHitExtractor. "
+	       "If set and found in the frame the launch hits are taken from there "
+	       "instead of the DOM launches.",
+	       triggerHitTableName_);
+
+  AddParameter("TriggerCollectorName",
+	       "Name of the TriggerCollector to add the triggers to.  If set, "
+	       "I3GlobalTriggerSim makes the I3TriggerHierarchy from it, "
+	       "otherwise the triggers are added to TriggerName right away.",
+	       triggerCollectorName_);
+
+  AddParameter("ProfileName",
+	       "If set, the time, the number of hits and the number of cylinders "
+	       "and DOM pairs looked at of every frame are put into the frame "
+	       "under this name and summed up at Finish.",
+	       profileName_);
+
   AddOutBox("OutBox");
 }
 
@@ -85,6 +108,13 @@ void CylinderTrigger::Configure()
   GetParameter("TriggerName",triggerName_);
   GetParameter("TriggerConfigID",configIDParam_);
   GetParameter("DOMSetsName", domSetsName_);
+  GetParameter("DetectorStatusName", detectorStatusName_);
+  GetParameter("TriggerHitTableName", triggerHitTableName_);
+  GetParameter("TriggerCollectorName", triggerCollectorName_);
+  GetParameter("ProfileName", profileName_);
+
+  if(profileName_.size())
+    profile_ = TriggerProfilePtr(new TriggerProfile(GetName()));
 
   GetParameter("MeasurementMode",measurementMode_);
 
@@ -97,6 +127,8 @@ void CylinderTrigger::Configure()
 
 void CylinderTrigger::DAQ(I3FramePtr frame)
 {
+  if(profile_) profile_->Start();
+
  
   // Get the DOMSets from the frame
   I3MapKeyVectorIntConstPtr domSets = 
@@ -112,17 +144,27 @@ void CylinderTrigger::DAQ(I3FramePtr frame)
   } else { 
     log_debug("You requested to grab the \"%s\" DOMSets from the frame, but it is empty.", domSetsName_.c_str());  // debug
   }
+  domSetTable_ = DOMSetFunctions::GetDOMSetTable(domSets, domSetTable_);
 
   // needed to calculate Cylinder
   I3GeometryConstPtr geometry = frame->Get<I3GeometryConstPtr>(); 
+  if(geometry != neighboursGeometry_ ||
+     (geometry && !neighbours_)){
+    neighboursGeometry_ = geometry;
+    neighbours_.reset();
+    volumeTrigger_.reset();
+    if(geometry)
+      neighbours_ = CylinderNeighbourTableConstPtr
+	(new CylinderNeighbourTable(I3OMGeoTable::Get(geometry), cylinderRadius_, cylinderHeight_));
+  }
   
   // Create the trigger object
-  CylinderTriggerAlgorithm volumeTrigger(triggerWindow_, 
-					 triggerThreshold_, 
-					 simpleMultiplicity_, 
-					 geometry, 
-					 cylinderRadius_, 
-					 cylinderHeight_);
+  if(!volumeTrigger_)
+    volumeTrigger_ = CylinderTriggerAlgorithmPtr
+      (new CylinderTriggerAlgorithm(triggerWindow_, 
+				    triggerThreshold_, 
+				    simpleMultiplicity_, 
+				    neighbours_));
 
   log_debug("Checking for CylinderTriggers...");
   eventCount_++;
@@ -185,28 +227,50 @@ void CylinderTrigger::DAQ(I3FramePtr frame)
   }
   log_debug("Got %d pulses to split", count);
 
+  TriggerHitTableConstPtr hitTable;
+  if(triggerHitTableName_.size()){
+    hitTable = frame->Get<TriggerHitTableConstPtr>(triggerHitTableName_);
+    if(hitTable && hitTable->GetSourceName() != launchReadoutName_)
+      log_fatal("The TriggerHitTable %s was made from %s, not %s.",
+		triggerHitTableName_.c_str(),
+		hitTable->GetSourceName().c_str(),
+		launchReadoutName_.c_str());
+  }
+
   /*------------------------------------------------------------*
    * Fill the hits
    *------------------------------------------------------------*/
-  TriggerHitVectorPtr hitVector(new TriggerHitVector);
-  FillHits(launchMap, hitVector, domSets);
-  FillHits(pulseMap, hitVector, domSets);
+  // the buffer only allocates when it has to grow
+  const size_t growths(hits_.GetGrowths());
+  hits_.clear();
+  if(hitTable) FillHits(*hitTable, hits_);
+  else FillHits(launchMap, hits_, *domSetTable_);
+  FillHits(pulseMap, hits_, *domSetTable_);
 
   /*------------------------------------------------------------*
    * Time order the hits
+   * The hits from the table are already in order, so only
+   * sort if there's something else mixed in.
    *------------------------------------------------------------*/
-  std::sort(hitVector->begin(), hitVector->end());
-  Dump(hitVector);
+  if(!hitTable || !pulseMap->empty())
+    hits_.SortByTime();
+  Dump(hits_);
 
   /*------------------------------------------------------------*
    * Run the CylinderTrigger
    *------------------------------------------------------------*/
-  volumeTrigger.AddHits(hitVector);
+  volumeTrigger_->AddHits(hits_);
+  if(profile_){
+    profile_->Count("hits", hits_.size());
+    profile_->Count("buffer_growths", hits_.GetGrowths() - growths);
+    profile_->Count("cylinders", volumeTrigger_->GetNumberOfCylinders());
+    profile_->Count("pairs", volumeTrigger_->GetNumberOfPairs());
+  }
   
-  unsigned int numTriggers = volumeTrigger.GetNumberOfTriggers();
+  unsigned int numTriggers = volumeTrigger_->GetNumberOfTriggers();
   for (unsigned int n = 0; n < numTriggers; n++) {
     
-    TriggerHitVectorPtr triggerHits = volumeTrigger.GetNextTrigger();
+    TriggerHitVectorPtr triggerHits = volumeTrigger_->GetNextTrigger();
     
     // We have a trigger!
     triggerCount_++;
@@ -225,22 +289,13 @@ void CylinderTrigger::DAQ(I3FramePtr frame)
     
   } // end loop over triggers
     
-  // Check to see if a trigger hierarchy already exists
-  I3TriggerHierarchyPtr triggers;
-  if(frame->Has(triggerName_)){
-    const I3TriggerHierarchy& old_th = frame->Get<I3TriggerHierarchy>(triggerName_);
-    triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy(old_th));
-    frame->Delete(triggerName_);
-  }else{
-    triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy);
-  }
+  // Add the triggers to the trigger hierarchy (or the collector)
+  TriggerCollector::AddTriggers(*frame, triggerCollectorName_, triggerName_, tlist);
 
-  // Fill the trigger hierarchy
-  std::vector<I3Trigger>::const_iterator tIter;
-  for (tIter = tlist.begin(); tIter != tlist.end(); tIter++)
-    triggers->insert(triggers->begin(), *tIter);    
-
-  frame->Put(triggerName_,triggers);
+  if(profile_){
+    profile_->Count("triggers", tlist.size());
+    profile_->Stop(*frame, profileName_);
+  }
   PushFrame( frame );
 }
 
@@ -251,17 +306,27 @@ void CylinderTrigger::Finish()
   if(configID_) sstr<<" for config id "<<configID_.get()<<".";
   else sstr<<".";
   log_info("%s",sstr.str().c_str());
+
+  if(profile_) log_info("%s", profile_->Summary().c_str());
 }
 
 void CylinderTrigger::FillHits(I3DOMLaunchSeriesMapConstPtr launches, 
-			       TriggerHitVectorPtr hits, 
-			       I3MapKeyVectorIntConstPtr domSets)
+			       TriggerHitBuffer& hits, 
+			       const DOMSetTable& domSets)
 {
   log_debug("Fill the hits");
-  I3DOMLaunchSeriesMap::const_iterator mapIter;
+  if (domSet_) 
+    log_debug("A DOMSet is specified for this trigger: %d", domSet_.get());
+  else
+    log_debug("No DOMSet is specified, so all DOMs are included by default"); 
+
+  // the DOMs in the DOMSet (or all of them), selected in one go
+  std::vector<I3DOMLaunchSeriesMap::const_iterator> doms;
+  domSets.Select(*launches, domSet_, doms);
+
   std::set<OMKey> lcPMTs;
   std::set<OMKey> lcOMs;
-  for (mapIter = launches->begin(); mapIter != launches->end(); mapIter++) {
+  BOOST_FOREACH(I3DOMLaunchSeriesMap::const_iterator mapIter, doms) {
     const OMKey& omKey = mapIter->first;
 
     I3DOMLaunchSeries::const_iterator seriesIter;
@@ -269,19 +334,7 @@ void CylinderTrigger::FillHits(I3DOMLaunchSeriesMapConstPtr launches,
 	 seriesIter != mapIter->second.end();
 	 seriesIter++) {
       if( seriesIter->GetLCBit() ){
-	if (domSet_) { 
-	  log_debug("A DOMSet is specified for this trigger: %d", domSet_.get());
-	  log_debug("...and is DOM %s included? %d", omKey.str().c_str(), DOMSetFunctions::InDOMSet(omKey,domSet_.get(),domSets));
-	}
-	else { 
-	  log_debug("No DOMSet is specified, so this code will just say %s is included by default", omKey.str().c_str()); 
-	}      
-      	if( ( domSet_ && DOMSetFunctions::InDOMSet(omKey,domSet_.get(),domSets) ) ||
-	    !domSet_ ){
-          TriggerHitPtr hit(new TriggerHit);
-		  hit->pos = omKey.GetOM();
-		  hit->string = omKey.GetString();
-		  hit->time = seriesIter->GetStartTime();
+          TriggerHit hit(seriesIter->GetStartTime(), omKey.GetOM(), omKey.GetString());
 		  
 		  switch(measurementMode_) {
 		  case 1: {
@@ -289,7 +342,7 @@ void CylinderTrigger::FillHits(I3DOMLaunchSeriesMapConstPtr launches,
 		 	   lcPMTs.end(),
 			   omKey) == lcPMTs.end() ){
 	           lcPMTs.insert(omKey);
-	           hits->push_back(*hit);
+	           hits.push_back(hit);
 			}
 			break;
 		  }
@@ -300,14 +353,13 @@ void CylinderTrigger::FillHits(I3DOMLaunchSeriesMapConstPtr launches,
 			    lcOMs.end(),
 			    module) == lcOMs.end() ){
 				lcOMs.insert(module);
-				hits->push_back(*hit);
+				hits.push_back(hit);
 			}
 			break;
 		  }
 		  default: 
-		    hits->push_back(*hit);
+		    hits.push_back(hit);
 		  }
-		}
       }
     }	
   }
@@ -316,14 +368,16 @@ void CylinderTrigger::FillHits(I3DOMLaunchSeriesMapConstPtr launches,
 
 
 void CylinderTrigger::FillHits(I3RecoPulseSeriesMapConstPtr pulses, 
-			       TriggerHitVectorPtr hits, 
-			       I3MapKeyVectorIntConstPtr domSets)
+			       TriggerHitBuffer& hits, 
+			       const DOMSetTable& domSets)
 {
   log_debug("Fill the hits");
-  I3RecoPulseSeriesMap::const_iterator mapIter;
+  std::vector<I3RecoPulseSeriesMap::const_iterator> doms;
+  domSets.Select(*pulses, domSet_, doms);
+
   std::set<OMKey> lcPMTs;
   std::set<OMKey> lcOMs;
-  for (mapIter = pulses->begin(); mapIter != pulses->end(); mapIter++) {
+  BOOST_FOREACH(I3RecoPulseSeriesMap::const_iterator mapIter, doms) {
     const OMKey& omKey = mapIter->first;
 
     I3RecoPulseSeries::const_iterator seriesIter;
@@ -331,19 +385,13 @@ void CylinderTrigger::FillHits(I3RecoPulseSeriesMapConstPtr pulses,
 	 seriesIter != mapIter->second.end();
 	 seriesIter++) {
       if( seriesIter->GetFlags() & I3RecoPulse::LC ){
-      	if( ( domSet_ && DOMSetFunctions::InDOMSet(omKey,domSet_.get(),domSets) ) ||
-	    !domSet_ ){
-  
-     	  TriggerHitPtr hit(new TriggerHit);
-		  hit->pos = omKey.GetOM();
-		  hit->string = omKey.GetString();
-		  hit->time = seriesIter->GetTime();
+     	  TriggerHit hit(seriesIter->GetTime(), omKey.GetOM(), omKey.GetString());
 
 		  switch(measurementMode_) {
             case 1: {
 		      if( std::find(lcPMTs.begin(), lcPMTs.end(), omKey) == lcPMTs.end() ){
                 lcPMTs.insert(omKey);
-			    hits->push_back(*hit);
+			    hits.push_back(hit);
 		      }
 			  break;
 		    }
@@ -352,15 +400,14 @@ void CylinderTrigger::FillHits(I3RecoPulseSeriesMapConstPtr pulses,
 		      module.SetPMT(0);
 		      if( std::find(lcOMs.begin(), lcOMs.end(), module) == lcOMs.end() ){
 			    lcOMs.insert(module);
-			    hits->push_back(*hit);
+			    hits.push_back(hit);
 		      }
 			  break;
 		    }
 		    default: {
-		      hits->push_back(*hit);
+		      hits.push_back(hit);
 		    }
 		  }
-		}
       }
     }
   }
@@ -368,26 +415,53 @@ void CylinderTrigger::FillHits(I3RecoPulseSeriesMapConstPtr pulses,
 
 
 
-void CylinderTrigger::Dump(TriggerHitVectorPtr input)
+void CylinderTrigger::FillHits(const TriggerHitTable& table,
+			       TriggerHitBuffer& hits)
+{
+  log_debug("Fill the hits from the TriggerHitTable");
+  std::set<OMKey> lcPMTs;
+  std::set<OMKey> lcOMs;
+  BOOST_FOREACH(const TriggerHitTable::Hit& h, table){
+    if( !h.lc || ( domSet_ && !h.InDOMSet(domSet_.get()) ) )
+      continue;
+
+    // the table is time ordered, so the first hit seen on
+    // a PMT (or module) is the same one the launch map gives
+    switch(measurementMode_) {
+    case 1:
+      if( !lcPMTs.insert(h.omKey).second ) continue;
+      break;
+    case 2: {
+      OMKey module(h.omKey);
+      module.SetPMT(0);
+      if( !lcOMs.insert(module).second ) continue;
+      break;
+    }
+    default:
+      break;
+    }
+    hits.push_back(h.time, h.omKey.GetOM(), h.omKey.GetString());
+  }
+}
+
+void CylinderTrigger::Dump(const TriggerHitBuffer& input)
 {
-  log_debug("Dumping Event with %zd hits...", input->size());
+  log_debug("Dumping Event with %zd hits...", input.size());
 
-  TriggerHitVector::const_iterator iter;
-  for (iter = input->begin(); iter != input->end(); iter++) {
-    const TriggerHit& hit __attribute__((unused)) = *iter;
-    log_debug("  Time %f   Position %u", hit.time, hit.pos);
+  for (size_t i = 0; i < input.size(); i++) {
+    log_debug("  Time %f   Position %u", input.time[i], input.pos[i]);
   }
 }
 
 void CylinderTrigger::DetectorStatus(I3FramePtr frame){
   // Get DetectorStatus from the frame
-  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>();
-  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object.");
+  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>(detectorStatusName_);
+  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object called %s.",
+                           detectorStatusName_.c_str());
 
-  boost::optional<tk_ts_pair_t> tkts = GetTriggerStatus
-    (detStatus, _sourceID = TriggerKey::UNKNOWN_SOURCE,
-     _typeID = TYPEID,
-     _configID = configID_ );
+  triggerConfig_ = TriggerConfig::Get(detStatus);
+  boost::optional<tk_ts_pair_t> tkts =
+    triggerConfig_->GetTriggerStatus(TriggerKey::UNKNOWN_SOURCE, TYPEID, configID_);
 
   if(!tkts) log_fatal("Failed to configure this module from the DetectorStatus.");
 
@@ -402,6 +476,11 @@ void CylinderTrigger::DetectorStatus(I3FramePtr frame){
   tkts.get().second.GetTriggerConfigValue("height", cylinderHeight_);
   tkts.get().second.GetTriggerConfigValue("domSet", domSet_);
 
+  // the cylinder might have changed, the algorithm is made
+  // with the new settings at the next DAQ frame
+  neighbours_.reset();
+  volumeTrigger_.reset();
+
   log_info("Cylinder: %d, multi: %d, timewindow: %f, radius: %f, height: %f, domset: %d", 
 	    simpleMultiplicity_, triggerThreshold_, triggerWindow_, 
 	    cylinderRadius_, cylinderHeight_, domSet_.get());
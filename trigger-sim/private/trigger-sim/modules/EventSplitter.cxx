@@ -0,0 +1,273 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ *
+ * @file EventSplitter.cxx
+ */
+
+#include <algorithm>
+#include <set>
+#include <utility>
+
+#include <boost/foreach.hpp>
+
+#include "icetray/I3Frame.h"
+#include "icetray/I3Units.h"
+#include "dataclasses/I3Double.h"
+#include "dataclasses/I3Map.h"
+#include "dataclasses/I3Time.h"
+#include "dataclasses/physics/I3EventHeader.h"
+#include "dataclasses/physics/I3TriggerHierarchy.h"
+#include "dataclasses/physics/I3DOMLaunch.h"
+#include "dataclasses/physics/I3MCHit.h"
+#include "dataclasses/physics/I3MCTree.h"
+#include "dataclasses/physics/I3MCTreeUtils.h"
+
+#include "trigger-sim/modules/EventSplitter.h"
+
+I3_MODULE(EventSplitter);
+
+namespace{
+
+  double HitTime(const I3DOMLaunch& launch){ return launch.GetStartTime(); }
+  double HitTime(const I3MCHit& hit){ return hit.GetTime(); }
+
+  bool EarlierTrigger(const I3Trigger& lhs, const I3Trigger& rhs){
+    return lhs.GetTriggerTime() < rhs.GetTriggerTime();
+  }
+
+  bool EarlierEdge(const std::pair<double, int>& lhs,
+                   const std::pair<double, int>& rhs){
+    return lhs.first < rhs.first;
+  }
+
+  /**
+   * The readout windows (lower[i], upper[i]] of the sub-events.
+   * Both bounds are non-decreasing, so the sub-events a hit at time t
+   * belongs to are a contiguous range found with two binary searches.
+   */
+  struct ReadoutWindows{
+    std::vector<double> lower;
+    std::vector<double> upper;
+
+    std::pair<size_t, size_t> Find(double t) const {
+      size_t first = std::lower_bound(upper.begin(), upper.end(), t) - upper.begin();
+      size_t last = std::lower_bound(lower.begin(), lower.end(), t) - lower.begin();
+      return std::make_pair(first, std::max(first, last));
+    }
+  };
+
+  /**
+   * Distributes the hits of the full map over the sub-event maps
+   * in a single pass.  The hits keep their order within each DOM.
+   */
+  template <typename MapType>
+  std::vector<boost::shared_ptr<MapType> >
+  Split(const MapType& fullMap, const ReadoutWindows& windows){
+    std::vector<boost::shared_ptr<MapType> > subMaps;
+    for(size_t i = 0; i < windows.lower.size(); ++i)
+      subMaps.push_back(boost::shared_ptr<MapType>(new MapType));
+
+    BOOST_FOREACH(typename MapType::const_reference r, fullMap){
+      BOOST_FOREACH(typename MapType::mapped_type::const_reference hit, r.second){
+        std::pair<size_t, size_t> range = windows.Find(HitTime(hit));
+        for(size_t i = range.first; i < range.second; ++i)
+          (*subMaps[i])[r.first].push_back(hit);
+      }
+    }
+    return subMaps;
+  }
+
+  /**
+   * The primaries of the SPE hits in each sub-event, in the order
+   * they're first seen.  The primary of each hit is only looked up
+   * once, even if the hit is in more than one sub-event.
+   */
+  std::vector<std::vector<I3ParticleID> >
+  SplitPrimaries(const I3MCHitSeriesMap& fullMap,
+                 const I3MCTree& tree,
+                 const ReadoutWindows& windows){
+    std::vector<std::vector<I3ParticleID> > primaries(windows.lower.size());
+    std::vector<std::set<I3ParticleID> > seen(windows.lower.size());
+
+    BOOST_FOREACH(I3MCHitSeriesMap::const_reference r, fullMap){
+      BOOST_FOREACH(const I3MCHit& hit, r.second){
+        if(hit.GetHitSource() != I3MCHit::SPE)
+          continue;
+        std::pair<size_t, size_t> range = windows.Find(hit.GetTime());
+        if(range.first == range.second || !I3MCTreeUtils::Has(tree, hit))
+          continue;
+        I3ParticleID primary = I3MCTreeUtils::GetPrimary(tree, hit).GetID();
+        for(size_t i = range.first; i < range.second; ++i)
+          if(seen[i].insert(primary).second)
+            primaries[i].push_back(primary);
+      }
+    }
+    return primaries;
+  }
+
+  I3MCTreePtr
+  PruneTree(const I3MCTree& tree, const std::vector<I3ParticleID>& primaries){
+    I3MCTreePtr newTree(new I3MCTree);
+    BOOST_FOREACH(const I3ParticleID& primary, primaries){
+      I3MCTreeUtils::AddPrimary(*newTree, I3MCTreeUtils::GetParticle(tree, primary));
+      // copies the daughters with their whole subtrees
+      BOOST_FOREACH(const I3Particle& daughter, I3MCTreeUtils::GetDaughters(tree, primary))
+        newTree->append_child(primary, tree, daughter.GetID());
+    }
+    return newTree;
+  }
+
+}
+
+EventSplitter::EventSplitter(const I3Context& ctx) :
+  I3Module(ctx),
+  triggerName_("I3Triggers"),
+  readoutWindowBefore_(6.0*I3Units::microsecond),
+  readoutWindowAfter_(4.0*I3Units::microsecond),
+  mcTreeName_("I3MCTree"),
+  mcHitSeriesMapName_("MCHitSeriesMap"),
+  weightMapName_("CorsikaWeightMap")
+{
+  domLaunchSeriesMapNames_.push_back("InIceRawData");
+  domLaunchSeriesMapNames_.push_back("IceTopRawData");
+
+  AddParameter("I3TriggerName", "InIce Trigger name in frame", triggerName_);
+  AddParameter("I3ReadoutWindowBefore", "Readout window before the trigger",
+               readoutWindowBefore_);
+  AddParameter("I3ReadoutWindowAfter", "Readout window after the trigger",
+               readoutWindowAfter_);
+  AddParameter("I3MCTreeName", "Name of I3MCTree to split", mcTreeName_);
+  AddParameter("I3MCHitSeriesMapName", "Name of the hitseries object to split",
+               mcHitSeriesMapName_);
+  AddParameter("I3DOMLaunchSeriesMapNames", "Names of the DOM launches to split",
+               domLaunchSeriesMapNames_);
+  AddParameter("MCWeightMapName", "name of weightmap", weightMapName_);
+  AddOutBox("OutBox");
+}
+
+EventSplitter::~EventSplitter()
+{
+}
+
+void EventSplitter::Configure()
+{
+  GetParameter("I3TriggerName", triggerName_);
+  GetParameter("I3ReadoutWindowBefore", readoutWindowBefore_);
+  GetParameter("I3ReadoutWindowAfter", readoutWindowAfter_);
+  GetParameter("I3MCTreeName", mcTreeName_);
+  GetParameter("I3MCHitSeriesMapName", mcHitSeriesMapName_);
+  GetParameter("I3DOMLaunchSeriesMapNames", domLaunchSeriesMapNames_);
+  GetParameter("MCWeightMapName", weightMapName_);
+}
+
+void EventSplitter::DAQ(I3FramePtr frame){
+
+  I3TriggerHierarchyConstPtr i3Triggers =
+    frame->Get<I3TriggerHierarchyConstPtr>(triggerName_);
+  if(!i3Triggers){
+    log_debug("No IceCube triggers found ('%s').", triggerName_.c_str());
+    PushFrame(frame, "OutBox");
+    return;
+  }
+  if(i3Triggers->empty()){
+    log_debug("Zero triggers found ('%s').", triggerName_.c_str());
+    return;
+  }
+
+  // build a semaphore queue to keep track of open triggers
+  std::vector<I3Trigger> triggers;
+  std::vector<std::pair<double, int> > edges;
+  for(I3TriggerHierarchy::iterator i = i3Triggers->begin();
+      i != i3Triggers->end(); ++i){
+    edges.push_back(std::make_pair(i->GetTriggerTime(), 1));
+    edges.push_back(std::make_pair(i->GetTriggerTime() + i->GetTriggerLength(), -1));
+    triggers.push_back(*i);
+  }
+  std::stable_sort(edges.begin(), edges.end(), EarlierEdge);
+  std::stable_sort(triggers.begin(), triggers.end(), EarlierTrigger);
+
+  // the first gap is at the beginning of the event and
+  // there's another one wherever there are no open triggers.
+  std::vector<double> gaps(1, edges.front().first);
+  int semaphore(0);
+  typedef std::pair<double, int> edge_t;
+  BOOST_FOREACH(const edge_t& edge, edges){
+    semaphore += edge.second;
+    if(semaphore == 0)
+      gaps.push_back(edge.first);
+  }
+
+  ReadoutWindows windows;
+  for(size_t i = 1; i < gaps.size(); ++i){
+    windows.lower.push_back(gaps[i-1] - readoutWindowBefore_);
+    windows.upper.push_back(gaps[i] + readoutWindowAfter_);
+  }
+  const size_t nSubEvents(windows.lower.size());
+
+  I3EventHeaderConstPtr header = frame->Get<I3EventHeaderConstPtr>("I3EventHeader");
+  I3Time dt;
+  if(header)
+    dt = header->GetStartTime();
+  else
+    dt.SetModJulianTime(55697, 43200, 0.0);
+
+  std::vector<std::pair<std::string, std::vector<I3DOMLaunchSeriesMapPtr> > > launches;
+  BOOST_FOREACH(const std::string& name, domLaunchSeriesMapNames_){
+    I3DOMLaunchSeriesMapConstPtr fullMap = frame->Get<I3DOMLaunchSeriesMapConstPtr>(name);
+    if(fullMap)
+      launches.push_back(std::make_pair(name, Split(*fullMap, windows)));
+  }
+
+  std::vector<I3MCHitSeriesMapPtr> mcHits;
+  std::vector<std::vector<I3ParticleID> > primaries;
+  I3MCHitSeriesMapConstPtr fullHits =
+    frame->Get<I3MCHitSeriesMapConstPtr>(mcHitSeriesMapName_);
+  I3MCTreeConstPtr mcTree = frame->Get<I3MCTreeConstPtr>(mcTreeName_);
+  I3MapStringDoubleConstPtr weights =
+    frame->Get<I3MapStringDoubleConstPtr>(weightMapName_);
+  if(fullHits){
+    mcHits = Split(*fullHits, windows);
+    if(mcTree)
+      primaries = SplitPrimaries(*fullHits, *mcTree, windows);
+  }
+
+  std::vector<I3Trigger>::const_iterator trigger = triggers.begin();
+  for(size_t i = 0; i < nSubEvents; ++i){
+    const double tstart(gaps[i]);
+    const double tend(gaps[i+1]);
+
+    I3TriggerHierarchyPtr newHierarchy(new I3TriggerHierarchy);
+    while(trigger != triggers.end() && trigger->GetTriggerTime() < tstart)
+      ++trigger;
+    for(; trigger != triggers.end() && trigger->GetTriggerTime() < tend; ++trigger)
+      newHierarchy->insert(newHierarchy->end(), *trigger);
+
+    I3EventHeaderPtr newHeader(header ? new I3EventHeader(*header) : new I3EventHeader);
+    newHeader->SetStartTime(dt + tstart);
+
+    I3FramePtr newFrame(new I3Frame(I3Frame::DAQ));
+    newFrame->Put("I3EventHeader", newHeader);
+    newFrame->Put("triggertime", I3DoublePtr(new I3Double(tstart)));
+    newFrame->Put("trigersize", I3DoublePtr(new I3Double(newHierarchy->size())));
+    newFrame->Put("triggers", newHierarchy);
+
+    typedef std::pair<std::string, std::vector<I3DOMLaunchSeriesMapPtr> > launches_t;
+    BOOST_FOREACH(const launches_t& l, launches)
+      newFrame->Put(l.first, l.second[i]);
+
+    if(fullHits){
+      newFrame->Put(mcHitSeriesMapName_, mcHits[i]);
+      if(mcTree){
+        newFrame->Put(mcTreeName_, PruneTree(*mcTree, primaries[i]));
+        if(weights){
+          I3MapStringDoublePtr newWeights(new I3MapStringDouble(*weights));
+          (*newWeights)["multiplicity"] = primaries[i].size();
+          newFrame->Put(weightMapName_, newWeights);
+        }
+      }
+    }
+
+    PushFrame(newFrame, "OutBox");
+  }
+}
@@ -16,6 +16,7 @@
 #include "dataclasses/I3Vector.h"
 #include "trigger-sim/utilities/DOMSetFunctions.h"
 #include "trigger-sim/algorithms/TriggerContainer.h"
+#include "trigger-sim/algorithms/TriggerCollector.h"
 #include "trigger-sim/modules/FaintParticleTrigger.h"
 #include "trigger-sim/utilities/DetectorStatusUtils.h"
 #include "trigger-sim/algorithms/FptHit.h"
@@ -26,10 +27,6 @@ using namespace std;
 using namespace I3Units;
 
 using DetectorStatusUtils::tk_ts_pair_t;
-using DetectorStatusUtils::_sourceID;
-using DetectorStatusUtils::_typeID;
-using DetectorStatusUtils::_configID;
-using DetectorStatusUtils::GetTriggerStatus;
 
 I3_MODULE(FaintParticleTrigger);
 const TriggerKey::SourceID SOURCEID(TriggerKey::IN_ICE);
@@ -43,6 +40,10 @@ FaintParticleTrigger::FaintParticleTrigger(const I3Context& ctx) :
   triggerName_("I3Triggers"),
   dataReadoutName_("InIceRawData"),
   domSetsName_("DOMSets"),
+  detectorStatusName_("I3DetectorStatus"),
+  triggerHitTableName_(""),
+  triggerCollectorName_(""),
+  profileName_(""),
   // the following parameters are read from the GCD:
   time_window_(NAN),     // 2500 for  DC 3000 ns for full detector
   time_window_separation_(NAN), // 800 ns
@@ -81,6 +82,28 @@ FaintParticleTrigger::FaintParticleTrigger(const I3Context& ctx) :
     AddParameter("DOMSetsName",
          "Name of the I3MapKeyVectorInt defining the DomSets for each DOM.",
          domSetsName_);
+
+    AddParameter("DetectorStatusName",
+         "Name of the I3DetectorStatus to take the trigger configuration from.",
+         detectorStatusName_);
+
+    AddParameter("TriggerHitTableName",
+         "Name of the TriggerHitTable made by the TriggerHitExtractor. "
+         "If set and found in the frame the hits are taken from there "
+         "instead of the DOM launches.",
+         triggerHitTableName_);
+
+    AddParameter("TriggerCollectorName",
+         "Name of the TriggerCollector to add the triggers to.  If set, "
+         "I3GlobalTriggerSim makes the I3TriggerHierarchy from it, "
+         "otherwise the triggers are added to TriggerName right away.",
+         triggerCollectorName_);
+
+    AddParameter("ProfileName",
+         "If set, the time, the number of hits and the number of pairs and "
+         "triples of hits looked at of every frame are put into the frame "
+         "under this name and summed up at Finish.",
+         profileName_);
     
 
 }    
@@ -95,6 +118,13 @@ void FaintParticleTrigger::Configure(){
     GetParameter("TriggerSource",triggerSourceParam_);
     GetParameter("TriggerConfigID",configIDParam_);
     GetParameter("DOMSetsName", domSetsName_);
+    GetParameter("DetectorStatusName", detectorStatusName_);
+    GetParameter("TriggerHitTableName", triggerHitTableName_);
+    GetParameter("TriggerCollectorName", triggerCollectorName_);
+    GetParameter("ProfileName", profileName_);
+
+    if(profileName_.size())
+      profile_ = TriggerProfilePtr(new TriggerProfile(GetName()));
 
     if(triggerSourceParam_ != INT_MIN)
       triggerSource_ = static_cast<TriggerKey::SourceID>(triggerSourceParam_);
@@ -106,13 +136,16 @@ void FaintParticleTrigger::Configure(){
 }
 
 void FaintParticleTrigger::Finish(){
+  if(profile_) log_info("%s", profile_->Summary().c_str());
 }
       
 void FaintParticleTrigger::DAQ(I3FramePtr frame){
+  if(profile_) profile_->Start();
       
   // Get the DOMSets from the frame
   I3MapKeyVectorIntConstPtr domSets = 
     frame->Get<I3MapKeyVectorIntConstPtr>(domSetsName_);
+  domSetTable_ = DOMSetFunctions::GetDOMSetTable(domSets, domSetTable_);
     
     
   I3GeometryConstPtr geometry = frame->Get<I3GeometryConstPtr>();    
@@ -124,45 +157,44 @@ void FaintParticleTrigger::DAQ(I3FramePtr frame){
   /*------------------------------------------------------------*
    * Get DomLaunchSeriesMap from frame
    *------------------------------------------------------------*/
-  if (!frame->Has(dataReadoutName_)) {
+  TriggerHitTableConstPtr hitTable;
+  if(triggerHitTableName_.size()){
+    hitTable = frame->Get<TriggerHitTableConstPtr>(triggerHitTableName_);
+    if(hitTable && hitTable->GetSourceName() != dataReadoutName_)
+      log_fatal("The TriggerHitTable %s was made from %s, not %s.",
+                triggerHitTableName_.c_str(),
+                hitTable->GetSourceName().c_str(),
+                dataReadoutName_.c_str());
+  }
+
+  if (!hitTable && !frame->Has(dataReadoutName_)) {
     log_debug("Frame does not contain an I3DOMLaunchSeriesMap named %s", 
          dataReadoutName_.c_str());
+    if(profile_) profile_->Stop(*frame, profileName_);
     PushFrame( frame );
     return;
   }
-    
+
+  if (hitTable) {
+    // SLC hits are kept here too, the algorithm needs them for the SLC fraction.
+    hits->reserve(hitTable->size());
+    BOOST_FOREACH(const TriggerHitTable::Hit& h, *hitTable){
+      if( domSet_ && !h.InDOMSet(domSet_.get()) ) continue;
+      hits->push_back(FptHit(h.time, h.omKey.GetOM(), h.lc, h.omKey.GetString()));
+    }
+  } else {
   const I3DOMLaunchSeriesMap& dlsMap = frame->Get<I3DOMLaunchSeriesMap>(dataReadoutName_);
-  BOOST_FOREACH(I3DOMLaunchSeriesMap::const_reference r,dlsMap){
-    BOOST_FOREACH(I3DOMLaunchSeries::const_reference launch,r.second){
-   
-    
-    if( ( domSet_ && DOMSetFunctions::InDOMSet(r.first,domSet_.get(),domSets) ) ||
-        !domSet_ ) {                                                      
-      // either if the whole detector or a specific domset are specified, 
-      // in both cases copy DomLaunches
-       
-      FptHitPtr hit = FptHitPtr(new FptHit);
-      hit->string = r.first.GetString();
-      hit->pos = r.first.GetOM();
-      hit->lc = launch.GetLCBit();
-      hit->time = launch.GetStartTime();
-      hits->push_back(*hit);
-      /*  
-      SlcTHit hit;
-      hit.string = r.first.GetString();
-      hit.pos = r.first.GetOM();
-      hit.lc = launch.GetLCBit();
-      std::cout << "hits"<< launch.GetLCBit();  
-      hit.time = launch.GetStartTime();
-      TimeWindowList.push_back(hit);
-       */
-        
-      
-      
-                }
-          }
-   
-      }
+
+  // either if the whole detector or a specific domset are specified, 
+  // in both cases copy DomLaunches
+  std::vector<I3DOMLaunchSeriesMap::const_iterator> doms;
+  domSetTable_->Select(dlsMap, domSet_, doms);
+
+  BOOST_FOREACH(I3DOMLaunchSeriesMap::const_iterator r, doms){
+    BOOST_FOREACH(I3DOMLaunchSeries::const_reference launch,r->second)
+      hits->push_back(FptHit(launch.GetStartTime(), r->first.GetOM(), launch.GetLCBit(), r->first.GetString()));
+  }
+  }
       
 
     /*
@@ -187,21 +219,17 @@ void FaintParticleTrigger::DAQ(I3FramePtr frame){
     std::cout<<"trigger length max"<<max_trigger_length_<<std::endl;
     */
 
-    // Check to see if a trigger hierarchy already exists
-    I3TriggerHierarchyPtr triggers;
-    if(frame->Has(triggerName_)){
-        const I3TriggerHierarchy& old_th = frame->Get<I3TriggerHierarchy>(triggerName_);
-        triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy(old_th));
-        frame->Delete(triggerName_);
-    }else{
-        triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy);
-    }
-    
     I3GeometryConstPtr geo = frame->Get<I3GeometryConstPtr>("I3Geometry");
     if( ! geo )
       {
       log_fatal("Can't get geometry from the frame!");
       }
+    if (geo != geoTableGeometry_)
+      {
+      geoTableGeometry_ = geo;
+      geoTable_ = I3OMGeoTable::Get(geo);
+      fpTrigger_.reset();
+      }
 
     
     // Sort hits timewise
@@ -214,10 +242,16 @@ void FaintParticleTrigger::DAQ(I3FramePtr frame){
     
     */
     std::vector<I3Trigger> tlist;
-    sort(hits->begin(), hits->end());
+    // the hits from the TriggerHitTable are already time ordered
+    if (!hitTable)
+      sort(hits->begin(), hits->end());
     if (hits->size()>1){
 
         tlist =RunTrigger(hits, geo);
+        if(profile_){
+          profile_->Count("pairs", fpTrigger_->GetNumberOfPairs());
+          profile_->Count("triples", fpTrigger_->GetNumberOfTriples());
+        }
     }
         
 
@@ -225,12 +259,14 @@ void FaintParticleTrigger::DAQ(I3FramePtr frame){
 
 
 
-    // Fill the trigger hierarchy
-    std::vector<I3Trigger>::const_iterator tIter;
-    for (tIter = tlist.begin(); tIter != tlist.end(); tIter++)
-      triggers->insert(triggers->begin(), *tIter);    
+    // Add the triggers to the trigger hierarchy (or the collector)
+    TriggerCollector::AddTriggers(*frame, triggerCollectorName_, triggerName_, tlist);
 
-    frame->Put(triggerName_,triggers);
+    if(profile_){
+      profile_->Count("hits", hits->size());
+      profile_->Count("triggers", tlist.size());
+      profile_->Stop(*frame, profileName_);
+    }
     PushFrame( frame );
 
 
@@ -240,7 +276,11 @@ std::vector<I3Trigger> FaintParticleTrigger::RunTrigger(FptHitVectorPtr hits__,
     
 {
     std::vector<I3Trigger> tlist__;
-    FaintParticleTriggerAlgorithm fpTrigger(time_window_,time_window_separation_, max_trigger_length_,hit_min_, hit_max_,double_velocity_min_,double_velocity_max_,double_min_,use_dc_version_, triple_min_, azimuth_histogram_min_, zenith_histogram_min_, histogram_binning_, slcfraction_min_,   geo);
+    // the algorithm is only made again for a new DetectorStatus or geometry
+    if (!fpTrigger_)
+      fpTrigger_ = boost::shared_ptr<FaintParticleTriggerAlgorithm>
+        (new FaintParticleTriggerAlgorithm(time_window_,time_window_separation_, max_trigger_length_,hit_min_, hit_max_,double_velocity_min_,double_velocity_max_,double_min_,use_dc_version_, triple_min_, azimuth_histogram_min_, zenith_histogram_min_, histogram_binning_, slcfraction_min_,   geo, geoTable_));
+    FaintParticleTriggerAlgorithm& fpTrigger = *fpTrigger_;
     
  
     
@@ -297,11 +337,13 @@ std::vector<I3Trigger> FaintParticleTrigger::RunTrigger(FptHitVectorPtr hits__,
 
 void FaintParticleTrigger::DetectorStatus(I3FramePtr frame){
   // Get DetectorStatus from the frame
-  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>();
-  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object.");
+  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>(detectorStatusName_);
+  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object called %s.",
+                           detectorStatusName_.c_str());
 
-  boost::optional<tk_ts_pair_t> tkts = GetTriggerStatus
-    (detStatus, _sourceID = SOURCEID, _typeID = TYPEID, _configID = configID_ );
+  triggerConfig_ = TriggerConfig::Get(detStatus);
+  boost::optional<tk_ts_pair_t> tkts =
+    triggerConfig_->GetTriggerStatus(SOURCEID, TYPEID, configID_);
 
   if(!tkts) log_fatal("Failed to configure this module from the DetectorStatus.");
 
@@ -325,6 +367,9 @@ void FaintParticleTrigger::DetectorStatus(I3FramePtr frame){
   tkts.get().second.GetTriggerConfigValue("slcfraction_min", slcfraction_min_);
   tkts.get().second.GetTriggerConfigValue("domSet", domSet_);//these are optional
 
+  // the algorithm has to be made again with the new settings
+  fpTrigger_.reset();
+
 
   
    
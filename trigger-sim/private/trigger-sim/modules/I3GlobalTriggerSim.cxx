@@ -14,6 +14,7 @@
 
 #include <trigger-sim/modules/I3GlobalTriggerSim.h>
 #include <trigger-sim/algorithms/GlobalTriggerSim.h>
+#include <trigger-sim/algorithms/TriggerCollector.h>
 #include <icetray/I3TrayHeaders.h>
 #include <icetray/I3Module.h>
 #include <icetray/I3Units.h>
@@ -37,18 +38,30 @@ I3GlobalTriggerSim::I3GlobalTriggerSim(const I3Context& ctx)
   : I3Module(ctx),
     eventID_(0),
     i3TriggName_("I3Triggers"),
+    triggerCollectorName_(""),
     globalTriggName_("I3TriggerHierarchy"),
+    detectorStatusName_("I3DetectorStatus"),
+    eventHeaderName_("I3EventHeader"),
     filterMode_(true),
     i3ReadoutWindowBefore_(NAN),
     i3ReadoutWindowAfter_(NAN),
     i3ReadoutWindowOffset_(NAN),
     time_increment_(0.),
     run_id_(std::numeric_limits<unsigned>::max()),
+    profileName_(""),
     dt_(0.)
 {
  
    AddParameter("I3TriggerName","InIce Trigger name in frame",i3TriggName_);
    AddParameter("GlobalTriggerName","Output global trigger name in frame",globalTriggName_);
+   AddParameter("TriggerCollectorName",
+		"Name of the TriggerCollector the trigger modules added their triggers to. "
+		"If it's in the frame it's made into the I3TriggerName hierarchy first.",
+		triggerCollectorName_);
+   AddParameter("DetectorStatusName",
+		"Name of the I3DetectorStatus to take the readout windows from.",
+		detectorStatusName_);
+   AddParameter("EventHeaderName","Output I3EventHeader name in frame",eventHeaderName_);
    AddParameter("FilterMode","Filter events that do not satisfy the trigger condition",filterMode_);
    AddParameter("I3ReadoutWindowBefore", "Readout window before the trigger",i3ReadoutWindowBefore_); 
    AddParameter("I3ReadoutWindowAfter", "Readout window after the trigger",i3ReadoutWindowAfter_);
@@ -63,6 +76,10 @@ I3GlobalTriggerSim::I3GlobalTriggerSim(const I3Context& ctx)
    AddParameter("FromTime","If set I3Times will be uniformly spread from this time, until ToTime.", I3TimePtr());
    AddParameter("ToTime","If set I3Times will be uniformly spread to this time.", I3TimePtr());
    AddParameter("RunID","ID of the run.", run_id_);
+   AddParameter("ProfileName",
+		"If set, the time and the number of triggers of every frame are put "
+		"into the frame under this name and summed up at Finish.",
+		profileName_);
  
    AddOutBox("OutBox");
 }
@@ -73,6 +90,9 @@ void I3GlobalTriggerSim::Configure()
 
    GetParameter("I3TriggerName", i3TriggName_);
    GetParameter("GlobalTriggerName", globalTriggName_);
+   GetParameter("TriggerCollectorName", triggerCollectorName_);
+   GetParameter("DetectorStatusName", detectorStatusName_);
+   GetParameter("EventHeaderName", eventHeaderName_);
    GetParameter("FilterMode",filterMode_);
    GetParameter("I3ReadoutWindowBefore",i3ReadoutWindowBefore_);
    GetParameter("I3ReadoutWindowAfter",i3ReadoutWindowAfter_);
@@ -80,6 +100,10 @@ void I3GlobalTriggerSim::Configure()
    GetParameter("I3DOMLaunchSeriesMapNames",domLaunchSeriesMapNames_);		 
    GetParameter("TimeIncrement", time_increment_);
    GetParameter("RunID", run_id_);
+   GetParameter("ProfileName", profileName_);
+
+   if(profileName_.size())
+     profile_ = TriggerProfilePtr(new TriggerProfile(GetName()));
 
    I3TimePtr from_time;
    I3TimePtr to_time;
@@ -112,17 +136,27 @@ void I3GlobalTriggerSim::Configure()
 void I3GlobalTriggerSim::DAQ(I3FramePtr frame)
 {
    log_debug("Entering I3GlobalTriggerSim::DAQ()");
+   if(profile_) profile_->Start();
 
-   const I3DetectorStatus& detStat = frame->Get<I3DetectorStatus>();
-
-   GlobalTriggerSim gts(detStat);
-   I3TriggerReadoutConfig roc;
-   roc.readoutTimeMinus = i3ReadoutWindowBefore_;
-   roc.readoutTimePlus = i3ReadoutWindowAfter_;
-   roc.readoutTimeOffset = i3ReadoutWindowOffset_;
-   gts.SetDefaultReadoutConfig(roc);
+   // the GlobalTriggerSim is only made again when the I3DetectorStatus changes
+   I3DetectorStatusConstPtr detStat = frame->Get<I3DetectorStatusConstPtr>(detectorStatusName_);
+   if(!detStat)
+     log_fatal("This frame has no I3DetectorStatus called %s.", detectorStatusName_.c_str());
+   if(!triggerConfig_ || triggerConfig_->GetDetectorStatus() != detStat){
+     triggerConfig_ = TriggerConfig::Get(detStat);
+     gts_ = boost::shared_ptr<GlobalTriggerSim>
+       (new GlobalTriggerSim(triggerConfig_->GetReadoutWindowUtil()));
+     I3TriggerReadoutConfig roc;
+     roc.readoutTimeMinus = i3ReadoutWindowBefore_;
+     roc.readoutTimePlus = i3ReadoutWindowAfter_;
+     roc.readoutTimeOffset = i3ReadoutWindowOffset_;
+     gts_->SetDefaultReadoutConfig(roc);
+   }
+   GlobalTriggerSim& gts = *gts_;
 
-   I3TriggerHierarchyConstPtr i3Triggers = frame->Get<I3TriggerHierarchyConstPtr>(i3TriggName_);
+   // the trigger hierarchy is made once here if the trigger modules collected their triggers
+   I3TriggerHierarchyConstPtr i3Triggers =
+     TriggerCollector::Finish(*frame, triggerCollectorName_, i3TriggName_);
 
    std::vector<I3Trigger> triggers;
    I3TriggerHierarchy::iterator i;
@@ -133,6 +167,10 @@ void I3GlobalTriggerSim::DAQ(I3FramePtr frame)
    gts.InsertThroughputTriggers( triggers, tTriggers );
 
    I3TriggerHierarchyPtr gTriggers = gts.Merge(tTriggers); 
+   if(profile_){
+     profile_->Count("triggers", triggers.size());
+     profile_->Count("global_triggers", gTriggers ? gTriggers->size() : 0);
+   }
 
    /*
     * Determine the size of the event. For triggered events
@@ -173,14 +211,15 @@ void I3GlobalTriggerSim::DAQ(I3FramePtr frame)
    
    if(! (start_times.size() || stop_times.size()) ){
      log_debug("No hits in this event.");
+     if(profile_) profile_->Stop(*frame, profileName_);
      PushIf(false,frame);
      return;
    }
    
    // delete the old I3EventHeader
    // one will exist already when re-triggering
-   if(frame->Get<I3EventHeaderConstPtr>()){
-     frame->Delete("I3EventHeader");
+   if(frame->Get<I3EventHeaderConstPtr>(eventHeaderName_)){
+     frame->Delete(eventHeaderName_);
    }
    
    double earliest = *min_element(start_times.begin(),start_times.end());
@@ -202,8 +241,7 @@ void I3GlobalTriggerSim::DAQ(I3FramePtr frame)
      double dt = rng->Uniform(d_time_range);
      start_time = time_range_->first + earliest + dt;
    }else{
-     I3DetectorStatusConstPtr dstatus = frame->Get<I3DetectorStatusConstPtr>("I3DetectorStatus");
-     start_time = dstatus->startTime + dt_ + earliest;
+     start_time = detStat->startTime + dt_ + earliest;
    }
    end_time = start_time + latest - earliest;
    
@@ -218,9 +256,16 @@ void I3GlobalTriggerSim::DAQ(I3FramePtr frame)
    /*
     * Fill the frame
     */
-   frame->Put(header);
+   frame->Put(eventHeaderName_, header);
    frame->Put(globalTriggName_, gTriggers);
    
+   if(profile_) profile_->Stop(*frame, profileName_);
+
    // If there are no triggers, return false
    PushIf(!gTriggers->empty() ,frame);
 }
+
+void I3GlobalTriggerSim::Finish()
+{
+   if(profile_) log_info("%s", profile_->Summary().c_str());
+}
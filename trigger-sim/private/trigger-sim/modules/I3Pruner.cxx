@@ -17,9 +17,11 @@
 #include "icetray/I3Units.h"
 
 #include "trigger-sim/modules/I3Pruner.h"
-#include "trigger-sim/utilities/ReadoutWindowUtil.h"
+#include "trigger-sim/utilities/TriggerConfig.h"
 
 #include <boost/foreach.hpp>
+#include <algorithm>
+#include <cmath>
 
 I3_MODULE(I3Pruner);
 
@@ -27,12 +29,17 @@ using namespace std;
 
 I3Pruner::I3Pruner(const I3Context& ctx) : 
   I3ConditionalModule(ctx),
-  triggerName_("I3TriggerHierarchy")
+  triggerName_("I3TriggerHierarchy"),
+  profileName_("")
 {
    dataReadoutNames_.push_back("InIceRawData");
    dataReadoutNames_.push_back("IceTopRawData");
    AddParameter("DOMLaunchSeriesMapNames", "This holds the DOM launches", dataReadoutNames_);
    AddParameter("GlobalTriggerName", "Name of the global trigger hierarchy", triggerName_);
+   AddParameter("ProfileName",
+		"If set, the time and the number of launches kept and removed of every "
+		"frame are put into the frame under this name and summed up at Finish.",
+		profileName_);
    AddOutBox("OutBox");
 }
 
@@ -44,26 +51,89 @@ void I3Pruner::Configure()
 {  
    GetParameter("DOMLaunchSeriesMapNames", dataReadoutNames_); 
    GetParameter("GlobalTriggerName",triggerName_);
+   GetParameter("ProfileName", profileName_);
+
+   if(profileName_.size())
+     profile_ = TriggerProfilePtr(new TriggerProfile(GetName()));
+}
+
+void I3Pruner::Finish()
+{
+   if(profile_) log_info("%s", profile_->Summary().c_str());
+}
+
+namespace{
+
+  typedef std::vector< std::pair<double,double> > window_vector_t;
+
+  // Sorts the readout windows and merges the overlapping ones.
+  // Windows with a NAN edge can't contain any hit and are dropped.
+  void MergeWindows(window_vector_t& windows){
+    window_vector_t::iterator end =
+      std::remove_if(windows.begin(), windows.end(),
+		     [](const std::pair<double,double>& w)
+		     { return std::isnan(w.first) || std::isnan(w.second) || w.first > w.second; });
+    windows.erase(end, windows.end());
+    std::sort(windows.begin(), windows.end());
+
+    window_vector_t merged;
+    BOOST_FOREACH(const window_vector_t::value_type& w, windows){
+      if(merged.size() && w.first <= merged.back().second)
+	merged.back().second = std::max(merged.back().second, w.second);
+      else
+	merged.push_back(w);
+    }
+    windows.swap(merged);
+  }
+
+  // Is the time inside one of the sorted, disjoint readout windows?
+  bool InWindow(const window_vector_t& windows, double time){
+    window_vector_t::const_iterator i =
+      std::upper_bound(windows.begin(), windows.end(), time,
+		       [](double t, const std::pair<double,double>& w){ return t < w.first; });
+    return i != windows.begin() && time <= (i - 1)->second;
+  }
+
 }
 
 void I3Pruner::DAQ(I3FramePtr frame){
+  if(profile_) profile_->Start();
+  size_t nKept(0);
+  size_t nRemoved(0);
 
   // Get the geometry
   const I3Geometry& geometry = frame->Get<I3Geometry>();
 
-  // Get the detector status
-  const I3DetectorStatus& status = frame->Get<I3DetectorStatus>();
-
-  // Create the ReadoutWindowUtil helper class
-  ReadoutWindowUtil rwUtil(status);
+  // Get the detector status and get the readout windows
+  // (shared with I3GlobalTriggerSim) only when it changes
+  I3DetectorStatusConstPtr status = frame->Get<I3DetectorStatusConstPtr>();
+  if(!status)
+    log_fatal("This frame has no I3DetectorStatus.");
+  if(!triggerConfig_ || triggerConfig_->GetDetectorStatus() != status)
+    triggerConfig_ = TriggerConfig::Get(status);
+  const ReadoutWindowUtil& rwUtil = *triggerConfig_->GetReadoutWindowUtil();
 
   // Get the trigger hierarchy
   I3TriggerHierarchyConstPtr gTrigger = frame->Get<I3TriggerHierarchyConstPtr>(triggerName_);
   
-  I3TriggerHierarchy::iterator th_iter;
   if (gTrigger && gTrigger->size()) {
 
-    BOOST_FOREACH(std::string dataReadoutName, dataReadoutNames_) { // suppose you have several input maps, loops through all
+    // Collect the readout windows of all subdetector triggers (inice or icetop)
+    // once per frame and merge them, so each hit is a binary search away.
+    window_vector_t iniceReadoutWindows;
+    window_vector_t icetopReadoutWindows;
+    for (I3TriggerHierarchy::iterator th_iter = gTrigger->begin(); th_iter != gTrigger->end(); th_iter++) {
+      bool triggerIsInIce = th_iter->GetTriggerKey().GetSource() == TriggerKey::IN_ICE;
+      bool triggerIsIceTop = th_iter->GetTriggerKey().GetSource() == TriggerKey::ICE_TOP;
+      if ( triggerIsInIce || triggerIsIceTop ) {
+	iniceReadoutWindows.push_back(rwUtil.GetInIceReadoutWindow(*th_iter));
+	icetopReadoutWindows.push_back(rwUtil.GetIceTopReadoutWindow(*th_iter));
+      }
+    }
+    MergeWindows(iniceReadoutWindows);
+    MergeWindows(icetopReadoutWindows);
+
+    BOOST_FOREACH(const std::string& dataReadoutName, dataReadoutNames_) { // suppose you have several input maps, loops through all
 
       // skip if the map isn't found in the frame
       if ( ! frame->Has(dataReadoutName) ) continue;      
@@ -79,69 +149,33 @@ void I3Pruner::DAQ(I3FramePtr frame){
       for (iter = dlsInMap->begin(); iter != dlsInMap->end(); ++iter) { // loop thorugh all doms in this dataReadoutName
 
 	// get the sub-detector of these launches
-	I3OMGeo omgeo = geometry.omgeo.find(iter->first)->second;
-	bool hitIsInIce = omgeo.omtype == I3OMGeo::IceCube;
-	bool hitIsIceTop = omgeo.omtype == I3OMGeo::IceTop;
+	I3OMGeoMap::const_iterator geo_iter = geometry.omgeo.find(iter->first);
+	if (geo_iter == geometry.omgeo.end())
+	  log_fatal("%s is not in the geometry.", iter->first.str().c_str());
+	const I3OMGeo& omgeo = geo_iter->second;
+
+	// only inice and icetop hits can be in a readout window
+	const window_vector_t* readoutWindows = NULL;
+	if (omgeo.omtype == I3OMGeo::IceCube)
+	  readoutWindows = &iniceReadoutWindows;
+	else if (omgeo.omtype == I3OMGeo::IceTop)
+	  readoutWindows = &icetopReadoutWindows;
+	if (!readoutWindows || readoutWindows->empty()) {
+	  nRemoved += iter->second.size();
+	  continue;
+	}
 
 	I3DOMLaunchSeries launch_series;
-	I3DOMLaunchSeries::const_iterator dlIter;
-	for (dlIter = iter->second.begin(); dlIter != iter->second.end(); ++dlIter) { // loop through the launches per dom
-
-	  bool keepHit = false;
-	  double hitTime = dlIter->GetStartTime();
-
-	  // check the trigger hierarchy for a readout window that includes this hit
-	  for (th_iter = gTrigger->begin(); th_iter != gTrigger->end(); th_iter++) {
-
-	    // make sure this is a subdetector trigger (inice or icetop)
-	    bool triggerIsInIce = th_iter->GetTriggerKey().GetSource() == TriggerKey::IN_ICE;
-	    bool triggerIsIceTop = th_iter->GetTriggerKey().GetSource() == TriggerKey::ICE_TOP;
-
-	    if ( triggerIsInIce || triggerIsIceTop ) {
-
-	      // Get the readout windows
-	      const I3Trigger& trigger = *th_iter;
-	      std::pair<double,double> iniceReadoutWindow = rwUtil.GetInIceReadoutWindow(trigger);
-	      std::pair<double,double> icetopReadoutWindow = rwUtil.GetIceTopReadoutWindow(trigger);
-			 
-	      // Get the times (initalize to inice)
-	      double earliestTime = iniceReadoutWindow.first;
-	      double latestTime = iniceReadoutWindow.second;
-	      if (hitIsIceTop) {
-		earliestTime = icetopReadoutWindow.first;
-		latestTime = icetopReadoutWindow.second;
-	      }
-
-	      // See if this hit should be kept
-	      if (hitIsInIce && earliestTime != NAN && latestTime != NAN) {
-		// This is an inice hit and the inice readout window is valid
-		if ( (hitTime >= earliestTime) && (hitTime <= latestTime) )
-		  keepHit = true;
-	      }
-
-	      if (hitIsIceTop && earliestTime != NAN && latestTime != NAN) {
-		// This is an icetop hit and the icetop readout window is valid
-		if ( (hitTime >= earliestTime) && (hitTime <= latestTime) )
-		  keepHit = true;
-	      }
-
-	    }
- 
-	    // if we know we want it, break the iteration over sub-detector triggers
-	    if (keepHit) break;
-
-	  } // end loop over triggers
-
-	  // now see if we kept this hit
-	  if (keepHit) {
-	    //only push back events within the readout time window
-	    launch_series.push_back(*dlIter);             
-	  }
-
+	BOOST_FOREACH(const I3DOMLaunch& launch, iter->second) { // loop through the launches per dom
+	  //only push back events within the readout time window
+	  if (InWindow(*readoutWindows, launch.GetStartTime()))
+	    launch_series.push_back(launch);
 	} // end loop over hits
 
+	nKept += launch_series.size();
+	nRemoved += iter->second.size() - launch_series.size();
 	if (launch_series.size()) {
-	  (*pruned_map)[iter->first] = launch_series;
+	  (*pruned_map)[iter->first].swap(launch_series);
 	}
 
       } // end loop over doms
@@ -154,6 +188,10 @@ void I3Pruner::DAQ(I3FramePtr frame){
    
   }
    
+  if(profile_){
+    profile_->Count("launches", nKept);
+    profile_->Count("pruned", nRemoved);
+    profile_->Stop(*frame, profileName_);
+  }
   PushFrame(frame,"OutBox");
 }
-
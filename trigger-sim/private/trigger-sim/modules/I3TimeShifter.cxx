@@ -0,0 +1,48 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ *
+ * @file I3TimeShifter.cxx
+ */
+
+#include <cmath>
+
+#include "icetray/I3Frame.h"
+#include "dataclasses/I3Double.h"
+
+#include "trigger-sim/modules/I3TimeShifter.h"
+#include "trigger-sim/utilities/TimeShifterUtils.h"
+
+I3_MODULE(I3TimeShifter);
+
+I3TimeShifter::I3TimeShifter(const I3Context& ctx) : 
+  I3ConditionalModule(ctx)
+{
+   AddParameter("SkipKeys", "Don't shift these frame objects.", skipKeys_);
+   AddParameter("ShiftI3DoubleKeys", "Do shift these I3Doubles.", shiftI3DoubleKeys_);
+   AddOutBox("OutBox");
+}
+
+I3TimeShifter::~I3TimeShifter()
+{
+}
+
+void I3TimeShifter::Configure()
+{  
+   GetParameter("SkipKeys", skipKeys_);
+   GetParameter("ShiftI3DoubleKeys", shiftI3DoubleKeys_);
+}
+
+void I3TimeShifter::DAQ(I3FramePtr frame){
+
+  // The global time shift, the earliest trigger, MC hit or launch time.
+  double dt = TimeShifterUtils::GetTimeShift(*frame, skipKeys_);
+  if(std::isnan(dt))
+    log_fatal("The time shift is NAN.");
+
+  TimeShifterUtils::ShiftFrameObjects(frame, dt, skipKeys_, shiftI3DoubleKeys_);
+
+  frame->Put("TimeShift", I3DoublePtr(new I3Double(dt)));
+
+  PushFrame(frame,"OutBox");
+}
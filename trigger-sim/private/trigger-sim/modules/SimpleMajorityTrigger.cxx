@@ -10,6 +10,7 @@
  */
 
 #include <trigger-sim/modules/SimpleMajorityTrigger.h>
+#include <trigger-sim/algorithms/TriggerCollector.h>
 #include <trigger-sim/algorithms/SimpleMajorityTriggerAlgorithm.h>
 #include <icetray/OMKey.h>
 #include <dataclasses/I3Vector.h>
@@ -25,10 +26,6 @@
 using namespace boost::assign;
 
 using DetectorStatusUtils::tk_ts_pair_t;
-using DetectorStatusUtils::_sourceID;
-using DetectorStatusUtils::_typeID;
-using DetectorStatusUtils::_configID;
-using DetectorStatusUtils::GetTriggerStatus;
 
 I3_MODULE(SimpleMajorityTrigger);
 
@@ -39,6 +36,10 @@ SimpleMajorityTrigger::SimpleMajorityTrigger(const I3Context& context) :
   dataReadoutName_(""),
   triggerName_("I3Triggers"),
   domSetsName_("DOMSets"),
+  detectorStatusName_("I3DetectorStatus"),
+  triggerHitTableName_(""),
+  triggerCollectorName_(""),
+  profileName_(""),
   triggerSourceParam_(INT_MIN),
   triggerSource_(TriggerKey::UNKNOWN_SOURCE),
   configIDParam_(INT_MIN),
@@ -69,6 +70,27 @@ SimpleMajorityTrigger::SimpleMajorityTrigger(const I3Context& context) :
 	       "Name of the I3MapKeyVectorInt defining the DomSets for each DOM.",
 	       domSetsName_);
 
+  AddParameter("DetectorStatusName",
+	       "Name of the I3DetectorStatus to take the trigger configuration from.",
+	       detectorStatusName_);
+
+  AddParameter("TriggerHitTableName",
+	       "Name of the TriggerHitTable made by the TriggerHitExtractor. "
+	       "If set and found in the frame the hits are taken from there "
+	       "instead of the DOM launches.",
+	       triggerHitTableName_);
+
+  AddParameter("TriggerCollectorName",
+	       "Name of the TriggerCollector to add the triggers to.  If set, "
+	       "I3GlobalTriggerSim makes the I3TriggerHierarchy from it, "
+	       "otherwise the triggers are added to TriggerName right away.",
+	       triggerCollectorName_);
+
+  AddParameter("ProfileName",
+	       "If set, the time and the number of hits of every frame are put "
+	       "into the frame under this name and summed up at Finish.",
+	       profileName_);
+
   AddOutBox("OutBox");
 }
 
@@ -81,6 +103,13 @@ void SimpleMajorityTrigger::Configure()
   GetParameter("TriggerSource",triggerSourceParam_);
   GetParameter("TriggerConfigID",configIDParam_);
   GetParameter("DOMSetsName", domSetsName_);
+  GetParameter("DetectorStatusName", detectorStatusName_);
+  GetParameter("TriggerHitTableName", triggerHitTableName_);
+  GetParameter("TriggerCollectorName", triggerCollectorName_);
+  GetParameter("ProfileName", profileName_);
+
+  if(profileName_.size())
+    profile_ = TriggerProfilePtr(new TriggerProfile(GetName()));
 
   if(triggerSourceParam_ != INT_MIN)
     triggerSource_ = static_cast<TriggerKey::SourceID>(triggerSourceParam_);
@@ -93,6 +122,8 @@ void SimpleMajorityTrigger::Configure()
 
 void SimpleMajorityTrigger::DAQ(I3FramePtr frame)
 {
+  if(profile_) profile_->Start();
+
   // Get the DOMSets from the frame
   I3MapKeyVectorIntConstPtr domSets = 
     frame->Get<I3MapKeyVectorIntConstPtr>(domSetsName_);
@@ -107,11 +138,14 @@ void SimpleMajorityTrigger::DAQ(I3FramePtr frame)
   } else { 
     log_debug("You requested to grab the \"%s\" DOMSets from the frame, but it is empty.", domSetsName_.c_str());
   }
+  domSetTable_ = DOMSetFunctions::GetDOMSetTable(domSets, domSetTable_);
   log_debug("  TriggerWindow = %f", triggerWindow_);
   log_debug("  TriggerThreshold = %d", triggerThreshold_);
 
   // Create the trigger object
-  SimpleMajorityTriggerAlgorithm smTrigger(triggerWindow_, triggerThreshold_);
+  if(!smTrigger_)
+    smTrigger_ = SimpleMajorityTriggerAlgorithmPtr
+      (new SimpleMajorityTriggerAlgorithm(triggerWindow_, triggerThreshold_));
 
   log_debug("Checking for Triggers...");
   eventCount_++;
@@ -137,55 +171,78 @@ void SimpleMajorityTrigger::DAQ(I3FramePtr frame)
     }
   }
 
+  TriggerHitTableConstPtr hitTable;
+  if(triggerHitTableName_.size()){
+    hitTable = frame->Get<TriggerHitTableConstPtr>(triggerHitTableName_);
+    if(hitTable && hitTable->GetSourceName() != dataReadoutName_)
+      log_fatal("The TriggerHitTable %s was made from %s, not %s.",
+		triggerHitTableName_.c_str(),
+		hitTable->GetSourceName().c_str(),
+		dataReadoutName_.c_str());
+  }
+
   log_debug("Grabbing the DOMLaunches called %s", dataReadoutName_.c_str());
   I3DOMLaunchSeriesMapConstPtr fullMap = 
     frame->Get<I3DOMLaunchSeriesMapConstPtr>(dataReadoutName_);
 
-  if (fullMap == 0) {
+  if (fullMap == 0 && !hitTable) {
     log_debug("Frame does not contain an I3DOMLaunchSeriesMap named %s",
 	      dataReadoutName_.c_str());
 
   } else {
 
-    // count the hits
-    int count = 0;
-    I3DOMLaunchSeriesMap::const_iterator mapIter;
-    for (mapIter = fullMap->begin(); mapIter != fullMap->end(); mapIter++) {
-      I3DOMLaunchSeries::const_iterator seriesIter;
-      for (seriesIter = mapIter->second.begin(); 
-	   seriesIter != mapIter->second.end(); 
-	   seriesIter++) count++;
-    }
-    log_debug("Got %d hits to split", count);
+    // the buffer only allocates when it has to grow
+    const size_t growths(hits_.GetGrowths());
+    hits_.clear();
+
+    if (hitTable) {
+      /*------------------------------------------------------------*
+       * The hits were already extracted and time ordered
+       *------------------------------------------------------------*/
+      log_debug("Got %zu hits from %s", hitTable->size(), triggerHitTableName_.c_str());
+      FillHits(*hitTable, hits_);
+
+    } else {
+      // count the hits
+      int count = 0;
+      I3DOMLaunchSeriesMap::const_iterator mapIter;
+      for (mapIter = fullMap->begin(); mapIter != fullMap->end(); mapIter++) {
+        I3DOMLaunchSeries::const_iterator seriesIter;
+        for (seriesIter = mapIter->second.begin(); 
+             seriesIter != mapIter->second.end(); 
+             seriesIter++) count++;
+      }
+      log_debug("Got %d hits to split", count);
 
-    /*------------------------------------------------------------*
-     * Fill the hits
-     *------------------------------------------------------------*/
-    TriggerHitVectorPtr hitVector(new TriggerHitVector);
-    FillHits(fullMap, hitVector, domSets);
+      /*------------------------------------------------------------*
+       * Fill the hits
+       *------------------------------------------------------------*/
+      FillHits(fullMap, hits_, *domSetTable_);
 
-    /*------------------------------------------------------------*
-     * Time order the hits
-     *------------------------------------------------------------*/
-    std::sort(hitVector->begin(), hitVector->end());
-    Dump(hitVector);
+      /*------------------------------------------------------------*
+       * Time order the hits
+       *------------------------------------------------------------*/
+      hits_.SortByTime();
+    }
+    Dump(hits_);
+    if(profile_){
+      profile_->Count("hits", hits_.size());
+      profile_->Count("buffer_growths", hits_.GetGrowths() - growths);
+    }
 
     /*------------------------------------------------------------*
      * Check Trigger condition on this string
      *------------------------------------------------------------*/
-    smTrigger.AddHits(hitVector);
-
-    unsigned int numTriggers = smTrigger.GetNumberOfTriggers();
-    for (unsigned int n = 0; n < numTriggers; n++) {
+    smTrigger_->AddHits(hits_);
 
-      TriggerHitVectorPtr timeHits = smTrigger.GetNextTrigger();
+    BOOST_FOREACH(const TriggerHitIndexPair& window, smTrigger_->GetTriggerWindows()) {
 
       // We have a trigger!
       triggerCount_++;
 
       // The trigger times are defined by the hits in the time window
-      double startTime(timeHits->front().time);
-      double stopTime(timeHits->back().time);
+      double startTime(hits_.time[window.first]);
+      double stopTime(hits_.time[window.second - 1]);
 
       I3Trigger tr;
       tr.GetTriggerKey() = triggerKey_;
@@ -199,22 +256,13 @@ void SimpleMajorityTrigger::DAQ(I3FramePtr frame)
 
   } // endif
   
-  // Check to see if a trigger hierarchy already exists
-  I3TriggerHierarchyPtr triggers;
-  if(frame->Has(triggerName_)){
-    const I3TriggerHierarchy& old_th = frame->Get<I3TriggerHierarchy>(triggerName_);
-    triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy(old_th));
-    frame->Delete(triggerName_);
-  }else{
-    triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy);
-  }
-
-  // Fill the trigger hierarchy
-  BOOST_FOREACH(I3Trigger& t, tlist)
-    triggers->insert(triggers->begin(), t);
-
-  frame->Put(triggerName_,triggers);
+  // Add the triggers to the trigger hierarchy (or the collector)
+  TriggerCollector::AddTriggers(*frame, triggerCollectorName_, triggerName_, tlist);
 
+  if(profile_){
+    profile_->Count("triggers", tlist.size());
+    profile_->Stop(*frame, profileName_);
+  }
   PushFrame( frame );
 }
 
@@ -225,62 +273,71 @@ void SimpleMajorityTrigger::Finish()
   if(configID_) sstr<<" for config id "<<configID_.get()<<".";
   else sstr<<".";
   log_info("%s",sstr.str().c_str());
+
+  if(profile_) log_info("%s", profile_->Summary().c_str());
 }
 
 void SimpleMajorityTrigger::FillHits(I3DOMLaunchSeriesMapConstPtr fullMap, 
-				     TriggerHitVectorPtr hitList, 
-				     I3MapKeyVectorIntConstPtr domSets)
+				     TriggerHitBuffer& hits, 
+				     const DOMSetTable& domSets)
 {
-  I3DOMLaunchSeriesMap::const_iterator fullMapIter;
-  for (fullMapIter = fullMap->begin(); fullMapIter != fullMap->end(); fullMapIter++) {
+  if (domSet_) 
+    log_debug("A DOMSet is specified for this trigger: %d", domSet_.get());
+  else
+    log_debug("No DOMSet is specified, so all DOMs are included by default"); 
+
+  // the DOMs in the DOMSet (or all of them), selected in one go
+  doms_.clear();
+  domSets.Select(*fullMap, domSet_, doms_);
+
+  BOOST_FOREACH(I3DOMLaunchSeriesMap::const_iterator fullMapIter, doms_) {
     const OMKey& omKey = fullMapIter->first;
     const I3DOMLaunchSeries& fullSeries = fullMapIter->second;
+    log_debug("DOM %s is included", omKey.str().c_str());
 
     I3DOMLaunchSeries::const_iterator fullSeriesIter;
     for (fullSeriesIter = fullSeries.begin(); 
 	 fullSeriesIter != fullSeries.end(); fullSeriesIter++) {
+      // TF : should there also be the "|| threshold ==1" like in I3SMTrigger ?	
       if( fullSeriesIter->GetLCBit() ){ 
-	if (domSet_) { 
-	  log_debug("A DOMSet is specified for this trigger: %d", domSet_.get());
-	  log_debug("...and is DOM %s included? %d", omKey.str().c_str(), DOMSetFunctions::InDOMSet(omKey,domSet_.get(),domSets));
-	}
-	else { 
-	  log_debug("No DOMSet is specified, so this code will just say %s is included by default", omKey.str().c_str()); 
-	}
-	// TF : should there also be the "|| threshold ==1" like in I3SMTrigger ?	
-	if( ( domSet_ && DOMSetFunctions::InDOMSet(omKey,domSet_.get(),domSets) ) 
-	    || !domSet_ ){
-	  TriggerHitPtr hit(new TriggerHit);
-	  hit->pos = omKey.GetOM();
-	  hit->time = fullSeriesIter->GetStartTime();
-	  hitList->push_back(*hit);
-	}
+	hits.push_back(fullSeriesIter->GetStartTime(), omKey.GetOM(), 0);
       }
     }
   }
 }
 
-void SimpleMajorityTrigger::Dump(TriggerHitVectorPtr input)
+void SimpleMajorityTrigger::FillHits(const TriggerHitTable& table,
+				     TriggerHitBuffer& hits)
 {
-  log_debug("Dumping Event with %zd hits...", input->size());
+  hits.reserve(table.size());
+  BOOST_FOREACH(const TriggerHitTable::Hit& h, table){
+    if( h.lc && ( !domSet_ || h.InDOMSet(domSet_.get()) ) ){
+      hits.push_back(h.time, h.omKey.GetOM(), 0);
+    }
+  }
+}
 
-  TriggerHitVector::const_iterator iter;
-  for (iter = input->begin(); iter != input->end(); iter++) {
-    const TriggerHit& hit __attribute__((unused)) = *iter;
-    log_debug("  Time %f   Position %u", hit.time, hit.pos);
+void SimpleMajorityTrigger::Dump(const TriggerHitBuffer& input)
+{
+  log_debug("Dumping Event with %zd hits...", input.size());
+
+  for (size_t i = 0; i < input.size(); i++) {
+    log_debug("  Time %f   Position %u", input.time[i], input.pos[i]);
   }
 }
 
 void SimpleMajorityTrigger::DetectorStatus(I3FramePtr frame){
   // Get DetectorStatus from the frame
-  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>();
-  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object.");
+  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>(detectorStatusName_);
+  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object called %s.",
+                           detectorStatusName_.c_str());
 
   // set the default triggerSource_ to UNKNOWN and
   // configID_ to "unset".   need to change the type 
   // boost::optional<int>.
-  boost::optional<tk_ts_pair_t> tkts = GetTriggerStatus
-    (detStatus, _sourceID = triggerSource_, _typeID = TYPEID, _configID = configID_ );
+  triggerConfig_ = TriggerConfig::Get(detStatus);
+  boost::optional<tk_ts_pair_t> tkts =
+    triggerConfig_->GetTriggerStatus(triggerSource_, TYPEID, configID_);
 
   if(!tkts) log_fatal("Failed to configure this module from the DetectorStatus.");
 
@@ -292,6 +349,9 @@ void SimpleMajorityTrigger::DetectorStatus(I3FramePtr frame){
   tkts.get().second.GetTriggerConfigValue("timeWindow", triggerWindow_);
   tkts.get().second.GetTriggerConfigValue("domSet", domSet_);
 
+  // the algorithm is made with the new settings at the next DAQ frame
+  smTrigger_.reset();
+
   log_debug("  TriggerWindow = %f", triggerWindow_);
   log_debug("  TriggerThreshold = %d", triggerThreshold_);
 
@@ -1,5 +1,6 @@
 #include <iostream>
 #include <math.h>
+#include <algorithm>
 #include <boost/foreach.hpp>
 
 #include "icetray/I3TrayHeaders.h"
@@ -17,6 +18,7 @@
 #include "dataclasses/I3Vector.h"
 #include "trigger-sim/utilities/DOMSetFunctions.h"
 #include "trigger-sim/algorithms/TriggerContainer.h"
+#include "trigger-sim/algorithms/TriggerCollector.h"
 #include "trigger-sim/algorithms/SlowMPHit.h"
 #include "trigger-sim/modules/SlowMonopoleTrigger.h"
 #include "trigger-sim/utilities/DetectorStatusUtils.h"
@@ -28,10 +30,6 @@ using namespace std;
 using namespace I3Units;
 
 using DetectorStatusUtils::tk_ts_pair_t;
-using DetectorStatusUtils::_sourceID;
-using DetectorStatusUtils::_typeID;
-using DetectorStatusUtils::_configID;
-using DetectorStatusUtils::GetTriggerStatus;
 
 I3_MODULE(SlowMonopoleTrigger);
 const TriggerKey::SourceID SOURCEID(TriggerKey::IN_ICE);
@@ -43,6 +41,10 @@ SlowMonopoleTrigger::SlowMonopoleTrigger(const I3Context& ctx) :
   triggerName_("I3Triggers"),
   dataReadoutName_("InIceRawData"),
   domSetsName_("DOMSets"),
+  detectorStatusName_("I3DetectorStatus"),
+  triggerHitTableName_(""),
+  triggerCollectorName_(""),
+  profileName_(""),
   save_additional_info_(false),
   // the following parameters are read from the GCD:
   t_proximity_(NAN),     // 2.5 microseconds
@@ -53,7 +55,9 @@ SlowMonopoleTrigger::SlowMonopoleTrigger(const I3Context& ctx) :
   dc_algo_(boost::optional<bool>()),           // true since IC2012, false for IC2011
   relv_(0.5),            // 0.5 (all values are per definition smaller than 3.0)
   min_tuples_(-1),       // take all by default. pole settings are: 5 for IC2012, 3 for IC2011
-  max_event_length_(NAN) // 5000 microseconds
+  max_event_length_(NAN), // 5000 microseconds
+  nPairs_(0),
+  nTriples_(0)
 {
     AddOutBox("OutBox");
     
@@ -72,6 +76,28 @@ SlowMonopoleTrigger::SlowMonopoleTrigger(const I3Context& ctx) :
     AddParameter("DOMSetsName",
 		 "Name of the I3MapKeyVectorInt defining the DomSets for each DOM.",
 		 domSetsName_);
+
+    AddParameter("DetectorStatusName",
+		 "Name of the I3DetectorStatus to take the trigger configuration from.",
+		 detectorStatusName_);
+    
+    AddParameter("TriggerHitTableName",
+		 "Name of the TriggerHitTable made by the TriggerHitExtractor. "
+		 "If set and found in the frame the hits are taken from there "
+		 "instead of the DOM launches.",
+		 triggerHitTableName_);
+
+    AddParameter("TriggerCollectorName",
+		 "Name of the TriggerCollector to add the triggers to.  If set, "
+		 "I3GlobalTriggerSim makes the I3TriggerHierarchy from it, "
+		 "otherwise the triggers are added to TriggerName right away.",
+		 triggerCollectorName_);
+
+    AddParameter("ProfileName",
+		 "If set, the time, the number of hits and the number of HLC pairs "
+		 "and triples looked at of every frame are put into the frame "
+		 "under this name and summed up at Finish.",
+		 profileName_);
     
     AddParameter("AdditionalInformation",
      		 "Additional 3tuple information",
@@ -88,21 +114,33 @@ void SlowMonopoleTrigger::Configure(){
     GetParameter("TriggerName",triggerName_);
     GetParameter("TriggerConfigID",configIDParam_);
     GetParameter("DOMSetsName", domSetsName_);
+    GetParameter("DetectorStatusName", detectorStatusName_);
+    GetParameter("TriggerHitTableName", triggerHitTableName_);
+    GetParameter("TriggerCollectorName", triggerCollectorName_);
+    GetParameter("ProfileName", profileName_);
+
+    if(profileName_.size())
+      profile_ = TriggerProfilePtr(new TriggerProfile(GetName()));
 
     if(configIDParam_ != INT_MIN)
       configID_ = configIDParam_;
 }
 
 void SlowMonopoleTrigger::Finish(){
+  if(profile_) log_info("%s", profile_->Summary().c_str());
 }
 
 void SlowMonopoleTrigger::DAQ(I3FramePtr frame){
   
   log_debug("starting new event");
+  if(profile_) profile_->Start();
+  nPairs_ = 0;
+  nTriples_ = 0;
 
   // Get the DOMSets from the frame
   I3MapKeyVectorIntConstPtr domSets = 
     frame->Get<I3MapKeyVectorIntConstPtr>(domSetsName_);
+  domSetTable_ = DOMSetFunctions::GetDOMSetTable(domSets, domSetTable_);
 
   // clear global variables before entering new frame
   trigger_container_vector.clear();
@@ -115,55 +153,57 @@ void SlowMonopoleTrigger::DAQ(I3FramePtr frame){
 
   SlowMPHitVectorPtr hits(new SlowMPHitVector);
   
-  if (!frame->Has(dataReadoutName_)) {
+  TriggerHitTableConstPtr hitTable;
+  if(triggerHitTableName_.size()){
+    hitTable = frame->Get<TriggerHitTableConstPtr>(triggerHitTableName_);
+    if(hitTable && hitTable->GetSourceName() != dataReadoutName_)
+      log_fatal("The TriggerHitTable %s was made from %s, not %s.",
+		triggerHitTableName_.c_str(),
+		hitTable->GetSourceName().c_str(),
+		dataReadoutName_.c_str());
+  }
+
+  if (!hitTable && !frame->Has(dataReadoutName_)) {
     log_debug("Frame does not contain an I3DOMLaunchSeriesMap named %s", 
 	      dataReadoutName_.c_str());
+    if(profile_) profile_->Stop(*frame, profileName_);
     PushFrame( frame );
     return;
   }
 
-
-  const I3DOMLaunchSeriesMap& dlsMap = frame->Get<I3DOMLaunchSeriesMap>(dataReadoutName_);
-  
   /**
    * When DOMset is not defined (i.e. no entry in the trigger status) the default
    * is to use *ALL* DOMs *including* the DeepCore DOMs.
    */
 
-  BOOST_FOREACH(I3DOMLaunchSeriesMap::const_reference r,dlsMap){
-    BOOST_FOREACH(I3DOMLaunchSeries::const_reference launch,r.second){
+  if (hitTable) {
+    hits->reserve(hitTable->size());
+    BOOST_FOREACH(const TriggerHitTable::Hit& h, *hitTable){
+      if( h.lc && ( !domset_ || h.InDOMSet(domset_.get()) ) )
+	hits->push_back(SlowMPHit(h.time, h.omKey.GetOM(), h.omKey.GetString()));
+    }
+  } else {
+  const I3DOMLaunchSeriesMap& dlsMap = frame->Get<I3DOMLaunchSeriesMap>(dataReadoutName_);
+
+  /**
+   * Either the whole detector or only the DOMs of the DOMSet
+   * (e.g. DOMSet 4 for DeepCore triggers).
+   */
+  std::vector<I3DOMLaunchSeriesMap::const_iterator> doms;
+  domSetTable_->Select(dlsMap, domset_, doms);
+
+  BOOST_FOREACH(I3DOMLaunchSeriesMap::const_iterator r, doms){
+    BOOST_FOREACH(I3DOMLaunchSeries::const_reference launch,r->second){
       /**
        * Only consider DOMs whose HLC bit is set or when the threshold
        * is set to one then use all DOMs.  This is the MinBias case.
        */
-      if(launch.GetLCBit()){
-	/**
-	 * For DeepCore triggers only consider DOMs in DOMset 4
-	 */
-	if( ( domset_ && DOMSetFunctions::InDOMSet(r.first,domset_.get(),domSets) ) ||
-	    !domset_ ) {                                                      
-	  // either if the whole detector or a specific domset are specified, 
-	  // in both cases copy DomLaunches
-	  SlowMPHitPtr hit = SlowMPHitPtr(new SlowMPHit);
-	  hit->string = r.first.GetString();
-	  hit->pos = r.first.GetOM();
-	  hit->time = launch.GetStartTime();
-	  hits->push_back(*hit);
-	}
-      }
+      if(launch.GetLCBit())
+	hits->push_back(SlowMPHit(launch.GetStartTime(), r->first.GetOM(), r->first.GetString()));
     }
   }
-
-  //Check to see if a trigger hierarchy already exists
-  I3TriggerHierarchyPtr triggers;
-  if(frame->Has(triggerName_)){
-    const I3TriggerHierarchy& old_th = frame->Get<I3TriggerHierarchy>(triggerName_);
-    triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy(old_th));
-    frame->Delete(triggerName_);
-  }else{
-    triggers = I3TriggerHierarchyPtr(new I3TriggerHierarchy());
   }
-  
+
   //Get Geometry from the frame
   I3GeometryConstPtr geo = frame->Get<I3GeometryConstPtr>("I3Geometry");
   if( ! geo )
@@ -171,23 +211,40 @@ void SlowMonopoleTrigger::DAQ(I3FramePtr frame){
 	  log_fatal("Can't get geometry from the frame!");
   }
 
+  if(geo != geoTableGeometry_){
+    geoTableGeometry_ = geo;
+    geoTable_ = I3OMGeoTable::Get(geo);
+  }
+
+  // Look up the DOM positions once per hit.  The triple search
+  // uses them for every combination of hits it looks at.
+  BOOST_FOREACH(SlowMPHit& hit, *hits){
+    int index = geoTable_->GetIndex(OMKey(hit.string, hit.pos));
+    if(index == I3OMGeoTable::NOT_IN_GEOMETRY)
+      log_fatal("OMKey(%d,%d) is not in the geometry", hit.string, hit.pos);
+    hit.x = geoTable_->GetX(index);
+    hit.y = geoTable_->GetY(index);
+    hit.z = geoTable_->GetZ(index);
+  }
+
 
   ////////////////////////////////////////////////////////////////////////
     ////////////////////////   calling trigger    /////////////////////
   ////////////////////////////////////////////////////////////////////////
 
-  // Sort hits timewise
-  sort(hits->begin(), hits->end());
+  // Sort hits timewise, the TriggerHitTable already is
+  if (!hitTable)
+    sort(hits->begin(), hits->end());
 
   for(int i = 0; i < int(hits->size()); i++)
   {
 	SlowMPHit payload = hits->at(i);
-	RunTrigger(&one_hit_list, &two_hit_list, &muon_time_window, payload, geo);
+	RunTrigger(&one_hit_list, &two_hit_list, &muon_time_window, payload);
   }
 
   // Final call of CheckTriggerStatus. This is only necessary in simulation.
   // In the DAQ module the data stream never ends, so the timing condition is fulfilled.
-  CheckTriggerStatus(&two_hit_list, geo);
+  CheckTriggerStatus(&two_hit_list);
   log_debug("Trigger status checked. trigger_list.size(): %d", int(trigger_list.size()) );
 
   /// insert triggers into the hierarchy
@@ -196,11 +253,20 @@ void SlowMonopoleTrigger::DAQ(I3FramePtr frame){
   {
 	log_debug("writing triggers to the hierarchy: start: %f, length :%f.", 
 		 tIter->GetTriggerTime(), tIter->GetTriggerLength() );
-	triggers->insert(triggers->end(), *tIter);
   }
 
-  // Now put everything into the frame
-  frame->Put(triggerName_,triggers); 
+  // Now put everything into the frame (or the collector), behind
+  // the triggers that are already there
+  TriggerCollector::AddTriggers(*frame, triggerCollectorName_, triggerName_,
+                                trigger_list, false);
+
+  if(profile_){
+    profile_->Count("hits", hits->size());
+    profile_->Count("pairs", nPairs_);
+    profile_->Count("triples", nTriples_);
+    profile_->Count("triggers", trigger_list.size());
+    profile_->Stop(*frame, profileName_);
+  }
   PushFrame( frame );
 
 }
@@ -208,8 +274,7 @@ void SlowMonopoleTrigger::DAQ(I3FramePtr frame){
 void SlowMonopoleTrigger::RunTrigger(SlowMPHitVector *one_hit_list__, 
 				     SlowMPHitVector *two_hit_list__, 
 				     double *muon_time_window__, 
-				     SlowMPHit new_hit, 
-				     const I3GeometryConstPtr &geo)
+				     SlowMPHit new_hit)
 {
   if(one_hit_list__->size() == 0) // size is 0, so just add it to the list
     {
@@ -277,7 +342,7 @@ void SlowMonopoleTrigger::RunTrigger(SlowMPHitVector *one_hit_list__,
                             else
                             {
 			      // checks current two_hit_list for 3-tuples
-                                CheckTriggerStatus(two_hit_list__, geo); 
+                                CheckTriggerStatus(two_hit_list__); 
                                 two_hit_list__->push_back(check_payload);
                             }
                         }
@@ -298,7 +363,7 @@ void SlowMonopoleTrigger::RunTrigger(SlowMPHitVector *one_hit_list__,
                             }
                             else
                             {
-                                CheckTriggerStatus(two_hit_list__, geo);
+                                CheckTriggerStatus(two_hit_list__);
                                 two_hit_list__->push_back(check_payload);
                             }
                         }
@@ -322,7 +387,7 @@ void SlowMonopoleTrigger::RunTrigger(SlowMPHitVector *one_hit_list__,
         {
         	if( (one_hit_list__->front().time - two_hit_list__->back().time) > t_max_)
         	{
-                CheckTriggerStatus(two_hit_list__, geo);
+                CheckTriggerStatus(two_hit_list__);
         	}
         }
     }
@@ -330,6 +395,7 @@ void SlowMonopoleTrigger::RunTrigger(SlowMPHitVector *one_hit_list__,
 
 bool SlowMonopoleTrigger::HLCPairCheck(SlowMPHit hit1, SlowMPHit hit2)
 {
+	nPairs_++;
 	int string_nr1 = hit1.string;
 	int string_nr2 = hit2.string;
 
@@ -346,24 +412,56 @@ bool SlowMonopoleTrigger::HLCPairCheck(SlowMPHit hit1, SlowMPHit hit2)
     return false;
 }
 
-void SlowMonopoleTrigger::CheckTriggerStatus(SlowMPHitVector *two_hit_list__, 
-					     const I3GeometryConstPtr &geo)
+/**
+ * The triples are checked in the same order as a loop over all
+ * combinations would, but combinations that can't pass the time
+ * conditions of CheckTriple are never looked at.  The two_hit_list is
+ * time ordered (every entry is more than t_proximity after the one before),
+ * so for each entry the later entries more than t_min away start at an
+ * index that only moves forward and the ones that are t_max away or more
+ * end the loop.  The distance of the first two hits is only taken once
+ * per pair.
+ */
+void SlowMonopoleTrigger::CheckTriggerStatus(SlowMPHitVector *two_hit_list__)
 {
-    int list_size = two_hit_list__->size();
+    const SlowMPHitVector& hits = *two_hit_list__;
+    const int list_size = hits.size();
     if(list_size >= 3)
     {
-        for(SlowMPHitVector::iterator iter_1 = two_hit_list__->begin(); 
-	    iter_1 != two_hit_list__->end() -2 ; iter_1++ )
+        // without time ordering (t_proximity < 0) every combination is checked
+        const bool ordered = std::is_sorted(hits.begin(), hits.end());
+
+        // first[i] is the first entry after i with t - t_i > t_min
+        std::vector<int> first(list_size);
+        int next = 1;
+        for(int i = 0; i < list_size; i++)
         {
-        	for(SlowMPHitVector::iterator iter_2 = iter_1 + 1; 
-		    iter_2 != two_hit_list__->end() - 1 ; iter_2++ )
-        	{
-        		for(SlowMPHitVector::iterator iter_3 = iter_2 + 1 ; 
-			    iter_3 != two_hit_list__->end(); iter_3++ )
-        		{
-        			CheckTriple(*iter_1, *iter_2, *iter_3, geo);
-        		}
-        	}
+            next = std::max(next, i + 1);
+            if(ordered)
+            {
+                while(next < list_size && !(hits[next].time - hits[i].time > t_min_))
+                    next++;
+            }
+            first[i] = next;
+        }
+
+        for(int i = 0; i < list_size - 2; i++)
+        {
+            for(int j = first[i]; j < list_size - 1; j++)
+            {
+                if(ordered && !(hits[j].time - hits[i].time < t_max_))
+                    break;
+                double p_diff1 = getDistance(hits[i], hits[j]);
+                // CheckTriple rejects all triples starting with the same DOM twice
+                if(!(p_diff1 > 0))
+                    continue;
+                for(int k = first[j]; k < list_size; k++)
+                {
+                    if(ordered && !(hits[k].time - hits[j].time < t_max_))
+                        break;
+                    CheckTriple(hits[i], hits[j], hits[k], p_diff1);
+                }
+            }
         }
     }
 
@@ -391,17 +489,17 @@ void SlowMonopoleTrigger::CheckTriggerStatus(SlowMPHitVector *two_hit_list__,
 void SlowMonopoleTrigger::CheckTriple(SlowMPHit hit1, 
 				      SlowMPHit hit2,  
 				      SlowMPHit hit3, 
-				      const I3GeometryConstPtr &geo)
+				      double p_diff1)
 {
+  nTriples_++;
   double t_diff1 = hit2.time - hit1.time;
   double t_diff2 = hit3.time - hit2.time;
   if((t_diff1 > t_min_) && (t_diff2 > t_min_) && (t_diff1 < t_max_) && (t_diff2 < t_max_))
     {
       double t_diff3 = hit3.time - hit1.time;
       
-      double p_diff1 = getDistance(hit1, hit2, geo);
-      double p_diff2 = getDistance(hit2, hit3, geo);
-      double p_diff3 = getDistance(hit1, hit3, geo);
+      double p_diff2 = getDistance(hit2, hit3);
+      double p_diff3 = getDistance(hit1, hit3);
       log_debug("    ->step2 - p_diff1: %f, p_diff2: %f, p_diff3: %f", 
 		p_diff1, p_diff2, p_diff3);
       
@@ -510,21 +608,11 @@ void SlowMonopoleTrigger::CheckTriple(SlowMPHit hit1,
     }
 }
 
-double SlowMonopoleTrigger::getDistance(SlowMPHit hit1, 
-					SlowMPHit hit2, 
-					const I3GeometryConstPtr &geo)
+double SlowMonopoleTrigger::getDistance(const SlowMPHit& hit1, 
+					const SlowMPHit& hit2)
 {
-  I3OMGeoMap::const_iterator geo_iterator_1 = geo->omgeo.find(OMKey(hit1.string, hit1.pos));
-  I3OMGeoMap::const_iterator geo_iterator_2 = geo->omgeo.find(OMKey(hit2.string, hit2.pos));
-  
-  double x1 = geo_iterator_1->second.position.GetX();
-  double y1 = geo_iterator_1->second.position.GetY();
-  double z1 = geo_iterator_1->second.position.GetZ();
-  double x2 = geo_iterator_2->second.position.GetX();
-  double y2 = geo_iterator_2->second.position.GetY();
-  double z2 = geo_iterator_2->second.position.GetZ();
-  
-  double diff = sqrt( pow(x2 - x1, 2) + pow(y2 - y1, 2) + pow(z2 - z1, 2) );
+  // the positions were filled from the geometry in DAQ
+  double diff = sqrt( pow(hit2.x - hit1.x, 2) + pow(hit2.y - hit1.y, 2) + pow(hit2.z - hit1.z, 2) );
   
   return diff;
 }
@@ -593,11 +681,13 @@ vector<I3ParticlePtr> additional_info(SlowMPHit hit1, SlowMPHit hit2, SlowMPHit
 
 void SlowMonopoleTrigger::DetectorStatus(I3FramePtr frame){
   // Get DetectorStatus from the frame
-  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>();
-  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object.");
+  I3DetectorStatusConstPtr detStatus = frame->Get<I3DetectorStatusConstPtr>(detectorStatusName_);
+  if(!detStatus) log_fatal("This DetectorStatus frame has no I3DetectorStatus object called %s.",
+                           detectorStatusName_.c_str());
 
-  boost::optional<tk_ts_pair_t> tkts = GetTriggerStatus
-    (detStatus, _sourceID = SOURCEID, _typeID = TYPEID, _configID = configID_ );
+  triggerConfig_ = TriggerConfig::Get(detStatus);
+  boost::optional<tk_ts_pair_t> tkts =
+    triggerConfig_->GetTriggerStatus(SOURCEID, TYPEID, configID_);
 
   if(!tkts) log_fatal("Failed to configure this module from the DetectorStatus.");
 
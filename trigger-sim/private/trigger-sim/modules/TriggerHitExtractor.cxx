@@ -0,0 +1,81 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerHitExtractor.cxx
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#include <boost/foreach.hpp>
+#include <boost/assign/std/vector.hpp>
+
+#include <dataclasses/I3Map.h>
+#include <dataclasses/physics/I3DOMLaunch.h>
+
+#include <trigger-sim/modules/TriggerHitExtractor.h>
+#include <trigger-sim/algorithms/TriggerHitTable.h>
+#include <trigger-sim/utilities/DOMSetFunctions.h>
+
+using namespace boost::assign;
+
+I3_MODULE(TriggerHitExtractor);
+
+TriggerHitExtractor::TriggerHitExtractor(const I3Context& context) :
+  I3Module(context),
+  domSetsName_("DOMSets"),
+  outputSuffix_("TriggerHits")
+{
+  dataReadoutNames_ += "InIceRawData", "IceTopRawData";
+
+  AddParameter("DataReadoutNames",
+	       "Names of the I3DOMLaunchSeriesMaps to extract the hits from.",
+	       dataReadoutNames_);
+
+  AddParameter("DOMSetsName",
+	       "Name of the I3MapKeyVectorInt defining the DomSets for each DOM.",
+	       domSetsName_);
+
+  AddParameter("OutputSuffix",
+	       "The TriggerHitTable is stored as <DataReadoutName><OutputSuffix>.",
+	       outputSuffix_);
+
+  AddOutBox("OutBox");
+}
+
+TriggerHitExtractor::~TriggerHitExtractor() {}
+
+void TriggerHitExtractor::Configure()
+{
+  GetParameter("DataReadoutNames", dataReadoutNames_);
+  GetParameter("DOMSetsName", domSetsName_);
+  GetParameter("OutputSuffix", outputSuffix_);
+
+  if(!outputSuffix_.size())
+    log_fatal("OutputSuffix can't be empty, or the tables would replace the launches.");
+}
+
+void TriggerHitExtractor::DAQ(I3FramePtr frame)
+{
+  I3MapKeyVectorIntConstPtr domSets =
+    frame->Get<I3MapKeyVectorIntConstPtr>(domSetsName_);
+  if(!domSets)
+    log_debug("No DOMSets called \"%s\" in the frame. Using the defaults.", domSetsName_.c_str());
+  domSetTable_ = DOMSetFunctions::GetDOMSetTable(domSets, domSetTable_);
+
+  BOOST_FOREACH(const std::string& name, dataReadoutNames_){
+    I3DOMLaunchSeriesMapConstPtr launches =
+      frame->Get<I3DOMLaunchSeriesMapConstPtr>(name);
+    if(!launches){
+      log_debug("Frame does not contain an I3DOMLaunchSeriesMap named %s", name.c_str());
+      continue;
+    }
+
+    TriggerHitTablePtr table(new TriggerHitTable(name, *launches, *domSetTable_));
+    frame->Put(name + outputSuffix_, table);
+  }
+
+  PushFrame(frame);
+}
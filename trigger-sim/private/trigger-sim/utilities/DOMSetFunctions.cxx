@@ -32,6 +32,8 @@ bool DOMSetFunctions::InDOMSet(const OMKey& dom, const unsigned& domSet,
   // in the frame
   if (!domSets) {
     log_debug("No domSet Map configured, using default values.");
+    if (std::count(DOMSETS.begin(), DOMSETS.end(), domSet))
+      return GetDefaultDOMSetTable()->InDOMSet(dom, domSet);
     return DOMSetFunctions::InDOMSet_orig(dom,domSet);
   }
     
@@ -55,44 +57,53 @@ bool DOMSetFunctions::InDOMSet(const OMKey& dom, const unsigned& domSet,
 }
 
 
+uint32_t DOMSetFunctions::GetDOMSetMask(const OMKey& dom,
+                                        const I3MapKeyVectorIntConstPtr &domSets)
+{
+  uint32_t mask(0);
+
+  if (!domSets)
+    return GetDefaultDOMSetTable()->GetMask(dom);
+
+  I3MapKeyVectorInt::const_iterator it = domSets->find(dom);
+  if (it == domSets->end()) {
+    log_error_stream("DOM" << dom << " is not in DOMSet configured from frame!");
+    return mask;
+  }
+
+  BOOST_FOREACH(int setID, it->second) {
+    if (setID < 0 || setID >= 32) {
+      log_debug("DOMSet %d can't be represented in the DOMSet mask.", setID);
+      continue;
+    }
+    mask |= (1u << setID);
+  }
+  return mask;
+}
+
+
 // function that returns a I3MapKeyVectorInt with the default
 // DOMSets (as configured in InDOMSet_orig below)
 I3MapKeyVectorIntPtr DOMSetFunctions::GetDefaultDOMSets()
 {
-  // stupidly iterate over all known DOMSet IDs and OMKeys
-  // to fill the map. It's not efficient, but it needs to
-  // be done only once. 
-  // If someone wants to improve this: you are very welcome
-  // to do it! :) -ck
+  // the memberships were already evaluated for the default DOMSetTable,
+  // so this just copies them out of the masks.
+  const DOMSetTable& table = *GetDefaultDOMSetTable();
 
   // allocate the output map
   I3MapKeyVectorIntPtr output(new I3MapKeyVectorInt());
     
-  // all possible domSet ids
   for (int stringId=1;stringId<=86;++stringId) {
     for (unsigned domId=1;domId<=60;++domId) {
       const OMKey dom(stringId, domId);
+      const uint32_t mask = table.GetMask(dom);
 
-      // create an empty map entry (there are DOMs
-      // that are in no DOMSet at all [DeepCore DOMs 1-11])
-      I3MapKeyVectorInt::iterator it = 
-        output->insert(std::make_pair(dom, std::vector<int>())).first;
-      std::vector<int> &sets = it->second;
-
-      // now check all possible DOMSets
+      // this creates an empty entry for DOMs that are in no
+      // DOMSet at all [DeepCore DOMs 1-11]
+      std::vector<int> &sets = (*output)[dom];
       BOOST_FOREACH(unsigned domSetId, DOMSETS)
-      {
-        // skip if not in DOMSet
-        if (!DOMSetFunctions::InDOMSet_orig(dom, domSetId))
-          continue;
-          
-        // found a DOM, add it to the output map!
-        // (this either inserts a new, empty entry or
-        // retrieves an iterator to an existing entry)
-
-        // finally, add the domSet ID
-        sets.push_back(domSetId);
-      }
+        if (mask & (1u << domSetId))
+          sets.push_back(domSetId);
     }        
   }
     
@@ -100,6 +111,26 @@ I3MapKeyVectorIntPtr DOMSetFunctions::GetDefaultDOMSets()
 }
 
 
+DOMSetTableConstPtr DOMSetFunctions::GetDefaultDOMSetTable()
+{
+  // built on first use, the defaults never change
+  static const DOMSetTableConstPtr table(new DOMSetTable());
+  return table;
+}
+
+
+DOMSetTableConstPtr DOMSetFunctions::GetDOMSetTable(const I3MapKeyVectorIntConstPtr &domSets,
+                                                    const DOMSetTableConstPtr &table)
+{
+  if (table && table->GetDOMSets() == domSets)
+    return table;
+  if (!domSets)
+    return GetDefaultDOMSetTable();
+  log_debug("Building the DOMSetTable for %zu DOMs.", domSets->size());
+  return DOMSetTableConstPtr(new DOMSetTable(domSets));
+}
+
+
 
 ////////////////////////////////////////
 ///// this is the old InDOMSet code, retain it as a default setting:
@@ -0,0 +1,138 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file DOMSetTable.cxx
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#include <algorithm>
+
+#include <boost/foreach.hpp>
+
+#include "trigger-sim/utilities/DOMSetTable.h"
+#include "trigger-sim/utilities/DOMSetFunctions.h"
+
+// forward declaration of the original InDOMSet function
+namespace DOMSetFunctions {
+  bool InDOMSet_orig(const OMKey& dom, const unsigned& domSet);
+}
+
+namespace{
+  // InDOMSet_orig puts no DOM outside of these in a DOMSet, except for
+  // DeepCore strings above 86 which are looked up in GetMaskOutside.
+  const int DEFAULT_MIN_STRING(0);
+  const int DEFAULT_MAX_STRING(86);
+  const unsigned DEFAULT_MAX_OM(66);
+}
+
+DOMSetTable::DOMSetTable() :
+  defaults_(true), knownSets_(0),
+  minString_(0), nStrings_(0), nOMs_(0)
+{
+  FillDefaults();
+}
+
+DOMSetTable::DOMSetTable(const I3MapKeyVectorIntConstPtr& domSets) :
+  domSets_(domSets), defaults_(!domSets), knownSets_(0),
+  minString_(0), nStrings_(0), nOMs_(0)
+{
+  if(domSets)
+    Fill(*domSets);
+  else
+    FillDefaults();
+}
+
+void DOMSetTable::FillDefaults()
+{
+  BOOST_FOREACH(unsigned domSet, DOMSetFunctions::DOMSETS)
+    knownSets_ |= (1u << domSet);
+
+  minString_ = DEFAULT_MIN_STRING;
+  nStrings_ = DEFAULT_MAX_STRING - DEFAULT_MIN_STRING + 1;
+  nOMs_ = DEFAULT_MAX_OM + 1;
+  masks_.assign(nStrings_*nOMs_, 0);
+
+  for(size_t string = 0; string < nStrings_; string++)
+    for(unsigned om = 0; om < nOMs_; om++){
+      const OMKey dom(minString_ + string, om);
+      uint32_t& mask = masks_[string*nOMs_ + om];
+      BOOST_FOREACH(unsigned domSet, DOMSetFunctions::DOMSETS)
+        if(DOMSetFunctions::InDOMSet_orig(dom, domSet))
+          mask |= (1u << domSet);
+    }
+}
+
+void DOMSetTable::Fill(const I3MapKeyVectorInt& domSets)
+{
+  // every DOMSet that fits in the mask can be answered from it,
+  // DOMs that aren't in the map have an empty mask and are reported
+  // in GetMaskOutside.
+  knownSets_ = ~uint32_t(0);
+
+  bool first(true);
+  int maxString(0);
+  unsigned maxOM(0);
+  BOOST_FOREACH(I3MapKeyVectorInt::const_reference r, domSets){
+    if(r.first.GetPMT() != 0) continue;
+    if(first){
+      minString_ = maxString = r.first.GetString();
+      first = false;
+    }
+    minString_ = std::min(minString_, r.first.GetString());
+    maxString = std::max(maxString, r.first.GetString());
+    maxOM = std::max(maxOM, r.first.GetOM());
+  }
+  if(!first){
+    nStrings_ = maxString - minString_ + 1;
+    nOMs_ = maxOM + 1;
+    masks_.assign(nStrings_*nOMs_, 0);
+  }
+
+  BOOST_FOREACH(I3MapKeyVectorInt::const_reference r, domSets){
+    uint32_t mask(0);
+    BOOST_FOREACH(int setID, r.second){
+      if(setID < 0 || setID >= 32) {
+        log_debug("DOMSet %d can't be represented in the DOMSet mask.", setID);
+        continue;
+      }
+      mask |= (1u << setID);
+    }
+
+    if(r.first.GetPMT() != 0)
+      others_[r.first] = mask;
+    else
+      masks_[size_t(r.first.GetString() - minString_)*nOMs_ + r.first.GetOM()] = mask;
+  }
+}
+
+uint32_t DOMSetTable::GetMaskOutside(const OMKey& dom) const
+{
+  uint32_t mask(0);
+  if(defaults_){
+    BOOST_FOREACH(unsigned domSet, DOMSetFunctions::DOMSETS)
+      if(DOMSetFunctions::InDOMSet_orig(dom, domSet))
+        mask |= (1u << domSet);
+    return mask;
+  }
+
+  if(!domSets_->count(dom)){
+    log_error_stream("DOM" << dom << " is not in DOMSet configured from frame!");
+    return mask;
+  }
+
+  std::map<OMKey, uint32_t>::const_iterator i = others_.find(dom);
+  if(i != others_.end())
+    mask = i->second;
+  return mask;
+}
+
+bool DOMSetTable::InDOMSetSlow(const OMKey& dom, unsigned domSet) const
+{
+  // DOMSets the masks can't represent, or that the defaults don't
+  // know about (which is fatal there).
+  return DOMSetFunctions::InDOMSet(dom, domSet, domSets_);
+}
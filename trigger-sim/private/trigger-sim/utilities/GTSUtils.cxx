@@ -54,7 +54,7 @@ string GTSUtils::Stringize(I3TriggerHierarchyPtr t){
   return GTSUtils::Stringize(*t);
 }
 
-bool GTSUtils::LessThan(I3Trigger i, I3Trigger j){
+bool GTSUtils::LessThan(const I3Trigger& i, const I3Trigger& j){
   return i.GetTriggerTime() < j.GetTriggerTime();
 }
 
@@ -8,15 +8,15 @@ ReadoutWindowUtil::ReadoutWindowUtil(const I3DetectorStatus& detectorStatus)
 
 ReadoutWindowUtil::~ReadoutWindowUtil() {}
 
-std::pair<double,double> ReadoutWindowUtil::GetInIceReadoutWindow(const I3Trigger& trigger) {
+std::pair<double,double> ReadoutWindowUtil::GetInIceReadoutWindow(const I3Trigger& trigger) const {
   return GetReadoutWindow(I3TriggerStatus::INICE, trigger);
 }
 
-std::pair<double,double> ReadoutWindowUtil::GetIceTopReadoutWindow(const I3Trigger& trigger) {
+std::pair<double,double> ReadoutWindowUtil::GetIceTopReadoutWindow(const I3Trigger& trigger) const {
   return GetReadoutWindow(I3TriggerStatus::ICETOP, trigger);
 }
 
-double ReadoutWindowUtil::GetEarliestReadoutTime(const I3Trigger& trigger) {
+double ReadoutWindowUtil::GetEarliestReadoutTime(const I3Trigger& trigger) const {
 
   std::pair<double,double> iniceReadout = GetReadoutWindow(I3TriggerStatus::INICE, trigger);
   std::pair<double,double> icetopReadout = GetReadoutWindow(I3TriggerStatus::ICETOP, trigger);
@@ -25,7 +25,7 @@ double ReadoutWindowUtil::GetEarliestReadoutTime(const I3Trigger& trigger) {
   
 }
 
-double ReadoutWindowUtil::GetLatestReadoutTime(const I3Trigger& trigger) {
+double ReadoutWindowUtil::GetLatestReadoutTime(const I3Trigger& trigger) const {
 
   std::pair<double,double> iniceReadout = GetReadoutWindow(I3TriggerStatus::INICE, trigger);
   std::pair<double,double> icetopReadout = GetReadoutWindow(I3TriggerStatus::ICETOP, trigger);
@@ -38,7 +38,7 @@ double ReadoutWindowUtil::GetLatestReadoutTime(const I3Trigger& trigger) {
  * Return one readout window corresponding to subdetector InIce or IceTop
  *
  */
-std::pair<double,double> ReadoutWindowUtil::GetReadoutWindow(I3TriggerStatus::Subdetector subdetector, const I3Trigger& trigger) {
+std::pair<double,double> ReadoutWindowUtil::GetReadoutWindow(I3TriggerStatus::Subdetector subdetector, const I3Trigger& trigger) const {
 
   // The return window
   std::pair<double,double> readoutWindow(NAN,NAN);
@@ -54,10 +54,10 @@ std::pair<double,double> ReadoutWindowUtil::GetReadoutWindow(I3TriggerStatus::Su
     log_debug("TriggerKey not found in I3TriggerStatus.");
     return readoutWindow;
   }
-  I3TriggerStatus triggerStatus = triggerStatusIter->second;
+  const I3TriggerStatus& triggerStatus = triggerStatusIter->second;
   
   // Get the I3TriggerReadoutConfig map for this I3Trigger
-  const std::map<I3TriggerStatus::Subdetector, I3TriggerReadoutConfig> readoutConfigMap = triggerStatus.GetReadoutSettings();
+  const std::map<I3TriggerStatus::Subdetector, I3TriggerReadoutConfig>& readoutConfigMap = triggerStatus.GetReadoutSettings();
 
   // Lookup the I3TriggerReadoutConfig first for I3TriggerStatus::ALL
   std::map<I3TriggerStatus::Subdetector, I3TriggerReadoutConfig>::const_iterator readoutConfigIter;
@@ -73,7 +73,7 @@ std::pair<double,double> ReadoutWindowUtil::GetReadoutWindow(I3TriggerStatus::Su
     }
 
   }
-  I3TriggerReadoutConfig readoutConfig = readoutConfigIter->second;
+  const I3TriggerReadoutConfig& readoutConfig = readoutConfigIter->second;
 
   // Get the trigger times of this I3Trigger
   double triggerStart = trigger.GetTriggerTime();
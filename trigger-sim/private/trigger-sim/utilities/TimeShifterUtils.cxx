@@ -1,10 +1,12 @@
 #include <algorithm>
+#include <map>
 #include <vector>
 
 #include <boost/foreach.hpp>
 
 #include <trigger-sim/utilities/TimeShifterUtils.h>
 #include <icetray/I3Frame.h>
+#include <icetray/name_of.h>
 #include <dataclasses/physics/I3MCHit.h>
 #include "dataclasses/physics/I3MCTree.h"
 #include "simclasses/I3MMCTrack.h"
@@ -158,6 +160,10 @@ Shift(I3VectorI3ParticleConstPtr vect, double dt){
   return newvect;
 }
 
+double GetHitTime(const I3MCHit& h){ return h.GetTime(); }
+double GetHitTime(const I3MCPE& h){ return h.time; }
+double GetHitTime(const I3DOMLaunch& l){ return l.GetStartTime(); }
+
 template<class T>
 bool ShiftAndReplaceInFrame(I3FramePtr frame, const std::string &key, double dt)
 {
@@ -185,10 +191,92 @@ bool ShiftAndReplaceInFrame(I3FramePtr frame, const std::string &key, double dt)
   return true;
 }
 
+namespace{
+
+  // The type name of T as it compares to TypeName below
+  template<class T>
+  const std::string& NormalizedName(){
+    static const std::string name(TimeShifterUtils::NormalizeTypeName(I3::name_of<T>()));
+    return name;
+  }
+
+  // The frame knows the type name of every object without
+  // deserializing it.
+  std::string TypeName(const I3Frame& frame, const std::string& key){
+    return TimeShifterUtils::NormalizeTypeName(frame.type_name(key));
+  }
+
+  typedef bool (*shift_function_t)(I3FramePtr, const std::string&, double);
+  typedef std::vector<std::pair<std::string, shift_function_t> > shift_list_t;
+  typedef std::map<std::string, shift_function_t> shift_table_t;
+
+  template<class T>
+  void AddShift(shift_list_t& shifts){
+    shifts.push_back(std::make_pair(NormalizedName<T>(), &ShiftAndReplaceInFrame<T>));
+  }
+
+  // in the order they used to be tried in
+  shift_list_t MakeShiftList(){
+    shift_list_t shifts;
+    AddShift<I3MCTree>(shifts);
+    AddShift<I3MCHitSeriesMap>(shifts);
+    AddShift<I3MMCTrackList>(shifts);
+    AddShift<I3DOMLaunchSeriesMap>(shifts);
+    AddShift<I3RecoPulseSeriesMap>(shifts);
+    AddShift<I3VectorI3Trigger>(shifts);
+    AddShift<I3TriggerHierarchy>(shifts);
+    AddShift<I3FlasherInfoVect>(shifts);
+    AddShift<I3MCPESeriesMap>(shifts);
+    AddShift<I3MCPulseSeriesMap>(shifts);
+    AddShift<I3Particle>(shifts);
+    AddShift<I3VectorI3Particle>(shifts);
+    return shifts;
+  }
+
+  // keeps the earliest of the times it's given
+  struct EarliestTime{
+    EarliestTime() : found(false), time(0) {}
+    void Add(double t){
+      if(!found || t < time){
+        time = t;
+        found = true;
+      }
+    }
+    bool found;
+    double time;
+  };
+
+  template<class T>
+  void AddHitTimes(const I3Frame& frame, const std::string& key, EarliestTime& earliest){
+    const I3Map<OMKey, std::vector<T> >& hitmap =
+      frame.Get<I3Map<OMKey, std::vector<T> > >(key);
+    BOOST_FOREACH(typename I3Map<OMKey, std::vector<T> >::const_reference hs_pair, hitmap)
+      BOOST_FOREACH(const T& h, hs_pair.second)
+        earliest.Add(GetHitTime(h));
+  }
+
+}
+
+std::string TimeShifterUtils::NormalizeTypeName(const std::string& type_name){
+  // libc++ puts the standard library in the inline namespace std::__1
+  std::string name(type_name);
+  const std::string inline_ns("__1::");
+  for(size_t pos = name.find(inline_ns); pos != std::string::npos; pos = name.find(inline_ns, pos))
+    name.erase(pos, inline_ns.size());
+  return name;
+}
+
 void TimeShifterUtils::ShiftFrameObjects(I3FramePtr frame, 
                                          double dt,
                                          const std::vector<std::string>& skip_keys,
                                          const std::vector<std::string>& shift_i3double_keys){
+
+  static const shift_list_t shift_list(MakeShiftList());
+  // Objects of other types are tried as each of the known types, like
+  // the shift used to, which also finds the types derived from them.
+  // What was found goes into the table under the type name, so an object
+  // of a type that isn't shifted is only deserialized the first time.
+  static shift_table_t shift_table(shift_list.begin(), shift_list.end());
   
   BOOST_FOREACH(const std::string& key, frame->keys())
   {
@@ -199,20 +287,70 @@ void TimeShifterUtils::ShiftFrameObjects(I3FramePtr frame,
     if(std::count(skip_keys.begin(),skip_keys.end(),key))
       continue;
 
-    ShiftAndReplaceInFrame<I3MCTree>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3MCHitSeriesMap>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3MMCTrackList>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3DOMLaunchSeriesMap>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3RecoPulseSeriesMap>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3VectorI3Trigger>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3TriggerHierarchy>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3FlasherInfoVect>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3MCPESeriesMap>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3MCPulseSeriesMap>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3Particle>(frame, key, dt);
-    ShiftAndReplaceInFrame<I3VectorI3Particle>(frame, key, dt);
+    const std::string type_name(TypeName(*frame, key));
+    shift_table_t::const_iterator shift_iter = shift_table.find(type_name);
+    if(shift_iter == shift_table.end()){
+      shift_function_t shift(0);
+      BOOST_FOREACH(const shift_list_t::value_type& known, shift_list){
+        if(known.second(frame, key, dt)){
+          log_debug("Shifted '%s' of type %s as a %s.",
+                    key.c_str(), type_name.c_str(), known.first.c_str());
+          shift = known.second;
+          break;
+        }
+      }
+      shift_table[type_name] = shift;
+      if(shift) continue;
+    }else if(shift_iter->second){
+      shift_iter->second(frame, key, dt);
+      continue;
+    }
 
     if(std::count(shift_i3double_keys.begin(), shift_i3double_keys.end(), key))
       ShiftAndReplaceInFrame<I3Double>(frame, key, dt);
   }
 }
+
+double TimeShifterUtils::GetTimeShift(const I3Frame& frame,
+                                      const std::vector<std::string>& skip_keys){
+
+  // look up the type names once, nothing is deserialized for that
+  std::vector<std::pair<std::string, std::string> > typed_keys;
+  BOOST_FOREACH(const std::string& key, frame.keys()){
+    if(std::count(skip_keys.begin(),skip_keys.end(),key))
+      continue;
+    typed_keys.push_back(std::make_pair(key, TypeName(frame, key)));
+  }
+
+  // triggered events use the earliest fired trigger
+  EarliestTime earliest;
+  typedef std::pair<std::string, std::string> typed_key_t;
+  BOOST_FOREACH(const typed_key_t& tk, typed_keys){
+    if(tk.second != NormalizedName<I3TriggerHierarchy>())
+      continue;
+    const I3TriggerHierarchy& triggers = frame.Get<I3TriggerHierarchy>(tk.first);
+    for(I3TriggerHierarchy::iterator t_iter = triggers.begin();
+        t_iter != triggers.end(); t_iter++)
+      if(t_iter->GetTriggerFired())
+        earliest.Add(t_iter->GetTriggerTime());
+  }
+  if(earliest.found)
+    return earliest.time;
+
+  // untriggered events use the earliest I3MCHit or I3MCPE
+  BOOST_FOREACH(const typed_key_t& tk, typed_keys){
+    if(tk.second == NormalizedName<I3MCHitSeriesMap>())
+      AddHitTimes<I3MCHit>(frame, tk.first, earliest);
+    else if(tk.second == NormalizedName<I3MCPESeriesMap>())
+      AddHitTimes<I3MCPE>(frame, tk.first, earliest);
+  }
+  if(earliest.found)
+    return earliest.time;
+
+  // and trigger hitspool data the earliest launch
+  BOOST_FOREACH(const typed_key_t& tk, typed_keys){
+    if(tk.second == NormalizedName<I3DOMLaunchSeriesMap>())
+      AddHitTimes<I3DOMLaunch>(frame, tk.first, earliest);
+  }
+  return earliest.time;
+}
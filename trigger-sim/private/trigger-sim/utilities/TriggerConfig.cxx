@@ -0,0 +1,77 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerConfig.cxx
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#include <boost/weak_ptr.hpp>
+
+#include "trigger-sim/utilities/TriggerConfig.h"
+
+using DetectorStatusUtils::tk_ts_pair_t;
+using DetectorStatusUtils::_sourceID;
+using DetectorStatusUtils::_typeID;
+using DetectorStatusUtils::_configID;
+
+namespace{
+  // The configs that are still used by some module, by DetectorStatus.
+  // They're only held weakly, so a config (and its DetectorStatus) goes
+  // away with the last module that has it.
+  typedef std::map<const I3DetectorStatus*, boost::weak_ptr<const TriggerConfig> > cache_t;
+  cache_t cache;
+  std::mutex cacheMutex;
+}
+
+TriggerConfig::TriggerConfig(const I3DetectorStatusConstPtr& status) :
+  status_(status)
+{
+  if(!status_)
+    log_fatal("Can't make a TriggerConfig without an I3DetectorStatus.");
+  roUtil_ = ReadoutWindowUtilConstPtr(new ReadoutWindowUtil(*status_));
+}
+
+boost::optional<tk_ts_pair_t>
+TriggerConfig::GetTriggerStatus(TriggerKey::SourceID sourceID,
+                                TriggerKey::TypeID typeID,
+                                boost::optional<int> configID) const
+{
+  std::lock_guard<std::mutex> lock(mutex_);
+  const query_t query(sourceID, typeID, configID);
+  auto i = triggerStatus_.find(query);
+  if(i == triggerStatus_.end()){
+    boost::optional<tk_ts_pair_t> tkts = DetectorStatusUtils::GetTriggerStatus
+      (status_, _sourceID = sourceID, _typeID = typeID, _configID = configID);
+    i = triggerStatus_.insert(std::make_pair(query, tkts)).first;
+  }
+  return i->second;
+}
+
+TriggerConfigConstPtr TriggerConfig::Get(const I3DetectorStatusConstPtr& status)
+{
+  if(!status)
+    log_fatal("Can't make a TriggerConfig without an I3DetectorStatus.");
+
+  std::lock_guard<std::mutex> lock(cacheMutex);
+  for(cache_t::iterator i = cache.begin(); i != cache.end();){
+    if(i->second.expired())
+      cache.erase(i++);
+    else
+      i++;
+  }
+
+  TriggerConfigConstPtr config;
+  cache_t::iterator i = cache.find(status.get());
+  if(i != cache.end())
+    config = i->second.lock();
+  if(!config || config->GetDetectorStatus() != status){
+    log_debug("Making the TriggerConfig of a new I3DetectorStatus.");
+    config = TriggerConfigConstPtr(new TriggerConfig(status));
+    cache[status.get()] = config;
+  }
+  return config;
+}
@@ -0,0 +1,110 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerProfile.cxx
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#include <algorithm>
+#include <cmath>
+#include <sstream>
+#include <iomanip>
+
+#include <boost/foreach.hpp>
+
+#include "trigger-sim/utilities/TriggerProfile.h"
+
+namespace{
+  typedef std::map<std::string, double> count_map_t;
+}
+
+TriggerProfile::TriggerProfile(const std::string& name) :
+  name_(name),
+  nFrames_(0),
+  timeHistogram_(N_TIME_BINS, 0)
+{}
+
+void TriggerProfile::Start()
+{
+  // a new map every frame, the last one belongs to the last frame now
+  frameCounts_ = I3MapStringDoublePtr(new I3MapStringDouble);
+  start_ = std::chrono::steady_clock::now();
+}
+
+void TriggerProfile::Count(const std::string& name, double n)
+{
+  if(!frameCounts_)
+    log_fatal("TriggerProfile %s: Count called before Start.", name_.c_str());
+  (*frameCounts_)[name] += n;
+}
+
+void TriggerProfile::Stop(I3Frame& frame, const std::string& key)
+{
+  if(!frameCounts_)
+    log_fatal("TriggerProfile %s: Stop called before Start.", name_.c_str());
+
+  const double microseconds = std::chrono::duration<double, std::micro>
+    (std::chrono::steady_clock::now() - start_).count();
+  (*frameCounts_)["time"] = microseconds;
+
+  nFrames_++;
+  timeHistogram_[GetTimeBin(microseconds)]++;
+  BOOST_FOREACH(const I3MapStringDouble::value_type& count, *frameCounts_){
+    totals_[count.first] += count.second;
+    count_map_t::iterator max = maxima_.find(count.first);
+    if(max == maxima_.end())
+      maxima_[count.first] = count.second;
+    else if(count.second > max->second)
+      max->second = count.second;
+  }
+
+  if(key.size())
+    frame.Put(key, frameCounts_);
+  frameCounts_.reset();
+}
+
+double TriggerProfile::GetTimeBinEdge(unsigned i)
+{
+  // [0, 1), [1, 2), [2, 4), [4, 8), ... microseconds
+  return i ? std::ldexp(1., i - 1) : 0.;
+}
+
+unsigned TriggerProfile::GetTimeBin(double microseconds)
+{
+  if(!(microseconds >= 1.))
+    return 0;
+  int exponent;
+  std::frexp(microseconds, &exponent);
+  return std::min(unsigned(exponent), N_TIME_BINS - 1);
+}
+
+std::string TriggerProfile::Summary() const
+{
+  std::stringstream s;
+  s << name_ << ": " << nFrames_ << " frames";
+  if(!nFrames_)
+    return s.str();
+
+  s << std::fixed << std::setprecision(1);
+  BOOST_FOREACH(const count_map_t::value_type& total, totals_)
+    s << "\n  " << std::setw(12) << std::left << total.first
+      << " mean " << std::setw(12) << std::right << total.second / nFrames_
+      << " max " << std::setw(12) << maxima_.find(total.first)->second;
+
+  s << "\n  time per frame [us]:";
+  for(unsigned i = 0; i < N_TIME_BINS; i++){
+    if(!timeHistogram_[i])
+      continue;
+    s << "\n    [" << std::setw(10) << GetTimeBinEdge(i) << ", ";
+    if(i + 1 < N_TIME_BINS)
+      s << std::setw(10) << GetTimeBinEdge(i + 1) << ")";
+    else
+      s << std::setw(10) << "inf" << ")";
+    s << " " << timeHistogram_[i];
+  }
+  return s.str();
+}
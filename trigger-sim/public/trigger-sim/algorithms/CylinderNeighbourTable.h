@@ -0,0 +1,77 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file CylinderNeighbourTable.h
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#ifndef CYLINDER_NEIGHBOUR_TABLE_H
+#define CYLINDER_NEIGHBOUR_TABLE_H
+
+#include <vector>
+
+#include "icetray/I3Logging.h"
+#include "icetray/OMKey.h"
+#include <dataclasses/geometry/I3Geometry.h>
+#include <dataclasses/geometry/I3OMGeoTable.h>
+
+/**
+ * @brief For each DOM in the geometry, the list of DOMs inside the
+ *        cylinder the CylinderTrigger puts around it.
+ *
+ * Two DOMs are neighbours if their horizontal distance is less than
+ * the radius and their vertical distance is less than half the height,
+ * same as in CylinderTriggerAlgorithm.  This only depends on the geometry
+ * and the trigger configuration so it's built once and shared between
+ * frames.
+ */
+class CylinderNeighbourTable
+{
+ public:
+
+  static const unsigned NOT_IN_GEOMETRY;
+
+  CylinderNeighbourTable(const I3Geometry& geometry, double radius, double height);
+
+  /**
+   * Same as above, with the DOM positions from a table that's already
+   * there, e.g. the one I3OMGeoTable::Get() shares for a geometry.
+   */
+  CylinderNeighbourTable(const I3OMGeoTableConstPtr& geoTable, double radius, double height);
+
+  /**
+   * Dense index of the DOM, or NOT_IN_GEOMETRY.
+   */
+  unsigned GetIndex(const OMKey& omkey) const;
+
+  /**
+   * Sorted indices of the DOMs in the cylinder around the DOM with index i.
+   */
+  const std::vector<unsigned>& GetNeighbours(unsigned i) const { return neighbours_.at(i); }
+
+  bool AreNeighbours(unsigned i, unsigned j) const;
+
+  size_t size() const { return neighbours_.size(); }
+  double GetRadius() const { return radius_; }
+  double GetHeight() const { return height_; }
+
+ private:
+
+  double radius_;
+  double height_;
+
+  I3OMGeoTableConstPtr geoTable_;
+  std::vector<std::vector<unsigned> > neighbours_;
+
+  void Fill();
+
+  SET_LOGGER("CylinderNeighbourTable");
+};
+
+I3_POINTER_TYPEDEFS(CylinderNeighbourTable);
+
+#endif
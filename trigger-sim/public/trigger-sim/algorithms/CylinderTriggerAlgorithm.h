@@ -12,8 +12,11 @@
 #ifndef CYLINDER_TRIGGER_ALGORITHM_H
 #define CYLINDER_TRIGGER_ALGORITHM_H
 
+#include <deque>
 #include "icetray/I3Logging.h"
 #include "trigger-sim/algorithms/TriggerHit.h"
+#include "trigger-sim/algorithms/TriggerHitBuffer.h"
+#include "trigger-sim/algorithms/CylinderNeighbourTable.h"
 #include <dataclasses/geometry/I3Geometry.h>
 
 class CylinderTriggerAlgorithm
@@ -22,13 +25,31 @@ class CylinderTriggerAlgorithm
  public:
   CylinderTriggerAlgorithm(double triggerWindow, unsigned int triggerThreshold, unsigned int simpleMultiplicity,
 			  I3GeometryConstPtr Geometry, double Radius , double Zdistance);
+  /**
+   * Use a prebuilt neighbour table, which carries the radius and height.
+   */
+  CylinderTriggerAlgorithm(double triggerWindow, unsigned int triggerThreshold, unsigned int simpleMultiplicity,
+			  CylinderNeighbourTableConstPtr neighbours);
   ~CylinderTriggerAlgorithm();
 
   void AddHits(TriggerHitVectorPtr hits);
 
+  /**
+   * Finds the triggers in the time ordered hits of the buffer.  The
+   * algorithm keeps its memory between calls, so keep one around.
+   */
+  void AddHits(const TriggerHitBuffer& hits);
+
   unsigned int GetNumberOfTriggers();
   TriggerHitVectorPtr GetNextTrigger();
 
+  /**
+   * Number of cylinders counted and of DOM pairs looked at
+   * for them in the last AddHits.
+   */
+  size_t GetNumberOfCylinders() const { return nCylinders_; }
+  size_t GetNumberOfPairs() const { return nPairs_; }
+
  private:
 
   double triggerWindow_;
@@ -36,17 +57,36 @@ class CylinderTriggerAlgorithm
   unsigned int simpleMultiplicity_;
   double Radius_; 
   double Zdistance_; 
-  I3GeometryConstPtr Geometry_;
-  
-  TriggerHitList hitQueue_;
+  CylinderNeighbourTableConstPtr neighbours_;
+
+  // the hits passed in as a TriggerHitVector
+  TriggerHitBuffer buffer_;
+
+  struct QueuedHit
+  {
+    TriggerHit hit;
+    unsigned dom;
+    bool operator<(const QueuedHit& rhs) const { return hit < rhs.hit; }
+  };
+  std::deque<QueuedHit> hitQueue_;
+
+  // scratch space for PosWindow, indexed by the DOM index
+  std::vector<unsigned> domCount_;
+  std::vector<bool> domChecked_;
+  std::vector<unsigned> windowDOMs_;
   
   TriggerHitVectorVector triggers_;
   unsigned int triggerCount_;
+  size_t nCylinders_;
+  size_t nPairs_;
 
+  void Queue(const TriggerHit& hit);
   bool PosWindow();
 
 
   SET_LOGGER("CylinderTriggerAlgorithm");
 };
 
+I3_POINTER_TYPEDEFS(CylinderTriggerAlgorithm);
+
 #endif
@@ -26,9 +26,7 @@ class GlobalTriggerSim
 {
 
  private:
-    boost::shared_ptr< std::map<TriggerKey, I3TriggerStatus> > triggerStatusMap_;
-
-    boost::shared_ptr<ReadoutWindowUtil> roUtil_;
+    ReadoutWindowUtilConstPtr roUtil_;
 
     I3TriggerReadoutConfig defaultReadoutConfig_;
 
@@ -39,21 +37,20 @@ class GlobalTriggerSim
  public:    
 
     GlobalTriggerSim(const I3DetectorStatus& d){
-      triggerStatusMap_ = boost::shared_ptr< std::map<TriggerKey, I3TriggerStatus> >
-	( new std::map<TriggerKey, I3TriggerStatus>(d.triggerStatus) );
-
-      roUtil_ = boost::shared_ptr< ReadoutWindowUtil >
-	( new ReadoutWindowUtil(d) );
+      roUtil_ = ReadoutWindowUtilConstPtr( new ReadoutWindowUtil(d) );
     };
 
     GlobalTriggerSim(I3DetectorStatusConstPtr d){
-      triggerStatusMap_ = boost::shared_ptr< std::map<TriggerKey, I3TriggerStatus> >
-	( new std::map<TriggerKey, I3TriggerStatus>(d->triggerStatus) );
-
-      roUtil_ = boost::shared_ptr< ReadoutWindowUtil >
-	( new ReadoutWindowUtil(*d) );
+      roUtil_ = ReadoutWindowUtilConstPtr( new ReadoutWindowUtil(*d) );
     };
 
+    /**
+     * Uses readout windows that were already worked out, e.g. the
+     * ones of a TriggerConfig.
+     */
+    GlobalTriggerSim(const ReadoutWindowUtilConstPtr& roUtil) :
+      roUtil_(roUtil) {};
+
     void SetDefaultReadoutConfig(I3TriggerReadoutConfig r){ 
       defaultReadoutConfig_ = r;
     };
@@ -0,0 +1,114 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerCollector.h
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#ifndef TRIGGER_COLLECTOR_H
+#define TRIGGER_COLLECTOR_H
+
+#include <string>
+#include <vector>
+
+#include <icetray/I3FrameObject.h>
+#include <icetray/I3Frame.h>
+#include <icetray/I3Logging.h>
+#include <icetray/serialization.h>
+#include <dataclasses/physics/I3Trigger.h>
+#include <dataclasses/physics/I3TriggerHierarchy.h>
+
+/**
+ * @brief The triggers found by the trigger modules in a frame, before
+ *        they're put in an I3TriggerHierarchy.
+ *
+ * On their own, the trigger modules each copy the I3TriggerHierarchy
+ * in the frame, add their triggers and put the copy back.  When they're
+ * given a TriggerCollectorName they add their triggers to a collector
+ * in the frame instead, and I3GlobalTriggerSim makes the hierarchy
+ * once with Finish().  The hierarchy is the same either way.
+ *
+ * Like the hierarchy, the collector is copied and put back by every
+ * module, but it only holds the triggers of the frame.  It's only meant
+ * to live between the trigger modules and I3GlobalTriggerSim in the same
+ * frame.
+ */
+class TriggerCollector : public I3FrameObject
+{
+ public:
+
+  TriggerCollector() {}
+  ~TriggerCollector();
+
+  /**
+   * Same as inserting the trigger at the beginning of the hierarchy.
+   */
+  void PushFront(const I3Trigger& trigger) { front_.push_back(trigger); }
+
+  /**
+   * Same as inserting the trigger at the end of the hierarchy.
+   */
+  void PushBack(const I3Trigger& trigger) { back_.push_back(trigger); }
+
+  size_t size() const { return front_.size() + back_.size(); }
+  bool empty() const { return front_.empty() && back_.empty(); }
+
+  /**
+   * The triggers in hierarchy order, without the ones of the
+   * hierarchy they'll be added to.
+   */
+  std::vector<I3Trigger> GetTriggers() const;
+
+  /**
+   * The hierarchy the trigger modules would have made by adding their
+   * triggers to the hierarchy old (which can be null).
+   */
+  I3TriggerHierarchyPtr MakeHierarchy(const I3TriggerHierarchyConstPtr& old) const;
+
+  std::ostream& Print(std::ostream&) const override;
+
+  /**
+   * Adds the triggers of a trigger module to the frame, in front of
+   * (or behind) the ones that are already there.  If collectorName is
+   * set they go to a copy of the collector of that name (or a new one),
+   * which replaces it in the frame.  Otherwise the I3TriggerHierarchy triggerName is
+   * copied and put back with the triggers.
+   */
+  static void AddTriggers(I3Frame& frame,
+                          const std::string& collectorName,
+                          const std::string& triggerName,
+                          const std::vector<I3Trigger>& triggers,
+                          bool front = true);
+
+  /**
+   * Makes the I3TriggerHierarchy triggerName from the collector
+   * collectorName (if it's in the frame) and removes the collector.
+   * Returns the hierarchy in the frame, which is null if there's none.
+   */
+  static I3TriggerHierarchyConstPtr Finish(I3Frame& frame,
+                                           const std::string& collectorName,
+                                           const std::string& triggerName);
+
+ private:
+
+  // front_ is in the order the triggers were pushed, so it's reversed
+  // in the hierarchy, back_ is in hierarchy order.
+  std::vector<I3Trigger> front_;
+  std::vector<I3Trigger> back_;
+
+  friend class icecube::serialization::access;
+  template <class Archive> void serialize(Archive& ar, unsigned version);
+
+  SET_LOGGER("TriggerCollector");
+};
+
+std::ostream& operator<<(std::ostream&, const TriggerCollector&);
+
+I3_POINTER_TYPEDEFS(TriggerCollector);
+I3_CLASS_VERSION(TriggerCollector, 0);
+
+#endif // TRIGGER_COLLECTOR_H
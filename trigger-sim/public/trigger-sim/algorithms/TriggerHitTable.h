@@ -0,0 +1,109 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerHitTable.h
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#ifndef TRIGGER_HIT_TABLE_H
+#define TRIGGER_HIT_TABLE_H
+
+#include <string>
+#include <vector>
+#include <stdint.h>
+
+#include <icetray/I3FrameObject.h>
+#include <icetray/OMKey.h>
+#include <icetray/serialization.h>
+#include <dataclasses/I3Map.h>
+#include <dataclasses/physics/I3DOMLaunch.h>
+#include <trigger-sim/utilities/DOMSetTable.h>
+
+/**
+ * @brief Time ordered table of the launches in an I3DOMLaunchSeriesMap,
+ *        reduced to what the trigger algorithms need.
+ *
+ * The table is filled once per frame by the TriggerHitExtractor and
+ * the trigger modules read their hits from it instead of walking the
+ * launch map and evaluating the DOMSets themselves.
+ */
+class TriggerHitTable : public I3FrameObject
+{
+ public:
+
+  struct Hit
+  {
+    Hit() : time(0), lc(false), domSetMask(0) {}
+    Hit(double aTime, const OMKey& aKey, bool aLC, uint32_t aMask) :
+      time(aTime), omKey(aKey), lc(aLC), domSetMask(aMask) {}
+
+    double time;
+    OMKey omKey;
+    bool lc;
+    uint32_t domSetMask;
+
+    bool InDOMSet(unsigned domSet) const
+    { return domSet < 32 && (domSetMask & (1u << domSet)); }
+
+    bool operator<(const Hit& rhs) const { return time < rhs.time; }
+    bool operator==(const Hit& rhs) const
+    { return time == rhs.time && omKey == rhs.omKey && lc == rhs.lc && domSetMask == rhs.domSetMask; }
+
+    template <class Archive> void serialize(Archive& ar, unsigned version);
+  };
+
+  typedef std::vector<Hit> HitVector;
+  typedef HitVector::const_iterator const_iterator;
+
+  TriggerHitTable() {}
+
+  /**
+   * Fills the table from the launches in the map, sorted in time.
+   * The DOMSet membership of each DOM is looked up once in domSets
+   * (or the defaults if domSets is null).
+   */
+  TriggerHitTable(const std::string& sourceName,
+                  const I3DOMLaunchSeriesMap& launches,
+                  const I3MapKeyVectorIntConstPtr& domSets);
+
+  /**
+   * Same as above, with the DOMSet membership taken from a DOMSetTable
+   * the caller keeps between frames.
+   */
+  TriggerHitTable(const std::string& sourceName,
+                  const I3DOMLaunchSeriesMap& launches,
+                  const DOMSetTable& domSets);
+
+  ~TriggerHitTable();
+
+  const std::string& GetSourceName() const { return sourceName_; }
+  const HitVector& GetHits() const { return hits_; }
+
+  const_iterator begin() const { return hits_.begin(); }
+  const_iterator end() const { return hits_.end(); }
+  size_t size() const { return hits_.size(); }
+  bool empty() const { return hits_.empty(); }
+
+  std::ostream& Print(std::ostream&) const override;
+
+ private:
+
+  void Fill(const I3DOMLaunchSeriesMap& launches, const DOMSetTable& domSets);
+
+  std::string sourceName_;
+  HitVector hits_;
+
+  friend class icecube::serialization::access;
+  template <class Archive> void serialize(Archive& ar, unsigned version);
+};
+
+std::ostream& operator<<(std::ostream&, const TriggerHitTable&);
+
+I3_POINTER_TYPEDEFS(TriggerHitTable);
+I3_CLASS_VERSION(TriggerHitTable, 0);
+
+#endif // TRIGGER_HIT_TABLE_H
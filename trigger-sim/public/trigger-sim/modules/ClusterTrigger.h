@@ -21,6 +21,12 @@
 #include <dataclasses/physics/I3Trigger.h>
 #include <dataclasses/I3Map.h>
 #include <trigger-sim/algorithms/TriggerHit.h>
+#include <trigger-sim/algorithms/TriggerHitBuffer.h>
+#include <trigger-sim/algorithms/ClusterTriggerAlgorithm.h>
+#include <trigger-sim/algorithms/TriggerHitTable.h>
+#include <trigger-sim/utilities/DOMSetTable.h>
+#include <trigger-sim/utilities/TriggerConfig.h>
+#include <trigger-sim/utilities/TriggerProfile.h>
 
 class ClusterTrigger : public I3Module
 {
@@ -40,6 +46,10 @@ class ClusterTrigger : public I3Module
   std::string dataReadoutName_;
   std::string triggerName_;
   std::string domSetsName_;
+  std::string detectorStatusName_;
+  std::string triggerHitTableName_;
+  std::string triggerCollectorName_;
+  std::string profileName_;
 
   int configIDParam_;
   boost::optional<int> configID_;
@@ -52,11 +62,28 @@ class ClusterTrigger : public I3Module
   int eventCount_;
   int triggerCount_;
 
+  // rebuilt when the DOMSets in the frame change
+  DOMSetTableConstPtr domSetTable_;
+
+  // the trigger configuration of the DetectorStatus, shared with the other modules
+  TriggerConfigConstPtr triggerConfig_;
+
+  // Reused for every frame, so once they've seen the largest event
+  // the hit buffer doesn't have to grow again.  The algorithm is made
+  // again when the DetectorStatus changes.
+  TriggerHitBuffer hits_;
+  std::vector<I3DOMLaunchSeriesMap::const_iterator> doms_;
+  ClusterTriggerAlgorithmPtr stringTrigger_;
+
+  // only made if ProfileName is set
+  TriggerProfilePtr profile_;
 
   void FillHits(I3DOMLaunchSeriesMapConstPtr fullMap, 
-		TriggerHitVectorPtr hits, 
-		I3MapKeyVectorIntConstPtr domSets);
-  void Dump(TriggerHitVectorPtr input);
+		TriggerHitBuffer& hits, 
+		const DOMSetTable& domSets);
+  void FillHits(const TriggerHitTable& table,
+		TriggerHitBuffer& hits);
+  void Dump(const TriggerHitBuffer& input);
 
   SET_LOGGER("ClusterTrigger");
 };
@@ -22,6 +22,13 @@
 #include <dataclasses/physics/I3Trigger.h>
 #include <dataclasses/I3Map.h>
 #include <trigger-sim/algorithms/TriggerHit.h>
+#include <trigger-sim/algorithms/TriggerHitTable.h>
+#include <trigger-sim/algorithms/TriggerHitBuffer.h>
+#include <trigger-sim/algorithms/CylinderNeighbourTable.h>
+#include <trigger-sim/algorithms/CylinderTriggerAlgorithm.h>
+#include <trigger-sim/utilities/DOMSetTable.h>
+#include <trigger-sim/utilities/TriggerConfig.h>
+#include <trigger-sim/utilities/TriggerProfile.h>
 
 class CylinderTrigger : public I3Module
 {
@@ -42,6 +49,10 @@ class CylinderTrigger : public I3Module
   std::string pulseReadoutName_;
   std::string triggerName_;
   std::string domSetsName_;
+  std::string detectorStatusName_;
+  std::string triggerHitTableName_;
+  std::string triggerCollectorName_;
+  std::string profileName_;
 
   int configIDParam_;
   boost::optional<int> configID_;
@@ -54,19 +65,41 @@ class CylinderTrigger : public I3Module
   int measurementMode_;
   boost::optional<int> domSet_;
 
+  // only rebuilt when the geometry or the cylinder changes
+  CylinderNeighbourTableConstPtr neighbours_;
+  I3GeometryConstPtr neighboursGeometry_;
+
+  // rebuilt when the DOMSets in the frame change
+  DOMSetTableConstPtr domSetTable_;
+
+  // the trigger configuration of the DetectorStatus, shared with the other modules
+  TriggerConfigConstPtr triggerConfig_;
+
+  // Reused for every frame, so once it's seen the largest event the
+  // hit buffer doesn't have to grow again.  The algorithm is made again
+  // when the DetectorStatus or the neighbour table changes.
+  TriggerHitBuffer hits_;
+  CylinderTriggerAlgorithmPtr volumeTrigger_;
+
+  // only made if ProfileName is set
+  TriggerProfilePtr profile_;
+
   int eventCount_;
   int triggerCount_;
   TriggerKey triggerKey_;
   
   void FillHits(I3DOMLaunchSeriesMapConstPtr fullMap, 
-		TriggerHitVectorPtr hits, 
-		I3MapKeyVectorIntConstPtr domSets);
+		TriggerHitBuffer& hits, 
+		const DOMSetTable& domSets);
 
   void FillHits(I3RecoPulseSeriesMapConstPtr fullMap, 
-		TriggerHitVectorPtr hits, 
-		I3MapKeyVectorIntConstPtr domSets);
+		TriggerHitBuffer& hits, 
+		const DOMSetTable& domSets);
+
+  void FillHits(const TriggerHitTable& table,
+		TriggerHitBuffer& hits);
 
-  void Dump(TriggerHitVectorPtr input);
+  void Dump(const TriggerHitBuffer& input);
 
   SET_LOGGER("CylinderTrigger");
 };
@@ -0,0 +1,64 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file EventSplitter.h
+ * @version
+ * @date
+ * @author juancarlos
+ */
+
+#ifndef EVENTSPLITTER_H
+#define EVENTSPLITTER_H
+
+#include <string>
+#include <vector>
+
+#include "icetray/I3Module.h"
+
+/**
+ * @brief Splits a DAQ frame into one frame per group of overlapping
+ *        triggers.
+ *
+ * A new sub-event starts whenever no trigger is open.  Each sub-event
+ * frame gets the triggers that start in it ("triggers"), its start time
+ * ("triggertime") and number of triggers ("trigersize"), a copy of the
+ * I3EventHeader with the start time moved to the sub-event, and the
+ * launches and MC hits in the readout window around it.  The I3MCTree
+ * is pruned to the primaries (with their full subtrees) of the SPE hits
+ * in the sub-event and the weight map gets the number of primaries as
+ * "multiplicity".
+ *
+ * Same as the python EventSplitter, but every launch and MC hit is only
+ * visited once, no matter how many sub-events there are.
+ */
+class EventSplitter : public I3Module
+{
+public:
+
+    EventSplitter(const I3Context& ctx);
+    ~EventSplitter();
+    void Configure();
+
+    void DAQ(I3FramePtr frame);
+
+private:
+
+    EventSplitter();
+    EventSplitter(const EventSplitter& source);
+    EventSplitter& operator=(const EventSplitter& source);
+
+    std::string triggerName_;
+    double readoutWindowBefore_;
+    double readoutWindowAfter_;
+    std::string mcTreeName_;
+    std::string mcHitSeriesMapName_;
+    std::vector<std::string> domLaunchSeriesMapNames_;
+    std::string weightMapName_;
+
+    SET_LOGGER("EventSplitter");
+
+};	// end of class EventSplitter
+
+#endif //EVENTSPLITTER_H
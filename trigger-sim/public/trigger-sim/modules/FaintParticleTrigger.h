@@ -5,8 +5,14 @@
 #include "dataclasses/physics/I3Trigger.h"
 #include "dataclasses/physics/I3Particle.h"
 #include <dataclasses/geometry/I3Geometry.h>
+#include <dataclasses/geometry/I3OMGeoTable.h>
 #include "trigger-sim/algorithms/FptHit.h"
 #include "trigger-sim/algorithms/TriggerContainer.h"
+#include "trigger-sim/algorithms/TriggerHitTable.h"
+#include "trigger-sim/algorithms/FaintParticleTriggerAlgorithm.h"
+#include "trigger-sim/utilities/DOMSetTable.h"
+#include "trigger-sim/utilities/TriggerConfig.h"
+#include "trigger-sim/utilities/TriggerProfile.h"
 
 
 /*
@@ -48,6 +54,10 @@ private:
     std::string triggerName_;
     std::string dataReadoutName_;
     std::string domSetsName_;
+    std::string detectorStatusName_;
+    std::string triggerHitTableName_;
+    std::string triggerCollectorName_;
+    std::string profileName_;
     double time_window_;
     double time_window_separation_;
     double max_trigger_length_; 
@@ -64,6 +74,22 @@ private:
     double slcfraction_min_;
     boost::optional<int> domSet_;
 
+    // DOM positions of the last geometry
+    I3OMGeoTableConstPtr geoTable_;
+    I3GeometryConstPtr geoTableGeometry_;
+
+    // DOMSet membership, rebuilt when the DOMSets in the frame change
+    DOMSetTableConstPtr domSetTable_;
+
+    // the trigger configuration of the DetectorStatus, shared with the other modules
+    TriggerConfigConstPtr triggerConfig_;
+
+    // made from the settings of the DetectorStatus and the geometry,
+    // and used for every frame until one of them changes
+    boost::shared_ptr<FaintParticleTriggerAlgorithm> fpTrigger_;
+
+    // only made if ProfileName is set
+    TriggerProfilePtr profile_;
     
     SET_LOGGER("FaintParticleTrigger");
 
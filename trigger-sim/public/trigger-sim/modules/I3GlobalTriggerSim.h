@@ -19,6 +19,9 @@
 
 #include <icetray/I3Module.h>
 #include <dataclasses/I3Time.h>
+#include <trigger-sim/algorithms/GlobalTriggerSim.h>
+#include <trigger-sim/utilities/TriggerConfig.h>
+#include <trigger-sim/utilities/TriggerProfile.h>
 
 class I3GlobalTriggerSim : public I3Module
 {
@@ -37,14 +40,17 @@ public:
 
   void DAQ(I3FramePtr frame);
 
-  void Finish(){};
+  void Finish();
 
 private:
 
   //Class parameters
   unsigned eventID_;
   std::string i3TriggName_;
+  std::string triggerCollectorName_;
   std::string globalTriggName_;
+  std::string detectorStatusName_;
+  std::string eventHeaderName_;
   bool filterMode_;
   double i3ReadoutWindowBefore_;
   double i3ReadoutWindowAfter_;
@@ -52,6 +58,7 @@ private:
   std::vector<std::string> domLaunchSeriesMapNames_;
   double time_increment_;
   unsigned run_id_;
+  std::string profileName_;
 
   // Internal time shift.  This is incremented by
   // time_increment_ on each frame.
@@ -59,6 +66,14 @@ private:
 
   boost::optional<std::pair<I3Time, I3Time> > time_range_;
 
+  // The trigger configuration and the GlobalTriggerSim made from it,
+  // kept until the I3DetectorStatus changes.
+  TriggerConfigConstPtr triggerConfig_;
+  boost::shared_ptr<GlobalTriggerSim> gts_;
+
+  // only made if ProfileName is set
+  TriggerProfilePtr profile_;
+
   void PushIf(bool triggerCondition, I3FramePtr frame);
 
   SET_LOGGER("I3GlobalTriggerSim");
@@ -13,6 +13,9 @@
 #define I3PRUNER_H
 
 #include "icetray/I3ConditionalModule.h"
+#include "dataclasses/status/I3DetectorStatus.h"
+#include "trigger-sim/utilities/TriggerConfig.h"
+#include "trigger-sim/utilities/TriggerProfile.h"
 /**
  * @brief IceTray module to remove launches outside the readout window
  */
@@ -25,6 +28,7 @@ public:
     void Configure();
 
     void DAQ(I3FramePtr frame);
+    void Finish();
 
 private:
 
@@ -34,6 +38,13 @@ private:
     
     std::vector<std::string> dataReadoutNames_;
     std::string triggerName_;
+    std::string profileName_;
+
+    // readout windows of the last DetectorStatus seen
+    TriggerConfigConstPtr triggerConfig_;
+
+    // only made if ProfileName is set
+    TriggerProfilePtr profile_;
 
     SET_LOGGER("I3Pruner");
 
@@ -0,0 +1,58 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file I3TimeShifter.h
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#ifndef I3TIMESHIFTER_H
+#define I3TIMESHIFTER_H
+
+#include <string>
+#include <vector>
+
+#include "icetray/I3ConditionalModule.h"
+
+/**
+ * @brief Shifts the time of everything time-like in the frame.
+ *
+ * The reference time is the earliest fired trigger in the trigger
+ * hierarchies, or for untriggered events the earliest I3MCPE (or
+ * I3MCHit), or the earliest launch if there are neither.  The shift
+ * is stored in the frame as the I3Double "TimeShift".
+ *
+ * Same as the python I3TimeShifter, but the frame objects are
+ * dispatched on the type names stored in the frame, so objects of
+ * types that aren't shifted are never deserialized.
+ *
+ * I3Doubles are only shifted when listed in ShiftI3DoubleKeys, since
+ * there's no way of knowing whether they're time-like.
+ */
+class I3TimeShifter : public I3ConditionalModule
+{
+public:
+
+    I3TimeShifter(const I3Context& ctx);
+    ~I3TimeShifter();
+    void Configure();
+
+    void DAQ(I3FramePtr frame);
+
+private:
+
+    I3TimeShifter();
+    I3TimeShifter(const I3TimeShifter& source);
+    I3TimeShifter& operator=(const I3TimeShifter& source);
+    
+    std::vector<std::string> skipKeys_;
+    std::vector<std::string> shiftI3DoubleKeys_;
+
+    SET_LOGGER("I3TimeShifter");
+
+};	// end of class I3TimeShifter
+
+#endif //I3TIMESHIFTER_H
@@ -20,6 +20,12 @@
 #include <dataclasses/status/I3DetectorStatus.h>
 #include <dataclasses/physics/I3Trigger.h>
 #include <trigger-sim/algorithms/TriggerHit.h>
+#include <trigger-sim/algorithms/TriggerHitBuffer.h>
+#include <trigger-sim/algorithms/SimpleMajorityTriggerAlgorithm.h>
+#include <trigger-sim/algorithms/TriggerHitTable.h>
+#include <trigger-sim/utilities/DOMSetTable.h>
+#include <trigger-sim/utilities/TriggerConfig.h>
+#include <trigger-sim/utilities/TriggerProfile.h>
 
 typedef std::vector<I3Trigger> SimpleMajorityTriggerList;
 I3_POINTER_TYPEDEFS(SimpleMajorityTriggerList);
@@ -42,6 +48,10 @@ class SimpleMajorityTrigger : public I3Module
   std::string dataReadoutName_;
   std::string triggerName_;
   std::string domSetsName_;
+  std::string detectorStatusName_;
+  std::string triggerHitTableName_;
+  std::string triggerCollectorName_;
+  std::string profileName_;
 
   int triggerSourceParam_;
   TriggerKey::SourceID triggerSource_;
@@ -52,14 +62,33 @@ class SimpleMajorityTrigger : public I3Module
   boost::optional<int> domSet_;
   TriggerKey triggerKey_;
 
+  // rebuilt when the DOMSets in the frame change
+  DOMSetTableConstPtr domSetTable_;
+
+  // the trigger configuration of the DetectorStatus, shared with the other modules
+  TriggerConfigConstPtr triggerConfig_;
+
+  // Reused for every frame, so once they've seen the largest event
+  // filling the hits and looking for triggers doesn't allocate.
+  // The algorithm is made again when the DetectorStatus changes.
+  TriggerHitBuffer hits_;
+  std::vector<I3DOMLaunchSeriesMap::const_iterator> doms_;
+  SimpleMajorityTriggerAlgorithmPtr smTrigger_;
+
+  // only made if ProfileName is set
+  TriggerProfilePtr profile_;
+
   int eventCount_;
   int triggerCount_;
 
   void FillHits(I3DOMLaunchSeriesMapConstPtr fullMap, 
-		TriggerHitVectorPtr hitList, 
-		I3MapKeyVectorIntConstPtr domSets);
+		TriggerHitBuffer& hits, 
+		const DOMSetTable& domSets);
+
+  void FillHits(const TriggerHitTable& table,
+		TriggerHitBuffer& hits);
   
-  void Dump(TriggerHitVectorPtr input);
+  void Dump(const TriggerHitBuffer& input);
 
   SET_LOGGER("SimpleMajorityTrigger");
 };
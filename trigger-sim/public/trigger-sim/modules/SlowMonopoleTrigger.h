@@ -5,8 +5,13 @@
 #include "dataclasses/physics/I3Trigger.h"
 #include "dataclasses/physics/I3Particle.h"
 #include <dataclasses/geometry/I3Geometry.h>
+#include <dataclasses/geometry/I3OMGeoTable.h>
 #include "trigger-sim/algorithms/SlowMPHit.h"
 #include "trigger-sim/algorithms/TriggerContainer.h"
+#include "trigger-sim/algorithms/TriggerHitTable.h"
+#include "trigger-sim/utilities/DOMSetTable.h"
+#include "trigger-sim/utilities/TriggerConfig.h"
+#include "trigger-sim/utilities/TriggerProfile.h"
 
 /*
  * slow monopole trigger
@@ -36,13 +41,12 @@ private:
     void RunTrigger(SlowMPHitVector *one_hit_list__, 
 		    SlowMPHitVector *two_hit_list__, 
 		    double *muon_time_window__,
-		    SlowMPHit new_hit, 
-		    const I3GeometryConstPtr &geo);
+		    SlowMPHit new_hit);
     bool HLCPairCheck(SlowMPHit hit1, SlowMPHit hit2);
-    void CheckTriggerStatus(SlowMPHitVector *two_hit_list__, const I3GeometryConstPtr &geo);
+    void CheckTriggerStatus(SlowMPHitVector *two_hit_list__);
     void CheckTriple(SlowMPHit hit1, SlowMPHit hit2, SlowMPHit hit3, 
-		     const I3GeometryConstPtr &geo);
-    double getDistance(SlowMPHit hit1, SlowMPHit hit2, const I3GeometryConstPtr &geo);
+		     double p_diff1);
+    double getDistance(const SlowMPHit& hit1, const SlowMPHit& hit2);
     std::vector<I3ParticlePtr> additional_info(SlowMPHit hit1, SlowMPHit hit2, SlowMPHit hit3);
 
 
@@ -57,6 +61,10 @@ private:
     std::string triggerName_;
     std::string dataReadoutName_;
     std::string domSetsName_;
+    std::string detectorStatusName_;
+    std::string triggerHitTableName_;
+    std::string triggerCollectorName_;
+    std::string profileName_;
 
     boost::optional<int> domset_;
     // should additional info about the 3-tuples be saved in the frame?
@@ -75,6 +83,22 @@ private:
     int min_tuples_;
     double max_event_length_;    
 
+    // DOM positions of the last geometry
+    I3OMGeoTableConstPtr geoTable_;
+    I3GeometryConstPtr geoTableGeometry_;
+
+    // DOMSet membership, rebuilt when the DOMSets in the frame change
+    DOMSetTableConstPtr domSetTable_;
+
+    // the trigger configuration of the DetectorStatus, shared with the other modules
+    TriggerConfigConstPtr triggerConfig_;
+
+    // only made if ProfileName is set
+    TriggerProfilePtr profile_;
+    // HLC pairs and triples of pairs looked at in this frame
+    size_t nPairs_;
+    size_t nTriples_;
+
     SET_LOGGER("SlowMonopoleTrigger");
 
 };	// end of class 
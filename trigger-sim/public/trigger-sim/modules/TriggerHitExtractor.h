@@ -0,0 +1,52 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerHitExtractor.h
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#ifndef TRIGGER_HIT_EXTRACTOR_H
+#define TRIGGER_HIT_EXTRACTOR_H
+
+#include <string>
+#include <vector>
+
+#include <icetray/I3Module.h>
+#include <icetray/I3Context.h>
+#include <icetray/I3Frame.h>
+#include <trigger-sim/utilities/DOMSetTable.h>
+
+/**
+ * @brief Converts the launch maps to time ordered TriggerHitTables
+ *        so the trigger modules downstream share one pass over the
+ *        launches instead of each doing their own.
+ *
+ * For every name in DataReadoutNames a TriggerHitTable called
+ * <DataReadoutName><OutputSuffix> is put in the DAQ frame.
+ */
+class TriggerHitExtractor : public I3Module
+{
+ public:
+  TriggerHitExtractor(const I3Context& context);
+  ~TriggerHitExtractor();
+
+  void Configure();
+  void DAQ(I3FramePtr frame);
+
+ private:
+
+  std::vector<std::string> dataReadoutNames_;
+  std::string domSetsName_;
+  std::string outputSuffix_;
+
+  // rebuilt when the DOMSets in the frame change
+  DOMSetTableConstPtr domSetTable_;
+
+  SET_LOGGER("TriggerHitExtractor");
+};
+
+#endif
@@ -12,8 +12,10 @@
 #ifndef DOMSETFUNCTIONS_H
 #define DOMSETFUNCTIONS_H
 
+#include <stdint.h>
 #include <icetray/OMKey.h>
 #include <dataclasses/I3Map.h>
+#include <trigger-sim/utilities/DOMSetTable.h>
 #include <boost/assign/list_of.hpp>
 
 /**
@@ -39,9 +41,31 @@ namespace DOMSetFunctions{
   const std::vector<unsigned> DOMSETS = boost::assign::list_of(2)(3)(4)(5)(6)(7)(8)(9)(10)(11);
   bool InDOMSet(const OMKey& dom, const unsigned& domSet,
                 const I3MapKeyVectorIntConstPtr &domSets);
+
+  /**
+   * Returns the DOMSet membership of a DOM as a bitmask, where bit N
+   * is set if the DOM is in DOMSet N.  Only DOMSet IDs below 32 can
+   * be represented.  Falls back to the default DOMSets if domSets is null.
+   */
+  uint32_t GetDOMSetMask(const OMKey& dom,
+                         const I3MapKeyVectorIntConstPtr &domSets);
     
   I3MapKeyVectorIntPtr GetDefaultDOMSets();
 
+  /**
+   * Returns the DOMSetTable of the default DOMSets, which is only built once.
+   */
+  DOMSetTableConstPtr GetDefaultDOMSetTable();
+
+  /**
+   * Returns table if it was built from domSets and a new DOMSetTable
+   * otherwise, so a module can keep its table until the DOMSets in
+   * the frame change (i.e. once per DetectorStatus):
+   *     domSetTable_ = DOMSetFunctions::GetDOMSetTable(domSets, domSetTable_);
+   */
+  DOMSetTableConstPtr GetDOMSetTable(const I3MapKeyVectorIntConstPtr &domSets,
+                                     const DOMSetTableConstPtr &table = DOMSetTableConstPtr());
+
 }; 
 
 #endif //DOMSETFUNCTIONS_H
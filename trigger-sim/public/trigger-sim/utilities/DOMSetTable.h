@@ -0,0 +1,151 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file DOMSetTable.h
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#ifndef DOMSETTABLE_H
+#define DOMSETTABLE_H
+
+#include <vector>
+#include <map>
+#include <stdint.h>
+
+#include <boost/optional.hpp>
+
+#include <icetray/OMKey.h>
+#include <icetray/I3PointerTypedefs.h>
+#include <dataclasses/I3Map.h>
+
+/**
+ * @brief Precomputed DOMSet membership of every DOM.
+ *
+ * The DOMs are densely indexed by (string, om) and each one gets a
+ * bitmask where bit N is set if the DOM is in DOMSet N, so bit N of
+ * all the masks is the membership bitset of DOMSet N.  Looking up a
+ * DOM is an array access instead of a search through the DOMSets map,
+ * and Select() filters a whole launch (or pulse) map in one call.
+ *
+ * DOMs that aren't in the DOMSets from the frame are in no DOMSet, and
+ * looking them up logs an error like DOMSetFunctions::InDOMSet does.
+ *
+ * The table is a snapshot of the DOMSets it's built from, so build it
+ * once per DetectorStatus (see DOMSetFunctions::GetDOMSetTable) and
+ * keep it as long as those DOMSets are in the frame.
+ */
+class DOMSetTable
+{
+ public:
+
+  /**
+   * The default DOMSets, see DOMSetFunctions::InDOMSet_orig.
+   */
+  DOMSetTable();
+
+  /**
+   * The DOMSets from the frame, or the defaults if domSets is null.
+   */
+  explicit DOMSetTable(const I3MapKeyVectorIntConstPtr& domSets);
+
+  /**
+   * The DOMSets the table was built from (null for the defaults).
+   */
+  const I3MapKeyVectorIntConstPtr& GetDOMSets() const { return domSets_; }
+
+  /**
+   * Same as DOMSetFunctions::GetDOMSetMask.
+   */
+  uint32_t GetMask(const OMKey& dom) const
+  {
+    if((defaults_ || dom.GetPMT() == 0) &&
+       dom.GetString() >= minString_ && dom.GetOM() < nOMs_){
+      size_t string = dom.GetString() - minString_;
+      if(string < nStrings_){
+        // an empty mask from the frame may be a DOM that isn't in the map
+        uint32_t mask = masks_[string*nOMs_ + dom.GetOM()];
+        if(mask || defaults_)
+          return mask;
+      }
+    }
+    return GetMaskOutside(dom);
+  }
+
+  /**
+   * Same as DOMSetFunctions::InDOMSet.
+   */
+  bool InDOMSet(const OMKey& dom, unsigned domSet) const
+  {
+    if(domSet < 32 && (knownSets_ & (1u << domSet)))
+      return GetMask(dom) & (1u << domSet);
+    return InDOMSetSlow(dom, domSet);
+  }
+
+  /**
+   * Appends an iterator to every entry of the map whose DOM is in
+   * the DOMSet, in map order.
+   */
+  template <class MapType>
+  void Select(const MapType& doms, unsigned domSet,
+              std::vector<typename MapType::const_iterator>& selected) const
+  {
+    selected.reserve(selected.size() + doms.size());
+    if(domSet < 32 && (knownSets_ & (1u << domSet))){
+      const uint32_t bit(1u << domSet);
+      for(typename MapType::const_iterator i = doms.begin(); i != doms.end(); i++)
+        if(GetMask(i->first) & bit)
+          selected.push_back(i);
+    }else{
+      for(typename MapType::const_iterator i = doms.begin(); i != doms.end(); i++)
+        if(InDOMSetSlow(i->first, domSet))
+          selected.push_back(i);
+    }
+  }
+
+  /**
+   * Same as above, but selects every entry if no DOMSet is given,
+   * which is what the trigger modules do when their DOMSet isn't set.
+   */
+  template <class MapType>
+  void Select(const MapType& doms, const boost::optional<int>& domSet,
+              std::vector<typename MapType::const_iterator>& selected) const
+  {
+    if(domSet){
+      Select(doms, static_cast<unsigned>(domSet.get()), selected);
+      return;
+    }
+    selected.reserve(selected.size() + doms.size());
+    for(typename MapType::const_iterator i = doms.begin(); i != doms.end(); i++)
+      selected.push_back(i);
+  }
+
+ private:
+
+  void Fill(const I3MapKeyVectorInt& domSets);
+  void FillDefaults();
+
+  uint32_t GetMaskOutside(const OMKey& dom) const;
+  bool InDOMSetSlow(const OMKey& dom, unsigned domSet) const;
+
+  I3MapKeyVectorIntConstPtr domSets_;
+  bool defaults_;
+
+  // bit N is set if InDOMSet can be answered from the masks for DOMSet N
+  uint32_t knownSets_;
+
+  // The mask of the DOM (string, om) is masks_[(string - minString_)*nOMs_ + om].
+  // DOMs from the frame with a PMT number other than 0 are kept in others_.
+  int minString_;
+  size_t nStrings_;
+  unsigned nOMs_;
+  std::vector<uint32_t> masks_;
+  std::map<OMKey, uint32_t> others_;
+};
+
+I3_POINTER_TYPEDEFS(DOMSetTable);
+
+#endif //DOMSETTABLE_H
@@ -24,7 +24,7 @@
 namespace GTSUtils 
 {
 			    
-  bool LessThan(I3Trigger i, I3Trigger j);
+  bool LessThan(const I3Trigger& i, const I3Trigger& j);
 
   I3TriggerStatus::Subdetector KeyToSubDetector(const TriggerKey& k);
 
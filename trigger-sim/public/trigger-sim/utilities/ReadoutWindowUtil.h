@@ -12,6 +12,7 @@
  * (c) 2006 IceCube Collaboration
  */
 
+#include "icetray/I3PointerTypedefs.h"
 #include "dataclasses/physics/I3Trigger.h"
 #include "dataclasses/TriggerKey.h"
 #include "dataclasses/status/I3DetectorStatus.h"
@@ -30,14 +31,14 @@ class ReadoutWindowUtil
   ReadoutWindowUtil(const I3DetectorStatus& detectorStatus);
   ~ReadoutWindowUtil();
 
-  std::pair<double,double> GetInIceReadoutWindow(const I3Trigger& trigger);
-  std::pair<double,double> GetIceTopReadoutWindow(const I3Trigger& trigger);
+  std::pair<double,double> GetInIceReadoutWindow(const I3Trigger& trigger) const;
+  std::pair<double,double> GetIceTopReadoutWindow(const I3Trigger& trigger) const;
 
   std::pair<double,double> GetReadoutWindow(I3TriggerStatus::Subdetector subdetector, 
-					    const I3Trigger& trigger);
+					    const I3Trigger& trigger) const;
 
-  double GetEarliestReadoutTime(const I3Trigger& trigger);
-  double GetLatestReadoutTime(const I3Trigger& trigger);
+  double GetEarliestReadoutTime(const I3Trigger& trigger) const;
+  double GetLatestReadoutTime(const I3Trigger& trigger) const;
 
  private:
 
@@ -45,4 +46,6 @@ class ReadoutWindowUtil
 
 };
 
+I3_POINTER_TYPEDEFS(ReadoutWindowUtil);
+
 #endif // READOUT_WINDOW_UTIL_H
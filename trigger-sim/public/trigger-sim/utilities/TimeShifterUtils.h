@@ -11,14 +11,40 @@
  *
  * (c) 2006 IceCube Collaboration
  */
+#include <string>
+#include <vector>
 #include <icetray/I3PointerTypedefs.h>
 I3_FORWARD_DECLARATION(I3Frame);
 
 namespace TimeShifterUtils {			    
+  /**
+   * Shifts the times of all frame objects of known types by -dt.
+   * The type of each object is taken from the type name stored in
+   * the frame.  An object of another type is tried as each of the
+   * known types the first time its type name comes up, which finds
+   * the types derived from them, and after that the type name says
+   * whether and how objects of that type are shifted.
+   */
   void ShiftFrameObjects(I3FramePtr frame, 
                          double dt, 
                          const std::vector<std::string>& skip_keys,
                          const std::vector<std::string>& shift_i3double_keys);
+
+  /**
+   * The reference time of the frame : the earliest fired trigger in
+   * any I3TriggerHierarchy, or if there is none the earliest
+   * I3MCHit/I3MCPE, or if there are none the earliest I3DOMLaunch.
+   * Returns 0 if the frame has none of these.
+   */
+  double GetTimeShift(const I3Frame& frame,
+                      const std::vector<std::string>& skip_keys);
+
+  /**
+   * The type name with the libc++ inline namespace (std::__1) dropped,
+   * so names from libc++ and libstdc++ builds compare equal.  Both the
+   * names in the frame and the ones of the known types go through this.
+   */
+  std::string NormalizeTypeName(const std::string& type_name);
 };
 
 #endif //TIMESHIFTERUTILS_H
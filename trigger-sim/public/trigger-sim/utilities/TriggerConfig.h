@@ -0,0 +1,82 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerConfig.h
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#ifndef TRIGGERCONFIG_H
+#define TRIGGERCONFIG_H
+
+#include <map>
+#include <mutex>
+#include <tuple>
+
+#include <boost/optional.hpp>
+
+#include <icetray/I3Logging.h>
+#include <icetray/I3PointerTypedefs.h>
+#include <dataclasses/TriggerKey.h>
+#include <dataclasses/status/I3DetectorStatus.h>
+#include <trigger-sim/utilities/ReadoutWindowUtil.h>
+#include <trigger-sim/utilities/DetectorStatusUtils.h>
+
+/**
+ * @brief What the trigger modules need from an I3DetectorStatus,
+ *        worked out once and shared by all of them.
+ *
+ * Get one with TriggerConfig::Get(), which returns the same object to
+ * every module as long as they pass the same I3DetectorStatus, so the
+ * trigger status lookups and the readout windows are only done once
+ * per DetectorStatus frame.  Modules keep it until the I3DetectorStatus
+ * in the frame changes:
+ *     if(!triggerConfig_ || triggerConfig_->GetDetectorStatus() != status)
+ *       triggerConfig_ = TriggerConfig::Get(status);
+ */
+class TriggerConfig
+{
+ public:
+
+  explicit TriggerConfig(const I3DetectorStatusConstPtr& status);
+
+  const I3DetectorStatusConstPtr& GetDetectorStatus() const { return status_; }
+
+  /**
+   * The readout windows of the triggers in the I3DetectorStatus.
+   */
+  const ReadoutWindowUtilConstPtr& GetReadoutWindowUtil() const { return roUtil_; }
+
+  /**
+   * Same as DetectorStatusUtils::GetTriggerStatus, but only looked up
+   * the first time it's asked for.
+   */
+  boost::optional<DetectorStatusUtils::tk_ts_pair_t>
+  GetTriggerStatus(TriggerKey::SourceID sourceID,
+                   TriggerKey::TypeID typeID,
+                   boost::optional<int> configID) const;
+
+  /**
+   * Returns the TriggerConfig of status, which is shared by all the
+   * callers with the same I3DetectorStatus.
+   */
+  static boost::shared_ptr<const TriggerConfig> Get(const I3DetectorStatusConstPtr& status);
+
+ private:
+
+  I3DetectorStatusConstPtr status_;
+  ReadoutWindowUtilConstPtr roUtil_;
+
+  typedef std::tuple<TriggerKey::SourceID, TriggerKey::TypeID, boost::optional<int> > query_t;
+  mutable std::map<query_t, boost::optional<DetectorStatusUtils::tk_ts_pair_t> > triggerStatus_;
+  mutable std::mutex mutex_;
+
+  SET_LOGGER("TriggerConfig");
+};
+
+I3_POINTER_TYPEDEFS(TriggerConfig);
+
+#endif // TRIGGERCONFIG_H
@@ -0,0 +1,104 @@
+/**
+ * copyright  (C) 2023
+ * the icecube collaboration
+ * $Id:
+ *
+ * @file TriggerProfile.h
+ * @version
+ * @date
+ * @author olivas
+ */
+
+#ifndef TRIGGERPROFILE_H
+#define TRIGGERPROFILE_H
+
+#include <chrono>
+#include <map>
+#include <string>
+#include <vector>
+
+#include <icetray/I3Logging.h>
+#include <icetray/I3PointerTypedefs.h>
+#include <icetray/I3Frame.h>
+#include <dataclasses/I3Map.h>
+
+/**
+ * @brief Time and counts of a trigger-sim module, per frame and summed
+ *        up over the run.
+ *
+ * The modules make one if their ProfileName parameter is set and use it
+ * like this for every frame:
+ *     if(profile_) profile_->Start();
+ *     ...
+ *     if(profile_){
+ *       profile_->Count("hits", hits.size());
+ *       profile_->Stop(*frame, profileName_);
+ *     }
+ *     PushFrame(frame);
+ *
+ * Stop() puts the numbers of the frame, the wall time in microseconds
+ * ("time") and the counts, as an I3MapStringDouble into the frame.  The
+ * times also go into a histogram with bins doubling in width, and
+ * Summary() gives the mean and maximum of every count and the time
+ * histogram, which the modules log at Finish.
+ */
+class TriggerProfile
+{
+ public:
+
+  static const unsigned N_TIME_BINS = 32;
+
+  explicit TriggerProfile(const std::string& name);
+
+  /**
+   * Starts the clock and the counts of a new frame.
+   */
+  void Start();
+
+  /**
+   * Adds n to the count called name of this frame.
+   */
+  void Count(const std::string& name, double n);
+
+  /**
+   * Stops the clock, adds the frame to the totals and, if key isn't
+   * empty, puts the numbers of the frame into it under key.
+   */
+  void Stop(I3Frame& frame, const std::string& key);
+
+  const std::string& GetName() const { return name_; }
+  unsigned GetNFrames() const { return nFrames_; }
+
+  /**
+   * Sum and maximum over all frames of the counts (and "time").
+   */
+  const std::map<std::string, double>& GetTotals() const { return totals_; }
+  const std::map<std::string, double>& GetMaxima() const { return maxima_; }
+
+  /**
+   * Number of frames with a time in [GetTimeBinEdge(i), GetTimeBinEdge(i+1))
+   * microseconds.  The last bin takes everything above.
+   */
+  const std::vector<unsigned>& GetTimeHistogram() const { return timeHistogram_; }
+  static double GetTimeBinEdge(unsigned i);
+  static unsigned GetTimeBin(double microseconds);
+
+  std::string Summary() const;
+
+ private:
+
+  std::string name_;
+  std::chrono::steady_clock::time_point start_;
+  I3MapStringDoublePtr frameCounts_;
+
+  unsigned nFrames_;
+  std::map<std::string, double> totals_;
+  std::map<std::string, double> maxima_;
+  std::vector<unsigned> timeHistogram_;
+
+  SET_LOGGER("TriggerProfile");
+};
+
+I3_POINTER_TYPEDEFS(TriggerProfile);
+
+#endif // TRIGGERPROFILE_H
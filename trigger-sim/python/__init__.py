@@ -4,6 +4,70 @@ load_pybindings(__name__, __path__)
 from icecube import icetray, dataclasses
 from icecube.trigger_sim.InjectDefaultDOMSets import InjectDefaultDOMSets
 
+# loop through the trigger status map and configure what we can
+# we still need to do this for STRING and SIMPLE_MULTIPLICITY
+# triggers since there can be multiple trigger configurations
+# of this type.  With the smarter trigger-sim modules we *only*
+# need to specify the configID though since that's unique for
+# each trigger.
+_key_to_module = {dataclasses.SIMPLE_MULTIPLICITY : "SimpleMajorityTrigger" ,
+                  dataclasses.STRING : "ClusterTrigger",
+                  dataclasses.VOLUME : "CylinderTrigger",
+                  dataclasses.SLOW_PARTICLE : "SlowMonopoleTrigger",
+                  dataclasses.FAINT_PARTICLE : "FaintParticleTrigger"}
+
+# the launches are converted to time ordered hits once per
+# frame and shared by all trigger modules of the same source.
+_source_to_readout = {dataclasses.IN_ICE : "InIceRawData",
+                      dataclasses.ICE_TOP : "IceTopRawData"}
+_hit_table_suffix = "TriggerHits"
+
+def get_trigger_status(gcd_file):
+    """
+    Returns the trigger status map of the first I3DetectorStatus
+    in the GCD file (an I3File).
+    """
+    fr = gcd_file.pop_frame()
+    while "I3DetectorStatus" not in fr :
+        fr = gcd_file.pop_frame()
+    return fr.Get("I3DetectorStatus").trigger_status
+
+def _add_trigger_modules(tray, tsmap, profile_name = None, **kwargs):
+    """
+    Adds a trigger module for every trigger in the trigger status map
+    that we have a simulation module for.  The keyword arguments are
+    passed to all of them.  If profile_name is set every module puts
+    its profile into the frame as <profile_name>_<module>_<config ID>.
+    """
+    for tkey, ts in tsmap :
+        # skip any triggers we don't have simulation modules for
+        if (tkey.source != dataclasses.IN_ICE and \
+          tkey.source != dataclasses.ICE_TOP) or\
+           tkey.type not in _key_to_module:
+            continue
+        
+        # If we find a ULEE configuration in the GCD file
+        # alert the user that this is no longer supported.
+        if tkey.type == dataclasses.STRING :
+            if "maxLength" in ts.trigger_settings and \
+              "multiplicity" in ts.trigger_settings and \
+              "string" in ts.trigger_settings and \
+              "timeWindow" in ts.trigger_settings :
+                icetray.logging.log_warn("ULEE found in GCD but is no longer supported.")            
+                continue
+
+        module_kwargs = dict(kwargs)
+        if profile_name :
+            module_kwargs["ProfileName"] = "%s_%s_%d" % \
+                (profile_name, _key_to_module[tkey.type], tkey.config_id)
+
+        # Load the appropriate module with its TriggerConfigID.  All trigger
+        # modules should be able to configure themselves solely from the
+        # trigger config ID.
+        tray.Add(_key_to_module[tkey.type], TriggerConfigID = tkey.config_id,
+                 TriggerHitTableName = _source_to_readout[tkey.source] + _hit_table_suffix,
+                 **module_kwargs)
+
 @icetray.traysegment
 def TriggerSim(tray,
                name,
@@ -12,7 +76,9 @@ def TriggerSim(tray,
                prune = True,
                time_shift = True,
                time_shift_args = dict(),
-               filter_mode = True ):
+               filter_mode = True,
+               global_trigger_args = dict(),
+               profile = False ):
     """
     Configure triggers according to the GCD file.
 
@@ -34,6 +100,12 @@ def TriggerSim(tray,
       It makes simulation look more like data.
     * time_shift_args - dict that's forwarded to the I3TimeShifter module.
     * filter_mode - Whether to filter frames that do not trigger.    
+    * global_trigger_args - dict that's forwarded to the I3GlobalTriggerSim
+      module, e.g. TimeIncrement or FromTime and ToTime.
+    * profile - Whether the trigger modules, I3GlobalTriggerSim and
+      I3Pruner put the time and counts of every frame into the frame
+      (as I3MapStringDouble <name>_Profile_<module>) and log a summary
+      at Finish.
 
     This ignores AMANDA triggers and only supports the following modules:
 
@@ -50,54 +122,132 @@ def TriggerSim(tray,
     if run_id == None :
         icetray.logging.log_fatal("You have to set run_id to a valid number.")
 
-    from icecube.trigger_sim.modules.time_shifter import I3TimeShifter
+    tsmap = get_trigger_status(gcd_file)
 
-    # get the trigger status
-    fr = gcd_file.pop_frame()
-    while "I3DetectorStatus" not in fr :
-        fr = gcd_file.pop_frame()
-    tsmap = fr.Get("I3DetectorStatus").trigger_status
-
-    # loop through the trigger status map and configure what we can
-    # we still need to do this for STRING and SIMPLE_MULTIPLICITY
-    # triggers since there can be multiple trigger configurations
-    # of this type.  With the smarter trigger-sim modules we *only*
-    # need to specify the configID though since that's unique for
-    # each trigger.
-    key_to_module = {dataclasses.SIMPLE_MULTIPLICITY : "SimpleMajorityTrigger" ,
-                         dataclasses.STRING : "ClusterTrigger",
-                         dataclasses.VOLUME : "CylinderTrigger",
-                         dataclasses.SLOW_PARTICLE : "SlowMonopoleTrigger",
-                         dataclasses.FAINT_PARTICLE : "FaintParticleTrigger"}
-                        
-    for tkey, ts in tsmap :
-        # skip any triggers we don't have simulation modules for
-        if (tkey.source != dataclasses.IN_ICE and \
-          tkey.source != dataclasses.ICE_TOP) or\
-           tkey.type not in key_to_module:
-            continue
-        
-        # If we find a ULEE configuration in the GCD file
-        # alert the user that this is no longer supported.
-        if tkey.type == dataclasses.STRING :
-            if "maxLength" in ts.trigger_settings and \
-              "multiplicity" in ts.trigger_settings and \
-              "string" in ts.trigger_settings and \
-              "timeWindow" in ts.trigger_settings :
-                icetray.logging.log_warn("ULEE found in GCD but is no longer supported.")            
-                continue
+    # the trigger modules collect their triggers and the
+    # I3GlobalTriggerSim makes the trigger hierarchy once.
+    trigger_collector = name + "_TriggerCollector"
+    tray.AddModule("TriggerHitExtractor", name + "_hit_extractor",
+                   DataReadoutNames = list(_source_to_readout.values()),
+                   OutputSuffix = _hit_table_suffix)
 
-        # Load the appropriate module with its TriggerConfigID.  All trigger
-        # modules should be able to configure themselves solely from the
-        # trigger config ID.
-        tray.Add(key_to_module[tkey.type], TriggerConfigID = tkey.config_id)
+    profile_name = name + "_Profile" if profile else None
+    _add_trigger_modules(tray, tsmap,
+                         profile_name = profile_name,
+                         TriggerCollectorName = trigger_collector)
 
+    if profile :
+        global_trigger_args = dict(global_trigger_args,
+                                   ProfileName = profile_name + "_I3GlobalTriggerSim")
     tray.AddModule("I3GlobalTriggerSim",name + "_global_trig",
                    RunID = run_id,
-                   FilterMode = filter_mode)
+                   FilterMode = filter_mode,
+                   TriggerCollectorName = trigger_collector,
+                   **global_trigger_args)
+
+    tray.AddModule("Delete", name + "_delete_hit_tables",
+                   Keys = [readout + _hit_table_suffix
+                           for readout in _source_to_readout.values()])
     if prune :
-        tray.AddModule("I3Pruner")
+        tray.AddModule("I3Pruner",
+                       ProfileName = profile_name + "_I3Pruner" if profile else "")
 
     if time_shift :
-        tray.AddModule(I3TimeShifter, **time_shift_args)
+        tray.AddModule("I3TimeShifter", **time_shift_args)
                        
+
+@icetray.traysegment
+def MultiConfigTriggerSim(tray,
+                          name,
+                          configurations,
+                          run_id = None,
+                          filter_mode = True,
+                          global_trigger_args = dict()):
+    """
+    Runs several trigger configurations over the same events in one
+    pass, e.g. to sweep a trigger setting without reading the input
+    once per setting.
+
+    Parameters:
+
+    * tray - Standard for segments.
+    * name - Standard for segments.
+    * configurations - dict of label : configuration, where the
+      configuration is either a GCD file (I3File) or an
+      I3TriggerStatusMap.
+    * run_id - As for TriggerSim.
+    * filter_mode - Whether to filter frames that none of the
+      configurations trigger.
+    * global_trigger_args - dict that's forwarded to the I3GlobalTriggerSim
+      of every configuration.
+
+    For every label the trigger status is put in the DetectorStatus
+    frame as I3DetectorStatus_<label>, and the DAQ frame gets the
+    triggers as I3Triggers_<label> and the output of an I3GlobalTriggerSim
+    as I3TriggerHierarchy_<label> and I3EventHeader_<label>, the same as
+    TriggerSim would make for that configuration.  The launches are
+    converted to hits once and shared by all configurations.
+
+    There's no I3Pruner or I3TimeShifter, since the readout windows and
+    the time shift differ between the configurations.
+    """
+
+    if run_id == None :
+        icetray.logging.log_fatal("You have to set run_id to a valid number.")
+
+    tsmaps = dict()
+    for label, configuration in configurations.items() :
+        if hasattr(configuration, "pop_frame") :
+            tsmaps[label] = get_trigger_status(configuration)
+        else :
+            tsmaps[label] = configuration
+
+    def PutDetectorStatus(frame):
+        ds = frame["I3DetectorStatus"]
+        for label, tsmap in tsmaps.items() :
+            key = "I3DetectorStatus_" + label
+            if key in frame :
+                del frame[key]
+            status = dataclasses.I3DetectorStatus()
+            status.start_time = ds.start_time
+            status.end_time = ds.end_time
+            status.trigger_status = tsmap
+            frame[key] = status
+
+    tray.AddModule(PutDetectorStatus, name + "_put_detector_status",
+                   Streams = [icetray.I3Frame.DetectorStatus])
+
+    tray.AddModule("TriggerHitExtractor", name + "_hit_extractor",
+                   DataReadoutNames = list(_source_to_readout.values()),
+                   OutputSuffix = _hit_table_suffix)
+
+    for label, tsmap in tsmaps.items() :
+        _add_trigger_modules(tray, tsmap,
+                             DetectorStatusName = "I3DetectorStatus_" + label,
+                             TriggerName = "I3Triggers_" + label,
+                             TriggerCollectorName = name + "_TriggerCollector_" + label)
+
+    # one configuration must not drop the frames of the others,
+    # so the frames are only filtered once all of them are done
+    for label in tsmaps :
+        tray.AddModule("I3GlobalTriggerSim", name + "_global_trig_" + label,
+                       RunID = run_id,
+                       FilterMode = False,
+                       DetectorStatusName = "I3DetectorStatus_" + label,
+                       I3TriggerName = "I3Triggers_" + label,
+                       TriggerCollectorName = name + "_TriggerCollector_" + label,
+                       GlobalTriggerName = "I3TriggerHierarchy_" + label,
+                       EventHeaderName = "I3EventHeader_" + label,
+                       **global_trigger_args)
+
+    if filter_mode :
+        def AnyTriggered(frame):
+            return any(len(frame["I3TriggerHierarchy_" + label]) > 0
+                       for label in tsmaps
+                       if "I3TriggerHierarchy_" + label in frame)
+        tray.AddModule(AnyTriggered, name + "_filter",
+                       Streams = [icetray.I3Frame.DAQ])
+
+    tray.AddModule("Delete", name + "_delete_hit_tables",
+                   Keys = [readout + _hit_table_suffix
+                           for readout in _source_to_readout.values()])
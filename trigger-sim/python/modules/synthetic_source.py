@@ -0,0 +1,195 @@
+import math
+import random
+
+from icecube import icetray
+from icecube import dataclasses
+from icecube.icetray import I3Units
+
+# speed of light in vacuum and the group velocity in ice
+C_VACUUM = 0.299792458 * I3Units.m / I3Units.ns
+C_ICE = C_VACUUM / 1.35
+COS_CHERENKOV = 1. / 1.33
+SIN_CHERENKOV = math.sqrt(1. - COS_CHERENKOV**2)
+TAN_CHERENKOV = SIN_CHERENKOV / COS_CHERENKOV
+
+class SyntheticEventSource(icetray.I3Module):
+    '''
+    Fills DAQ frames with synthetic InIceRawData and IceTopRawData for
+    benchmarking the trigger modules.  It needs a geometry in the frame,
+    so put it behind an I3InfiniteSource with a GCD file as prefix.
+
+    Every event is a readout window of ReadoutLength with
+
+    * uncorrelated noise launches on every DOM, at NoiseRate for the
+      in-ice DOMs and IceTopNoiseRate for the IceTop DOMs, and
+    * if TrackBrightness > 0, a muon track through the in-ice detector.
+      A DOM at a distance d from the track gets on average
+      TrackBrightness * exp(-d/AttenuationLength) launches, at the direct
+      Cherenkov time plus an exponential scattering delay.
+
+    The LC bit is set for launches with a launch on a neighbouring DOM
+    (up to two DOMs away on the same string, or another DOM of the same
+    IceTop station) within one microsecond.
+
+    The launches are the same for the same Seed, so the numbers from
+    different builds can be compared.
+    '''
+    def __init__(self, context):
+        icetray.I3Module.__init__(self, context)
+        self.AddParameter("NoiseRate",
+                          "Noise rate of the in-ice DOMs.",
+                          500. / I3Units.second)
+        self.AddParameter("IceTopNoiseRate",
+                          "Noise rate of the IceTop DOMs.",
+                          1500. / I3Units.second)
+        self.AddParameter("TrackBrightness",
+                          "Mean number of launches of a DOM on the track.  0 for noise only.",
+                          10.)
+        self.AddParameter("AttenuationLength",
+                          "Distance at which the number of launches drops by 1/e.",
+                          30. * I3Units.m)
+        self.AddParameter("ReadoutLength",
+                          "Length of the event.",
+                          20. * I3Units.microsecond)
+        self.AddParameter("Seed",
+                          "Seed of the random numbers.",
+                          0)
+        self.AddParameter("InIceRawDataName",
+                          "Name of the in-ice launches.",
+                          "InIceRawData")
+        self.AddParameter("IceTopRawDataName",
+                          "Name of the IceTop launches.",
+                          "IceTopRawData")
+        self.AddOutBox("OutBox")
+
+    def Configure(self):
+        self.noise_rate = self.GetParameter("NoiseRate")
+        self.icetop_noise_rate = self.GetParameter("IceTopNoiseRate")
+        self.brightness = self.GetParameter("TrackBrightness")
+        self.attenuation_length = self.GetParameter("AttenuationLength")
+        self.readout_length = self.GetParameter("ReadoutLength")
+        self.rng = random.Random(self.GetParameter("Seed"))
+        self.inice_name = self.GetParameter("InIceRawDataName")
+        self.icetop_name = self.GetParameter("IceTopRawDataName")
+        self.geometry = None
+
+    def Geometry(self, frame):
+        self._set_geometry(frame["I3Geometry"])
+        self.PushFrame(frame)
+
+    def _set_geometry(self, geometry):
+        self.geometry = geometry
+        self.inice_doms = list()
+        self.icetop_doms = list()
+        for omkey, omgeo in geometry.omgeo:
+            if omgeo.omtype == dataclasses.I3OMGeo.IceCube:
+                self.inice_doms.append((omkey, omgeo.position))
+            elif omgeo.omtype == dataclasses.I3OMGeo.IceTop:
+                self.icetop_doms.append((omkey, omgeo.position))
+
+        # the tracks go through a cylinder around the in-ice DOMs
+        n = max(len(self.inice_doms), 1)
+        self.center = dataclasses.I3Position(
+            sum(p.x for k, p in self.inice_doms) / n,
+            sum(p.y for k, p in self.inice_doms) / n,
+            sum(p.z for k, p in self.inice_doms) / n)
+        self.radius = max([math.hypot(p.x - self.center.x, p.y - self.center.y)
+                           for k, p in self.inice_doms] + [0.])
+        self.half_height = max([abs(p.z - self.center.z)
+                                for k, p in self.inice_doms] + [0.])
+
+    def _add_noise(self, hits, doms, rate):
+        # one Poisson process for all DOMs together
+        total_rate = rate * len(doms)
+        if total_rate <= 0:
+            return
+        t = self.rng.expovariate(total_rate)
+        while t < self.readout_length:
+            omkey = doms[self.rng.randrange(len(doms))][0]
+            hits.setdefault(omkey, list()).append(t)
+            t += self.rng.expovariate(total_rate)
+
+    def _poisson(self, mean):
+        # Knuth's method, the means here are small
+        limit = math.exp(-mean)
+        n = 0
+        p = self.rng.random()
+        while p > limit:
+            n += 1
+            p *= self.rng.random()
+        return n
+
+    def _add_track(self, hits):
+        # a point in the detector and an isotropic direction
+        r = self.radius * math.sqrt(self.rng.random())
+        phi = 2 * math.pi * self.rng.random()
+        vertex = dataclasses.I3Position(
+            self.center.x + r * math.cos(phi),
+            self.center.y + r * math.sin(phi),
+            self.center.z + self.half_height * (2 * self.rng.random() - 1))
+        direction = dataclasses.I3Direction(math.acos(2 * self.rng.random() - 1),
+                                            2 * math.pi * self.rng.random())
+        # the track passes the vertex in the first half of the readout window
+        t0 = 0.5 * self.readout_length * self.rng.random()
+
+        max_distance = self.attenuation_length * math.log(max(self.brightness, 1.) / 0.01)
+        for omkey, pos in self.inice_doms:
+            dx = pos.x - vertex.x
+            dy = pos.y - vertex.y
+            dz = pos.z - vertex.z
+            along = dx * direction.x + dy * direction.y + dz * direction.z
+            d = math.sqrt(max(dx*dx + dy*dy + dz*dz - along*along, 0.))
+            if d > max_distance:
+                continue
+            n = self._poisson(self.brightness * math.exp(-d / self.attenuation_length))
+            if not n:
+                continue
+            t_direct = t0 + (along - d / TAN_CHERENKOV) / C_VACUUM \
+                + d / (C_ICE * SIN_CHERENKOV)
+            # the scattering delays get longer the further away the DOM is
+            mean_delay = 1. * I3Units.ns + d / C_ICE
+            for i in range(n):
+                t = t_direct + self.rng.expovariate(1. / mean_delay)
+                if 0. <= t < self.readout_length:
+                    hits.setdefault(omkey, list()).append(t)
+
+    @staticmethod
+    def _neighbours(omkey, icetop):
+        if icetop:
+            return [icetray.OMKey(omkey.string, om) for om in range(61, 65)
+                    if om != omkey.om]
+        return [icetray.OMKey(omkey.string, omkey.om + i) for i in (-2, -1, 1, 2)
+                if omkey.om + i > 0]
+
+    def _launch_map(self, hits, icetop):
+        launchmap = dataclasses.I3DOMLaunchSeriesMap()
+        for omkey in hits:
+            hits[omkey].sort()
+        for omkey, times in hits.items():
+            neighbour_times = [t for n in self._neighbours(omkey, icetop)
+                               for t in hits.get(n, ())]
+            series = dataclasses.I3DOMLaunchSeries()
+            for t in times:
+                launch = dataclasses.I3DOMLaunch()
+                launch.time = t
+                launch.lc_bit = any(abs(t - nt) <= I3Units.microsecond
+                                    for nt in neighbour_times)
+                series.append(launch)
+            launchmap[omkey] = series
+        return launchmap
+
+    def DAQ(self, frame):
+        if self.geometry is None:
+            self._set_geometry(frame["I3Geometry"])
+
+        inice = dict()
+        self._add_noise(inice, self.inice_doms, self.noise_rate)
+        if self.brightness > 0 and self.inice_doms:
+            self._add_track(inice)
+
+        icetop = dict()
+        self._add_noise(icetop, self.icetop_doms, self.icetop_noise_rate)
+
+        frame[self.inice_name] = self._launch_map(inice, False)
+        frame[self.icetop_name] = self._launch_map(icetop, True)
+        self.PushFrame(frame)
@@ -3,7 +3,7 @@ from icecube import dataclasses
 from icecube import simclasses
 from numpy import isnan
 
-from icecube.trigger_sim import ShiftFrameObjects
+from icecube.trigger_sim import ShiftFrameObjects, GetTimeShift
 
 class I3TimeShifter(icetray.I3Module) :
     '''
@@ -16,6 +16,9 @@ class I3TimeShifter(icetray.I3Module) :
     to know whether they're time-like objects or not.  Most of the time
     they won't be, so the user has to explicitly state which one's need
     to be shifted.
+
+    The C++ module "I3TimeShifter" does the same without going through
+    python for every frame.
     '''
     def __init__(self,context):
         icetray.I3Module.__init__(self,context)
@@ -47,65 +50,12 @@ class I3TimeShifter(icetray.I3Module) :
 
         # DELTA_T is the global time shift.
         # This will be stored in the frame as an I3Double with the key "TimeShift".
-        DELTA_T = 0.
-
-        # Fill the ttimes list with either I3MCHit times
-        # or trigger times.  The earliest time will be DELTA_T.
-        ttimes = list()
-        for frame_key in frame.keys():
-            if frame_key in self.skip_keys:
-                continue
-            try:
-                frame_object = frame[frame_key]
-            except RuntimeError:
-                continue
-            except KeyError as ke:
-                if frame_key not in frame:
-                    raise ke
-                else:
-                    continue
-            
-            if isinstance(frame_object, dataclasses.I3TriggerHierarchy) :
-                ttimes.extend([t.time for t in frame_object if t.fired])
-            
-        if len(ttimes) == 0 :
-            # These are untriggered events, so look for the earliest I3MCHit or I3MCPE.
-            for frame_key in frame.keys():
-                if frame_key in self.skip_keys:
-                    continue
-                try:
-                    frame_object = frame[frame_key]
-                except RuntimeError:
-                    continue
-                except KeyError as ke:
-                    if frame_key not in frame:
-                        raise ke
-                    else:
-                        continue
-
-                if isinstance(frame_object, dataclasses.I3MCHitSeriesMap) or \
-                    isinstance(frame_object, simclasses.I3MCPESeriesMap):
-                    for omkey, series in frame_object:
-                        ttimes.extend([o.time for o in series])
-
-            if len(ttimes) == 0 :
-                # check for DOMLaunches.
-                # this is for trigger hitspool data
-                for frame_key in frame.keys():
-                    if frame_key in self.skip_keys:
-                        continue
-                    try:
-                        frame_object = frame[frame_key]
-                    except RuntimeError:
-                        continue
-
-                    if isinstance(frame_object, dataclasses.I3DOMLaunchSeriesMap):                            
-                        for omkey, series in frame_object:
-                            ttimes.extend([o.time for o in series])
-                    
-        # Calculate the earliest time.
-        if ttimes :
-            DELTA_T = min(ttimes)
+        # It's the earliest trigger time or, for untriggered events, the
+        # earliest I3MCHit/I3MCPE time or the earliest DOMLaunch time
+        # (trigger hitspool data).  The frame objects are picked by the
+        # type name stored in the frame, so nothing else gets deserialized.
+        # The code is in trigger-sim/utilities/TimeShifterUtils.h(cxx)
+        DELTA_T = GetTimeShift(frame, self.skip_keys)
             
         if isnan(DELTA_T) :
             raise ValueError("DELTA_T is 'NaN'")            
@@ -0,0 +1,209 @@
+'''
+Runs the TriggerSim segment over the DAQ frames of a file on several
+processes.
+
+IceTray pushes the frames through a tray one at a time, so the frames
+are split into chunks of consecutive DAQ frames instead, and every chunk
+is run through its own tray in a worker process.  The trigger
+simulation of a frame only depends on the frame and the GCD, so the
+chunks are independent.  The input is read once: every chunk is written
+to its own file behind the latest G, C and D frames, and the chunks are
+simulated while the rest of the input is still being split.  They're
+put back together in the order of the input, with the same frames and
+event IDs a single tray would have made.
+
+Everything random (the event times of I3GlobalTriggerSim with FromTime
+and ToTime) comes from a random service seeded from the seed and the
+chunk number, so the output only depends on the seed and the chunk size,
+not on the number of workers or on which worker ran which chunk.
+'''
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+from icecube import icetray, dataclasses, dataio
+
+# the index of the DAQ frame in the input, so the chunks can be merged
+_FRAME_INDEX_KEY = "TriggerSimFrameIndex"
+
+def _chunk_seed(seed, chunk):
+    return (seed * 1000003 + chunk) % 2**32
+
+def _simulate_chunk(task):
+    '''
+    Runs the TriggerSim segment over one chunk and writes its DAQ frames
+    to task["output"].  Returns the number of event IDs I3GlobalTriggerSim
+    used up, which is the number of frames with launches, triggered or
+    not.
+    '''
+    from I3Tray import I3Tray
+    from icecube import phys_services
+    from icecube.trigger_sim import TriggerSim
+
+    launch_map_names = task["launch_map_names"]
+    n_events = [0]
+    def CountEvents(frame):
+        if any(name in frame and any(len(series) for omkey, series in frame[name])
+               for name in launch_map_names):
+            n_events[0] += 1
+
+    tray = I3Tray()
+    tray.context["I3RandomService"] = \
+        phys_services.I3GSLRandomService(_chunk_seed(task["seed"], task["chunk"]))
+    tray.AddModule("I3Reader", "reader",
+                   Filename = task["input"])
+    tray.AddModule(CountEvents, "count_events",
+                   Streams = [icetray.I3Frame.DAQ])
+    tray.AddSegment(TriggerSim, "trigger_sim",
+                    gcd_file = dataio.I3File(task["gcd_file"]),
+                    **task["kwargs"])
+    tray.AddModule("I3Writer", "writer",
+                   Filename = task["output"],
+                   Streams = [icetray.I3Frame.DAQ])
+    tray.Execute()
+    os.remove(task["input"])
+    return n_events[0]
+
+def run_parallel(infiles,
+                 outfile,
+                 gcd_file,
+                 run_id,
+                 nworkers = None,
+                 chunk_size = 100,
+                 seed = 0,
+                 **kwargs):
+    '''
+    Same as reading infiles, running the TriggerSim segment and writing
+    the frames to outfile in one tray, but on nworkers processes.
+
+    Parameters:
+
+    * infiles - The input files.  The GCD frames need to be in front of
+      the DAQ frames, either in the files or in gcd_file.
+    * outfile - The output file.
+    * gcd_file - Name of the GCD file with the trigger configuration.
+      It's read in front of infiles too, unless it's the first of them.
+    * run_id - Passed to TriggerSim.
+    * nworkers - Number of processes, by default the number of CPUs.
+    * chunk_size - Number of DAQ frames per chunk.
+    * seed - Seed of the random services of the chunks.
+    * kwargs - Passed to TriggerSim.
+
+    The frames that aren't DAQ frames are copied from the input, so this
+    only works as long as the segment doesn't change them.
+    '''
+    if isinstance(infiles, str):
+        infiles = [infiles]
+    filenames = list(infiles)
+    if not filenames or filenames[0] != gcd_file:
+        filenames.insert(0, gcd_file)
+
+    global_trigger_args = kwargs.get("global_trigger_args", dict())
+    launch_map_names = global_trigger_args.get("I3DOMLaunchSeriesMapNames",
+                                               ["InIceRawData", "IceTopRawData"])
+    time_increment = global_trigger_args.get("TimeIncrement", 0.)
+    kwargs["run_id"] = run_id
+
+    tmpdir = tempfile.mkdtemp(prefix = "trigger_sim_")
+    try:
+        pool = multiprocessing.get_context("spawn").Pool(nworkers)
+        try:
+            # Split the input in one pass.  The DAQ frames go to the chunk
+            # files, behind the latest frame of every other stream (the
+            # GCD), and everything else to others, which is merged back
+            # in following is_daq.
+            others_name = os.path.join(tmpdir, "others.i3")
+            others = dataio.I3File(others_name, 'w')
+            is_daq = list()
+            latest = dict()
+            chunk_results = list()
+            chunk_file = None
+            n_daq = 0
+
+            def start_chunk():
+                chunk = len(chunk_results)
+                task = dict(chunk = chunk,
+                            seed = seed,
+                            input = os.path.join(tmpdir, "chunk_in_%06d.i3" % chunk),
+                            output = os.path.join(tmpdir, "chunk_%06d.i3" % chunk),
+                            gcd_file = gcd_file,
+                            launch_map_names = launch_map_names,
+                            kwargs = kwargs)
+                chunk_file.close()
+                chunk_results.append((task["output"],
+                                      pool.apply_async(_simulate_chunk, (task,))))
+
+            for filename in filenames:
+                for frame in dataio.I3File(filename):
+                    if frame.Stop != icetray.I3Frame.DAQ:
+                        others.push(frame)
+                        is_daq.append(False)
+                        if frame.Stop != icetray.I3Frame.Physics:
+                            latest.pop(frame.Stop, None)
+                            latest[frame.Stop] = frame
+                        continue
+
+                    if n_daq % chunk_size == 0:
+                        if chunk_file is not None:
+                            start_chunk()
+                        chunk_file = dataio.I3File(
+                            os.path.join(tmpdir, "chunk_in_%06d.i3" % len(chunk_results)), 'w')
+                        for other in latest.values():
+                            chunk_file.push(other)
+                    frame[_FRAME_INDEX_KEY] = icetray.I3Int(n_daq)
+                    chunk_file.push(frame)
+                    is_daq.append(True)
+                    n_daq += 1
+            if chunk_file is not None:
+                start_chunk()
+            others.close()
+            latest.clear()
+
+            # Merge in the order of the input.  The chunks count their
+            # event IDs (and time increments) from 0, so they're shifted
+            # by the number of events in the chunks before them.
+            out = dataio.I3File(outfile, 'w')
+            others = dataio.I3File(others_name)
+            index = 0
+            event_offset = 0
+            simulated = None
+            next_frame = None
+            for daq in is_daq:
+                if not daq:
+                    out.push(others.pop_frame())
+                    continue
+
+                if index % chunk_size == 0:
+                    if simulated is not None:
+                        simulated.close()
+                        event_offset += n_events
+                    output, result = chunk_results[index // chunk_size]
+                    n_events = result.get()
+                    simulated = dataio.I3File(output)
+                    next_frame = simulated.pop_frame() if simulated.more() else None
+
+                if next_frame is not None and \
+                   next_frame[_FRAME_INDEX_KEY].value == index:
+                    del next_frame[_FRAME_INDEX_KEY]
+                    if event_offset and "I3EventHeader" in next_frame:
+                        header = next_frame["I3EventHeader"]
+                        header.event_id += event_offset
+                        if time_increment:
+                            header.start_time += event_offset * time_increment
+                            header.end_time += event_offset * time_increment
+                        del next_frame["I3EventHeader"]
+                        next_frame["I3EventHeader"] = header
+                    out.push(next_frame)
+                    next_frame = simulated.pop_frame() if simulated.more() else None
+                index += 1
+            if simulated is not None:
+                simulated.close()
+            others.close()
+            out.close()
+        finally:
+            pool.close()
+            pool.join()
+    finally:
+        shutil.rmtree(tmpdir)
@@ -3,36 +3,29 @@ from icecube.dataclasses import I3TriggerHierarchy
 from icecube.dataclasses import I3Trigger
 from icecube.dataclasses import TriggerKey
 
+def _index(th):
+    # the lookups are answered by an I3TriggerHierarchyIndex, which walks
+    # the hierarchy once in C++.  Pass one in (made once per frame) instead
+    # of the I3TriggerHierarchy to ask for several keys without walking it
+    # again for every call.
+    if isinstance(th, dataclasses.I3TriggerHierarchyIndex):
+        return th
+    return dataclasses.I3TriggerHierarchyIndex(th)
+
 def find_triggers(th, key):
-    return_list = list()
-    for t in th:
-        if t.key == key:
-            return_list.append(t)
-    return return_list
+    return _index(th).find(key)
 
 def n_triggers(th, sourceID = None, typeID = None, configID = None):
     if sourceID == None and \
             typeID == None and \
             configID == None : return 0
-    return_value = 0
-    for t in th:
-        if ( sourceID == None or t.key.source == sourceID ) and \
-        ( typeID == None or t.key.type == typeID ) and \
-        ( configID == None or t.key.config_id == configID ) :
-            return_value += 1
-    return return_value      
+    return _index(th).count(sourceID, typeID, configID)
 
 def trigger_lengths(th, sourceID = None, typeID = None, configID = None):
-    return_list = list() 
     if sourceID == None and \
             typeID == None and \
-            configID == None : return return_list
-    for t in th:
-        if ( sourceID == None or t.key.source == sourceID ) and \
-        ( typeID == None or t.key.type == typeID ) and \
-        ( configID == None or t.key.config_id == configID ) :
-            return_list.append( t.length )
-    return return_list
+            configID == None : return list()
+    return _index(th).lengths(sourceID, typeID, configID)
 
 from icecube import dataclasses as dc
 def generate_trigger_key(key_str):
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+
+'''
+Benchmarks the TriggerSim segment on synthetic events.
+
+The events are made by SyntheticEventSource from the geometry of a GCD
+file, so the benchmark doesn't need any simulation files.  For every
+noise rate the segment is run over the same number of frames and the
+time each module took is taken from the tray usage.  Raising the noise
+rate raises the number of launches per frame, which gives the scaling
+of every trigger module, I3GlobalTriggerSim, I3Pruner and I3TimeShifter
+with the size of the events.
+'''
+
+import argparse
+import json
+from os.path import expandvars
+
+parser = argparse.ArgumentParser(description='Benchmark the trigger-sim modules.')
+parser.add_argument('--gcd',
+                    dest='GCD',
+                    default=expandvars("$I3_TESTDATA/GCD/GeoCalibDetectorStatus_2013.56429_V1.i3.gz"),
+                    help='GCD file with the geometry and the trigger configuration.')
+parser.add_argument('--nframes',
+                    dest='NFRAMES',
+                    type=int,
+                    default=1000,
+                    help='Number of frames per noise rate.')
+parser.add_argument('--noise-rates',
+                    dest='NOISE_RATES',
+                    default='500,1000,2000,4000,8000',
+                    help='Comma separated in-ice noise rates in Hz.')
+parser.add_argument('--icetop-noise-rate',
+                    dest='ICETOP_NOISE_RATE',
+                    type=float,
+                    default=1500.,
+                    help='IceTop noise rate in Hz.')
+parser.add_argument('--brightness',
+                    dest='BRIGHTNESS',
+                    type=float,
+                    default=10.,
+                    help='Mean number of launches of a DOM on the track.  0 for noise only.')
+parser.add_argument('--readout-length',
+                    dest='READOUT_LENGTH',
+                    type=float,
+                    default=20.,
+                    help='Length of the events in microseconds.')
+parser.add_argument('--seed',
+                    dest='SEED',
+                    type=int,
+                    default=0,
+                    help='Seed of the synthetic events.')
+parser.add_argument('--output',
+                    dest='OUTPUT',
+                    default=None,
+                    help='Write the results to this JSON file.')
+args = parser.parse_args()
+
+from I3Tray import I3Tray
+from icecube import icetray, dataclasses, dataio, trigger_sim
+from icecube.icetray import I3Units
+from icecube.trigger_sim.modules.synthetic_source import SyntheticEventSource
+
+class LaunchCounter(icetray.I3Module):
+    '''
+    Counts the frames and the launches that go into the trigger modules.
+    '''
+    def __init__(self, context):
+        icetray.I3Module.__init__(self, context)
+        self.AddParameter("Counts", "dict to fill", None)
+        self.AddOutBox("OutBox")
+
+    def Configure(self):
+        self.counts = self.GetParameter("Counts")
+
+    def DAQ(self, frame):
+        for name in ("InIceRawData", "IceTopRawData"):
+            if name in frame:
+                self.counts[name] += sum(len(s) for s in frame[name].values())
+        self.counts["frames"] += 1
+        self.PushFrame(frame)
+
+def run(noise_rate):
+    counts = {"InIceRawData" : 0, "IceTopRawData" : 0, "frames" : 0}
+
+    tray = I3Tray()
+    tray.AddModule("I3InfiniteSource", "source",
+                   Prefix = args.GCD,
+                   Stream = icetray.I3Frame.DAQ)
+    tray.AddModule(SyntheticEventSource, "synthetic_events",
+                   NoiseRate = noise_rate / I3Units.second,
+                   IceTopNoiseRate = args.ICETOP_NOISE_RATE / I3Units.second,
+                   TrackBrightness = args.BRIGHTNESS,
+                   ReadoutLength = args.READOUT_LENGTH * I3Units.microsecond,
+                   Seed = args.SEED)
+    tray.AddModule(LaunchCounter, "launch_counter", Counts = counts)
+    tray.AddSegment(trigger_sim.TriggerSim, "trigger",
+                    gcd_file = dataio.I3File(args.GCD),
+                    run_id = 1)
+    # the GCD frames of the prefix count too
+    tray.Execute(args.NFRAMES + n_gcd_frames)
+
+    usage = tray.Usage()
+    modules = dict()
+    for name in usage.keys():
+        if name in ("source", "synthetic_events", "launch_counter"):
+            continue
+        ru = usage[name]
+        seconds = ru.usertime + ru.systime
+        modules[name] = {"ncall" : ru.ncall,
+                         "usertime" : ru.usertime,
+                         "systime" : ru.systime,
+                         "us_per_frame" : 1e6 * seconds / max(counts["frames"], 1),
+                         "frames_per_second" : counts["frames"] / seconds if seconds > 0 else float("inf")}
+
+    frames = max(counts["frames"], 1)
+    return {"noise_rate" : noise_rate,
+            "frames" : counts["frames"],
+            "inice_launches_per_frame" : counts["InIceRawData"] / frames,
+            "icetop_launches_per_frame" : counts["IceTopRawData"] / frames,
+            "modules" : modules}
+
+n_gcd_frames = len([frame for frame in dataio.I3File(args.GCD)])
+results = [run(float(rate)) for rate in args.NOISE_RATES.split(',')]
+
+# one line per module and noise rate, so the scaling can be read off
+print("%-40s %10s %12s %12s %14s" % ("module", "noise [Hz]", "launches", "us/frame", "frames/s"))
+for name in sorted(results[0]["modules"]):
+    for r in results:
+        m = r["modules"].get(name)
+        if not m:
+            continue
+        print("%-40s %10.0f %12.1f %12.1f %14.1f" %
+              (name, r["noise_rate"],
+               r["inice_launches_per_frame"] + r["icetop_launches_per_frame"],
+               m["us_per_frame"], m["frames_per_second"]))
+
+if args.OUTPUT:
+    with open(args.OUTPUT, "w") as f:
+        json.dump({"gcd" : args.GCD,
+                   "nframes" : args.NFRAMES,
+                   "brightness" : args.BRIGHTNESS,
+                   "readout_length" : args.READOUT_LENGTH,
+                   "seed" : args.SEED,
+                   "results" : results}, f, indent = 2)
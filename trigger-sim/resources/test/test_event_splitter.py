@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+
+from I3Tray import I3Tray
+from icecube.icetray import I3Test
+from icecube import icetray
+from icecube import dataclasses
+from icecube import trigger_sim
+
+TRIGGER_TIMES = [1000., 50000.]
+TRIGGER_LENGTH = 1000.
+LAUNCH_TIMES = [1500., 30000., 50500.]
+
+# A sub-event lasts until the next gap between triggers, so the second
+# one starts when the first trigger closes.  Its readout window reaches
+# back far enough to contain the first event too.
+# (start time, launch and hit times, number of primaries)
+EXPECTED = [(1000., [1500.], 1),
+            (2000., LAUNCH_TIMES, 2)]
+
+def TestSetup(frame):
+
+    triggers = dataclasses.I3TriggerHierarchy()
+    for time in TRIGGER_TIMES:
+        t = dataclasses.I3Trigger()
+        t.time = time
+        t.length = TRIGGER_LENGTH
+        t.fired = True
+        triggers.insert(t)
+    frame["I3Triggers"] = triggers
+
+    launchseries = dataclasses.I3DOMLaunchSeries()
+    for time in LAUNCH_TIMES:
+        d = dataclasses.I3DOMLaunch()
+        d.time = time
+        launchseries.append(d)
+    launchmap = dataclasses.I3DOMLaunchSeriesMap()
+    launchmap[icetray.OMKey(21,30)] = launchseries
+    frame["InIceRawData"] = launchmap
+
+    # one primary with a daughter per event
+    mctree = dataclasses.I3MCTree()
+    mchitseries = dataclasses.I3MCHitSeries()
+    for time in TRIGGER_TIMES:
+        primary = dataclasses.I3Particle()
+        daughter = dataclasses.I3Particle()
+        mctree.add_primary(primary)
+        mctree.append_child(primary, daughter)
+        mchit = dataclasses.I3MCHit(daughter.major_id, daughter.minor_id)
+        mchit.time = time + TRIGGER_LENGTH/2
+        mchit.hit_source = dataclasses.I3MCHit.SPE
+        mchitseries.append(mchit)
+    mchitmap = dataclasses.I3MCHitSeriesMap()
+    mchitmap[icetray.OMKey(21,30)] = mchitseries
+    frame["MCHitSeriesMap"] = mchitmap
+    frame["I3MCTree"] = mctree
+
+    weights = dataclasses.I3MapStringDouble()
+    weights["Weight"] = 1.
+    frame["CorsikaWeightMap"] = weights
+
+class TestSplit(icetray.I3Module):
+    def __init__(self, context):
+        icetray.I3Module.__init__(self, context)
+        self.AddOutBox("OutBox")
+
+    def Configure(self):
+        self.nframes = 0
+
+    def DAQ(self, frame):
+        time, launch_times, nprimaries = EXPECTED[self.nframes]
+        self.nframes += 1
+
+        I3Test.ENSURE(frame["triggertime"].value == time, "wrong sub-event time")
+        I3Test.ENSURE(len(frame["triggers"]) == 1, "wrong number of triggers")
+        I3Test.ENSURE(frame["trigersize"].value == 1, "wrong trigger size")
+        I3Test.ENSURE(frame["I3EventHeader"].start_time.mod_julian_sec == 43200, \
+                      "wrong start time")
+
+        launches = [l.time for om, ls in frame["InIceRawData"] for l in ls]
+        I3Test.ENSURE(launches == launch_times, "wrong launches %s" % launches)
+
+        hits = [h.time for om, hs in frame["MCHitSeriesMap"] for h in hs]
+        hit_times = [t + TRIGGER_LENGTH/2 for t in TRIGGER_TIMES[:nprimaries]]
+        I3Test.ENSURE(hits == hit_times, "wrong MC hits %s" % hits)
+
+        I3Test.ENSURE(len(frame["I3MCTree"].primaries) == nprimaries, \
+                      "wrong number of primaries")
+        I3Test.ENSURE(len(frame["I3MCTree"]) == 2*nprimaries, \
+                      "the daughters weren't copied")
+        I3Test.ENSURE(frame["CorsikaWeightMap"]["multiplicity"] == nprimaries, \
+                      "wrong multiplicity")
+        I3Test.ENSURE(frame["CorsikaWeightMap"]["Weight"] == 1, "weight wasn't copied")
+
+    def Finish(self):
+        I3Test.ENSURE(self.nframes == len(EXPECTED), \
+                      "expected %d frames, got %d" % (len(EXPECTED), self.nframes))
+
+tray = I3Tray()
+tray.AddModule("I3InfiniteSource")
+tray.AddModule(TestSetup, streams = [icetray.I3Frame.DAQ])
+tray.AddModule("EventSplitter")
+tray.AddModule(TestSplit)
+tray.Execute(1)
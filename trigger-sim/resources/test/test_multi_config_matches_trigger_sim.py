@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+# A configuration of MultiConfigTriggerSim has to give the same triggers,
+# global triggers and event header as the TriggerSim segment with that
+# GCD file.
+
+from I3Tray import I3Tray
+from icecube.icetray import I3Test
+from icecube import icetray, dataclasses, dataio, trigger_sim
+from icecube.trigger_sim.modules.synthetic_source import SyntheticEventSource
+
+from os.path import expandvars
+
+gcd_file = expandvars("$I3_TESTDATA/GCD/GeoCalibDetectorStatus_2013.56429_V1.i3.gz")
+N_GCD_FRAMES = len([frame for frame in dataio.I3File(gcd_file)])
+NFRAMES = 20
+
+def triggers(hierarchy):
+    return [(t.key.source, t.key.type, t.key.config_id,
+             t.fired, t.time, t.length) for t in hierarchy]
+
+n_throughput = list()
+def Compare(frame):
+    for single, multi in (("I3Triggers", "I3Triggers_GCD"),
+                          ("I3TriggerHierarchy", "I3TriggerHierarchy_GCD")):
+        I3Test.ENSURE(triggers(frame[single]) == triggers(frame[multi]),
+                      "%s and %s differ" % (single, multi))
+    header, multi_header = frame["I3EventHeader"], frame["I3EventHeader_GCD"]
+    I3Test.ENSURE(header.start_time == multi_header.start_time, "different start times")
+    I3Test.ENSURE(header.end_time == multi_header.end_time, "different end times")
+    I3Test.ENSURE(header.event_id == multi_header.event_id, "different event IDs")
+    n_throughput.append(len([t for t in frame["I3TriggerHierarchy"]
+                             if t.key.type == dataclasses.THROUGHPUT]))
+
+tray = I3Tray()
+tray.AddModule("I3InfiniteSource", prefix = gcd_file,
+               stream = icetray.I3Frame.DAQ)
+tray.AddModule(SyntheticEventSource, Seed = 5)
+# TriggerSim does the filtering, so both see the same frames
+tray.AddSegment(trigger_sim.MultiConfigTriggerSim, "multi",
+                run_id = 1,
+                filter_mode = False,
+                configurations = {"GCD" : dataio.I3File(gcd_file)})
+tray.AddSegment(trigger_sim.TriggerSim, "single",
+                gcd_file = dataio.I3File(gcd_file),
+                run_id = 1,
+                prune = False,
+                time_shift = False)
+tray.AddModule(Compare, streams = [icetray.I3Frame.DAQ])
+tray.Execute(NFRAMES + N_GCD_FRAMES)
+
+I3Test.ENSURE(len(n_throughput) > 0, "nothing triggered")
+I3Test.ENSURE(sum(n_throughput) > 0, "no throughput triggers")
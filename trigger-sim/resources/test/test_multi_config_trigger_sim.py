@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+from I3Tray import I3Tray
+from icecube.icetray import I3Test
+from icecube import icetray, dataclasses, dataio, trigger_sim
+from icecube.trigger_sim.inice_test_modules import TestSource
+from icecube.trigger_sim.trigger_hierarchy_recipes import n_triggers
+
+from os.path import expandvars
+
+gcd_file = expandvars("$I3_TESTDATA/GCD/GeoCalibDetectorStatus_2013.56429_V1.i3.gz")
+
+# the same trigger configuration with SMT8 raised to SMT12
+tsmap = trigger_sim.get_trigger_status(dataio.I3File(gcd_file))
+for key, status in tsmap.items() :
+    if key.config_id == 1006 :
+        status.trigger_settings["threshold"] = "12"
+        tsmap[key] = status
+
+def TestTriggers(frame):
+    # 10 hits in 1 microsecond fire SMT8, but not SMT12
+    for label, expected in [("SMT8", 1), ("SMT12", 0)] :
+        I3Test.ENSURE("I3Triggers_" + label in frame,
+                      "no trigger hierarchy for %s" % label)
+        n = n_triggers(frame["I3Triggers_" + label],
+                       sourceID = dataclasses.IN_ICE,
+                       typeID = dataclasses.SIMPLE_MULTIPLICITY,
+                       configID = 1006)
+        I3Test.ENSURE(n == expected,
+                      "%s has %d SMT triggers" % (label, n))
+        # every trigger gets a throughput trigger from the I3GlobalTriggerSim
+        n_tt = n_triggers(frame["I3TriggerHierarchy_" + label],
+                          sourceID = dataclasses.GLOBAL,
+                          typeID = dataclasses.THROUGHPUT)
+        I3Test.ENSURE(n_tt == len(frame["I3Triggers_" + label]),
+                      "%s has %d throughput triggers" % (label, n_tt))
+
+    for key in ["InIceRawDataTriggerHits", "IceTopRawDataTriggerHits",
+                "sweep_TriggerCollector_SMT8", "sweep_TriggerCollector_SMT12"] :
+        I3Test.ENSURE(key not in frame, "%s wasn't removed" % key)
+
+tray = I3Tray()
+tray.AddModule("I3InfiniteSource", prefix = gcd_file,
+               stream = icetray.I3Frame.DAQ)
+tray.AddModule(TestSource, NDOMs = 10)
+tray.AddSegment(trigger_sim.MultiConfigTriggerSim, "sweep",
+                run_id = 1,
+                configurations = {"SMT8" : dataio.I3File(gcd_file),
+                                  "SMT12" : tsmap})
+tray.AddModule(TestTriggers, streams = [icetray.I3Frame.DAQ])
+tray.Execute(10)
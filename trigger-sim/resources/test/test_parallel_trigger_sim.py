@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+
+import os
+import shutil
+import tempfile
+
+from I3Tray import I3Tray
+from icecube.icetray import I3Test
+from icecube import icetray, dataclasses, dataio, trigger_sim
+from icecube.icetray import I3Units
+from icecube.trigger_sim.modules.synthetic_source import SyntheticEventSource
+from icecube.trigger_sim.parallel import run_parallel
+
+from os.path import expandvars
+
+gcd_file = expandvars("$I3_TESTDATA/GCD/GeoCalibDetectorStatus_2013.56429_V1.i3.gz")
+N_GCD_FRAMES = len([frame for frame in dataio.I3File(gcd_file)])
+NFRAMES = 20
+global_trigger_args = {"TimeIncrement" : 100 * I3Units.ns}
+
+tmpdir = tempfile.mkdtemp()
+infile = os.path.join(tmpdir, "in.i3")
+sequential_file = os.path.join(tmpdir, "sequential.i3")
+parallel_file = os.path.join(tmpdir, "parallel.i3")
+
+def summary(filename):
+    events = list()
+    for frame in dataio.I3File(filename):
+        if frame.Stop != icetray.I3Frame.DAQ:
+            continue
+        header = frame["I3EventHeader"]
+        events.append((header.event_id,
+                       header.start_time.utc_daq_time,
+                       [(t.key.source, t.key.type, t.time)
+                        for t in frame["I3TriggerHierarchy"]]))
+    return events
+
+try:
+    # noise only, so some of the frames don't trigger
+    tray = I3Tray()
+    tray.AddModule("I3InfiniteSource", prefix = gcd_file,
+                   stream = icetray.I3Frame.DAQ)
+    tray.AddModule(SyntheticEventSource,
+                   NoiseRate = 2000. / I3Units.second,
+                   TrackBrightness = 0.,
+                   Seed = 7)
+    tray.AddModule("I3Writer", Filename = infile)
+    tray.Execute(NFRAMES + N_GCD_FRAMES)
+
+    tray = I3Tray()
+    tray.AddModule("I3Reader", Filename = infile)
+    tray.AddSegment(trigger_sim.TriggerSim, "trigger",
+                    gcd_file = dataio.I3File(gcd_file),
+                    run_id = 1,
+                    global_trigger_args = global_trigger_args)
+    tray.AddModule("I3Writer", Filename = sequential_file)
+    tray.Execute()
+
+    # more chunks than workers
+    run_parallel(infile, parallel_file, gcd_file,
+                 run_id = 1,
+                 nworkers = 2,
+                 chunk_size = 3,
+                 global_trigger_args = global_trigger_args)
+
+    sequential = summary(sequential_file)
+    I3Test.ENSURE(len(sequential) > 0, "nothing triggered")
+    I3Test.ENSURE(sequential == summary(parallel_file),
+                  "the parallel run doesn't give the same events")
+finally:
+    shutil.rmtree(tmpdir)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+# Runs the SimpleMajorityTrigger over the same events twice.  The second
+# time its hit buffer has seen every event already, so it must not grow.
+
+from I3Tray import I3Tray
+from icecube.icetray import I3Test
+from icecube import icetray, dataclasses, dataio, trigger_sim
+from icecube.trigger_sim.modules.synthetic_source import SyntheticEventSource
+
+from os.path import expandvars
+
+gcd_file = expandvars("$I3_TESTDATA/GCD/GeoCalibDetectorStatus_2013.56429_V1.i3.gz")
+N_GCD_FRAMES = len([frame for frame in dataio.I3File(gcd_file)])
+NEVENTS = 20
+
+launches = list()
+def Replay(frame):
+    # the first NEVENTS frames are kept, the next NEVENTS get them back
+    if len(launches) < NEVENTS:
+        launches.append(frame["InIceRawData"])
+    else:
+        del frame["InIceRawData"]
+        frame["InIceRawData"] = launches[len(launches) - NEVENTS]
+        launches.append(frame["InIceRawData"])
+
+profiles = list()
+def Collect(frame):
+    profiles.append(dict(frame["SMTProfile"]))
+
+tray = I3Tray()
+tray.AddModule("I3InfiniteSource", prefix = gcd_file,
+               stream = icetray.I3Frame.DAQ)
+tray.AddModule(SyntheticEventSource, Seed = 7, TrackBrightness = 20.)
+tray.AddModule(Replay, streams = [icetray.I3Frame.DAQ])
+# no TriggerHitTableName, so the module fills and sorts the hits itself
+tray.AddModule("SimpleMajorityTrigger", TriggerConfigID = 1006,
+               ProfileName = "SMTProfile")
+tray.AddModule(Collect, streams = [icetray.I3Frame.DAQ])
+tray.Execute(2 * NEVENTS + N_GCD_FRAMES)
+
+I3Test.ENSURE(len(profiles) == 2 * NEVENTS, "wrong number of frames")
+first, second = profiles[:NEVENTS], profiles[NEVENTS:]
+
+I3Test.ENSURE(sum(p["buffer_growths"] for p in first) > 0,
+              "the hit buffer never grew")
+I3Test.ENSURE(sum(p["triggers"] for p in first) > 0, "the SMT8 never triggered")
+for n, (p1, p2) in enumerate(zip(first, second)):
+    I3Test.ENSURE(p1["hits"] == p2["hits"], "frame %d has different hits" % n)
+    I3Test.ENSURE(p1["triggers"] == p2["triggers"],
+                  "frame %d has different triggers" % n)
+    I3Test.ENSURE(p2["buffer_growths"] == 0,
+                  "the hit buffer grew for frame %d the second time" % n)
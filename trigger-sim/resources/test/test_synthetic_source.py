@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+from I3Tray import I3Tray
+from icecube.icetray import I3Test
+from icecube import icetray, dataclasses, dataio
+from icecube.icetray import I3Units
+from icecube.trigger_sim.modules.synthetic_source import SyntheticEventSource
+
+from os.path import expandvars
+
+gcd_file = expandvars("$I3_TESTDATA/GCD/GeoCalibDetectorStatus_2013.56429_V1.i3.gz")
+READOUT_LENGTH = 20 * I3Units.microsecond
+# the GCD frames of the prefix count in Execute
+N_GCD_FRAMES = len([frame for frame in dataio.I3File(gcd_file)])
+
+def generate(nframes, **kwargs):
+    launches = list()
+    def Collect(frame):
+        event = dict()
+        for name in ("InIceRawData", "IceTopRawData"):
+            I3Test.ENSURE(name in frame, "%s is missing" % name)
+            for omkey, series in frame[name] :
+                times = [launch.time for launch in series]
+                I3Test.ENSURE(times == sorted(times), "the launches aren't time ordered")
+                I3Test.ENSURE(all(0 <= t < READOUT_LENGTH for t in times),
+                              "launch outside the readout window")
+                event[(name, omkey.string, omkey.om)] = [(launch.time, launch.lc_bit)
+                                                         for launch in series]
+        launches.append(event)
+
+    tray = I3Tray()
+    tray.AddModule("I3InfiniteSource", prefix = gcd_file,
+                   stream = icetray.I3Frame.DAQ)
+    tray.AddModule(SyntheticEventSource,
+                   ReadoutLength = READOUT_LENGTH,
+                   **kwargs)
+    tray.AddModule(Collect, streams = [icetray.I3Frame.DAQ])
+    tray.Execute(nframes + N_GCD_FRAMES)
+    return launches
+
+# the same seed gives the same events
+first = generate(5, Seed = 42)
+I3Test.ENSURE(len(first) == 5, "expected 5 events")
+I3Test.ENSURE(first == generate(5, Seed = 42), "the events aren't reproducible")
+I3Test.ENSURE(first != generate(5, Seed = 43), "the seed isn't used")
+
+# the track gives the LC launches
+I3Test.ENSURE(any(lc for event in first for series in event.values() for t, lc in series),
+              "no LC launches")
+
+# nothing without noise and track
+for event in generate(3, NoiseRate = 0., IceTopNoiseRate = 0., TrackBrightness = 0.) :
+    I3Test.ENSURE(len(event) == 0, "there shouldn't be any launches")
+
+# more noise, more launches
+quiet = generate(3, TrackBrightness = 0.)
+noisy = generate(3, TrackBrightness = 0., NoiseRate = 10 * 500. / I3Units.second)
+I3Test.ENSURE(sum(len(s) for e in noisy for s in e.values()) >
+              sum(len(s) for e in quiet for s in e.values()),
+              "the noise rate isn't used")
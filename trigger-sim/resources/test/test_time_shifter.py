@@ -20,6 +20,9 @@ def TestSetup(frame, add_empty_trigger = False, add_mchits = True ) :
     mctree.add_primary(p)
     frame["MCTree"] = mctree
 
+    # derived from I3MCTree, so it has to be shifted as one
+    frame["LinearizedMCTree"] = dataclasses.I3LinearizedMCTree(mctree)
+
     # I3MMCTrack
     mmctrack = simclasses.I3MMCTrack()
     mmctrack.SetParticle(p)
@@ -167,6 +170,11 @@ def TestShift(frame, expect_mchits = True, expect_trigger = True):
         print("I3MCTree p.time = ",p.time)
         I3Test.ENSURE(p.time == 0, "I3MCTree time is %f"\
                       % p.time)
+
+    for p in frame["LinearizedMCTree"] :
+        print("I3LinearizedMCTree p.time = ",p.time)
+        I3Test.ENSURE(p.time == 0, "I3LinearizedMCTree time is %f"\
+                      % p.time)
                               
 
     # I3MMCTrack
@@ -255,3 +263,29 @@ tray.AddModule(I3TimeShifter, \
 tray.AddModule(TestShift, streams = [icetray.I3Frame.DAQ])
 tray.Execute(1)
 
+
+# The C++ I3TimeShifter has to give the same results,
+# with and without a trigger hierarchy in the frame.
+tray = I3Tray()
+tray.AddModule("I3InfiniteSource")
+tray.AddModule(TestSetup, streams = [icetray.I3Frame.DAQ])
+tray.AddModule("I3TimeShifter",\
+               SkipKeys = ["NotTime"],
+               ShiftI3DoubleKeys = ["SomeTime"])
+tray.AddModule(TestShift, streams = [icetray.I3Frame.DAQ])
+tray.Execute(1)
+
+tray = I3Tray()
+tray.AddModule("I3InfiniteSource")
+tray.AddModule(TestSetup, \
+               streams = [icetray.I3Frame.DAQ])
+tray.AddModule(remove_frame_object, \
+               streams = [icetray.I3Frame.DAQ], \
+               key = "Trigger")
+tray.AddModule("I3TimeShifter",\
+               SkipKeys = ["NotTime"],
+               ShiftI3DoubleKeys = ["SomeTime"])
+tray.AddModule(TestShift, \
+               streams = [icetray.I3Frame.DAQ],\
+               expect_trigger = False)
+tray.Execute(1)
@@ -83,3 +83,13 @@ ENSURE( len(trigger_lengths(th, configID = cid1)) == 1, "expected 2 config %s fo
 
 
 
+
+# an index made once answers the same as the hierarchy
+index = dataclasses.I3TriggerHierarchyIndex(th)
+for tk in tkey_l :
+    ENSURE( len(find_triggers(index,tk)) == 1, "there should be 1 trigger found in the index" )
+ENSURE( n_triggers(index, sourceID = sid1) == n_triggers(th, sourceID = sid1),
+        "the index and the hierarchy disagree" )
+ENSURE( trigger_lengths(index, typeID = tid1) == trigger_lengths(th, typeID = tid1),
+        "the index and the hierarchy disagree" )
+ENSURE( n_triggers(index) == 0, "no IDs should count nothing" )
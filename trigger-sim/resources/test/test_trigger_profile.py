@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+
+from I3Tray import I3Tray
+from icecube.icetray import I3Test
+from icecube import icetray, dataclasses, dataio, trigger_sim
+from icecube.trigger_sim.modules.synthetic_source import SyntheticEventSource
+
+from os.path import expandvars
+
+gcd_file = expandvars("$I3_TESTDATA/GCD/GeoCalibDetectorStatus_2013.56429_V1.i3.gz")
+N_GCD_FRAMES = len([frame for frame in dataio.I3File(gcd_file)])
+NFRAMES = 10
+
+profiles = list()
+def Collect(frame):
+    profiles.append({key : dict(frame[key]) for key in frame.keys()
+                     if key.startswith("trigger_Profile_")})
+
+tray = I3Tray()
+tray.AddModule("I3InfiniteSource", prefix = gcd_file,
+               stream = icetray.I3Frame.DAQ)
+tray.AddModule(SyntheticEventSource, Seed = 3)
+tray.AddSegment(trigger_sim.TriggerSim, "trigger",
+                gcd_file = dataio.I3File(gcd_file),
+                run_id = 1,
+                profile = True)
+tray.AddModule(Collect, streams = [icetray.I3Frame.DAQ])
+tray.Execute(NFRAMES + N_GCD_FRAMES)
+
+I3Test.ENSURE(len(profiles) > 0, "nothing triggered")
+for profile in profiles:
+    # SMT8, the cylinder and the slow particle trigger are in the 2013 GCD
+    for key in ("trigger_Profile_SimpleMajorityTrigger_1006",
+                "trigger_Profile_CylinderTrigger_21001",
+                "trigger_Profile_SlowMonopoleTrigger_24002",
+                "trigger_Profile_I3GlobalTriggerSim",
+                "trigger_Profile_I3Pruner"):
+        I3Test.ENSURE(key in profile, "%s is missing" % key)
+        I3Test.ENSURE(profile[key]["time"] >= 0., "%s has no time" % key)
+
+    I3Test.ENSURE("hits" in profile["trigger_Profile_SimpleMajorityTrigger_1006"],
+                  "the SMT doesn't count hits")
+    I3Test.ENSURE("pairs" in profile["trigger_Profile_CylinderTrigger_21001"],
+                  "the cylinder trigger doesn't count pairs")
+    I3Test.ENSURE("triples" in profile["trigger_Profile_SlowMonopoleTrigger_24002"],
+                  "the slow particle trigger doesn't count triples")
+
+I3Test.ENSURE(sum(p["trigger_Profile_SimpleMajorityTrigger_1006"]["triggers"]
+                  for p in profiles) > 0, "the SMT8 never triggered")